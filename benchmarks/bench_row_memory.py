@@ -0,0 +1,121 @@
+"""
+行模型内存基准：对比旧的 ``rows_by_path`` 字典 + dataclass 与紧凑 RowStore 的每行占用。
+
+运行命令：python -m benchmarks.bench_row_memory [行数]
+"""
+from __future__ import annotations
+
+import gc
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from core.row_store import RowStore
+
+DEFAULT_ROWS = 150_000
+
+
+@dataclass
+class _LegacyFolderRemark:
+    """
+    改造前的行记录：普通 dataclass，持有 Path 与两份备注。
+    """
+
+    name: str
+    path: Path
+    original_remark: str
+    current_remark: str
+
+
+def _synthetic_rows(count: int) -> List[tuple[str, str]]:
+    """
+    生成模拟的 (路径, 备注) 数据，约三分之一的目录带备注。
+
+    Args:
+        count: 行数。
+
+    Returns:
+        路径文本与备注的列表。
+    """
+    parent: str = os.path.join(os.sep, "fileserver", "projects", "2024", "archive")
+    return [
+        (
+            os.path.join(parent, f"PRJ-{index:06d}-客户资料"),
+            f"项目 {index} 归档" if index % 3 == 0 else "",
+        )
+        for index in range(count)
+    ]
+
+
+def _build_legacy(rows: List[tuple[str, str]]) -> object:
+    """
+    按改造前的方式构建行模型（含 Treeview 外的路径键副本）。
+    """
+    rows_by_path: Dict[str, _LegacyFolderRemark] = {}
+    for raw_path, remark in rows:
+        path: Path = Path(raw_path)
+        rows_by_path[str(path)] = _LegacyFolderRemark(
+            name=path.name,
+            path=path,
+            original_remark=remark,
+            current_remark=remark,
+        )
+    return rows_by_path
+
+
+def _build_store(rows: List[tuple[str, str]]) -> object:
+    """
+    按 RowStore 构建行模型。
+    """
+    store: RowStore = RowStore()
+    for raw_path, remark in rows:
+        store.add(raw_path, remark)
+    return store
+
+
+def _measure(
+    builder: Callable[[List[tuple[str, str]]], object],
+    rows: List[tuple[str, str]],
+) -> int:
+    """
+    测量构建行模型新增的内存字节数（不含输入数据本身）。
+
+    Args:
+        builder: 行模型构建函数。
+        rows: 输入数据。
+
+    Returns:
+        构建结果仍存活时的净分配字节数。
+    """
+    gc.collect()
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+    model: object = builder(rows)
+    after: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del model
+    return after - before
+
+
+def main() -> None:
+    """
+    输出两种行模型的总占用与每行占用。
+    """
+    count: int = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    rows: List[tuple[str, str]] = _synthetic_rows(count)
+    legacy: int = _measure(_build_legacy, rows)
+    compact: int = _measure(_build_store, rows)
+    print(f"rows={count}")
+    for label, size in (("legacy dict+dataclass", legacy), ("RowStore", compact)):
+        print(
+            f"{label:<22} {size / 1024 / 1024:.1f} MiB, "
+            f"{size / count:.0f} B/row"
+        )
+    print(f"saving: {(1 - compact / legacy) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+整树扫描吞吐基准：对比线程模式（异步扫描引擎）与不同进程数的多进程模式。
+
+在临时目录生成带 desktop.ini 的合成目录树，逐个模式完整扫描并输出每秒目录数。
+运行命令：python -m benchmarks.bench_scan_processes [顶层目录数] [每个顶层下的目录数]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, List
+
+from core.async_scan import AsyncScanner, iter_sync
+from core.bulk_scan import iter_bulk_scan
+from core.constants import WALK_MAX_WORKERS
+from core.ini_service import DesktopIniService
+
+DEFAULT_TOPS = 16
+DEFAULT_PER_TOP = 1000
+
+# 模拟资源管理器写出的 desktop.ini，附带若干其他键以接近真实解析成本。
+_INI_TEMPLATE = (
+    "[.ShellClassInfo]\r\n"
+    "IconResource=C:\\Windows\\System32\\imageres.dll,-{index}\r\n"
+    "InfoTip=项目 {index} 归档资料\r\n"
+    "[ViewState]\r\n"
+    "Mode=\r\n"
+    "Vid=\r\n"
+    "FolderType=Documents\r\n"
+)
+
+
+def _build_tree(root: Path, tops: int, per_top: int) -> int:
+    """
+    生成两层合成目录树，每个目录都带 utf-16 编码的 desktop.ini。
+
+    Args:
+        root: 输出目录。
+        tops: 顶层目录数。
+        per_top: 每个顶层目录下的子目录数。
+
+    Returns:
+        生成的目录总数。
+    """
+    index: int = 0
+    for top in range(tops):
+        top_dir: Path = root / f"TOP-{top:03d}"
+        for child in range(per_top):
+            folder: Path = top_dir / f"PRJ-{child:05d}"
+            folder.mkdir(parents=True)
+            (folder / "desktop.ini").write_text(
+                _INI_TEMPLATE.format(index=index), encoding="utf-16"
+            )
+            index += 1
+    return tops * (per_top + 1)
+
+
+def _scan_threads(root: Path) -> Iterable[object]:
+    """
+    线程模式：共享线程池上的异步扫描引擎。
+    """
+    with ThreadPoolExecutor(max_workers=WALK_MAX_WORKERS) as executor:
+        scanner: AsyncScanner = AsyncScanner(DesktopIniService(), executor)
+        yield from iter_sync(scanner.iter_remarks(root))
+
+
+def _timed(scan: Callable[[], Iterable[object]]) -> tuple[int, float]:
+    """
+    完整消费一次扫描并计时。
+
+    Args:
+        scan: 返回扫描结果迭代器的函数。
+
+    Returns:
+        (产出条数, 用时秒数)。
+    """
+    started: float = time.perf_counter()
+    count: int = sum(1 for _ in scan())
+    return count, time.perf_counter() - started
+
+
+def main() -> None:
+    """
+    输出各模式的用时、吞吐与相对单进程的加速比。
+    """
+    tops: int = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TOPS
+    per_top: int = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PER_TOP
+    cpus: int = os.cpu_count() or 1
+    process_counts: List[int] = sorted(
+        {count for count in (1, 2, 4, 8, cpus) if count <= cpus}
+    )
+    with tempfile.TemporaryDirectory(prefix="desktopini_bench_") as temp:
+        root: Path = Path(temp)
+        total: int = _build_tree(root, tops, per_top)
+        print(f"folders={total} cpus={cpus}")
+        count, elapsed = _timed(lambda: _scan_threads(root))
+        print(
+            f"{'threads':<12} {elapsed:6.2f}s {count / elapsed:9.0f} folders/s"
+        )
+        baseline: float = 0.0
+        for processes in process_counts:
+            count, elapsed = _timed(
+                lambda: iter_bulk_scan(root, processes=processes)
+            )
+            baseline = baseline or elapsed
+            print(
+                f"{f'processes={processes}':<12} {elapsed:6.2f}s "
+                f"{count / elapsed:9.0f} folders/s "
+                f"x{baseline / elapsed:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
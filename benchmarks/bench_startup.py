@@ -0,0 +1,84 @@
+"""
+启动耗时基准：反复启动界面，统计首帧绘制与可交互耗时，便于按版本对比。
+
+以 ``DESKTOPINI_STARTUP_EXIT=1`` 启动 main.py，界面可交互后自动退出，
+再从日志中读取本轮新增的 METRIC 行。需在 Windows 桌面环境下运行。
+运行命令：python -m benchmarks.bench_startup [次数] [初始目录]
+"""
+from __future__ import annotations
+
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from core.constants import (
+    LOG_FILE_NAME,
+    METRIC_STARTUP_FIRST_PAINT,
+    METRIC_STARTUP_INTERACTIVE,
+    STARTUP_EXIT_ENV_VAR,
+)
+from core.utils import get_log_dir
+
+DEFAULT_RUNS = 5
+
+_METRIC_PATTERN = re.compile(r"\[METRIC\] name=(\S+) value_ms=([\d.]+)")
+
+
+def _read_metrics(log_file: Path, offset: int) -> Dict[str, List[float]]:
+    """
+    读取日志中 offset 之后新增的启动指标。
+
+    Args:
+        log_file: 日志文件。
+        offset: 起始字节位置。
+
+    Returns:
+        指标名称到各次取值（毫秒）的映射。
+    """
+    values: Dict[str, List[float]] = {
+        METRIC_STARTUP_FIRST_PAINT: [],
+        METRIC_STARTUP_INTERACTIVE: [],
+    }
+    with log_file.open("rb") as f:
+        f.seek(offset)
+        text: str = f.read().decode("utf-8", errors="ignore")
+    for match in _METRIC_PATTERN.finditer(text):
+        if match.group(1) in values:
+            values[match.group(1)].append(float(match.group(2)))
+    return values
+
+
+def main() -> None:
+    """
+    启动指定次数并输出各指标的中位数与最大值。
+    """
+    runs: int = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RUNS
+    extra_args: List[str] = sys.argv[2:3]
+    project_dir: Path = Path(__file__).resolve().parents[1]
+    log_file: Path = get_log_dir() / LOG_FILE_NAME
+    offset: int = log_file.stat().st_size if log_file.exists() else 0
+    env: Dict[str, str] = dict(os.environ, **{STARTUP_EXIT_ENV_VAR: "1"})
+    for _ in range(runs):
+        subprocess.run(
+            [sys.executable, str(project_dir / "main.py"), *extra_args],
+            cwd=project_dir,
+            env=env,
+            check=True,
+        )
+    for name, samples in _read_metrics(log_file, offset).items():
+        if not samples:
+            print(f"{name:<22} 无数据")
+            continue
+        print(
+            f"{name:<22} runs={len(samples)} "
+            f"median={statistics.median(samples):7.1f}ms "
+            f"max={max(samples):7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,640 @@
+"""
+命令行入口：不启动界面的批处理子命令；运行命令：python main.py <子命令> ...
+
+子命令：export（导出映射文本）、snapshot（拍摄快照）、diff（比较快照或目录）、
+restore（按快照恢复备注）、sync（把备注从源树镜像到目标树）、
+jobs（列出或删除可续跑任务）、resume（继续中断的任务）。
+
+导出到文件、restore 与 sync 作为可续跑任务执行，中断（Ctrl+C、崩溃）后
+可用 ``resume <任务ID>`` 从检查点继续。
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from core.async_scan import AsyncScanner, iter_sync
+from core.bulk_scan import iter_bulk_scan
+from core.constants import (
+    IO_PRIORITY_INDEX,
+    IO_TUNER_MAX_LIMIT,
+    IO_TUNING_FILE_NAME,
+    JOB_DIR_NAME,
+    JOB_KIND_EXPORT,
+    JOB_KIND_RESTORE,
+    JOB_KIND_SYNC,
+    JOB_STATUS_DONE,
+    JOB_STATUS_FAILED,
+    JOB_STATUS_LABELS,
+)
+from core.ini_service import DesktopIniService
+from core.io_scheduler import IoScheduler
+from core.io_tuner import ConcurrencyTuner
+from core.jobs import Job, JobError, JobManager, JobStore
+from core.mapping import format_mapping_lines, write_mapping_file
+from core.mirror import MirrorStats, iter_mirror_changes
+from core.snapshot import (
+    DIFF_ADDED,
+    DIFF_CHANGED,
+    DIFF_REMOVED,
+    RemarkDiff,
+    SnapshotError,
+    SnapshotHeader,
+    common_depth,
+    diff_entries,
+    iter_live,
+    iter_snapshot,
+    read_snapshot_header,
+    write_snapshot,
+)
+from core.utils import get_config_dir, log_message
+
+
+def _make_service(args: argparse.Namespace) -> DesktopIniService:
+    """
+    创建批处理使用的服务：按卷限制并发并自动调节上限，指定 ``--rate``
+    时按卷限速，避免整树扫描压满文件服务器。
+
+    Args:
+        args: 解析后的命令行参数。
+
+    Returns:
+        以 index 优先级调度的服务。
+    """
+    # 命令行没有界面操作，无需为其保留名额。
+    scheduler: IoScheduler = IoScheduler(
+        interactive_reserve=0, tuner=args.tuner
+    )
+    scheduler.set_rate_limit(IO_PRIORITY_INDEX, args.rate)
+    return DesktopIniService(scheduler=scheduler, priority=IO_PRIORITY_INDEX)
+
+
+def _job_manager() -> JobManager:
+    """
+    创建与界面共用任务目录的任务管理器。
+    """
+    return JobManager(JobStore(get_config_dir() / JOB_DIR_NAME))
+
+
+def _run_job(
+    args: argparse.Namespace, manager: JobManager, job: Job
+) -> int:
+    """
+    执行（或继续）任务并输出结果；Ctrl+C 中断时保存检查点并提示续跑命令。
+
+    Args:
+        args: 解析后的命令行参数，用于创建服务。
+        manager: 任务管理器。
+        job: 任务。
+
+    Returns:
+        0 表示全部成功，1 表示部分写入失败，2 表示任务出错，
+        130 表示被中断。
+    """
+    started: float = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=IO_TUNER_MAX_LIMIT) as executor:
+            manager.run(job, _make_service(args), executor)
+    except JobError as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        print(
+            f"\n已中断，进度已保存（{job.done} 项）。"
+            f"可运行 python main.py resume {job.job_id} 继续。",
+            file=sys.stderr,
+        )
+        return 130
+    elapsed: float = time.perf_counter() - started
+    for path, error in job.failures:
+        print(f"写入失败 {path}: {error}", file=sys.stderr)
+    if job.failed_count > len(job.failures):
+        print(
+            f"……另有 {job.failed_count - len(job.failures)} 项失败未列出。",
+            file=sys.stderr,
+        )
+    if job.status == JOB_STATUS_FAILED:
+        print(
+            f"任务出错：{job.error}。可运行 python main.py resume "
+            f"{job.job_id} 重试。",
+            file=sys.stderr,
+        )
+        return 2
+    if job.status != JOB_STATUS_DONE:
+        print(
+            f"任务{JOB_STATUS_LABELS.get(job.status, job.status)}。"
+            f"可运行 python main.py resume {job.job_id} 继续。",
+            file=sys.stderr,
+        )
+        return 130
+    if job.kind == JOB_KIND_EXPORT:
+        message: str = f"已导出 {job.done} 个目录"
+    else:
+        message = (
+            f"已写入 {job.done - job.failed_count} 个目录，"
+            f"失败 {job.failed_count} 个"
+        )
+    log_message("INFO", f"{job.kind} job {job.job_id}: {message}")
+    print(f"{message}，用时 {elapsed:.2f} 秒。", file=sys.stderr)
+    return 1 if job.failed_count else 0
+
+
+def _iter_threaded(
+    service: DesktopIniService,
+    root: Path,
+    max_depth: Optional[int],
+    remarked_only: bool,
+) -> Iterator[Tuple[str, str]]:
+    """
+    用线程池上的异步扫描引擎遍历子树，适合网络共享等 I/O 受限的场景。
+
+    Args:
+        service: desktop.ini 服务。
+        root: 扫描根目录。
+        max_depth: 最大深度；None 表示不限。
+        remarked_only: 只产出带备注的目录。
+
+    Yields:
+        (相对 root 的路径, 备注) 二元组，顺序取决于完成顺序。
+    """
+    prefix_len: int = len(str(root).rstrip("\\/")) + 1
+    with ThreadPoolExecutor(max_workers=IO_TUNER_MAX_LIMIT) as executor:
+        scanner: AsyncScanner = AsyncScanner(service, executor)
+        for folder, remark in iter_sync(scanner.iter_remarks(root, max_depth)):
+            if remark or not remarked_only:
+                yield str(folder)[prefix_len:], remark
+
+
+def _cmd_export(args: argparse.Namespace) -> int:
+    """
+    导出子树备注为“相对路径->备注”映射文本，可直接粘贴到批量映射窗口。
+
+    以线程方式导出到文件时作为可续跑任务执行，按直接子目录保存检查点。
+
+    Args:
+        args: 解析后的命令行参数。
+
+    Returns:
+        进程退出码。
+    """
+    root: Path = Path(args.root).resolve()
+    if not root.is_dir():
+        print(f"目录不存在：{root}", file=sys.stderr)
+        return 2
+    if args.output and args.processes is None:
+        manager: JobManager = _job_manager()
+        output: Path = Path(args.output).resolve()
+        job: Job = manager.create(
+            JOB_KIND_EXPORT,
+            f"导出 {root} → {output}",
+            {
+                "root": str(root),
+                "output": str(output),
+                "depth": args.depth,
+                "remarked_only": args.remarked_only,
+            },
+        )
+        return _run_job(args, manager, job)
+    rows: Iterator[Tuple[str, str]]
+    if args.processes is not None:
+        rows = iter_bulk_scan(
+            root,
+            processes=args.processes or None,
+            max_depth=args.depth,
+            remarked_only=args.remarked_only,
+        )
+    else:
+        rows = _iter_threaded(
+            _make_service(args), root, args.depth, args.remarked_only
+        )
+
+    count: int = 0
+
+    def counted() -> Iterator[Tuple[str, str, str]]:
+        nonlocal count
+        for relative, remark in rows:
+            count += 1
+            yield relative, remark, relative
+
+    started: float = time.perf_counter()
+    lines: Iterator[str] = format_mapping_lines(counted())
+    if args.output:
+        write_mapping_file(lines, Path(args.output))
+    else:
+        for line in lines:
+            sys.stdout.write(line + "\n")
+    elapsed: float = time.perf_counter() - started
+    mode: str = "processes" if args.processes is not None else "threads"
+    log_message(
+        "INFO", f"export {root}: {count} folders in {elapsed:.2f}s ({mode})"
+    )
+    print(f"已导出 {count} 个目录，用时 {elapsed:.2f} 秒。", file=sys.stderr)
+    return 0
+
+
+def _open_state(
+    spec: str,
+    service: DesktopIniService,
+    executor: ThreadPoolExecutor,
+    max_depth: Optional[int] = None,
+) -> Iterator[Tuple[str, str]]:
+    """
+    把命令行参数解释为备注状态：目录读取实时树，文件按快照读取。
+
+    Args:
+        spec: 目录或快照文件路径。
+        service: 读取实时树时使用的服务。
+        executor: 读取实时树时使用的线程池。
+        max_depth: 只比较到此深度；None 表示不限。
+
+    Returns:
+        按快照顺序排列的 (相对路径, 备注) 流。
+    """
+    path: Path = Path(spec)
+    if path.is_dir():
+        return iter_live(service, path.resolve(), executor, max_depth)
+    return iter_snapshot(path, max_depth)
+
+
+def _state_depth(spec: str) -> Optional[int]:
+    """
+    备注状态的扫描深度：目录不限，快照取文件头中记录的深度。
+
+    Raises:
+        SnapshotError: 快照文件头无效。
+        OSError: 快照文件无法读取。
+    """
+    path: Path = Path(spec)
+    if path.is_dir():
+        return None
+    return read_snapshot_header(path).max_depth
+
+
+def _format_diff(diff: RemarkDiff) -> str:
+    """
+    把一处差异格式化为一行文本：``+`` 新增、``-`` 删除、``~`` 修改。
+
+    Args:
+        diff: 差异。
+
+    Returns:
+        不含换行符的文本。
+    """
+    if diff.kind == DIFF_ADDED:
+        return f"+ {diff.path}\t{diff.new}"
+    if diff.kind == DIFF_REMOVED:
+        return f"- {diff.path}\t{diff.old}"
+    return f"~ {diff.path}\t{diff.old} -> {diff.new}"
+
+
+def _cmd_snapshot(args: argparse.Namespace) -> int:
+    """
+    扫描子树并写出备注快照。
+
+    Args:
+        args: 解析后的命令行参数。
+
+    Returns:
+        进程退出码。
+    """
+    root: Path = Path(args.root).resolve()
+    if not root.is_dir():
+        print(f"目录不存在：{root}", file=sys.stderr)
+        return 2
+    started: float = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=IO_TUNER_MAX_LIMIT) as executor:
+        count: int = write_snapshot(
+            Path(args.output),
+            root,
+            iter_live(_make_service(args), root, executor, args.depth),
+            args.depth,
+        )
+    elapsed: float = time.perf_counter() - started
+    log_message("INFO", f"snapshot {root}: {count} remarks in {elapsed:.2f}s")
+    print(
+        f"已写入 {count} 条备注到 {args.output}，用时 {elapsed:.2f} 秒。",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def _cmd_diff(args: argparse.Namespace) -> int:
+    """
+    比较两个快照或目录的备注状态。
+
+    Args:
+        args: 解析后的命令行参数。
+
+    Returns:
+        0 表示一致，1 表示存在差异，2 表示快照无效。
+    """
+    counts: Dict[str, int] = {DIFF_ADDED: 0, DIFF_REMOVED: 0, DIFF_CHANGED: 0}
+    service: DesktopIniService = _make_service(args)
+    with ThreadPoolExecutor(max_workers=IO_TUNER_MAX_LIMIT) as executor:
+        try:
+            # 深度受限的快照只能与同样深度的状态比较，否则更深的目录全部
+            # 显示为新增或删除。
+            depth: Optional[int] = common_depth(
+                _state_depth(args.left), _state_depth(args.right)
+            )
+            for diff in diff_entries(
+                _open_state(args.left, service, executor, depth),
+                _open_state(args.right, service, executor, depth),
+            ):
+                counts[diff.kind] += 1
+                sys.stdout.write(_format_diff(diff) + "\n")
+        except (SnapshotError, OSError) as exc:
+            print(f"读取失败：{exc}", file=sys.stderr)
+            return 2
+    print(
+        f"新增 {counts[DIFF_ADDED]}，删除 {counts[DIFF_REMOVED]}，"
+        f"修改 {counts[DIFF_CHANGED]}。",
+        file=sys.stderr,
+    )
+    return 1 if any(counts.values()) else 0
+
+
+def _cmd_restore(args: argparse.Namespace) -> int:
+    """
+    把目录树的备注恢复为快照中的状态，只写入有差异的目录。
+
+    实际写入作为可续跑任务执行；``--dry-run`` 只列出差异。
+
+    Args:
+        args: 解析后的命令行参数。
+
+    Returns:
+        0 表示全部成功，1 表示部分写入失败，2 表示参数或快照无效。
+    """
+    source: Path = Path(args.snapshot)
+    try:
+        header: SnapshotHeader = read_snapshot_header(source)
+    except (SnapshotError, OSError) as exc:
+        print(f"读取失败：{exc}", file=sys.stderr)
+        return 2
+    root: Path = Path(args.root or header.root).resolve()
+    if not root.is_dir():
+        print(f"目录不存在：{root}", file=sys.stderr)
+        return 2
+    if not args.dry_run:
+        manager: JobManager = _job_manager()
+        job: Job = manager.create(
+            JOB_KIND_RESTORE,
+            f"恢复 {root} ← {source}",
+            {"root": str(root), "snapshot": str(source.resolve())},
+        )
+        return _run_job(args, manager, job)
+    service: DesktopIniService = _make_service(args)
+    with ThreadPoolExecutor(max_workers=IO_TUNER_MAX_LIMIT) as executor:
+        diffs: Iterator[RemarkDiff] = diff_entries(
+            iter_live(service, root, executor, header.max_depth),
+            iter_snapshot(source),
+        )
+        try:
+            for diff in diffs:
+                sys.stdout.write(_format_diff(diff) + "\n")
+        except (SnapshotError, OSError) as exc:
+            print(f"读取失败：{exc}", file=sys.stderr)
+            return 2
+    return 0
+
+
+def _cmd_sync(args: argparse.Namespace) -> int:
+    """
+    把源树的备注镜像到目标树，只写入有差异的目录。
+
+    实际写入作为可续跑任务执行；``--dry-run`` 只列出差异。
+
+    Args:
+        args: 解析后的命令行参数。
+
+    Returns:
+        0 表示全部成功，1 表示部分写入失败，2 表示参数无效。
+    """
+    source: Path = Path(args.source).resolve()
+    target: Path = Path(args.target).resolve()
+    for folder in (source, target):
+        if not folder.is_dir():
+            print(f"目录不存在：{folder}", file=sys.stderr)
+            return 2
+    if not args.dry_run:
+        manager: JobManager = _job_manager()
+        job: Job = manager.create(
+            JOB_KIND_SYNC,
+            f"同步 {source} → {target}",
+            {
+                "source": str(source),
+                "root": str(target),
+                "keep_target": args.keep_target,
+                "depth": args.depth,
+            },
+        )
+        return _run_job(args, manager, job)
+    service: DesktopIniService = _make_service(args)
+    stats: MirrorStats = MirrorStats()
+    with ThreadPoolExecutor(max_workers=IO_TUNER_MAX_LIMIT) as executor:
+        for change in iter_mirror_changes(
+            service,
+            source,
+            target,
+            executor,
+            stats,
+            keep_target=args.keep_target,
+            max_depth=args.depth,
+        ):
+            if change.repair_only:
+                line = f"! {change.relative}\t（补齐属性）"
+            else:
+                line = (
+                    f"~ {change.relative}\t"
+                    f"{change.old_remark} -> {change.new_remark}"
+                )
+            sys.stdout.write(line + "\n")
+    print(f"{stats.summary()}。", file=sys.stderr)
+    return 0
+
+
+def _cmd_jobs(args: argparse.Namespace) -> int:
+    """
+    列出未完成的可续跑任务，或删除指定任务。
+
+    Args:
+        args: 解析后的命令行参数。
+
+    Returns:
+        0 表示成功，2 表示要删除的任务不存在或正在其他进程中执行。
+    """
+    manager: JobManager = _job_manager()
+    if args.delete:
+        if not manager.store.state_path(args.delete).exists():
+            print(f"任务不存在：{args.delete}", file=sys.stderr)
+            return 2
+        try:
+            manager.delete(args.delete)
+        except JobError as exc:
+            print(str(exc), file=sys.stderr)
+            return 2
+        print(f"已删除任务 {args.delete}。", file=sys.stderr)
+        return 0
+    jobs: List[Job] = manager.jobs()
+    if not jobs:
+        print("没有未完成的任务。", file=sys.stderr)
+        return 0
+    for job in jobs:
+        progress: str = (
+            f"{job.done}/{job.planned}" if job.planned else str(job.done)
+        )
+        status: str = JOB_STATUS_LABELS.get(job.status, job.status)
+        updated: str = time.strftime(
+            "%Y-%m-%d %H:%M:%S", time.localtime(job.updated)
+        )
+        sys.stdout.write(
+            f"{job.job_id}\t{status}\t{progress}\t{updated}\t{job.title}\n"
+        )
+    return 0
+
+
+def _cmd_resume(args: argparse.Namespace) -> int:
+    """
+    从检查点继续执行中断、取消或出错的任务。
+
+    Args:
+        args: 解析后的命令行参数。
+
+    Returns:
+        与任务对应子命令相同的退出码；任务不存在时为 2。
+    """
+    manager: JobManager = _job_manager()
+    try:
+        job: Job = manager.store.load(args.job_id)
+    except JobError as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+    print(f"继续任务：{job.title}（已完成 {job.done} 项）", file=sys.stderr)
+    return _run_job(args, manager, job)
+
+
+def _add_rate_argument(parser: argparse.ArgumentParser) -> None:
+    """
+    为读写目录树的子命令添加 ``--rate`` 限速参数。
+
+    Args:
+        parser: 子命令解析器。
+    """
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        metavar="OPS",
+        help="每个卷每秒最多的读写次数，避免压满文件服务器；缺省不限速",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    构建命令行解析器。
+
+    Returns:
+        包含全部子命令的解析器。
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py", description="文件夹备注批处理命令"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="导出子树备注为映射文本")
+    export.add_argument("root", help="扫描根目录")
+    export.add_argument("-o", "--output", help="输出文件；缺省写到标准输出")
+    export.add_argument(
+        "--depth", type=int, default=None, help="最大深度；缺省不限"
+    )
+    export.add_argument(
+        "--remarked-only", action="store_true", help="只导出带备注的目录"
+    )
+    export.add_argument(
+        "--processes",
+        type=int,
+        nargs="?",
+        const=0,
+        default=None,
+        help="使用多进程扫描（本地盘大树）；可指定进程数，缺省为 CPU 核数",
+    )
+    _add_rate_argument(export)
+    export.set_defaults(handler=_cmd_export)
+
+    snapshot = commands.add_parser("snapshot", help="拍摄子树备注快照")
+    snapshot.add_argument("root", help="扫描根目录")
+    snapshot.add_argument("-o", "--output", required=True, help="快照文件")
+    snapshot.add_argument(
+        "--depth", type=int, default=None, help="最大深度；缺省不限"
+    )
+    _add_rate_argument(snapshot)
+    snapshot.set_defaults(handler=_cmd_snapshot)
+
+    diff = commands.add_parser("diff", help="比较两个快照或目录的备注")
+    diff.add_argument("left", help="旧状态：快照文件或目录")
+    diff.add_argument("right", help="新状态：快照文件或目录")
+    _add_rate_argument(diff)
+    diff.set_defaults(handler=_cmd_diff)
+
+    restore = commands.add_parser("restore", help="按快照恢复备注")
+    restore.add_argument("snapshot", help="快照文件")
+    restore.add_argument(
+        "root", nargs="?", help="目标根目录；缺省为快照记录的根目录"
+    )
+    restore.add_argument(
+        "--dry-run", action="store_true", help="只列出将要写入的差异"
+    )
+    _add_rate_argument(restore)
+    restore.set_defaults(handler=_cmd_restore)
+
+    sync = commands.add_parser("sync", help="把备注从源树镜像到目标树")
+    sync.add_argument("source", help="源根目录")
+    sync.add_argument("target", help="目标根目录")
+    sync.add_argument(
+        "--dry-run", action="store_true", help="只列出将要写入的差异"
+    )
+    sync.add_argument(
+        "--keep-target",
+        action="store_true",
+        help="保留目标中源没有的备注（缺省会清空以与源一致）",
+    )
+    sync.add_argument(
+        "--depth", type=int, default=None, help="最大深度；缺省不限"
+    )
+    _add_rate_argument(sync)
+    sync.set_defaults(handler=_cmd_sync)
+
+    jobs = commands.add_parser("jobs", help="列出或删除未完成的可续跑任务")
+    jobs.add_argument("--delete", metavar="JOB_ID", help="删除指定任务")
+    jobs.set_defaults(handler=_cmd_jobs)
+
+    resume = commands.add_parser("resume", help="从检查点继续执行任务")
+    resume.add_argument("job_id", help="任务 ID（见 jobs 子命令）")
+    _add_rate_argument(resume)
+    resume.set_defaults(handler=_cmd_resume)
+    return parser
+
+
+def run_cli(argv: List[str]) -> int:
+    """
+    解析参数并执行子命令。
+
+    Args:
+        argv: 不含程序名的参数列表。
+
+    Returns:
+        进程退出码。
+    """
+    args: argparse.Namespace = build_parser().parse_args(argv)
+    handler: Callable[[argparse.Namespace], int] = args.handler
+    # 各卷学到的并发上限跨次运行沿用，界面与命令行共用同一文件。
+    args.tuner = ConcurrencyTuner.load(get_config_dir() / IO_TUNING_FILE_NAME)
+    try:
+        return handler(args)
+    finally:
+        args.tuner.save()
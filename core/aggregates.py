@@ -0,0 +1,339 @@
+"""
+子树备注统计：按目录缓存“有备注 / 全部”子目录数，自底向上汇总，
+按目录修改时间失效，写入备注时沿父链增量更新。
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.ini_service import DesktopIniService
+
+# 读取失败的目录记录的修改时间，下次刷新总会重新读取。
+_UNKNOWN_MTIME = -1
+
+
+@dataclass
+class _FolderEntry:
+    """
+    单个目录的扫描结果与子树汇总。
+
+    Attributes:
+        mtime_ns: 扫描时目录自身的修改时间。
+        remarked: 目录自身是否有备注。
+        children: 子目录路径字符串。
+        subtree_remarked: 子树中（不含自身）有备注的目录数。
+        subtree_total: 子树中（不含自身）的目录数。
+        complete: 全部后代都已扫描且汇总有效。
+    """
+
+    __slots__ = (
+        "mtime_ns",
+        "remarked",
+        "children",
+        "subtree_remarked",
+        "subtree_total",
+        "complete",
+    )
+
+    mtime_ns: int
+    remarked: bool
+    children: List[str]
+    subtree_remarked: int
+    subtree_total: int
+    complete: bool
+
+
+class AggregateStore:
+    """
+    线程安全的子树统计缓存。
+
+    每个目录保存自身的备注标记与子目录列表，汇总值由子目录自底向上相加。
+    目录修改时间变化（子目录或 desktop.ini 增删）时只重新读取该目录，
+    其余目录沿用缓存；``update_remark`` 在写入备注后沿父链加减计数，
+    不必重新扫描。其他程序只改写已有 desktop.ini 内容时目录修改时间不变，
+    需刷新当前目录后才能反映。
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, _FolderEntry] = {}
+        # 刷新完成且汇总完整的起点目录 -> 完成时间（monotonic）。
+        self._validated: Dict[str, float] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def counts(self, folder: Path) -> Optional[Tuple[int, int]]:
+        """
+        查询目录子树的统计。
+
+        Args:
+            folder: 目录路径。
+
+        Returns:
+            (有备注的目录数, 全部目录数)，均不含目录自身；
+            子树尚未完整扫描时返回 None。
+        """
+        with self._lock:
+            entry: Optional[_FolderEntry] = self._entries.get(str(folder))
+            if entry is None or not entry.complete:
+                return None
+            return entry.subtree_remarked, entry.subtree_total
+
+    def recently_validated(self, folder: Path, max_age_s: float) -> bool:
+        """
+        目录的统计是否完整，且它或某个祖先在 max_age_s 秒内刷新过。
+
+        Args:
+            folder: 目录路径。
+            max_age_s: 视为最近的秒数。
+        """
+        oldest: float = time.monotonic() - max_age_s
+        with self._lock:
+            entry: Optional[_FolderEntry] = self._entries.get(str(folder))
+            if entry is None or not entry.complete:
+                return False
+            for candidate in (folder, *folder.parents):
+                validated: Optional[float] = self._validated.get(
+                    str(candidate)
+                )
+                if validated is not None and validated >= oldest:
+                    return True
+            return False
+
+    def fresh_children(
+        self, folder: Path, mtime_ns: int
+    ) -> Optional[List[Path]]:
+        """
+        目录修改时间未变时返回缓存的子目录列表。
+
+        Args:
+            folder: 目录路径。
+            mtime_ns: 当前读取到的修改时间。
+
+        Returns:
+            子目录列表；未缓存或已变化时返回 None。
+        """
+        with self._lock:
+            entry: Optional[_FolderEntry] = self._entries.get(str(folder))
+            if entry is None or entry.mtime_ns != mtime_ns:
+                return None
+            return [Path(child) for child in entry.children]
+
+    def record(
+        self,
+        folder: Path,
+        mtime_ns: int,
+        remarked: bool,
+        children: List[Path],
+    ) -> None:
+        """
+        保存一次目录扫描的结果；已消失的子目录连同其子树一并移除。
+
+        目录及其祖先的汇总标记为失效，由 ``summarize`` 重新计算。
+
+        Args:
+            folder: 目录路径。
+            mtime_ns: 读取子目录列表之前的修改时间。
+            remarked: 目录自身是否有备注。
+            children: 子目录列表。
+        """
+        key: str = str(folder)
+        child_keys: List[str] = [str(child) for child in children]
+        with self._lock:
+            previous: Optional[_FolderEntry] = self._entries.get(key)
+            if previous is not None:
+                kept = set(child_keys)
+                for child in previous.children:
+                    if child not in kept:
+                        self._drop(child)
+            self._entries[key] = _FolderEntry(
+                mtime_ns, remarked, child_keys, 0, 0, False
+            )
+            self._mark_ancestors_stale(folder)
+
+    def summarize(self, folders: List[Path], root: Path) -> None:
+        """
+        自底向上重新计算汇总值，再沿 root 的父链更新已缓存的祖先。
+
+        Args:
+            folders: 本次遍历访问过的目录，父目录在子目录之前。
+            root: 遍历起点。
+        """
+        with self._lock:
+            for folder in reversed(folders):
+                self._recompute(str(folder))
+            for parent in root.parents:
+                if str(parent) not in self._entries:
+                    break
+                self._recompute(str(parent))
+            entry: Optional[_FolderEntry] = self._entries.get(str(root))
+            if entry is not None and entry.complete:
+                self._validated[str(root)] = time.monotonic()
+
+    def update_remark(self, folder: Path, remark: str) -> None:
+        """
+        备注写入后更新目录标记，并给已汇总的祖先加减计数。
+
+        可直接注册为 ``DesktopIniService.write_listeners`` 的回调。
+
+        Args:
+            folder: 被写入的目录。
+            remark: 新备注。
+        """
+        remarked: bool = bool(remark)
+        with self._lock:
+            entry: Optional[_FolderEntry] = self._entries.get(str(folder))
+            if entry is None or entry.remarked == remarked:
+                return
+            entry.remarked = remarked
+            delta: int = 1 if remarked else -1
+            for parent in folder.parents:
+                parent_entry: Optional[_FolderEntry] = self._entries.get(
+                    str(parent)
+                )
+                if parent_entry is None:
+                    break
+                if parent_entry.complete:
+                    parent_entry.subtree_remarked += delta
+
+    def clear(self) -> None:
+        """
+        清空全部统计。
+        """
+        with self._lock:
+            self._entries.clear()
+            self._validated.clear()
+
+    def _recompute(self, key: str) -> None:
+        """
+        由子目录的汇总求出目录的汇总（调用方需持有锁）。
+        """
+        entry: Optional[_FolderEntry] = self._entries.get(key)
+        if entry is None:
+            return
+        remarked: int = 0
+        total: int = 0
+        for child in entry.children:
+            child_entry: Optional[_FolderEntry] = self._entries.get(child)
+            if child_entry is None or not child_entry.complete:
+                entry.complete = False
+                return
+            remarked += child_entry.subtree_remarked + child_entry.remarked
+            total += child_entry.subtree_total + 1
+        entry.subtree_remarked = remarked
+        entry.subtree_total = total
+        entry.complete = True
+
+    def _mark_ancestors_stale(self, folder: Path) -> None:
+        """
+        把已缓存的祖先标记为待重新汇总（调用方需持有锁）。
+        """
+        for parent in folder.parents:
+            entry: Optional[_FolderEntry] = self._entries.get(str(parent))
+            if entry is None or not entry.complete:
+                break
+            entry.complete = False
+
+    def _drop(self, key: str) -> None:
+        """
+        移除目录及其缓存的全部后代（调用方需持有锁）。
+        """
+        stack: List[str] = [key]
+        while stack:
+            child_key: str = stack.pop()
+            self._validated.pop(child_key, None)
+            entry: Optional[_FolderEntry] = self._entries.pop(child_key, None)
+            if entry is not None:
+                stack.extend(entry.children)
+
+
+def _visit(
+    service: DesktopIniService, store: AggregateStore, folder: Path
+) -> List[Path]:
+    """
+    读取单个目录：修改时间未变时沿用缓存，否则重新枚举并读取备注。
+
+    Returns:
+        子目录列表；目录无法访问时按没有子目录记录。
+    """
+    try:
+        mtime_ns: int = service.folder_mtime(folder)
+        cached: Optional[List[Path]] = store.fresh_children(folder, mtime_ns)
+        if cached is not None:
+            return cached
+        children: List[Path] = service.list_subfolders(folder)
+        remark: str = service.read_info_tip(folder)
+    except OSError:
+        store.record(folder, _UNKNOWN_MTIME, False, [])
+        return []
+    store.record(folder, mtime_ns, bool(remark), children)
+    return children
+
+
+def refresh_aggregates(
+    service: DesktopIniService,
+    store: AggregateStore,
+    root: Path,
+    executor: Executor,
+    cancel_event: Optional[threading.Event] = None,
+    max_folders: Optional[int] = None,
+    max_depth: Optional[int] = None,
+) -> Optional[Tuple[int, int]]:
+    """
+    遍历子树，使 root 及其全部后代的统计与磁盘一致。
+
+    每个目录先读修改时间，未变化的目录只花一次 stat，不再枚举或读取
+    desktop.ini；因此重复刷新同一子树的代价远小于首次扫描。
+    按深度优先推进，提前停止时已读完的子树仍会得到统计。
+    指定 max_depth 时只核对到该深度，更深处只进入尚无完整统计的子树
+    （新出现或因修改时间变化而重新读取的目录），其余沿用缓存。
+
+    Args:
+        service: desktop.ini 服务（调用方选择优先级）。
+        store: 统计缓存。
+        root: 遍历起点。
+        executor: 执行读取的线程池。
+        cancel_event: 设置后尽快停止，已读取的目录保留在缓存中。
+        max_folders: 最多访问的目录数，避免整盘扫描；None 表示不限。
+        max_depth: 逐个核对修改时间的深度，1 表示 root 与直接子目录；
+            None 表示核对整棵子树。
+
+    Returns:
+        root 子树的 (有备注数, 目录数)；被取消或超出上限时返回 None。
+    """
+    visited: List[Path] = []
+    pending: List[Tuple[Path, int]] = [(root, 0)]
+    in_flight: Dict[Future, Tuple[Path, int]] = {}
+    while pending or in_flight:
+        if (cancel_event is not None and cancel_event.is_set()) or (
+            max_folders is not None and len(visited) >= max_folders
+        ):
+            for future in in_flight:
+                future.cancel()
+            break
+        # 在途上限每轮重新求值，跟随并发自动调节的结果。
+        limit: int = service.in_flight_limit(root)
+        while pending and len(in_flight) < limit:
+            folder, depth = pending.pop()
+            in_flight[
+                executor.submit(_visit, service, store, folder)
+            ] = (folder, depth)
+        done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+        for future in done:
+            folder, depth = in_flight.pop(future)
+            visited.append(folder)
+            pending.extend(
+                (child, depth + 1)
+                for child in future.result()
+                if max_depth is None
+                or depth < max_depth
+                or store.counts(child) is None
+            )
+    store.summarize(visited, root)
+    return store.counts(root)
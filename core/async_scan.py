@@ -0,0 +1,502 @@
+"""
+异步扫描引擎：以 async 迭代器提供子目录与备注，阻塞的文件系统调用
+在共享线程池中执行，并按卷限制并发、按结果队列容量施加背压。
+
+遍历、批量读取与批量写入都经由这里：同步代码用 ``iter_sync`` 消费遍历，
+用 ``map_bounded``、``map_ordered`` 对流式输入做有界并发映射。
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import Executor
+from functools import partial
+from pathlib import Path
+from typing import (
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from core.constants import (
+    ASYNC_SCAN_QUEUE_SIZE,
+    ASYNC_SCAN_TASKS,
+    ASYNC_SCAN_VOLUME_LIMIT,
+)
+from core.ini_service import DesktopIniService
+from core.probe import share_root
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# 结果队列中的结束标记。
+_DONE = object()
+
+
+class _Failure:
+    """
+    结果队列中的异常：枚举遇到 OSError 以外的错误时由消费者重新抛出。
+    """
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: Exception) -> None:
+        self.error: Exception = error
+
+
+class _VolumeGate:
+    """
+    事件循环内单个卷的并发闸门，每次放行前重新查询上限，
+    因此能跟随调度器的自动调节结果变化。
+    """
+
+    def __init__(self, limit: Callable[[], int]) -> None:
+        self._limit: Callable[[], int] = limit
+        self._running: int = 0
+        self._cond: asyncio.Condition = asyncio.Condition()
+
+    async def __aenter__(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(
+                lambda: self._running < max(1, self._limit())
+            )
+            self._running += 1
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        async with self._cond:
+            self._running -= 1
+            # 上限可能已调大，唤醒全部等待者重新判断。
+            self._cond.notify_all()
+
+
+# 单个事件循环内各卷的闸门。
+_Gates = Dict[str, _VolumeGate]
+
+
+class AsyncScanner:
+    """
+    界面加载、命令行导出与索引共用的扫描引擎。
+
+    每个卷（盘符或 UNC 共享）拥有独立的并发上限，慢速网络共享不会占满
+    线程池而拖慢本地盘；结果经有界队列交给消费者，消费变慢时枚举随之暂停。
+    服务配置了调度器时，未单独设置的卷沿用调度器（含自动调节）的上限。
+    闸门按事件循环分别创建，因此同一实例可在多个线程各自的循环中使用。
+
+    Attributes:
+        service: desktop.ini 服务。
+        executor: 执行阻塞调用的共享线程池。
+        volume_limit: 未单独配置且服务没有调度器时的默认并发上限。
+        tasks: 单次遍历的最少枚举协程数与读取备注的最少在途数，
+            卷的并发上限更高时按上限放宽。
+        queue_size: 结果队列容量。
+    """
+
+    def __init__(
+        self,
+        service: DesktopIniService,
+        executor: Executor,
+        volume_limit: int = ASYNC_SCAN_VOLUME_LIMIT,
+        tasks: int = ASYNC_SCAN_TASKS,
+        queue_size: int = ASYNC_SCAN_QUEUE_SIZE,
+    ) -> None:
+        self.service: DesktopIniService = service
+        self.executor: Executor = executor
+        self.volume_limit: int = volume_limit
+        self.tasks: int = tasks
+        self.queue_size: int = queue_size
+        self._volume_limits: Dict[str, int] = {}
+        self._gates: "weakref.WeakKeyDictionary[object, _Gates]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock: threading.Lock = threading.Lock()
+
+    def with_priority(self, priority: int) -> "AsyncScanner":
+        """
+        返回使用另一优先级服务的扫描器副本，线程池、卷上限与闸门共用。
+
+        Args:
+            priority: 调度优先级，例如 ``IO_PRIORITY_INTERACTIVE``。
+        """
+        clone: AsyncScanner = copy.copy(self)
+        clone.service = self.service.with_priority(priority)
+        return clone
+
+    def set_volume_limit(self, path: Path, limit: int) -> None:
+        """
+        为路径所在的卷单独设置并发上限，不再跟随调度器。
+
+        Args:
+            path: 卷内任意路径。
+            limit: 并发上限，至少为 1。
+        """
+        with self._lock:
+            self._volume_limits[share_root(path)] = max(1, limit)
+
+    def limit_for(self, path: Path) -> int:
+        """
+        查询路径所在卷的并发上限。
+
+        Args:
+            path: 卷内任意路径。
+
+        Returns:
+            单独配置的上限；未配置时为调度器的当前上限或默认值。
+        """
+        with self._lock:
+            limit: Optional[int] = self._volume_limits.get(share_root(path))
+        if limit is not None:
+            return limit
+        if self.service.scheduler is not None:
+            return self.service.scheduler.limit_for(path)
+        return self.volume_limit
+
+    async def run(self, path: Path, func: Callable[..., T], *args: object) -> T:
+        """
+        在所属卷的并发额度内，把阻塞调用交给线程池执行。
+
+        Args:
+            path: 调用涉及的路径，用于定位所属卷。
+            func: 阻塞函数。
+            *args: 传给 func 的参数。
+
+        Returns:
+            func 的返回值。
+        """
+        async with self._gate(path):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+
+    async def list_subfolders(self, parent: Path) -> List[Path]:
+        """
+        异步枚举直接子目录。
+
+        Args:
+            parent: 父目录。
+
+        Returns:
+            过滤并排序后的子目录列表。
+        """
+        return await self.run(parent, self.service.list_subfolders, parent)
+
+    async def read_remark(self, folder: Path) -> str:
+        """
+        异步读取目录备注。
+
+        Args:
+            folder: 目录路径。
+
+        Returns:
+            备注文本。
+        """
+        return await self.run(folder, self.service.read_info_tip, folder)
+
+    async def iter_subfolders(
+        self, root: Path, max_depth: Optional[int] = None
+    ) -> AsyncGenerator[Tuple[Path, int], None]:
+        """
+        并发遍历 root 下的子目录。
+
+        产出顺序取决于枚举完成顺序；枚举时 OSError 的目录会跳过，其他异常
+        在消费端重新抛出。消费者提前结束迭代时，在途的枚举会被取消。
+
+        Args:
+            root: 遍历起点（自身不产出）。
+            max_depth: 最大深度，1 表示只枚举直接子目录；None 表示不限。
+
+        Yields:
+            (子目录路径, 相对 root 的深度) 二元组。
+        """
+        work: "asyncio.Queue[Tuple[Path, int]]" = asyncio.Queue()
+        results: "asyncio.Queue[object]" = asyncio.Queue(
+            maxsize=self.queue_size
+        )
+        work.put_nowait((root, 0))
+        # 已入队或正在枚举的目录数，归零即遍历完成。
+        remaining: int = 1
+
+        async def worker() -> None:
+            nonlocal remaining
+            while True:
+                parent, depth = await work.get()
+                try:
+                    try:
+                        children: List[Path] = await self.list_subfolders(
+                            parent
+                        )
+                    except OSError:
+                        children = []
+                    for child in children:
+                        await results.put((child, depth + 1))
+                        if max_depth is None or depth + 1 < max_depth:
+                            remaining += 1
+                            work.put_nowait((child, depth + 1))
+                except Exception as exc:
+                    # 例如线程池已关闭：交给消费者抛出，而不是让遍历卡住。
+                    await results.put(_Failure(exc))
+                finally:
+                    remaining -= 1
+                # 被取消时不会执行到这里，结束标记只在枚举完成后投递。
+                if remaining == 0:
+                    await results.put(_DONE)
+
+        workers: List[asyncio.Task] = [
+            asyncio.ensure_future(worker())
+            for _ in range(max(self.tasks, self.limit_for(root)))
+        ]
+        try:
+            while True:
+                item: object = await results.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item  # type: ignore[misc]
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def iter_remarks(
+        self, root: Path, max_depth: Optional[int] = None
+    ) -> AsyncGenerator[Tuple[Path, str], None]:
+        """
+        并发遍历子树并读取每个目录的备注。
+
+        Args:
+            root: 遍历起点（自身不产出）。
+            max_depth: 最大深度；None 表示不限。
+
+        Yields:
+            (目录路径, 备注) 二元组，顺序取决于完成顺序；读取失败的目录会跳过。
+        """
+        folders: AsyncGenerator[Tuple[Path, int], None] = (
+            self.iter_subfolders(root, max_depth)
+        )
+        in_flight: Set["asyncio.Future[Optional[Tuple[Path, str]]]"] = set()
+        try:
+            async for folder, _ in folders:
+                in_flight.add(asyncio.ensure_future(self._read_pair(folder)))
+                if len(in_flight) < max(self.tasks, self.limit_for(root) * 2):
+                    continue
+                done, in_flight = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    pair = future.result()
+                    if pair is not None:
+                        yield pair
+            while in_flight:
+                done, in_flight = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    pair = future.result()
+                    if pair is not None:
+                        yield pair
+        finally:
+            for future in in_flight:
+                future.cancel()
+            await folders.aclose()
+
+    def map_bounded(
+        self,
+        anchor: Path,
+        func: Callable[[T], R],
+        items: Iterable[T],
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Iterator[Tuple[T, "asyncio.Future[R]"]]:
+        """
+        以有界并发把 func 应用到流式输入上，按完成顺序产出结果。
+
+        每项经 anchor 所在卷的闸门交给共享线程池执行，在途项不超过该卷上限的
+        两倍。输入只在事件循环空闲时拉取，因此可以是另一个 ``iter_sync``
+        遍历，不会嵌套运行事件循环。
+
+        Args:
+            anchor: 操作所在卷内的路径，决定闸门与在途上限。
+            func: 单项处理函数（阻塞调用）。
+            items: 输入的可迭代对象，可以是生成器。
+            cancel_event: 设置后停止提交新任务并取消在途任务。
+
+        Yields:
+            (输入项, 已完成的 Future) 二元组；异常保存在 Future 中由调用方处理。
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        iterator: Iterator[T] = iter(items)
+        in_flight: Dict["asyncio.Future[R]", T] = {}
+        exhausted: bool = False
+        try:
+            while cancel_event is None or not cancel_event.is_set():
+                limit: int = self._window(anchor)
+                while not exhausted and len(in_flight) < limit:
+                    try:
+                        item: T = next(iterator)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    in_flight[
+                        loop.create_task(self.run(anchor, func, item))
+                    ] = item
+                if not in_flight:
+                    return
+                done, _ = loop.run_until_complete(
+                    asyncio.wait(
+                        list(in_flight), return_when=asyncio.FIRST_COMPLETED
+                    )
+                )
+                for future in done:
+                    yield in_flight.pop(future), future
+        finally:
+            _close_loop(loop, list(in_flight))
+
+    def map_ordered(
+        self,
+        anchor: Path,
+        func: Callable[[T], R],
+        items: Iterable[T],
+        hold: Optional[Callable[[], bool]] = None,
+    ) -> Iterator[Tuple[T, "asyncio.Future[R]"]]:
+        """
+        以有界并发把 func 应用到流式输入上，按输入顺序产出结果。
+
+        适合需要保持有序的流（如按路径排序的快照、按计划顺序的写入）：
+        最多预先提交卷上限两倍的项，队首完成前后续结果暂存在窗口中。
+
+        Args:
+            anchor: 操作所在卷内的路径，决定闸门与在途上限。
+            func: 单项处理函数（阻塞调用）。
+            items: 输入的可迭代对象，可以是生成器。
+            hold: 返回 True 时不再拉取新输入，在途项全部产出后结束；
+                未拉取的输入仍留在 items 中，调用方可稍后用同一迭代器继续。
+
+        Yields:
+            (输入项, 已完成的 Future) 二元组；异常保存在 Future 中由调用方处理。
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        iterator: Iterator[T] = iter(items)
+        window: Deque[Tuple[T, "asyncio.Future[R]"]] = deque()
+        exhausted: bool = False
+        try:
+            while True:
+                limit: int = self._window(anchor)
+                while (
+                    not exhausted
+                    and len(window) < limit
+                    and (hold is None or not hold())
+                ):
+                    try:
+                        item: T = next(iterator)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    window.append(
+                        (item, loop.create_task(self.run(anchor, func, item)))
+                    )
+                if not window:
+                    return
+                head, future = window.popleft()
+                if not future.done():
+                    loop.run_until_complete(asyncio.wait([future]))
+                yield head, future
+        finally:
+            _close_loop(loop, [future for _, future in window])
+
+    def _window(self, anchor: Path) -> int:
+        """
+        有界映射的在途上限：卷并发上限的两倍，保证名额不空转。
+        """
+        return max(self.tasks, self.limit_for(anchor) * 2)
+
+    async def _read_pair(self, folder: Path) -> Optional[Tuple[Path, str]]:
+        """
+        读取备注并与路径配对。
+
+        Args:
+            folder: 目录路径。
+
+        Returns:
+            (目录路径, 备注)；读取失败时返回 None。
+        """
+        try:
+            return folder, await self.read_remark(folder)
+        except OSError:
+            return None
+
+    def _gate(self, path: Path) -> _VolumeGate:
+        """
+        取得当前事件循环中路径所在卷的闸门。
+
+        Args:
+            path: 卷内任意路径。
+        """
+        loop = asyncio.get_running_loop()
+        share: str = share_root(path)
+        with self._lock:
+            per_loop: _Gates = self._gates.setdefault(loop, {})
+            gate: Optional[_VolumeGate] = per_loop.get(share)
+            if gate is None:
+                gate = _VolumeGate(partial(self.limit_for, path))
+                per_loop[share] = gate
+            return gate
+
+
+def _close_loop(
+    loop: asyncio.AbstractEventLoop, pending: List["asyncio.Future"]
+) -> None:
+    """
+    取消尚未产出的任务并关闭事件循环；已交给线程池的调用会在后台跑完。
+    """
+    try:
+        for future in pending:
+            future.cancel()
+        if pending:
+            loop.run_until_complete(
+                asyncio.gather(*pending, return_exceptions=True)
+            )
+    finally:
+        loop.close()
+
+
+def iter_sync(
+    source: AsyncIterator[T],
+    cancel_event: Optional[threading.Event] = None,
+) -> Iterator[T]:
+    """
+    在当前线程新建事件循环，把 async 迭代器转换为普通生成器。
+
+    供后台线程（如 BackgroundTask 的 producer）或命令行直接消费异步扫描。
+
+    Args:
+        source: async 迭代器，通常是 AsyncScanner 的遍历方法返回值。
+        cancel_event: 设置后在产出下一项前停止并关闭 source。
+
+    Yields:
+        source 产出的每一项。
+    """
+    loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+    try:
+        while cancel_event is None or not cancel_event.is_set():
+            try:
+                item: T = loop.run_until_complete(source.__anext__())
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        try:
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                loop.run_until_complete(aclose())
+        finally:
+            loop.close()
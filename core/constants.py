@@ -5,6 +5,7 @@
 # Windows 文件属性常量，用于调用 Win32 API。
 FILE_ATTRIBUTE_HIDDEN: int = 0x0002
 FILE_ATTRIBUTE_SYSTEM: int = 0x0004
+FILE_ATTRIBUTE_REPARSE_POINT: int = 0x0400
 INVALID_FILE_ATTRIBUTES: int = 0xFFFFFFFF
 
 # 默认跳过的系统目录
@@ -13,6 +14,13 @@ DEFAULT_SKIP_NAMES = {"$RECYCLE.BIN", "System Volume Information"}
 # 资源管理器右键菜单名称。
 CONTEXT_MENU_NAME = "文件夹备注修改"
 
+# 多选右键菜单：MultiSelectModel 取值、命令行参数、转发载荷前缀，
+# 以及合并同一批启动的等待时间（毫秒，每收到一项重新计时）。
+MULTI_SELECT_MODEL = "Player"
+SELECT_ARG = "--select"
+SELECT_PAYLOAD_PREFIX = "select\n"
+SELECTION_COLLECT_MS = 300
+
 # UI 文案集中配置。
 APP_TITLE = "文件夹备注批量修改"
 TEXT_BIND_MENU = "绑定右键菜单"
@@ -21,25 +29,282 @@ TEXT_SELECT_FOLDER = "选择文件夹"
 TEXT_REFRESH = "刷新当前路径"
 TEXT_MAP_BUTTON = "文件夹名映射备注"
 TEXT_SAVE = "保存修改"
+TEXT_RULE_BUTTON = "规则批量备注"
+TEXT_MIRROR_BUTTON = "镜像备注到…"
+TEXT_KEEP_TARGET = "保留目标中源没有的备注"
+TEXT_ATTRIBUTE_REPAIR = "（补齐属性）"
+TEXT_JOBS_BUTTON = "后台任务"
+TEXT_JOBS_BUTTON_COUNT = "后台任务（{count}）"
+TEXT_AUTOSAVE = "自动保存"
+TEXT_CONFLICTS_BUTTON = "处理冲突"
+TEXT_CONFLICTS_BUTTON_COUNT = "处理冲突（{count}）"
 TITLE_INFO = "提示"
+TITLE_CONFLICTS = "备注冲突"
 TITLE_MAPPING = "文件夹名映射备注（文件名->备注）"
 TITLE_EDIT_REMARK = "编辑备注"
+TITLE_RULES = "规则批量备注（作用于当前目录的整个子树）"
+TITLE_MIRROR = "备注镜像（当前目录 → 目标目录）"
+TITLE_JOBS = "后台任务"
 TITLE_RESULT = "结果"
 TITLE_ERROR = "错误"
 MSG_MAPPING_HINT = (
-    "可 Ctrl+A 复制到外部编辑器，修改后粘贴回来。"
+    "可 Ctrl+A 复制到外部编辑器，修改后粘贴回来；"
+    "行数较多时可点击“外部编辑”，保存文件后自动载入。"
     "格式：文件名->备注；删除备注用 文件名->。"
+    "多层视图中文件名一列为相对路径。"
+)
+MSG_MAPPING_LOADING = "正在载入 {done}/{total} 行…"
+MSG_MAPPING_EXTERNAL = "正在外部编辑：{path}（保存后自动重新载入）"
+MSG_MAPPING_RELOADED = "已从外部文件载入 {count} 条映射。"
+MSG_MAPPING_EMPTY = "没有可用的映射，请检查输入。"
+MSG_RULE_HINT = (
+    "每行一条规则：匹配表达式 -> 备注模板，靠前的规则优先。"
+    "通配符 * ? 会成为捕获组 {1} {2}…；以 re: 开头按正则匹配。"
+    "模板可用 {name}（目录名）、{0}、{1}… 以及正则命名组。"
+)
+MSG_RULE_SCANNING = "正在扫描，已找到 {count} 项变更…"
+MSG_RULE_SCANNED = "扫描完成，共 {count} 项变更。"
+MSG_RULE_APPLYING = "正在写入 {count} 项变更…"
+MSG_MIRROR_HINT = (
+    "按相对路径比较当前目录与目标目录的子树，只把有差异的备注写入目标；"
+    "目标中缺失的目录会跳过。备注相同但目标目录缺少系统属性时也会重写。"
+)
+MSG_MIRROR_SCANNING = "正在比较… {summary}"
+MSG_MIRROR_SCANNED = "比较完成：{summary}"
+MSG_MIRROR_APPLYING = "正在写入 {count} 项变更…"
+LABEL_MIRROR_TARGET = "目标目录:"
+MSG_JOBS_HINT = (
+    "批量写入、导出、恢复与同步作为可续跑任务执行，进度定期保存；"
+    "取消或意外退出后可选中任务点击“继续”，已完成的部分不会重做。"
+)
+MSG_JOB_UNFINISHED = (
+    "任务{status}，已完成 {done} 项，可在“后台任务”中继续。"
 )
 PROMPT_NEW_REMARK = "输入新的备注："
 LABEL_DRIVE = "盘符:"
 LABEL_CURRENT_PATH_PREFIX = "当前路径："
+LABEL_DEPTH = "深度:"
+MSG_LOADING_ROWS = "加载中… 已载入 {count} 项"
+LABEL_PENDING = "待保存：{count} 项（{dirs} 个目录）"
+LABEL_WRITE_FAILED = "，{count} 项写入失败"
+MSG_CONFLICTS_HINT = (
+    "以下目录的备注在读取后已被其他用户或程序修改，未覆盖。"
+    "请选择保留自己的修改（覆盖对方）或采用磁盘上的备注。"
+)
+MSG_SAVE_CONFLICTS = (
+    "冲突（未覆盖）: {count} 项，请在“处理冲突”中选择保留哪一方。"
+)
+MSG_PASTE_NO_ROWS = (
+    "剪贴板中没有可识别的表格数据，需要“名称、备注、完整路径（可省略）”"
+    "三列以制表符分隔的文本。"
+)
+MSG_PASTE_SUMMARY = "已粘贴 {total} 行：修改 {applied} 项，未变更 {unchanged} 项。"
+BUTTON_KEEP_MINE = "保留我的修改"
+BUTTON_TAKE_THEIRS = "采用磁盘备注"
+COLUMN_HEADER_MY_REMARK = "我的修改"
+COLUMN_HEADER_DISK_REMARK = "磁盘上的备注"
+MSG_AUTOSAVE_BUSY = "修改正在自动保存，请稍候。"
+MSG_CLOSE_PENDING = "还有 {count} 项修改未保存，是否保存后退出？"
 BUTTON_APPLY = "应用"
 BUTTON_CANCEL = "取消"
+BUTTON_EXTERNAL_EDIT = "外部编辑"
+BUTTON_PREVIEW = "预览"
+BUTTON_CLOSE = "关闭"
+BUTTON_PAUSE = "暂停"
+BUTTON_RESUME = "继续"
+BUTTON_DELETE = "删除"
 PLACEHOLDER_LOADING = "..."
+TEXT_SHOW_MORE = "显示更多（剩余 {count} 项）…"
+LABEL_TREE_FILTER = "筛选子目录:"
+LABEL_TABLE_FILTER = "筛选:"
+MSG_STARTUP_LOADING = "正在读取盘符与初始目录…"
+MSG_BATCH_VIEW = "选中的 {count} 个目录"
+MSG_FILTER_COUNT = "显示 {visible}/{total} 项"
+TEXT_UNREACHABLE = "（不可达）"
+TEXT_TREE_COUNTS = "{name}  [{remarked}/{total}]"
 COLUMN_HEADER_NAME = "文件夹"
 COLUMN_HEADER_REMARK = "备注"
 COLUMN_HEADER_PATH = "完整路径"
+COLUMN_HEADER_RELATIVE_PATH = "相对路径"
+COLUMN_HEADER_OLD_REMARK = "原备注"
+COLUMN_HEADER_NEW_REMARK = "新备注"
+COLUMN_HEADER_JOB_TITLE = "任务"
+COLUMN_HEADER_JOB_STATUS = "状态"
+COLUMN_HEADER_JOB_PROGRESS = "进度"
+COLUMN_HEADER_JOB_UPDATED = "更新时间"
+COLUMN_HEADER_SIZE = "大小"
+COLUMN_HEADER_ITEMS = "项目数"
+TEXT_SHOW_SIZES = "显示大小"
+
+# 日志与诊断文件配置；CONFIG_DIR_NAME 为 %APPDATA% 下保存学习结果等状态的目录。
+LOG_FILE_NAME = "desktopini_tool.log"
+CONFIG_DIR_NAME = "DesktopIniTool"
+PROFILE_ENV_VAR = "DESKTOPINI_PROFILE"
+PROFILE_FILE_PREFIX = "desktopini_profile"
+PROFILE_HOTKEY = "<F12>"
+TEXT_PROFILE_ARMED = "（性能剖析已就绪，将记录下一次操作）"
+
+# 启动指标：首帧绘制与可交互的指标名、预读结果轮询间隔（毫秒），
+# 以及测量用环境变量（设为 1 时可交互后立即退出，供基准脚本反复启动）。
+METRIC_STARTUP_FIRST_PAINT = "startup_first_paint"
+METRIC_STARTUP_INTERACTIVE = "startup_interactive"
+STARTUP_POLL_MS = 15
+STARTUP_EXIT_ENV_VAR = "DESKTOPINI_STARTUP_EXIT"
+
+# 主循环响应监控：采样间隔、记录阈值与响应预算（毫秒）。
+UI_WATCHDOG_INTERVAL_MS = 100
+UI_STALL_THRESHOLD_MS = 200
+UI_RESPONSE_BUDGET_MS = 1000
+
+# 映射对话框：分隔符、文本框高度上限、分块插入行数与外部文件轮询间隔。
+MAPPING_SEPARATOR = "->"
+MAPPING_DIALOG_MAX_HEIGHT = 30
+MAPPING_INSERT_CHUNK = 2000
+MAPPING_FILE_POLL_MS = 1000
+MAPPING_FILE_PREFIX = "desktopini_mapping_"
+MAPPING_SUMMARY_LIMIT = 50
+
+# 目录树分页：首屏条数、空闲时每批条数与间隔、自动续插上限与筛选防抖。
+TREE_PAGE_SIZE = 200
+TREE_CHUNK_SIZE = 200
+TREE_CHUNK_DELAY_MS = 10
+TREE_AUTO_LIMIT = 2000
+TREE_FILTER_DELAY_MS = 200
+
+# 目录树子树统计：单次刷新最多访问的目录数（超出时只显示已读完子树的统计）；
+# 统计完整且在此秒数内刷新过的子树，再次展开时不再核对。
+TREE_COUNT_MAX_FOLDERS = 100_000
+TREE_COUNT_FRESH_S = 30.0
+
+# 表格大小列：缓存文件名（位于配置目录下）、最多缓存的目录数与显示单位。
+SIZE_CACHE_FILE_NAME = "size_cache.json.gz"
+SIZE_CACHE_MAX_ENTRIES = 200_000
+SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+# 自动保存：停止编辑后等待合并的时间、持续编辑时自第一次修改起的最长等待
+# （毫秒）与每批最多写入的目录数；达到批量上限时不等计时立即写入。
+# 表格行按保存状态着色。
+AUTOSAVE_DELAY_MS = 2000
+AUTOSAVE_MAX_WAIT_MS = 10000
+AUTOSAVE_BATCH_SIZE = 200
+ROW_STATE_PENDING = "pending"
+ROW_STATE_SAVED = "saved"
+ROW_STATE_FAILED = "failed"
+ROW_STATE_CONFLICT = "conflict"
+ROW_STATE_COLORS = {
+    ROW_STATE_PENDING: "#fff4cc",
+    ROW_STATE_SAVED: "#e3f4e1",
+    ROW_STATE_FAILED: "#f9d6d5",
+    ROW_STATE_CONFLICT: "#fde0c2",
+}
+
+# 表格筛选：空闲时每批预建索引的行数与间隔（毫秒）。
+TABLE_INDEX_CHUNK = 5000
+TABLE_INDEX_DELAY_MS = 1
+
+# 表格多层视图的最大深度。
+MAX_TABLE_DEPTH = 20
+
+# 规则批量备注：正则前缀。
+RULE_REGEX_PREFIX = "re:"
+
+# 后台任务：未配置调度器时的遍历并发基数（在途上限为其两倍）、
+# 结果轮询间隔与每次回传主线程的条数上限。
+WALK_MAX_WORKERS = 8
+BACKGROUND_POLL_MS = 100
+BACKGROUND_BATCH_LIMIT = 2000
+
+# 异步扫描引擎：每卷并发上限、协程数与结果队列容量（背压）。
+ASYNC_SCAN_VOLUME_LIMIT = 8
+ASYNC_SCAN_TASKS = 16
+ASYNC_SCAN_QUEUE_SIZE = 1000
+
+# 命令行：子命令名称（首个参数命中时不启动界面）。
+CLI_COMMANDS = (
+    "export", "snapshot", "diff", "restore", "sync", "jobs", "resume"
+)
+
+# 快照文件：首行标记与版本；版本 2 起文件头记录扫描深度，仍可读取版本 1。
+SNAPSHOT_MAGIC = "#desktopini-snapshot"
+SNAPSHOT_VERSION = 2
+SNAPSHOT_READABLE_VERSIONS = ("1", "2")
+
+# I/O 调度：每卷并发上限、为界面与保存保留的名额，以及优先级（数值越小越优先）。
+# 整树扫描类（多层加载、规则扫描、镜像比较、命令行批处理）归入 index。
+IO_VOLUME_LIMIT = 8
+IO_INTERACTIVE_RESERVE = 2
+IO_PRIORITY_INTERACTIVE = 0
+IO_PRIORITY_SAVE = 1
+IO_PRIORITY_PREFETCH = 2
+IO_PRIORITY_INDEX = 3
+IO_PRIORITY_NAMES = ("interactive", "save", "prefetch", "index")
+
+# 并发自动调节：上限范围、测量窗口（次数/秒）与不足以判断的最少次数，
+# 延迟超过基线多少倍时按比例收缩、视为噪声的吞吐波动比例、
+# 基线每个窗口允许上浮的比例，以及视为快速卷（不收缩也不超过默认上限）的延迟。
+# 学到的每卷上限保存在配置目录的 IO_TUNING_FILE_NAME 中。
+IO_TUNER_MIN_LIMIT = 1
+IO_TUNER_MAX_LIMIT = 64
+IO_TUNER_WINDOW_OPS = 32
+IO_TUNER_WINDOW_S = 1.0
+IO_TUNER_MIN_OPS = 4
+IO_TUNER_LATENCY_FACTOR = 2.0
+IO_TUNER_DECREASE = 0.75
+IO_TUNER_NOISE = 0.05
+IO_TUNER_BASELINE_DRIFT = 0.01
+IO_TUNER_FAST_LATENCY_S = 0.001
+IO_TUNING_FILE_NAME = "io_tuning.json"
+
+# 可续跑任务：保存目录（位于配置目录下）、检查点保存间隔与退出时等待
+# 任务停止的时长（秒）、保留的失败明细条数、任务类型与状态，
+# 以及任务面板的刷新间隔（毫秒）。
+JOB_DIR_NAME = "jobs"
+JOB_CHECKPOINT_INTERVAL_S = 2.0
+JOB_STOP_TIMEOUT_S = 5.0
+JOB_FAILURES_KEPT = 200
+JOB_KIND_APPLY = "apply"
+JOB_KIND_EXPORT = "export"
+JOB_KIND_RESTORE = "restore"
+JOB_KIND_SYNC = "sync"
+JOB_STATUS_RUNNING = "running"
+JOB_STATUS_PAUSED = "paused"
+JOB_STATUS_CANCELLED = "cancelled"
+JOB_STATUS_INTERRUPTED = "interrupted"
+JOB_STATUS_FAILED = "failed"
+JOB_STATUS_DONE = "done"
+# 状态文件显示运行中、但任务锁由另一个进程持有。
+JOB_STATUS_ELSEWHERE = "elsewhere"
+JOB_STATUS_LABELS = {
+    JOB_STATUS_RUNNING: "运行中",
+    JOB_STATUS_ELSEWHERE: "其他进程执行中",
+    JOB_STATUS_PAUSED: "已暂停",
+    JOB_STATUS_CANCELLED: "已取消",
+    JOB_STATUS_INTERRUPTED: "已中断",
+    JOB_STATUS_FAILED: "出错",
+    JOB_STATUS_DONE: "已完成",
+}
+JOB_PANEL_REFRESH_MS = 500
+
+# 写入前核对备注：同一目录的检查与写入在进程内按路径串行（锁分段数），
+# 跨进程由 desktop.ini 上的文件锁互斥（等待上限与轮询间隔，秒）。
+INI_PATH_LOCK_STRIPES = 64
+INI_LOCK_TIMEOUT_S = 10.0
+FILE_LOCK_POLL_S = 0.05
+
+# 目录缓存与预取：内存预算、过期时间（秒）、预取线程数与每次最多预取的子目录数
+# （目录树首屏条数，超出部分等用户滚动或展开时再读）。
+DIR_CACHE_BUDGET_BYTES = 64 * 1024 * 1024
+DIR_CACHE_TTL_S = 120.0
+PREFETCH_MAX_WORKERS = 2
+PREFETCH_MAX_CHILDREN = TREE_PAGE_SIZE
+
+# 路径探测：默认期限、不可达缓存时长（秒）与探测线程数。
+PROBE_TIMEOUT_S = 3.0
+PROBE_NEGATIVE_TTL_S = 30.0
+PROBE_MAX_WORKERS = 4
+PROBE_TIMEOUT_ENV_VAR = "DESKTOPINI_PROBE_TIMEOUT"
 
 # 实例通讯配置。
 SINGLE_INSTANCE_HOST = "127.0.0.1"
 SINGLE_INSTANCE_PORT = 53333
+SINGLE_INSTANCE_READ_TIMEOUT_S = 2.0
@@ -1,134 +1,251 @@
 """
 资源管理器右键菜单的注册与取消。
+
+注册表读写经由 ``RegistryBackend``：Windows 上使用 winreg，
+其他平台可用内存实现验证注册逻辑。
 """
 from __future__ import annotations
 
+from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, List
-import winreg
-
-from core.constants import CONTEXT_MENU_NAME
+from typing import Dict, List, Optional
+
+try:
+    import winreg
+except ImportError:  # pragma: no cover - 非 Windows 平台只能使用内存后端
+    winreg = None
+
+from core.constants import (
+    CONTEXT_MENU_NAME,
+    MULTI_SELECT_MODEL,
+    SELECT_ARG,
+)
 from core.utils import log_message
 
 
-def _menu_paths(menu_name: str) -> List[str]:
+class RegistryBackend(ABC):
+    """
+    HKEY_CURRENT_USER 下注册表操作的最小接口，路径均相对 HKCU。
     """
-    生成所有需要写入的注册表路径，统一管理根路径结构。
 
-    Args:
-        menu_name: 右键菜单名称。
+    @abstractmethod
+    def set_value(self, path: str, name: str, value: str) -> None:
+        """
+        写入字符串值，键（含中间键）不存在时自动创建。
 
-    Returns:
-        包含目录、空白区与磁盘三类路径的列表。
+        Args:
+            path: 注册表键路径。
+            name: 值名称；空字符串表示默认值。
+            value: 字符串内容。
+        """
+
+    @abstractmethod
+    def delete_key(self, path: str) -> None:
+        """
+        删除没有子键的键。
+
+        Args:
+            path: 注册表键路径。
+
+        Raises:
+            FileNotFoundError: 键不存在。
+            OSError: 键仍有子键等原因导致删除失败。
+        """
+
+    @abstractmethod
+    def key_exists(self, path: str) -> bool:
+        """
+        判断键是否存在。
+
+        Args:
+            path: 注册表键路径。
+        """
+
+
+class WinRegistryBackend(RegistryBackend):
+    """
+    基于 winreg 的真实注册表实现。
     """
-    base = r"Software\Classes"
-    return [
-        fr"{base}\Directory\shell\{menu_name}",
-        fr"{base}\Directory\Background\shell\{menu_name}",
-        fr"{base}\Drive\shell\{menu_name}",
-    ]
 
+    def set_value(self, path: str, name: str, value: str) -> None:
+        key = winreg.CreateKeyEx(
+            winreg.HKEY_CURRENT_USER, path, 0, winreg.KEY_WRITE
+        )
+        try:
+            winreg.SetValueEx(key, name, 0, winreg.REG_SZ, value)
+        finally:
+            winreg.CloseKey(key)
 
-def _set_command(key: winreg.HKEYType, command: str) -> None:
+    def delete_key(self, path: str) -> None:
+        winreg.DeleteKey(winreg.HKEY_CURRENT_USER, path)
+
+    def key_exists(self, path: str) -> bool:
+        try:
+            key = winreg.OpenKey(
+                winreg.HKEY_CURRENT_USER, path, 0, winreg.KEY_READ
+            )
+        except FileNotFoundError:
+            return False
+        winreg.CloseKey(key)
+        return True
+
+
+class MemoryRegistryBackend(RegistryBackend):
     """
-    为指定注册表键写入 command 子键。
+    内存中的注册表替身，键路径与 Windows 一样不区分大小写。
 
-    Args:
-        key: 已打开的注册表键。
-        command: 完整的执行命令。
+    Attributes:
+        keys: 小写键路径到值映射（值名称到内容）的字典。
     """
-    winreg.SetValue(key, "command", winreg.REG_SZ, command)
 
+    def __init__(self) -> None:
+        self.keys: Dict[str, Dict[str, str]] = {}
 
-def _open_or_create(path: str) -> winreg.HKEYType:
+    def set_value(self, path: str, name: str, value: str) -> None:
+        parts: List[str] = path.lower().split("\\")
+        for end in range(1, len(parts) + 1):
+            self.keys.setdefault("\\".join(parts[:end]), {})
+        self.keys[path.lower()][name] = value
+
+    def delete_key(self, path: str) -> None:
+        key: str = path.lower()
+        if key not in self.keys:
+            raise FileNotFoundError(path)
+        if any(other.startswith(key + "\\") for other in self.keys):
+            raise OSError(f"键仍有子键：{path}")
+        del self.keys[key]
+
+    def key_exists(self, path: str) -> bool:
+        return path.lower() in self.keys
+
+    def values(self, path: str) -> Dict[str, str]:
+        """
+        读取键下的全部值，便于检查注册结果。
+
+        Args:
+            path: 注册表键路径。
+
+        Returns:
+            值名称到内容的映射；键不存在时为空字典。
+        """
+        return dict(self.keys.get(path.lower(), {}))
+
+
+def get_default_backend() -> RegistryBackend:
+    """
+    返回当前平台的注册表实现。
+
+    Raises:
+        OSError: 当前平台没有 winreg。
     """
-    打开或创建可写注册表键，统一权限配置。
+    if winreg is None:
+        raise OSError("注册表仅在 Windows 上可用。")
+    return WinRegistryBackend()
+
+
+def _menu_paths(menu_name: str) -> List[str]:
+    """
+    生成所有需要写入的注册表路径，统一管理根路径结构。
 
     Args:
-        path: 目标注册表路径。
+        menu_name: 右键菜单名称。
 
     Returns:
-        可写的注册表键句柄。
+        包含目录、空白区与磁盘三类路径的列表。
     """
-    return winreg.CreateKeyEx(
-        winreg.HKEY_CURRENT_USER,
-        path,
-        0,
-        winreg.KEY_WRITE,
-    )
+    base = r"Software\Classes"
+    return [
+        fr"{base}\Directory\shell\{menu_name}",
+        fr"{base}\Directory\Background\shell\{menu_name}",
+        fr"{base}\Drive\shell\{menu_name}",
+    ]
 
 
 def register_context_menu(
     python_exe: Path | None,
     target_path: Path,
     menu_name: str = CONTEXT_MENU_NAME,
+    multi_select: bool = False,
+    backend: Optional[RegistryBackend] = None,
 ) -> None:
     """
     注册右键菜单，将菜单动作指向可执行目标。
 
+    多选模式下目录与磁盘菜单设置 ``MultiSelectModel=Player``，
+    选中任意多项都会显示菜单；资源管理器仍按项启动命令，
+    命令带 ``--select`` 参数，由已运行实例把同一批启动合并为一个批量视图。
+
     Args:
         python_exe: Python 解释器路径；冻结包时传入 None。
         target_path: 目标脚本或可执行文件路径。
         menu_name: 右键菜单名称。
+        multi_select: 是否注册为多选菜单。
+        backend: 注册表实现；None 表示当前平台的真实注册表。
     """
+    registry: RegistryBackend = backend or get_default_backend()
+    # 先清理旧注册，避免切换模式后残留 MultiSelectModel 等值。
+    unregister_context_menu(menu_name, registry)
     if python_exe is None:
         command_base: str = f'"{target_path}"'
     else:
         command_base = f'"{python_exe}" "{target_path}"'
+    select: str = f"{SELECT_ARG} " if multi_select else ""
 
     commands: Dict[str, str] = {
-        "Directory": f'{command_base} "%V"',
+        "Directory": f'{command_base} {select}"%V"',
         "Directory\\Background": f'{command_base} "%V"',
-        "Drive": f'{command_base} "%1"',
+        "Drive": f'{command_base} {select}"%1"',
     }
 
     for path in _menu_paths(menu_name):
-        key = _open_or_create(path)
-        winreg.SetValueEx(key, "", 0, winreg.REG_SZ, menu_name)
+        registry.set_value(path, "", menu_name)
         if "Background" in path:
             command = commands["Directory\\Background"]
         elif "Drive" in path:
             command = commands["Drive"]
         else:
             command = commands["Directory"]
+        # 空白区菜单只对应当前目录一项，不需要多选。
+        if multi_select and "Background" not in path:
+            registry.set_value(path, "MultiSelectModel", MULTI_SELECT_MODEL)
         log_message("INFO", f"register menu {path} -> {command}")
-        _set_command(key, command)
-        winreg.CloseKey(key)
+        registry.set_value(path + r"\command", "", command)
 
 
-def unregister_context_menu(menu_name: str = CONTEXT_MENU_NAME) -> None:
+def unregister_context_menu(
+    menu_name: str = CONTEXT_MENU_NAME,
+    backend: Optional[RegistryBackend] = None,
+) -> None:
     """
     取消右键菜单，清理所有相关注册表项。
 
     Args:
         menu_name: 右键菜单名称。
+        backend: 注册表实现；None 表示当前平台的真实注册表。
     """
+    registry: RegistryBackend = backend or get_default_backend()
     for path in _menu_paths(menu_name):
         try:
-            winreg.DeleteKey(winreg.HKEY_CURRENT_USER, path + r"\command")
-            winreg.DeleteKey(winreg.HKEY_CURRENT_USER, path)
+            registry.delete_key(path + r"\command")
+            registry.delete_key(path)
             log_message("INFO", f"unregister menu {path}")
         except FileNotFoundError:
             continue
 
 
-def is_context_menu_registered(menu_name: str = CONTEXT_MENU_NAME) -> bool:
+def is_context_menu_registered(
+    menu_name: str = CONTEXT_MENU_NAME,
+    backend: Optional[RegistryBackend] = None,
+) -> bool:
     """
     检查右键菜单是否已经存在。
 
     Args:
         menu_name: 右键菜单名称。
+        backend: 注册表实现；None 表示当前平台的真实注册表。
 
     Returns:
         True 表示任一注册表路径存在，False 表示未注册。
     """
-    for path in _menu_paths(menu_name):
-        try:
-            key = winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER, path, 0, winreg.KEY_READ
-            )
-            winreg.CloseKey(key)
-            return True
-        except FileNotFoundError:
-            continue
-    return False
+    registry: RegistryBackend = backend or get_default_backend()
+    return any(registry.key_exists(path) for path in _menu_paths(menu_name))
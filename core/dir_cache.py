@@ -0,0 +1,200 @@
+"""
+目录缓存：按目录保存子目录列表与备注，带内存预算与过期时间的 LRU。
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from core.constants import DIR_CACHE_BUDGET_BYTES, DIR_CACHE_TTL_S
+from core.ini_service import IniVersion
+
+# 单个路径在缓存中的估算开销（Path 对象、列表槽位与备注引用）。
+_ENTRY_OVERHEAD_BYTES = 160
+# 单个 desktop.ini 版本对象的估算开销。
+_VERSION_BYTES = 120
+
+
+@dataclass
+class CachedDirectory:
+    """
+    一个目录的缓存内容。
+
+    Attributes:
+        folders: 已过滤排序的子目录列表。
+        remarks: 与 folders 一一对应的备注；只缓存了列表时为 None。
+        versions: 与 remarks 对应的 desktop.ini 版本；未记录时为 None。
+        stored_at: 写入时间（monotonic 秒）。
+        size: 估算占用字节数。
+    """
+
+    __slots__ = ("folders", "remarks", "versions", "stored_at", "size")
+
+    folders: List[Path]
+    remarks: Optional[List[str]]
+    versions: Optional[List[Optional[IniVersion]]]
+    stored_at: float
+    size: int
+
+
+class DirectoryCache:
+    """
+    线程安全的目录缓存，供界面加载与后台预取共用。
+
+    超出内存预算时按最近最少使用淘汰；超过过期时间的条目视为未命中，
+    外部修改最多在过期时间内不可见，刷新或写入时会主动失效。
+
+    Attributes:
+        budget_bytes: 内存预算（估算值）。
+        ttl: 条目过期时间（秒）。
+        used_bytes: 当前估算占用。
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int = DIR_CACHE_BUDGET_BYTES,
+        ttl: float = DIR_CACHE_TTL_S,
+    ) -> None:
+        self.budget_bytes: int = budget_bytes
+        self.ttl: float = ttl
+        self.used_bytes: int = 0
+        self._entries: "OrderedDict[str, CachedDirectory]" = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, parent: Path) -> Optional[CachedDirectory]:
+        """
+        读取未过期的缓存条目。
+
+        Args:
+            parent: 目录路径。
+
+        Returns:
+            缓存条目；未命中或已过期时返回 None。
+        """
+        key: str = str(parent)
+        with self._lock:
+            entry: Optional[CachedDirectory] = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.stored_at > self.ttl:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(
+        self,
+        parent: Path,
+        folders: List[Path],
+        remarks: Optional[List[str]] = None,
+        versions: Optional[List[Optional[IniVersion]]] = None,
+    ) -> bool:
+        """
+        写入目录条目，必要时淘汰旧条目以满足预算。
+
+        Args:
+            parent: 目录路径。
+            folders: 子目录列表。
+            remarks: 与 folders 对应的备注；未读取时为 None。
+            versions: 与 remarks 对应的 desktop.ini 版本；未记录时为 None。
+
+        Returns:
+            True 表示已缓存；单个条目超过预算四分之一时不缓存。
+        """
+        size: int = sum(
+            len(str(folder)) * 2 + _ENTRY_OVERHEAD_BYTES for folder in folders
+        )
+        if remarks is not None:
+            size += sum(len(remark) * 2 for remark in remarks)
+        if versions is not None:
+            size += len(versions) * _VERSION_BYTES
+        if size > self.budget_bytes // 4:
+            return False
+        key: str = str(parent)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = CachedDirectory(
+                folders=folders,
+                remarks=remarks,
+                versions=versions,
+                stored_at=time.monotonic(),
+                size=size,
+            )
+            self.used_bytes += size
+            while self.used_bytes > self.budget_bytes and self._entries:
+                self._remove(next(iter(self._entries)))
+        return True
+
+    def has_fresh_remarks(self, parent: Path) -> bool:
+        """
+        判断目录是否已缓存了未过期的备注。
+
+        Args:
+            parent: 目录路径。
+
+        Returns:
+            True 表示列表与备注都可直接使用。
+        """
+        entry: Optional[CachedDirectory] = self.get(parent)
+        return entry is not None and entry.remarks is not None
+
+    def update_remark(
+        self,
+        folder: Path,
+        remark: str,
+        version: Optional[IniVersion] = None,
+    ) -> None:
+        """
+        写入备注后同步更新父目录条目中的缓存值。
+
+        Args:
+            folder: 被修改的目录。
+            remark: 新备注。
+            version: 写入后 desktop.ini 的版本；未知时为 None。
+        """
+        with self._lock:
+            entry: Optional[CachedDirectory] = self._entries.get(
+                str(folder.parent)
+            )
+            if entry is None or entry.remarks is None:
+                return
+            try:
+                index: int = entry.folders.index(folder)
+            except ValueError:
+                return
+            entry.remarks[index] = remark
+            if entry.versions is not None:
+                entry.versions[index] = version
+
+    def invalidate(self, parent: Path) -> None:
+        """
+        使单个目录条目失效。
+
+        Args:
+            parent: 目录路径。
+        """
+        with self._lock:
+            self._remove(str(parent))
+
+    def clear(self) -> None:
+        """
+        清空全部条目。
+        """
+        with self._lock:
+            self._entries.clear()
+            self.used_bytes = 0
+
+    def _remove(self, key: str) -> None:
+        """
+        移除条目并扣减占用（调用方需持有锁）。
+
+        Args:
+            key: 目录路径字符串。
+        """
+        entry: Optional[CachedDirectory] = self._entries.pop(key, None)
+        if entry is not None:
+            self.used_bytes -= entry.size
@@ -0,0 +1,85 @@
+"""
+跨进程的文件锁：Windows 使用 msvcrt.locking 锁定文件末尾之外的一个字节，
+其他平台使用 fcntl.flock。两者都只在遵守同一约定的进程之间互斥，不妨碍
+资源管理器等其他程序读取文件内容；锁随文件句柄存在，进程崩溃时由系统
+释放，不会遗留失效的锁。
+"""
+from __future__ import annotations
+
+import time
+from typing import IO
+
+from core.constants import FILE_LOCK_POLL_S
+
+try:
+    import msvcrt
+except ImportError:  # pragma: no cover - 非 Windows 平台使用 fcntl
+    msvcrt = None
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows 没有 fcntl
+    fcntl = None
+
+# msvcrt 锁定的字节位置：远在 desktop.ini 与任务锁文件的内容之外。
+_LOCK_OFFSET = 0x7FFFFFFE
+
+
+def try_lock(handle: IO[bytes]) -> bool:
+    """
+    以不阻塞的方式对已打开的文件加排他锁。
+
+    Args:
+        handle: 以二进制模式打开的文件。
+
+    Returns:
+        True 表示已取得锁；False 表示锁被其他句柄（通常是其他进程）持有。
+    """
+    try:
+        if msvcrt is not None:
+            position: int = handle.tell()
+            handle.seek(_LOCK_OFFSET)
+            try:
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+            finally:
+                handle.seek(position)
+        elif fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def lock(handle: IO[bytes], timeout_s: float) -> None:
+    """
+    对已打开的文件加排他锁，锁被占用时轮询等待。
+
+    Args:
+        handle: 以二进制模式打开的文件。
+        timeout_s: 最长等待秒数。
+
+    Raises:
+        TimeoutError: 超时仍未取得锁。
+    """
+    deadline: float = time.monotonic() + timeout_s
+    while not try_lock(handle):
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"文件被其他进程锁定：{handle.name}")
+        time.sleep(FILE_LOCK_POLL_S)
+
+
+def unlock(handle: IO[bytes]) -> None:
+    """
+    释放 ``try_lock`` 或 ``lock`` 取得的锁；关闭文件同样会释放。
+
+    Args:
+        handle: 已加锁的文件。
+    """
+    if msvcrt is not None:
+        position: int = handle.tell()
+        handle.seek(_LOCK_OFFSET)
+        try:
+            msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            handle.seek(position)
+    elif fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
@@ -3,20 +3,87 @@ desktop.ini 读写服务。
 """
 from __future__ import annotations
 
+import copy
+import hashlib
 import os
+import threading
 from configparser import ConfigParser
+from contextlib import nullcontext
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Set
+from typing import (
+    IO,
+    Callable,
+    ContextManager,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
-from core.constants import DEFAULT_SKIP_NAMES
+from core.constants import (
+    DEFAULT_SKIP_NAMES,
+    FILE_ATTRIBUTE_REPARSE_POINT,
+    INI_LOCK_TIMEOUT_S,
+    INI_PATH_LOCK_STRIPES,
+    IO_PRIORITY_INTERACTIVE,
+    WALK_MAX_WORKERS,
+)
+from core.file_lock import lock
+from core.io_scheduler import IoScheduler
+from core.probe import PathProbe
 from core.utils import (
     ensure_folder_system,
     ensure_ini_hidden_system,
-    safe_read_config,
-    write_config,
+    format_config,
+    parse_config_bytes,
 )
 
+_INFO_TIP_SECTION = ".ShellClassInfo"
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class IniVersion:
+    """
+    desktop.ini 在某次读取时的版本标记，用于写入前的乐观并发检查。
+
+    Attributes:
+        mtime_ns: 文件修改时间；文件不存在时为 0。
+        size: 文件字节数；文件不存在时为 -1。
+        digest: 内容摘要（64 位有符号整数，便于紧凑存储）。
+    """
+
+    __slots__ = ("mtime_ns", "size", "digest")
+
+    mtime_ns: int
+    size: int
+    digest: int
+
+
+MISSING_INI_VERSION = IniVersion(0, -1, 0)
+
+
+class RemarkConflictError(Exception):
+    """
+    写入前发现磁盘上的备注已被其他用户或程序修改，本次写入未覆盖。
+
+    Attributes:
+        folder: 目标目录。
+        disk_remark: 磁盘上当前的备注。
+        version: 磁盘上 desktop.ini 当前的版本，解决冲突后据此重新写入。
+    """
+
+    def __init__(
+        self, folder: Path, disk_remark: str, version: Optional[IniVersion]
+    ) -> None:
+        super().__init__(f"备注已被他人修改: {folder}")
+        self.folder: Path = folder
+        self.disk_remark: str = disk_remark
+        self.version: Optional[IniVersion] = version
+
 
 @dataclass
 class FolderRemark:
@@ -28,30 +95,152 @@ class FolderRemark:
         path: 目录的绝对路径。
         original_remark: 初始读取的备注值，用于脏检查。
         current_remark: 当前编辑后的备注值。
+        version: 读取 original_remark 时 desktop.ini 的版本；未记录时为 None。
     """
 
+    __slots__ = (
+        "name",
+        "path",
+        "original_remark",
+        "current_remark",
+        "version",
+    )
+
     name: str
     path: Path
     original_remark: str
     current_remark: str
+    version: Optional[IniVersion]
 
 
 class DesktopIniService:
     """
     desktop.ini 读写核心服务。
 
+    配置了调度器时，每次枚举、读取与写入都先在所属卷上取得对应优先级的名额；
+    ``with_priority`` 返回共享配置、只改优先级的副本，供预取与后台扫描使用。
+
     Attributes:
         skip_names: 需要跳过的目录名集合（小写），避免遍历系统目录。
+        probe: 可选的带超时探测器；设置后在界面线程上的枚举与读取整体受探测
+            期限约束，其他线程枚举前的存在性检查也不会无限阻塞。
+        scheduler: 可选的 I/O 调度器。
+        priority: 本实例操作使用的调度优先级。
+        write_listeners: 备注写入成功后的回调 (目录, 新备注)，在写入线程中
+            调用；``with_priority`` 的副本共用同一列表。
     """
 
-    def __init__(self, skip_names: Set[str] = DEFAULT_SKIP_NAMES) -> None:
+    def __init__(
+        self,
+        skip_names: Set[str] = DEFAULT_SKIP_NAMES,
+        probe: Optional[PathProbe] = None,
+        scheduler: Optional[IoScheduler] = None,
+        priority: int = IO_PRIORITY_INTERACTIVE,
+    ) -> None:
         """
         初始化服务，预处理跳过目录名称以统一大小写。
 
         Args:
             skip_names: 需要忽略的目录名称集合。
+            probe: 带超时的路径探测器。
+            scheduler: I/O 调度器；None 表示不限流。
+            priority: 调度优先级。
         """
         self.skip_names: Set[str] = {name.lower() for name in skip_names}
+        self.probe: Optional[PathProbe] = probe
+        self.scheduler: Optional[IoScheduler] = scheduler
+        self.priority: int = priority
+        self.write_listeners: List[Callable[[Path, str], None]] = []
+        # 按路径分段的写入锁，with_priority 的副本共用。
+        self._path_locks: List[threading.Lock] = [
+            threading.Lock() for _ in range(INI_PATH_LOCK_STRIPES)
+        ]
+
+    def with_priority(self, priority: int) -> "DesktopIniService":
+        """
+        返回使用另一优先级的服务副本，其余配置共享。
+
+        Args:
+            priority: 调度优先级，例如 ``IO_PRIORITY_PREFETCH``。
+
+        Returns:
+            新的服务实例；未配置调度器时同样可用。
+        """
+        clone: DesktopIniService = copy.copy(self)
+        clone.priority = priority
+        return clone
+
+    def in_flight_limit(self, path: Path) -> int:
+        """
+        建议的在途任务数：路径所在卷当前并发上限的两倍，保证名额不空转。
+
+        Args:
+            path: 操作涉及的路径。
+
+        Returns:
+            在途任务上限；未配置调度器时为固定值。
+        """
+        if self.scheduler is None:
+            return WALK_MAX_WORKERS * 2
+        return self.scheduler.limit_for(path) * 2
+
+    def _slot(self, path: Path) -> ContextManager[None]:
+        """
+        取得一次 I/O 的调度名额；未配置调度器时不做任何事。
+
+        Args:
+            path: 操作涉及的路径。
+        """
+        if self.scheduler is None:
+            return nullcontext()
+        return self.scheduler.slot(self.priority, path)
+
+    def _bounded(self, path: Path, func: Callable[[], T]) -> T:
+        """
+        在界面线程上调用且配置了探测器时，经探测器限时执行整个访问，
+        失联的共享不会卡住界面；其他线程直接执行。
+
+        Args:
+            path: 访问涉及的路径。
+            func: 实际执行访问的无参函数。
+
+        Raises:
+            PathUnreachableError: 共享不可达或访问超时。
+        """
+        if (
+            self.probe is None
+            or threading.current_thread() is not threading.main_thread()
+        ):
+            return func()
+        return self.probe.run(path, func)
+
+    def _access(self, path: Path, func: Callable[[], T]) -> T:
+        """
+        取得调度名额后执行一次访问，整体交给 ``_bounded``。
+
+        名额在探测期限之内等待：界面线程上即使该卷的名额被挂起的写入占满，
+        也会在期限到达时抛出 ``PathUnreachableError``，而不是无限阻塞。
+
+        Args:
+            path: 访问涉及的路径。
+            func: 实际执行访问的无参函数。
+
+        Raises:
+            PathUnreachableError: 共享不可达或访问（含等待名额）超时。
+        """
+
+        def run() -> T:
+            with self._slot(path):
+                return func()
+
+        return self._bounded(path, run)
+
+    def _heartbeat(self) -> None:
+        """
+        在探测器中执行时报告一次进展，长时间的枚举不会被误判为超时。
+        """
+        if self.probe is not None:
+            self.probe.heartbeat()
 
     def list_subfolders(self, parent: Path) -> List[Path]:
         """
@@ -62,13 +251,28 @@ class DesktopIniService:
 
         Returns:
             经过过滤并排序的子目录路径列表。
+
+        Raises:
+            PathUnreachableError: 配置了探测器且父目录所在共享不可达时抛出。
+        """
+        return self._access(parent, lambda: self._list_subfolders(parent))
+
+    def _list_subfolders(self, parent: Path) -> List[Path]:
+        """
+        枚举子目录的实际实现。
         """
         subfolders: List[Path] = []
-        if not parent.exists():
+        exists: bool = (
+            self.probe.exists(parent)
+            if self.probe is not None
+            else parent.exists()
+        )
+        if not exists:
             return subfolders
         try:
             with os.scandir(parent) as entries:
                 for entry in entries:
+                    self._heartbeat()
                     try:
                         if not entry.is_dir(follow_symlinks=False):
                             continue
@@ -81,6 +285,121 @@ class DesktopIniService:
             return subfolders
         return sorted(subfolders)
 
+    def has_subfolder(self, folder: Path) -> bool:
+        """
+        判断目录下是否有未被跳过的子目录，找到第一个即返回，
+        用于决定目录树节点是否放置懒加载占位符。
+
+        Args:
+            folder: 目录路径。
+
+        Returns:
+            True 表示存在子目录；目录无法读取时返回 False。
+
+        Raises:
+            PathUnreachableError: 配置了探测器且共享不可达或访问超时。
+        """
+        return self._access(folder, lambda: self._has_subfolder(folder))
+
+    def _has_subfolder(self, folder: Path) -> bool:
+        """
+        判断是否有子目录的实际实现。
+        """
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    self._heartbeat()
+                    try:
+                        if not entry.is_dir(follow_symlinks=False):
+                            continue
+                    except OSError:
+                        continue
+                    if entry.name.lower() not in self.skip_names:
+                        return True
+        except OSError:
+            return False
+        return False
+
+    def list_remarks(
+        self, parent: Path
+    ) -> List[Tuple[Path, str, Optional[IniVersion]]]:
+        """
+        枚举子目录并逐个读取备注。
+
+        在界面线程上调用时，枚举与全部读取作为一次访问受探测期限约束：
+        每读完一个目录算一次进展，共享中途失联时不会卡住界面。
+
+        Args:
+            parent: 父目录。
+
+        Returns:
+            (子目录, 备注, 版本) 列表，顺序与 ``list_subfolders`` 相同。
+
+        Raises:
+            PathUnreachableError: 配置了探测器且共享不可达或访问超时。
+        """
+
+        def read_all() -> List[Tuple[Path, str, Optional[IniVersion]]]:
+            listing: List[Tuple[Path, str, Optional[IniVersion]]] = []
+            for folder in self.list_subfolders(parent):
+                remark, version = self.read_remark(folder)
+                listing.append((folder, remark, version))
+            return listing
+
+        return self._bounded(parent, read_all)
+
+    def measure_folder(self, folder: Path) -> Tuple[List[Path], int, int]:
+        """
+        枚举目录的直接内容，用于统计大小。
+
+        与 ``list_subfolders`` 不同，这里不跳过系统目录；符号链接与目录联接
+        只计为一项，不进入，避免重复统计或循环。
+
+        Args:
+            folder: 目录路径。
+
+        Returns:
+            (子目录列表, 文件总字节数, 文件数)。
+
+        Raises:
+            OSError: 目录无法枚举时抛出。
+        """
+        subfolders: List[Path] = []
+        total_bytes: int = 0
+        files: int = 0
+        with self._slot(folder), os.scandir(folder) as entries:
+            for entry in entries:
+                try:
+                    info: os.stat_result = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                reparse: bool = entry.is_symlink() or bool(
+                    getattr(info, "st_file_attributes", 0)
+                    & FILE_ATTRIBUTE_REPARSE_POINT
+                )
+                if not reparse and entry.is_dir(follow_symlinks=False):
+                    subfolders.append(Path(entry.path))
+                    continue
+                total_bytes += info.st_size
+                files += 1
+        return subfolders, total_bytes, files
+
+    def folder_mtime(self, folder: Path) -> int:
+        """
+        读取目录自身的修改时间（纳秒），子目录或 desktop.ini 增删时会变化。
+
+        Args:
+            folder: 目录路径。
+
+        Returns:
+            ``st_mtime_ns``。
+
+        Raises:
+            OSError: 目录不存在或无法访问时抛出。
+        """
+        with self._slot(folder):
+            return os.stat(folder).st_mtime_ns
+
     def read_info_tip(self, folder: Path) -> str:
         """
         读取目录的 InfoTip（备注）。
@@ -91,55 +410,220 @@ class DesktopIniService:
         Returns:
             InfoTip 文本，若不存在则返回空字符串。
         """
-        ini_path: Path = folder / "desktop.ini"
-        parser: ConfigParser = safe_read_config(ini_path)
-        section: str = ".ShellClassInfo"
-        if not parser.has_section(section):
-            return ""
-        for option in parser.options(section):
-            if option.lower() == "infotip":
-                return parser.get(section, option, fallback="")
-        return ""
+        return self.read_remark(folder)[0]
+
+    def read_remark(self, folder: Path) -> Tuple[str, Optional[IniVersion]]:
+        """
+        读取目录的备注，同时记录 desktop.ini 的版本供写入时核对。
+
+        Args:
+            folder: 目标目录路径。
+
+        Returns:
+            (InfoTip 文本, 版本)；文件无法读取时版本为 None。
+        """
+        parser, version = self._access(
+            folder, lambda: _read_ini(folder / "desktop.ini")
+        )
+        self._heartbeat()
+        return _info_tip(parser), version
 
-    def write_info_tip(self, folder: Path, remark: str) -> None:
+    def write_info_tip(
+        self,
+        folder: Path,
+        remark: str,
+        expected: Optional[str] = None,
+        version: Optional[IniVersion] = None,
+    ) -> Optional[IniVersion]:
         """
         写入或清理目录的 InfoTip，并保持 desktop.ini 属性正确。
 
+        给出 expected 时先做乐观并发检查：desktop.ini 的版本与 version 一致
+        则直接写入；否则比对磁盘上的备注，已被改成 expected 与 remark 以外的值
+        时抛出 ``RemarkConflictError``，不覆盖他人的修改。检查与改写基于同一次
+        读取的内容，其他键（图标等）的改动会被保留；整个过程在进程内持有该
+        目录的路径锁、跨进程持有 desktop.ini 的文件锁，其他写入者（包括本工具
+        的其他实例）无法插入到检查与写入之间。
+
         Args:
             folder: 目标目录路径。
             remark: 需要写入的备注文本；为空时删除 InfoTip。
+            expected: 读取时的备注；None 表示不检查，直接覆盖。
+            version: 读取时 desktop.ini 的版本；未知时为 None（总是比对备注）。
+
+        Returns:
+            写入后 desktop.ini 的版本；文件被删除时为 ``MISSING_INI_VERSION``。
 
         Raises:
             FileNotFoundError: 当目录不存在时抛出。
+            RemarkConflictError: 磁盘上的备注已被他人修改时抛出。
+            TimeoutError: desktop.ini 被其他进程长时间锁定时抛出。
+        """
+        with self._slot(folder), self._path_lock(folder):
+            written: Optional[IniVersion] = self._write_info_tip(
+                folder, remark, expected, version
+            )
+        for listener in self.write_listeners:
+            listener(folder, remark)
+        return written
+
+    def _write_info_tip(
+        self,
+        folder: Path,
+        remark: str,
+        expected: Optional[str],
+        version: Optional[IniVersion],
+    ) -> Optional[IniVersion]:
+        """
+        写入 InfoTip 的实际实现。
         """
         if not folder.exists():
             raise FileNotFoundError(f"目录不存在: {folder}")
-        ensure_folder_system(folder)
-
         ini_path: Path = folder / "desktop.ini"
-        parser: ConfigParser = safe_read_config(ini_path)
-        parser.optionxform = str
-        section: str = ".ShellClassInfo"
-        if section not in parser.sections():
-            parser.add_section(section)
-
-        # 清理任意大小写的 InfoTip 冗余键，避免重复。
-        for option in list(parser.options(section)):
-            if option.lower() == "infotip":
-                parser.remove_option(section, option)
-
-        if remark:
-            parser.set(section, "InfoTip", remark)
-        else:
-            if parser.has_option(section, "InfoTip"):
-                parser.remove_option(section, "InfoTip")
-            if not parser.items(section):
-                parser.remove_section(section)
-
-        if not parser.sections():
-            if ini_path.exists():
-                ini_path.unlink()
-            return
-
-        write_config(ini_path, parser)
+        if not remark and not ini_path.exists():
+            return MISSING_INI_VERSION
+        # OPEN_ALWAYS 语义：不存在时创建，已有的隐藏/系统文件也能直接打开。
+        descriptor: int = os.open(
+            ini_path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        )
+        # 结束时文件为空（内容被清空，或刚创建后因冲突放弃）则删除。
+        emptied: bool = False
+        try:
+            with os.fdopen(descriptor, "r+b") as handle:
+                lock(handle, INI_LOCK_TIMEOUT_S)
+                data: bytes = handle.read()
+                emptied = not data
+                written: IniVersion = _rewrite_ini(
+                    folder, handle, data, remark, expected, version
+                )
+                emptied = written == MISSING_INI_VERSION
+        finally:
+            if emptied:
+                _remove_if_empty(ini_path)
+        if emptied:
+            return MISSING_INI_VERSION
         ensure_ini_hidden_system(ini_path)
+        return written
+
+    def _path_lock(self, folder: Path) -> threading.Lock:
+        """
+        取得目录对应的进程内写入锁（按路径哈希分段）。
+        """
+        key: str = os.path.normcase(str(folder))
+        return self._path_locks[hash(key) % len(self._path_locks)]
+
+
+def _read_ini(ini_path: Path) -> Tuple[ConfigParser, Optional[IniVersion]]:
+    """
+    读取并解析 desktop.ini，版本取自同一次读取的内容与文件句柄。
+
+    Returns:
+        (配置, 版本)；文件不存在时为空配置与 ``MISSING_INI_VERSION``，
+        其他读取失败时为空配置与 None。
+    """
+    try:
+        with ini_path.open("rb") as handle:
+            data: bytes = handle.read()
+            info: os.stat_result = os.fstat(handle.fileno())
+    except FileNotFoundError:
+        return parse_config_bytes(b""), MISSING_INI_VERSION
+    except OSError:
+        return parse_config_bytes(b""), None
+    return parse_config_bytes(data), _ini_version(data, info)
+
+
+def _rewrite_ini(
+    folder: Path,
+    handle: IO[bytes],
+    data: bytes,
+    remark: str,
+    expected: Optional[str],
+    version: Optional[IniVersion],
+) -> IniVersion:
+    """
+    在已加锁的 desktop.ini 上核对备注并改写内容。
+
+    Args:
+        folder: 目标目录。
+        handle: 已加锁、读完内容的 desktop.ini。
+        data: 读到的原始内容。
+        remark: 新备注。
+        expected: 读取时的备注；None 表示不检查。
+        version: 读取时的版本。
+
+    Returns:
+        写入后的版本；内容被清空时为 ``MISSING_INI_VERSION``。
+
+    Raises:
+        RemarkConflictError: 磁盘上的备注已被他人修改时抛出。
+    """
+    parser: ConfigParser = parse_config_bytes(data)
+    current: IniVersion = (
+        _ini_version(data, os.fstat(handle.fileno()))
+        if data
+        else MISSING_INI_VERSION
+    )
+    if expected is not None and (version is None or current != version):
+        disk_remark: str = _info_tip(parser)
+        if disk_remark not in (expected, remark):
+            raise RemarkConflictError(folder, disk_remark, current)
+    ensure_folder_system(folder)
+
+    section: str = _INFO_TIP_SECTION
+    if section not in parser.sections():
+        parser.add_section(section)
+
+    # 清理任意大小写的 InfoTip 冗余键，避免重复。
+    for option in list(parser.options(section)):
+        if option.lower() == "infotip":
+            parser.remove_option(section, option)
+
+    if remark:
+        parser.set(section, "InfoTip", remark)
+    else:
+        if parser.has_option(section, "InfoTip"):
+            parser.remove_option(section, "InfoTip")
+        if not parser.items(section):
+            parser.remove_section(section)
+
+    content: bytes = format_config(parser) if parser.sections() else b""
+    handle.seek(0)
+    handle.truncate()
+    handle.write(content)
+    handle.flush()
+    if not content:
+        return MISSING_INI_VERSION
+    return _ini_version(content, os.fstat(handle.fileno()))
+
+
+def _remove_if_empty(ini_path: Path) -> None:
+    """
+    删除仍为空的 desktop.ini；期间已被他人写入内容时保留。
+    """
+    try:
+        if ini_path.stat().st_size == 0:
+            ini_path.unlink()
+    except FileNotFoundError:
+        return
+
+
+def _ini_version(data: bytes, info: os.stat_result) -> IniVersion:
+    """
+    由文件内容与同一句柄的 stat 结果生成版本标记。
+    """
+    digest: int = int.from_bytes(
+        hashlib.blake2b(data, digest_size=8).digest(), "big", signed=True
+    )
+    return IniVersion(info.st_mtime_ns, info.st_size, digest)
+
+
+def _info_tip(parser: ConfigParser) -> str:
+    """
+    从已解析的 desktop.ini 中取出 InfoTip（键名不区分大小写）。
+    """
+    if not parser.has_section(_INFO_TIP_SECTION):
+        return ""
+    for option in parser.options(_INFO_TIP_SECTION):
+        if option.lower() == "infotip":
+            return parser.get(_INFO_TIP_SECTION, option, fallback="")
+    return ""
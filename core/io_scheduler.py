@@ -0,0 +1,318 @@
+"""
+I/O 调度：按卷限制 desktop.ini 读写的并发，按优先级分配名额并可限速，
+后台扫描与预取不会挤占界面操作，也不会压满文件服务器。
+配置了 ``ConcurrencyTuner`` 时，各卷上限随实测延迟自动调整。
+"""
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from core.constants import (
+    IO_INTERACTIVE_RESERVE,
+    IO_PRIORITY_INDEX,
+    IO_PRIORITY_NAMES,
+    IO_PRIORITY_PREFETCH,
+    IO_VOLUME_LIMIT,
+)
+from core.io_tuner import ConcurrencyTuner
+from core.probe import share_root
+
+# 只能使用非保留名额的优先级（后台类）。
+_BACKGROUND_PRIORITIES = (IO_PRIORITY_PREFETCH, IO_PRIORITY_INDEX)
+
+
+class _TokenBucket:
+    """
+    令牌桶限速：每秒补充 rate 个令牌，最多积攒 burst 个。
+    """
+
+    def __init__(self, rate: float) -> None:
+        self.rate: float = rate
+        self.burst: float = max(1.0, rate)
+        self._tokens: float = self.burst
+        self._updated: float = time.monotonic()
+
+    def take(self, now: float) -> float:
+        """
+        尝试取一个令牌。
+
+        Returns:
+            0 表示已取得；否则为需要等待的秒数。
+        """
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+        return (1.0 - self._tokens) / self.rate
+
+
+@dataclass
+class _VolumeState:
+    """
+    单个卷的名额占用、排队与限速状态。
+    """
+
+    limit: int
+    running: int = 0
+    background: int = 0
+    waiting: List[int] = field(
+        default_factory=lambda: [0] * len(IO_PRIORITY_NAMES)
+    )
+    buckets: Dict[int, _TokenBucket] = field(default_factory=dict)
+
+
+class IoScheduler:
+    """
+    按卷、按优先级发放 I/O 名额的准入闸门。
+
+    调用方在自己的线程中执行 I/O，只在开始前 ``acquire``、结束后 ``release``
+    （或使用 ``slot``）。规则：
+
+    - 每个卷同时进行的操作不超过其上限；
+    - 有更高优先级的操作在同一卷上排队时，低优先级操作不会取得名额；
+    - 预取与扫描等后台类最多占用 ``上限 - interactive_reserve`` 个名额，
+      界面操作总能在一次 I/O 的时间内拿到名额；为此任何卷的上限（含调节器
+      的建议）都不低于 ``interactive_reserve + 1``，后台类至少保有 1 个名额；
+    - 可为任意优先级设置每卷每秒操作数上限；
+    - 配置了调节器时，每次操作的耗时交给它，未用 ``set_volume_limit``
+      固定上限的卷按其建议调整上限。
+
+    Attributes:
+        volume_limit: 未单独配置、也没有学习结果的卷的并发上限。
+        interactive_reserve: 每卷为界面与保存操作保留的名额。
+        tuner: 可选的并发调节器。
+    """
+
+    def __init__(
+        self,
+        volume_limit: int = IO_VOLUME_LIMIT,
+        interactive_reserve: int = IO_INTERACTIVE_RESERVE,
+        tuner: Optional[ConcurrencyTuner] = None,
+    ) -> None:
+        self.interactive_reserve: int = max(0, interactive_reserve)
+        self.volume_limit: int = self._floor(volume_limit)
+        self.tuner: Optional[ConcurrencyTuner] = tuner
+        self._cond: threading.Condition = threading.Condition()
+        self._volumes: Dict[str, _VolumeState] = {}
+        self._volume_limits: Dict[str, int] = {}
+        self._rates: Dict[Tuple[Optional[str], int], float] = {}
+        self._acquired: List[int] = [0] * len(IO_PRIORITY_NAMES)
+        self._waited_ms: List[float] = [0.0] * len(IO_PRIORITY_NAMES)
+
+    def set_volume_limit(self, path: Union[Path, str], limit: int) -> None:
+        """
+        为路径所在的卷单独设置并发上限，该卷不再自动调节。
+
+        Args:
+            path: 卷内任意路径。
+            limit: 并发上限，不低于 ``interactive_reserve + 1``。
+        """
+        key: str = share_root(path)
+        with self._cond:
+            self._volume_limits[key] = self._floor(limit)
+            if key in self._volumes:
+                self._volumes[key].limit = self._volume_limits[key]
+            self._cond.notify_all()
+
+    def limit_for(self, path: Union[Path, str]) -> int:
+        """
+        查询路径所在卷当前的并发上限（含自动调节的结果）。
+
+        Args:
+            path: 卷内任意路径。
+        """
+        with self._cond:
+            return self._volume(share_root(path)).limit
+
+    def set_rate_limit(
+        self,
+        priority: int,
+        ops_per_second: Optional[float],
+        path: Optional[Union[Path, str]] = None,
+    ) -> None:
+        """
+        设置某一优先级的每卷限速。
+
+        Args:
+            priority: 优先级，例如 ``IO_PRIORITY_INDEX``。
+            ops_per_second: 每秒操作数上限；None 或非正数表示取消限速。
+            path: 只对该路径所在的卷生效；None 表示所有卷的默认值。
+        """
+        key: Optional[str] = share_root(path) if path is not None else None
+        with self._cond:
+            if ops_per_second is None or ops_per_second <= 0:
+                self._rates.pop((key, priority), None)
+            else:
+                self._rates[(key, priority)] = ops_per_second
+            # 已建立的令牌桶按新配置重建。
+            for volume_key, volume in self._volumes.items():
+                if key is None or key == volume_key:
+                    volume.buckets.pop(priority, None)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(
+        self, priority: int, path: Union[Path, str]
+    ) -> Iterator[None]:
+        """
+        在名额内执行一次 I/O 的上下文管理器。
+
+        Args:
+            priority: 优先级。
+            path: 操作涉及的路径，用于定位所属卷。
+        """
+        key: str = self.acquire(priority, path)
+        started: float = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(priority, key, time.monotonic() - started)
+
+    def acquire(self, priority: int, path: Union[Path, str]) -> str:
+        """
+        阻塞直到取得路径所在卷的一个名额。
+
+        Args:
+            priority: 优先级。
+            path: 操作涉及的路径。
+
+        Returns:
+            卷的键，归还名额时传给 ``release``。
+        """
+        key: str = share_root(path)
+        started: float = time.monotonic()
+        with self._cond:
+            volume: _VolumeState = self._volume(key)
+            volume.waiting[priority] += 1
+            try:
+                while True:
+                    if self._has_room(volume, priority):
+                        delay: float = self._take_token(key, volume, priority)
+                        if delay <= 0:
+                            break
+                        self._cond.wait(delay)
+                    else:
+                        self._cond.wait()
+            finally:
+                volume.waiting[priority] -= 1
+            volume.running += 1
+            if priority in _BACKGROUND_PRIORITIES:
+                volume.background += 1
+            self._acquired[priority] += 1
+            self._waited_ms[priority] += (time.monotonic() - started) * 1000
+        return key
+
+    def release(
+        self, priority: int, key: str, elapsed_s: Optional[float] = None
+    ) -> None:
+        """
+        归还名额并唤醒排队者。
+
+        Args:
+            priority: 取得名额时的优先级。
+            key: ``acquire`` 返回的卷键。
+            elapsed_s: 本次操作耗时（秒），提供时交给调节器。
+        """
+        with self._cond:
+            volume: _VolumeState = self._volumes[key]
+            if (
+                self.tuner is not None
+                and elapsed_s is not None
+                and key not in self._volume_limits
+            ):
+                new_limit: Optional[int] = self.tuner.observe(
+                    key,
+                    elapsed_s,
+                    volume.limit,
+                    volume.running >= volume.limit or any(volume.waiting),
+                    time.monotonic(),
+                )
+                if new_limit is not None:
+                    volume.limit = self._floor(new_limit)
+            volume.running -= 1
+            if priority in _BACKGROUND_PRIORITIES:
+                volume.background -= 1
+            self._cond.notify_all()
+
+    def summary(self) -> str:
+        """
+        生成各优先级的名额发放次数与平均排队时间。
+        """
+        with self._cond:
+            parts: List[str] = [
+                f"{name}={count}/{waited / count:.1f}ms"
+                for name, count, waited in zip(
+                    IO_PRIORITY_NAMES, self._acquired, self._waited_ms
+                )
+                if count
+            ]
+        return " ".join(parts) or "idle"
+
+    def _volume(self, key: str) -> _VolumeState:
+        """
+        取得卷状态，首次访问时创建（调用方需持有锁）。
+        """
+        volume: Optional[_VolumeState] = self._volumes.get(key)
+        if volume is None:
+            limit: Optional[int] = self._volume_limits.get(key)
+            if limit is None:
+                limit = (
+                    self._floor(
+                        self.tuner.initial_limit(key, self.volume_limit)
+                    )
+                    if self.tuner is not None
+                    else self.volume_limit
+                )
+            volume = _VolumeState(limit=limit)
+            self._volumes[key] = volume
+        return volume
+
+    def _has_room(self, volume: _VolumeState, priority: int) -> bool:
+        """
+        判断该优先级当前能否在卷上取得名额（调用方需持有锁）。
+        """
+        if volume.running >= volume.limit:
+            return False
+        if any(volume.waiting[:priority]):
+            return False
+        if priority in _BACKGROUND_PRIORITIES:
+            return (
+                volume.background < volume.limit - self.interactive_reserve
+            )
+        return True
+
+    def _floor(self, limit: int) -> int:
+        """
+        卷上限的下限：保留名额之外至少还有 1 个给后台类，否则调节器把上限
+        降到保留名额以内时，后台操作会占满全部名额。
+        """
+        return max(self.interactive_reserve + 1, limit)
+
+    def _take_token(
+        self, key: str, volume: _VolumeState, priority: int
+    ) -> float:
+        """
+        按限速配置取令牌（调用方需持有锁）。
+
+        Returns:
+            0 表示可以执行；否则为需要等待的秒数。
+        """
+        bucket: Optional[_TokenBucket] = volume.buckets.get(priority)
+        if bucket is None:
+            rate: Optional[float] = self._rates.get(
+                (key, priority), self._rates.get((None, priority))
+            )
+            if rate is None:
+                return 0.0
+            bucket = _TokenBucket(rate)
+            volume.buckets[priority] = bucket
+        return bucket.take(time.monotonic())
+
@@ -0,0 +1,216 @@
+"""
+并发自动调节：按卷测量 I/O 延迟与吞吐，以 AIMD 调整并发上限，
+并把学到的上限保存到配置目录，下次启动直接沿用。
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from core.constants import (
+    IO_TUNER_BASELINE_DRIFT,
+    IO_TUNER_DECREASE,
+    IO_TUNER_FAST_LATENCY_S,
+    IO_TUNER_LATENCY_FACTOR,
+    IO_TUNER_MAX_LIMIT,
+    IO_TUNER_MIN_LIMIT,
+    IO_TUNER_MIN_OPS,
+    IO_TUNER_NOISE,
+    IO_TUNER_WINDOW_OPS,
+    IO_TUNER_WINDOW_S,
+    IO_VOLUME_LIMIT,
+)
+from core.utils import log_message
+
+
+@dataclass
+class _VolumeWindow:
+    """
+    单个卷当前测量窗口的累计值与历史基线。
+
+    Attributes:
+        started: 窗口开始时间（monotonic 秒）。
+        ops: 窗口内完成的操作数。
+        total_s: 窗口内操作耗时之和。
+        saturated: 窗口内是否出现过名额用满或有人排队。
+        baseline_s: 观察到的最低平均延迟，缓慢上浮以适应环境变化。
+        throughput: 上一个窗口的吞吐（次/秒）。
+    """
+
+    started: float
+    ops: int = 0
+    total_s: float = 0.0
+    saturated: bool = False
+    baseline_s: Optional[float] = None
+    throughput: float = 0.0
+
+
+class ConcurrencyTuner:
+    """
+    按卷的 AIMD 并发调节器，由 ``IoScheduler`` 在每次 I/O 结束时调用。
+
+    每积累一个窗口（``IO_TUNER_WINDOW_OPS`` 次或 ``IO_TUNER_WINDOW_S`` 秒）
+    计算平均延迟与吞吐：
+
+    - 平均延迟超过基线的 ``IO_TUNER_LATENCY_FACTOR`` 倍，且吞吐没有明显
+      提升（不超过 ``IO_TUNER_NOISE``），说明多出的并发只是在卷上排队，
+      上限乘以 ``IO_TUNER_DECREASE``；
+    - 否则若窗口内名额被用满，说明还有需求，上限加 1；
+    - 其余情况保持不变。
+
+    平均延迟低于 ``IO_TUNER_FAST_LATENCY_S`` 的卷（本地 SSD、缓存命中）
+    耗时主要在解释器而非设备，延迟波动不代表拥塞，多线程收益也有限，
+    因此既不收缩，也不超过默认上限 ``IO_VOLUME_LIMIT`` 增长；高延迟的
+    网络共享延迟基本不随并发变化，上限会逐步升到 ``IO_TUNER_MAX_LIMIT``，
+    服务器开始排队时再按比例回落。
+    本类不自带锁，调用方（调度器）需在自己的锁内调用。
+
+    Attributes:
+        limits: 卷键到已学到的并发上限的映射。
+        path: 保存学习结果的文件；None 表示不持久化。
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.limits: Dict[str, int] = {}
+        self.path: Optional[Path] = path
+        self._windows: Dict[str, _VolumeWindow] = {}
+
+    @classmethod
+    def load(cls, path: Path) -> "ConcurrencyTuner":
+        """
+        从文件恢复学到的上限；文件不存在或损坏时从默认值开始。
+
+        Args:
+            path: 学习结果文件。
+
+        Returns:
+            调节器实例，之后 ``save`` 写回同一文件。
+        """
+        tuner: ConcurrencyTuner = cls(path)
+        try:
+            data: object = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return tuner
+        except (OSError, ValueError) as exc:
+            log_message("WARN", f"io tuning file ignored: {exc}")
+            return tuner
+        if isinstance(data, dict):
+            for key, limit in data.items():
+                if isinstance(key, str) and isinstance(limit, int):
+                    tuner.limits[key] = _clamp(limit)
+        return tuner
+
+    def save(self) -> None:
+        """
+        把学到的上限写回文件（先写临时文件再替换），失败时只记录日志。
+        """
+        if self.path is None or not self.limits:
+            return
+        temp_path: Path = self.path.with_suffix(".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_text(
+                json.dumps(self.limits, ensure_ascii=False, sort_keys=True),
+                encoding="utf-8",
+            )
+            os.replace(temp_path, self.path)
+        except OSError as exc:
+            log_message("WARN", f"io tuning not saved: {exc}")
+
+    def initial_limit(self, key: str, default: int) -> int:
+        """
+        查询卷的起始并发上限。
+
+        Args:
+            key: 卷键（``share_root`` 的结果）。
+            default: 尚未学习过该卷时的上限。
+        """
+        return self.limits.get(key, default)
+
+    def observe(
+        self,
+        key: str,
+        elapsed_s: float,
+        limit: int,
+        saturated: bool,
+        now: float,
+    ) -> Optional[int]:
+        """
+        记录一次 I/O 的耗时，窗口结束时给出新的并发上限。
+
+        Args:
+            key: 卷键。
+            elapsed_s: 本次操作耗时（秒）。
+            limit: 卷当前的并发上限。
+            saturated: 本次操作进行时名额是否已用满或有人排队。
+            now: 当前时间（monotonic 秒）。
+
+        Returns:
+            需要调整时为新的上限，否则为 None。
+        """
+        window: Optional[_VolumeWindow] = self._windows.get(key)
+        if window is None:
+            window = _VolumeWindow(started=now - elapsed_s)
+            self._windows[key] = window
+        window.ops += 1
+        window.total_s += elapsed_s
+        window.saturated = window.saturated or saturated
+        duration: float = now - window.started
+        if window.ops < IO_TUNER_WINDOW_OPS and duration < IO_TUNER_WINDOW_S:
+            return None
+        if window.ops < IO_TUNER_MIN_OPS:
+            # 操作太稀疏（如只有界面偶尔读取），不足以判断，重新计时。
+            self._reset(window, now)
+            return None
+        latency: float = window.total_s / window.ops
+        throughput: float = window.ops / max(duration, 1e-6)
+        baseline: float = latency
+        if window.baseline_s is not None:
+            drifted: float = window.baseline_s * (1 + IO_TUNER_BASELINE_DRIFT)
+            baseline = min(latency, drifted)
+        fast: bool = latency < IO_TUNER_FAST_LATENCY_S
+        congested: bool = (
+            not fast
+            and window.baseline_s is not None
+            and latency > window.baseline_s * IO_TUNER_LATENCY_FACTOR
+            and throughput < window.throughput * (1 + IO_TUNER_NOISE)
+        )
+        new_limit: int = limit
+        if congested:
+            new_limit = _clamp(int(limit * IO_TUNER_DECREASE))
+        elif window.saturated and not (fast and limit >= IO_VOLUME_LIMIT):
+            new_limit = _clamp(limit + 1)
+        window.baseline_s = baseline
+        window.throughput = throughput
+        self._reset(window, now)
+        self.limits[key] = new_limit
+        if new_limit == limit:
+            return None
+        if new_limit < limit:
+            log_message(
+                "INFO",
+                f"io tuner {key}: limit {limit}->{new_limit} "
+                f"latency={latency * 1000:.2f}ms "
+                f"throughput={throughput:.0f}/s",
+            )
+        return new_limit
+
+    @staticmethod
+    def _reset(window: _VolumeWindow, now: float) -> None:
+        """
+        开始新的测量窗口，保留基线与上一窗口的测量值。
+        """
+        window.started = now
+        window.ops = 0
+        window.total_s = 0.0
+        window.saturated = False
+
+
+def _clamp(limit: int) -> int:
+    """
+    把上限限制在允许范围内。
+    """
+    return max(IO_TUNER_MIN_LIMIT, min(IO_TUNER_MAX_LIMIT, limit))
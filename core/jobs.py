@@ -0,0 +1,896 @@
+"""
+可续跑的后台任务：长时间的批量写入与导出把计划和检查点持久化到配置目录，
+崩溃或关闭窗口后可从界面或命令行接着上次完成的位置继续。
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import Executor
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime
+from itertools import chain
+from pathlib import Path
+from typing import (
+    IO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from core.async_scan import AsyncScanner, iter_sync
+from core.constants import (
+    JOB_CHECKPOINT_INTERVAL_S,
+    JOB_FAILURES_KEPT,
+    JOB_KIND_APPLY,
+    JOB_KIND_EXPORT,
+    JOB_KIND_RESTORE,
+    JOB_KIND_SYNC,
+    JOB_STATUS_CANCELLED,
+    JOB_STATUS_DONE,
+    JOB_STATUS_ELSEWHERE,
+    JOB_STATUS_FAILED,
+    JOB_STATUS_INTERRUPTED,
+    JOB_STATUS_PAUSED,
+    JOB_STATUS_RUNNING,
+    MAPPING_SEPARATOR,
+)
+from core.file_lock import try_lock
+from core.ini_service import DesktopIniService
+from core.mirror import MirrorStats, iter_mirror_changes
+from core.snapshot import (
+    SnapshotHeader,
+    diff_entries,
+    iter_live,
+    iter_snapshot,
+    read_snapshot_header,
+)
+from core.utils import log_message
+
+# 计划中的一项写入：(目录完整路径, 新备注, 预览或扫描时读到的备注)。
+# 第三项用于写入前核对，磁盘上的备注已被他人改成其他值时不覆盖；
+# None 表示不核对。
+PlanItem = Tuple[str, str, Optional[str]]
+
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+
+class JobError(Exception):
+    """
+    任务不存在、记录损坏或参数无效。
+    """
+
+
+@dataclass
+class Job:
+    """
+    一个可续跑任务的持久化状态。
+
+    写入类任务（apply、restore、sync）的计划逐行保存在 ``.plan`` 文件中，
+    ``done`` 即已完成的计划前缀长度；恢复时从该位置继续，之前的写入不会重做。
+    restore、sync 边扫描边追加计划，扫描未完成时恢复会先写完已有计划，
+    再重新扫描（已写入的目录不再有差异，因此不会重复写入）。
+    导出任务按根目录的直接子目录（按名称排序）分段，``checkpoint`` 记录
+    最后完成的子目录名与输出文件的字节位置，恢复时截断到该位置后从排在
+    该名称之后的子目录继续，期间增删子目录不会导致重复或遗漏。
+    执行期间持有 ``<id>.lock`` 的文件锁，其他进程据此识别任务仍在运行。
+
+    Attributes:
+        job_id: 任务 ID，也是状态文件名。
+        kind: 任务类型，见 ``JOB_KIND_*``。
+        title: 展示用的标题。
+        params: 任务参数（根目录、输出文件等），只含 JSON 可序列化的值。
+        status: 任务状态，见 ``JOB_STATUS_*``。
+        done: 已处理的计划项数或导出的目录数。
+        planned: 已写入计划的项数；导出任务不使用。
+        scanned: 计划是否已完整生成。
+        checkpoint: 类型相关的检查点，例如导出的 ``last``、``bytes``。
+        failed_count: 写入失败的项数。
+        failures: 最早的若干项失败 (路径, 错误信息)。
+        error: 任务异常终止时的错误信息。
+        created: 创建时间（时间戳）。
+        updated: 最近一次保存检查点的时间（时间戳）。
+    """
+
+    job_id: str
+    kind: str
+    title: str
+    params: Dict[str, object] = field(default_factory=dict)
+    status: str = JOB_STATUS_RUNNING
+    done: int = 0
+    planned: int = 0
+    scanned: bool = False
+    checkpoint: Dict[str, Union[int, str]] = field(default_factory=dict)
+    failed_count: int = 0
+    failures: List[List[str]] = field(default_factory=list)
+    error: str = ""
+    created: float = field(default_factory=time.time)
+    updated: float = field(default_factory=time.time)
+
+    @property
+    def finished(self) -> bool:
+        """
+        任务是否已全部完成。
+        """
+        return self.status == JOB_STATUS_DONE
+
+    @property
+    def resumable(self) -> bool:
+        """
+        任务是否可以（重新）开始执行。
+        """
+        return self.status in (
+            JOB_STATUS_INTERRUPTED,
+            JOB_STATUS_CANCELLED,
+            JOB_STATUS_FAILED,
+        )
+
+    def record_failure(self, path: str, error: str) -> None:
+        """
+        记录一项写入失败，只保留最早的 ``JOB_FAILURES_KEPT`` 条明细。
+
+        Args:
+            path: 目录路径。
+            error: 错误信息。
+        """
+        self.failed_count += 1
+        if len(self.failures) < JOB_FAILURES_KEPT:
+            self.failures.append([path, error])
+
+
+class JobControl:
+    """
+    运行中任务的暂停、继续与取消开关，可在任意线程调用。
+
+    Attributes:
+        cancel_event: 取消标记；可传入已有的事件与其他取消来源联动。
+    """
+
+    def __init__(self, cancel_event: Optional[threading.Event] = None) -> None:
+        self.cancel_event: threading.Event = cancel_event or threading.Event()
+        self._running: threading.Event = threading.Event()
+        self._running.set()
+
+    @property
+    def paused(self) -> bool:
+        """
+        是否处于暂停状态。
+        """
+        return not self._running.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        是否已请求取消。
+        """
+        return self.cancel_event.is_set()
+
+    def pause(self) -> None:
+        """
+        请求暂停：在途的读写完成后不再开始新的操作。
+        """
+        self._running.clear()
+
+    def resume(self) -> None:
+        """
+        从暂停中继续。
+        """
+        self._running.set()
+
+    def cancel(self) -> None:
+        """
+        请求取消；暂停中的任务会立即醒来并退出。
+        """
+        self.cancel_event.set()
+        self._running.set()
+
+    def wait(self) -> bool:
+        """
+        暂停时阻塞直到继续或取消。
+
+        Returns:
+            False 表示已取消，调用方应停止。
+        """
+        while not self._running.wait(0.2):
+            if self.cancel_event.is_set():
+                return False
+        return not self.cancel_event.is_set()
+
+
+class JobStore:
+    """
+    任务状态与计划文件的存取，每个任务一个 ``<id>.json`` 与 ``<id>.plan``，
+    执行期间另有 ``<id>.lock``。
+
+    Attributes:
+        directory: 保存任务文件的目录。
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory: Path = directory
+
+    def new_id(self) -> str:
+        """
+        生成按时间排序的任务 ID。
+        """
+        stamp: str = datetime.now().strftime("%Y%m%d-%H%M%S")
+        return f"{stamp}-{os.urandom(2).hex()}"
+
+    def state_path(self, job_id: str) -> Path:
+        """
+        任务状态文件路径。
+        """
+        return self.directory / f"{job_id}.json"
+
+    def plan_path(self, job_id: str) -> Path:
+        """
+        任务计划文件路径。
+        """
+        return self.directory / f"{job_id}.plan"
+
+    def lock_path(self, job_id: str) -> Path:
+        """
+        任务锁文件路径。
+        """
+        return self.directory / f"{job_id}.lock"
+
+    def lock(self, job_id: str) -> Optional[IO[bytes]]:
+        """
+        取得任务的跨进程锁，关闭返回的文件即释放。
+
+        Args:
+            job_id: 任务 ID。
+
+        Returns:
+            持有锁的文件；锁被其他进程持有时为 None。
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        handle: IO[bytes] = self.lock_path(job_id).open("a+b")
+        if try_lock(handle):
+            return handle
+        handle.close()
+        return None
+
+    def running_elsewhere(self, job_id: str) -> bool:
+        """
+        任务锁是否被其他进程（或本进程的其他句柄）持有。
+
+        Args:
+            job_id: 任务 ID。
+        """
+        if not self.lock_path(job_id).exists():
+            return False
+        try:
+            handle: Optional[IO[bytes]] = self.lock(job_id)
+        except OSError:
+            return True
+        if handle is None:
+            return True
+        handle.close()
+        return False
+
+    def save(self, job: Job) -> None:
+        """
+        写入任务状态（先写临时文件再替换，中断不会留下半个文件）。
+
+        Args:
+            job: 任务。
+        """
+        job.updated = time.time()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target: Path = self.state_path(job.job_id)
+        temp: Path = target.with_suffix(".tmp")
+        temp.write_text(
+            json.dumps(asdict(job), ensure_ascii=False), encoding="utf-8"
+        )
+        os.replace(temp, target)
+
+    def load(self, job_id: str) -> Job:
+        """
+        读取任务状态；上次运行中或暂停中的任务视为已中断，任务锁仍被
+        其他进程持有时标记为 ``JOB_STATUS_ELSEWHERE``。
+
+        Args:
+            job_id: 任务 ID。
+
+        Returns:
+            任务。
+
+        Raises:
+            JobError: 任务不存在或记录损坏时抛出。
+        """
+        try:
+            data: object = json.loads(
+                self.state_path(job_id).read_text(encoding="utf-8")
+            )
+        except FileNotFoundError as exc:
+            raise JobError(f"任务不存在：{job_id}") from exc
+        except (OSError, ValueError) as exc:
+            raise JobError(f"任务记录损坏：{job_id}（{exc}）") from exc
+        if not isinstance(data, dict):
+            raise JobError(f"任务记录损坏：{job_id}")
+        names = {item.name for item in fields(Job)}
+        job: Job = Job(**{k: v for k, v in data.items() if k in names})
+        if job.status in (JOB_STATUS_RUNNING, JOB_STATUS_PAUSED):
+            job.status = (
+                JOB_STATUS_ELSEWHERE
+                if self.running_elsewhere(job_id)
+                else JOB_STATUS_INTERRUPTED
+            )
+        return job
+
+    def load_all(self) -> List[Job]:
+        """
+        读取全部任务，按创建时间排序；损坏的记录会跳过并记录日志。
+        """
+        jobs: List[Job] = []
+        if not self.directory.is_dir():
+            return jobs
+        for path in sorted(self.directory.glob("*.json")):
+            try:
+                jobs.append(self.load(path.stem))
+            except JobError as exc:
+                log_message("WARN", str(exc))
+        jobs.sort(key=lambda job: job.created)
+        return jobs
+
+    def delete(self, job_id: str) -> None:
+        """
+        删除任务的状态、计划与锁文件；锁文件仍被打开时保留（下次删除或
+        执行结束时清理）。
+
+        Args:
+            job_id: 任务 ID。
+        """
+        for path in (
+            self.state_path(job_id),
+            self.plan_path(job_id),
+            self.lock_path(job_id),
+        ):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            except PermissionError:
+                if path != self.lock_path(job_id):
+                    raise
+
+    def remove_lock(self, job_id: str) -> None:
+        """
+        释放任务锁后删除锁文件；其他进程刚好取得锁时保留。
+
+        Args:
+            job_id: 任务 ID。
+        """
+        try:
+            self.lock_path(job_id).unlink()
+        except (FileNotFoundError, PermissionError):
+            return
+
+    def iter_plan(
+        self, job_id: str, start: int, stop: int
+    ) -> Iterator[PlanItem]:
+        """
+        读取计划中 [start, stop) 范围的项；末尾写了一半的行会被忽略。
+
+        Args:
+            job_id: 任务 ID。
+            start: 起始项号。
+            stop: 结束项号（不含）。
+        """
+        if start >= stop:
+            return
+        try:
+            handle: IO[str] = self.plan_path(job_id).open(encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with handle:
+            for index, line in enumerate(handle):
+                if index >= stop:
+                    return
+                if index < start:
+                    continue
+                try:
+                    path, remark, *expected = json.loads(line)
+                except ValueError:
+                    return
+                # 旧版本的计划没有第三项，写入时不核对。
+                yield path, remark, expected[0] if expected else None
+
+
+class JobManager:
+    """
+    创建、执行并跟踪可续跑任务。
+
+    ``run`` 在调用方线程中同步执行任务（界面放在 BackgroundTask 中，命令行
+    直接调用），执行期间登记其 ``JobControl``，供任务面板暂停、继续或取消。
+    检查点每 ``JOB_CHECKPOINT_INTERVAL_S`` 秒以及暂停、结束时保存；
+    任务完成后自动删除其文件。
+
+    Attributes:
+        store: 任务文件存取。
+    """
+
+    def __init__(self, store: JobStore) -> None:
+        self.store: JobStore = store
+        self._lock: threading.Lock = threading.Lock()
+        self._stopped: threading.Condition = threading.Condition(self._lock)
+        self._live: Dict[str, Tuple[Job, JobControl]] = {}
+        self._discarded: Set[str] = set()
+
+    def create(
+        self,
+        kind: str,
+        title: str,
+        params: Dict[str, object],
+        plan: Optional[Iterable[PlanItem]] = None,
+    ) -> Job:
+        """
+        创建任务并保存初始状态。
+
+        Args:
+            kind: 任务类型。
+            title: 展示用的标题。
+            params: 任务参数；都须包含 ``root``（任务写入或扫描的根目录）。
+            plan: apply 任务的完整写入计划。
+
+        Returns:
+            新任务（尚未执行）。
+        """
+        job: Job = Job(self.store.new_id(), kind, title, dict(params))
+        self.store.directory.mkdir(parents=True, exist_ok=True)
+        if plan is not None:
+            with self.store.plan_path(job.job_id).open(
+                "w", encoding="utf-8"
+            ) as handle:
+                for item in plan:
+                    handle.write(json.dumps(item, ensure_ascii=False) + "\n")
+                    job.planned += 1
+            job.scanned = True
+        self.store.save(job)
+        return job
+
+    def jobs(self) -> List[Job]:
+        """
+        列出全部任务；本进程正在执行的任务返回内存中的最新状态。
+        """
+        with self._lock:
+            live: Dict[str, Job] = {
+                job_id: job for job_id, (job, _) in self._live.items()
+            }
+        result: List[Job] = [
+            live.pop(job.job_id, job) for job in self.store.load_all()
+        ]
+        result.extend(live.values())
+        return result
+
+    def control(self, job_id: str) -> Optional[JobControl]:
+        """
+        取得本进程中正在执行的任务的控制开关。
+
+        Args:
+            job_id: 任务 ID。
+        """
+        with self._lock:
+            entry = self._live.get(job_id)
+        return entry[1] if entry else None
+
+    def delete(self, job_id: str) -> None:
+        """
+        删除任务；正在执行的任务先取消，停止后再删除其文件。
+
+        Args:
+            job_id: 任务 ID。
+
+        Raises:
+            JobError: 任务正在其他进程中执行时抛出。
+        """
+        with self._lock:
+            entry = self._live.get(job_id)
+            if entry is not None:
+                self._discarded.add(job_id)
+                entry[1].cancel()
+                return
+        if self.store.running_elsewhere(job_id):
+            raise JobError(f"任务正在其他进程中执行：{job_id}")
+        self.store.delete(job_id)
+
+    def cancel_all(self, timeout: float) -> bool:
+        """
+        取消本进程中正在执行的全部任务，等待它们保存检查点后停止。
+
+        Args:
+            timeout: 最长等待秒数。
+
+        Returns:
+            True 表示全部任务已停止。
+        """
+        with self._lock:
+            for _, control in self._live.values():
+                control.cancel()
+            return self._stopped.wait_for(lambda: not self._live, timeout)
+
+    def run(
+        self,
+        job: Job,
+        service: DesktopIniService,
+        executor: Executor,
+        control: Optional[JobControl] = None,
+    ) -> Job:
+        """
+        执行（或从检查点继续执行）任务，返回结束时的状态。
+
+        完成时删除任务文件；暂停后取消、取消或出错时保存检查点以便续跑。
+        KeyboardInterrupt 等非 Exception 中断同样保存检查点后继续抛出。
+        执行期间持有任务锁，另一个进程不能同时执行同一任务。
+
+        Args:
+            job: 任务。
+            service: 读写使用的服务（调用方选择优先级）。
+            executor: 执行读写的线程池。
+            control: 控制开关；None 时新建。
+
+        Returns:
+            传入的任务对象。
+
+        Raises:
+            JobError: 任务正在本进程或其他进程中执行，或类型未知时抛出。
+        """
+        control = control or JobControl()
+        with self._lock:
+            if job.job_id in self._live:
+                raise JobError(f"任务正在执行：{job.job_id}")
+            lock: Optional[IO[bytes]] = self.store.lock(job.job_id)
+            if lock is None:
+                raise JobError(f"任务正在其他进程中执行：{job.job_id}")
+            self._live[job.job_id] = (job, control)
+        runner = _RUNNERS.get(job.kind)
+        job.status = JOB_STATUS_RUNNING
+        job.error = ""
+        checkpoint = _Checkpoint(self.store, job, control)
+        try:
+            if runner is None:
+                raise JobError(f"未知的任务类型：{job.kind}")
+            self.store.save(job)
+            runner(job, service, executor, control, checkpoint)
+            if control.cancelled:
+                job.status = JOB_STATUS_CANCELLED
+            else:
+                job.status = JOB_STATUS_DONE
+        except Exception as exc:
+            job.status = JOB_STATUS_FAILED
+            job.error = str(exc)
+            log_message("ERROR", f"job {job.job_id} failed: {exc}")
+        except BaseException:
+            job.status = JOB_STATUS_INTERRUPTED
+            raise
+        finally:
+            checkpoint.close()
+            if not job.finished:
+                self.store.save(job)
+            with self._lock:
+                self._live.pop(job.job_id, None)
+                discarded: bool = job.job_id in self._discarded
+                self._discarded.discard(job.job_id)
+                self._stopped.notify_all()
+            # 持有锁时删除，其他进程不会在删除前把它当作中断任务续跑。
+            if job.finished or discarded:
+                self.store.delete(job.job_id)
+            lock.close()
+            if job.finished or discarded:
+                self.store.remove_lock(job.job_id)
+            log_message(
+                "INFO",
+                f"job {job.job_id} ({job.kind}) {job.status}: "
+                f"done={job.done} failed={job.failed_count}",
+            )
+        return job
+
+
+class _Checkpoint:
+    """
+    按时间间隔保存检查点；暂停时先保存再等待，便于暂停期间进程退出。
+    计划文件的追加句柄与导出任务的输出文件也由它刷新：保存状态前先刷新
+    文件，保证已记录的位置一定落在磁盘上的内容之内。
+
+    Attributes:
+        output: 导出任务的输出文件。
+    """
+
+    def __init__(self, store: JobStore, job: Job, control: JobControl) -> None:
+        self.store: JobStore = store
+        self.job: Job = job
+        self.control: JobControl = control
+        self.output: Optional[IO[bytes]] = None
+        self._saved_at: float = time.monotonic()
+        self._plan: Optional[IO[str]] = None
+
+    def append_plan(self, item: PlanItem) -> None:
+        """
+        向计划末尾追加一项。
+        """
+        if self._plan is None:
+            self._plan = self.store.plan_path(self.job.job_id).open(
+                "a", encoding="utf-8"
+            )
+        self._plan.write(json.dumps(item, ensure_ascii=False) + "\n")
+        self.job.planned += 1
+
+    def tick(self, wait: bool = True) -> bool:
+        """
+        处理完一项后调用：到期时保存检查点，暂停时阻塞。
+
+        Args:
+            wait: 暂停时是否阻塞；False 时只保存检查点。
+
+        Returns:
+            False 表示已取消，调用方应停止。
+        """
+        if time.monotonic() - self._saved_at >= JOB_CHECKPOINT_INTERVAL_S:
+            self.save()
+        if wait and self.control.paused:
+            self.job.status = JOB_STATUS_PAUSED
+            self.save()
+            resumed: bool = self.control.wait()
+            self.job.status = JOB_STATUS_RUNNING
+            return resumed
+        return not self.control.cancelled
+
+    def save(self) -> None:
+        """
+        刷新计划与输出文件后保存任务状态。
+        """
+        if self._plan is not None:
+            self._plan.flush()
+        if self.output is not None and not self.output.closed:
+            self.output.flush()
+        self.store.save(self.job)
+        self._saved_at = time.monotonic()
+
+    def close(self) -> None:
+        """
+        关闭计划文件句柄。
+        """
+        if self._plan is not None:
+            self._plan.close()
+            self._plan = None
+
+
+def _write_plan(
+    job: Job,
+    service: DesktopIniService,
+    executor: Executor,
+    control: JobControl,
+    checkpoint: _Checkpoint,
+    items: Iterable[PlanItem],
+) -> None:
+    """
+    按计划顺序并行写入，结果按输入顺序取回，``done`` 始终是已完成的前缀长度。
+
+    暂停或取消时不再提交新的写入，但会等在途写入完成并计入进度，
+    因此检查点精确，恢复时不会重写已完成的目录。计划项带有读取时的备注，
+    磁盘上已被他人改成其他值的目录记为失败，不覆盖。
+    """
+    root: Path = Path(str(job.params["root"]))
+    scanner: AsyncScanner = AsyncScanner(service, executor)
+    pending: Iterator[PlanItem] = iter(items)
+    while True:
+        for item, future in scanner.map_ordered(
+            root,
+            lambda item: service.write_info_tip(
+                Path(item[0]), item[1], item[2]
+            ),
+            pending,
+            hold=lambda: control.paused or control.cancelled,
+        ):
+            try:
+                future.result()
+            except Exception as exc:
+                job.record_failure(item[0], str(exc))
+            job.done += 1
+            checkpoint.tick(wait=False)
+        if not control.paused and not control.cancelled:
+            return
+        if not checkpoint.tick():
+            return
+
+
+def _run_apply(
+    job: Job,
+    service: DesktopIniService,
+    executor: Executor,
+    control: JobControl,
+    checkpoint: _Checkpoint,
+) -> None:
+    """
+    执行预先确定的写入计划（界面的规则与镜像写入）。
+    """
+    _write_plan(
+        job,
+        service,
+        executor,
+        control,
+        checkpoint,
+        _pending_plan(checkpoint.store, job),
+    )
+
+
+def _pending_plan(store: JobStore, job: Job) -> Iterator[PlanItem]:
+    """
+    读取任务尚未执行的计划项。
+    """
+    return store.iter_plan(job.job_id, job.done, job.planned)
+
+
+def _run_scanned_plan(
+    job: Job,
+    service: DesktopIniService,
+    executor: Executor,
+    control: JobControl,
+    checkpoint: _Checkpoint,
+    scan: Iterator[PlanItem],
+) -> None:
+    """
+    先写完已有计划，再把扫描新发现的变更追加到计划并写入。
+    """
+
+    def planned() -> Iterator[PlanItem]:
+        for item in scan:
+            checkpoint.append_plan(item)
+            yield item
+        if not control.cancelled:
+            job.scanned = True
+
+    pending: Iterator[PlanItem] = _pending_plan(checkpoint.store, job)
+    if job.scanned:
+        items: Iterable[PlanItem] = pending
+    else:
+        items = chain(pending, planned())
+    _write_plan(job, service, executor, control, checkpoint, items)
+
+
+def _run_restore(
+    job: Job,
+    service: DesktopIniService,
+    executor: Executor,
+    control: JobControl,
+    checkpoint: _Checkpoint,
+) -> None:
+    """
+    把目录树恢复为快照状态：按快照的扫描深度比较实时树与快照，
+    写入有差异的目录。
+    """
+    root: Path = Path(str(job.params["root"]))
+    source: Path = Path(str(job.params["snapshot"]))
+    header: SnapshotHeader = read_snapshot_header(source)
+    scan: Iterator[PlanItem] = (
+        (str(root.joinpath(*diff.path.split("/"))), diff.new, diff.old)
+        for diff in diff_entries(
+            iter_live(service, root, executor, header.max_depth),
+            iter_snapshot(source),
+        )
+    )
+    _run_scanned_plan(job, service, executor, control, checkpoint, scan)
+
+
+def _run_sync(
+    job: Job,
+    service: DesktopIniService,
+    executor: Executor,
+    control: JobControl,
+    checkpoint: _Checkpoint,
+) -> None:
+    """
+    把源树备注镜像到目标树。
+    """
+    depth: object = job.params.get("depth")
+    scan: Iterator[PlanItem] = (
+        (str(change.target), change.new_remark, change.old_remark)
+        for change in iter_mirror_changes(
+            service,
+            Path(str(job.params["source"])),
+            Path(str(job.params["root"])),
+            executor,
+            MirrorStats(),
+            keep_target=bool(job.params.get("keep_target")),
+            max_depth=depth if isinstance(depth, int) else None,
+            cancel_event=control.cancel_event,
+        )
+    )
+    _run_scanned_plan(job, service, executor, control, checkpoint, scan)
+
+
+def _run_export(
+    job: Job,
+    service: DesktopIniService,
+    executor: Executor,
+    control: JobControl,
+    checkpoint: _Checkpoint,
+) -> None:
+    """
+    按直接子目录分段导出映射文本，每段完成后推进检查点。
+    """
+    root: Path = Path(str(job.params["root"]))
+    output: Path = Path(str(job.params["output"]))
+    depth: object = job.params.get("depth")
+    max_depth: Optional[int] = depth if isinstance(depth, int) else None
+    remarked_only: bool = bool(job.params.get("remarked_only"))
+    prefix_len: int = len(str(root).rstrip("\\/")) + 1
+    last: str = str(job.checkpoint.get("last", ""))
+    offset: int = int(job.checkpoint.get("bytes", 0))
+    if offset and last and output.exists():
+        handle: IO[bytes] = output.open("r+b")
+        handle.truncate(offset)
+        handle.seek(offset)
+        job.done = int(job.checkpoint.get("rows", 0))
+    else:
+        handle = output.open("wb")
+        handle.write(_UTF8_BOM)
+        job.done = 0
+        last = ""
+    checkpoint.output = handle
+    scanner: AsyncScanner = AsyncScanner(service, executor)
+    with handle:
+        children: List[Path] = sorted(
+            service.list_subfolders(root), key=_name_key
+        )
+        # 按名称而不是序号续跑：中断期间增删的子目录不会造成重复或遗漏。
+        if last:
+            children = [
+                child
+                for child in children
+                if _name_key(child) > _name_key(Path(last))
+            ]
+        for child in children:
+            rows: Iterator[Tuple[Path, str]] = iter([])
+            if max_depth is None or max_depth > 1:
+                rows = iter_sync(
+                    scanner.iter_remarks(
+                        child, None if max_depth is None else max_depth - 1
+                    ),
+                    control.cancel_event,
+                )
+            for folder, remark in chain(
+                [(child, service.read_info_tip(child))], rows
+            ):
+                if remark or not remarked_only:
+                    line: str = (
+                        f"{str(folder)[prefix_len:]}{MAPPING_SEPARATOR}"
+                        f"{remark}\n"
+                    )
+                    handle.write(line.encode("utf-8"))
+                    job.done += 1
+                if not checkpoint.tick():
+                    return
+            # 取消时遍历会静默提前结束，此段可能不完整，不能推进检查点。
+            if control.cancelled:
+                return
+            # 只在段边界推进检查点，段内中断时恢复会重做整段。
+            job.checkpoint = {
+                "last": child.name,
+                "bytes": handle.tell(),
+                "rows": job.done,
+            }
+        job.scanned = True
+
+
+def _name_key(folder: Path) -> Tuple[str, str]:
+    """
+    导出分段的排序键：先不区分大小写、再区分，与 Windows 的目录顺序一致。
+    """
+    return folder.name.lower(), folder.name
+
+
+_RUNNERS = {
+    JOB_KIND_APPLY: _run_apply,
+    JOB_KIND_EXPORT: _run_export,
+    JOB_KIND_RESTORE: _run_restore,
+    JOB_KIND_SYNC: _run_sync,
+}
@@ -0,0 +1,104 @@
+"""
+“文件名->备注”映射文本的格式化与流式解析，不依赖 Tk，可在界面外复用。
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Sequence, Tuple
+
+from core.constants import MAPPING_SEPARATOR, MAPPING_SUMMARY_LIMIT
+
+
+class MappingParseError(ValueError):
+    """
+    映射文本格式错误。
+
+    Attributes:
+        line_no: 出错的行号（从 1 开始）。
+        line: 出错行的原始文本。
+        reason: 错误原因。
+    """
+
+    def __init__(self, line_no: int, line: str, reason: str) -> None:
+        super().__init__(f"第 {line_no} 行{reason}：{line}")
+        self.line_no: int = line_no
+        self.line: str = line
+        self.reason: str = reason
+
+
+def format_mapping_lines(
+    mappings: Iterable[Tuple[str, str, str]]
+) -> Iterator[str]:
+    """
+    逐行生成映射文本，避免一次性拼接超大字符串。
+
+    Args:
+        mappings: 三元组 (名称, 备注, 路径) 的可迭代对象。
+
+    Yields:
+        不含换行符的 ``名称->备注`` 文本行。
+    """
+    for name, remark, _ in mappings:
+        yield f"{name}{MAPPING_SEPARATOR}{remark}"
+
+
+def parse_mapping_stream(lines: Iterable[str]) -> Dict[str, str]:
+    """
+    流式解析映射文本行并校验格式，遇到首个错误立即停止。
+
+    Args:
+        lines: 文本行的可迭代对象，例如文件对象或 ``str.splitlines()``。
+
+    Returns:
+        名称到备注的映射字典；空行会被忽略。
+
+    Raises:
+        MappingParseError: 当某行缺少分隔符或文件名为空时抛出。
+    """
+    mapping_dict: Dict[str, str] = {}
+    for line_no, line in enumerate(lines, start=1):
+        line = line.rstrip("\r\n")
+        stripped: str = line.strip()
+        if not stripped:
+            continue
+        if MAPPING_SEPARATOR not in stripped:
+            raise MappingParseError(line_no, line, f"缺少 '{MAPPING_SEPARATOR}'")
+        name_part, remark_part = stripped.split(MAPPING_SEPARATOR, 1)
+        if not name_part.strip():
+            raise MappingParseError(line_no, line, "文件名为空")
+        mapping_dict[name_part.strip()] = remark_part
+    return mapping_dict
+
+
+def write_mapping_file(lines: Iterable[str], target: Path) -> None:
+    """
+    将映射文本逐行写入文件，供外部编辑器编辑。
+
+    使用带 BOM 的 utf-8，保证记事本等编辑器正确识别中文。
+
+    Args:
+        lines: 不含换行符的映射文本行。
+        target: 输出文件路径。
+    """
+    with target.open("w", encoding="utf-8-sig", newline="\n") as handle:
+        for line in lines:
+            handle.write(line)
+            handle.write("\n")
+
+
+def summarize_names(
+    names: Sequence[str], limit: int = MAPPING_SUMMARY_LIMIT
+) -> str:
+    """
+    拼接名称列表用于结果提示，超出上限时只展示前若干项。
+
+    Args:
+        names: 名称序列。
+        limit: 最多展示的名称数量。
+
+    Returns:
+        逗号分隔的名称文本，截断时附带总数。
+    """
+    if len(names) <= limit:
+        return ", ".join(names)
+    return f"{', '.join(names[:limit])} … 等 {len(names)} 项"
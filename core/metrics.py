@@ -0,0 +1,58 @@
+"""
+轻量指标记录：把耗时类指标以固定格式写入日志，便于按版本统计。
+"""
+from __future__ import annotations
+
+import time
+from typing import Dict, Optional
+
+from core.utils import log_message
+
+
+def record_metric(name: str, value_ms: float, detail: str = "") -> None:
+    """
+    记录一条耗时指标，格式为 ``name=<指标> value_ms=<耗时> <附加信息>``。
+
+    Args:
+        name: 指标名称，例如 ``ui_stall``、``startup_first_paint``。
+        value_ms: 指标值（毫秒）。
+        detail: 附加上下文，例如正在执行的操作名称。
+    """
+    line: str = f"name={name} value_ms={value_ms:.1f}"
+    if detail:
+        line = f"{line} {detail}"
+    log_message("METRIC", line)
+
+
+class StartupTimer:
+    """
+    启动里程碑计时：从进程启动起算，各里程碑只记录第一次。
+
+    Attributes:
+        started_at: 起点（``time.perf_counter()`` 读数），通常在入口模块最先取得。
+        marks: 里程碑名称到耗时（毫秒）的映射。
+    """
+
+    def __init__(self, started_at: Optional[float] = None) -> None:
+        self.started_at: float = (
+            time.perf_counter() if started_at is None else started_at
+        )
+        self.marks: Dict[str, float] = {}
+
+    def mark(self, name: str, detail: str = "") -> Optional[float]:
+        """
+        记录一个里程碑并写入指标日志；重复记录时忽略。
+
+        Args:
+            name: 指标名称，例如 ``startup_first_paint``。
+            detail: 附加上下文。
+
+        Returns:
+            本次记录的耗时（毫秒）；已记录过时返回 None。
+        """
+        if name in self.marks:
+            return None
+        elapsed_ms: float = (time.perf_counter() - self.started_at) * 1000
+        self.marks[name] = elapsed_ms
+        record_metric(name, elapsed_ms, detail)
+        return elapsed_ms
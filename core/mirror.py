@@ -0,0 +1,199 @@
+"""
+备注镜像：按相对路径同步遍历源树与目标树，只把有差异的备注写入目标。
+"""
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.async_scan import AsyncScanner
+from core.constants import FILE_ATTRIBUTE_SYSTEM
+from core.ini_service import DesktopIniService
+from core.utils import get_file_attributes
+
+
+@dataclass
+class MirrorChange:
+    """
+    目标树中需要更新的一个目录。
+
+    Attributes:
+        relative: 相对根目录的路径。
+        target: 目标目录路径。
+        old_remark: 目标当前的备注。
+        new_remark: 源目录的备注。
+    """
+
+    __slots__ = ("relative", "target", "old_remark", "new_remark")
+
+    relative: str
+    target: Path
+    old_remark: str
+    new_remark: str
+
+    @property
+    def repair_only(self) -> bool:
+        """
+        备注相同但目标目录缺少 SYSTEM 属性，重写即可让资源管理器显示备注。
+        """
+        return self.old_remark == self.new_remark
+
+
+@dataclass
+class MirrorStats:
+    """
+    镜像统计。
+
+    Attributes:
+        compared: 两侧都存在并比较过的目录数。
+        missing: 源中存在、目标中缺失的目录数（其子树整体跳过）。
+        changed: 需要写入的目录数。
+        written: 写入成功的目录数。
+        failed: 写入失败的变更及错误信息。
+    """
+
+    compared: int = 0
+    missing: int = 0
+    changed: int = 0
+    written: int = 0
+    failed: List[Tuple[MirrorChange, str]] = field(default_factory=list)
+
+    def summary(self) -> str:
+        """
+        生成一行统计文本。
+        """
+        return (
+            f"比较 {self.compared} | 目标缺失 {self.missing} | "
+            f"差异 {self.changed} | 已写入 {self.written} | "
+            f"失败 {len(self.failed)}"
+        )
+
+
+def _missing_system_attribute(folder: Path) -> bool:
+    """
+    判断目录是否缺少 SYSTEM 属性（仅 Windows 有意义，其余平台视为不缺）。
+
+    Args:
+        folder: 目录路径。
+    """
+    if os.name != "nt":
+        return False
+    try:
+        return not get_file_attributes(folder) & FILE_ATTRIBUTE_SYSTEM
+    except OSError:
+        return False
+
+
+def iter_common_folders(
+    service: DesktopIniService,
+    source: Path,
+    target: Path,
+    stats: MirrorStats,
+    max_depth: Optional[int] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> Iterator[Tuple[str, Path, Path]]:
+    """
+    同步遍历两棵树，产出两侧都存在的目录。
+
+    每次只枚举一对父目录并按名称（不区分大小写）配对，
+    内存占用只与遍历栈和单个目录的子项数有关；目标缺失的子树不再深入。
+
+    Args:
+        service: desktop.ini 服务。
+        source: 源根目录。
+        target: 目标根目录。
+        stats: 统计对象，累计缺失目录数。
+        max_depth: 最大深度；None 表示不限。
+        cancel_event: 设置后尽快停止。
+
+    Yields:
+        (相对路径, 源目录, 目标目录) 三元组。
+    """
+    stack: List[Tuple[str, Path, Path, int]] = [("", source, target, 0)]
+    while stack:
+        if cancel_event is not None and cancel_event.is_set():
+            return
+        relative, source_dir, target_dir, depth = stack.pop()
+        if relative:
+            yield relative, source_dir, target_dir
+        if max_depth is not None and depth >= max_depth:
+            continue
+        try:
+            source_children: List[Path] = service.list_subfolders(source_dir)
+            target_children: Dict[str, Path] = {
+                child.name.lower(): child
+                for child in service.list_subfolders(target_dir)
+            }
+        except OSError:
+            continue
+        for child in reversed(source_children):
+            match: Optional[Path] = target_children.get(child.name.lower())
+            if match is None:
+                stats.missing += 1
+                continue
+            stack.append(
+                (os.path.join(relative, child.name), child, match, depth + 1)
+            )
+
+
+def iter_mirror_changes(
+    service: DesktopIniService,
+    source: Path,
+    target: Path,
+    executor: Executor,
+    stats: MirrorStats,
+    keep_target: bool = False,
+    max_depth: Optional[int] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> Iterator[MirrorChange]:
+    """
+    并行读取两侧备注，产出目标需要更新的目录。
+
+    Args:
+        service: desktop.ini 服务。
+        source: 源根目录。
+        target: 目标根目录。
+        executor: 执行读取的线程池。
+        stats: 统计对象，累计比较数与差异数。
+        keep_target: True 时保留目标中源没有的备注，否则清空以与源一致。
+        max_depth: 最大深度；None 表示不限。
+        cancel_event: 设置后尽快停止。
+
+    Yields:
+        需要写入的变更，顺序取决于读取完成顺序。
+    """
+
+    def read_pair(item: Tuple[str, Path, Path]) -> Tuple[str, str, bool]:
+        new_remark: str = service.read_info_tip(item[1])
+        old_remark: str = service.read_info_tip(item[2])
+        repair: bool = (
+            bool(new_remark)
+            and new_remark == old_remark
+            and _missing_system_attribute(item[2])
+        )
+        return old_remark, new_remark, repair
+
+    scanner: AsyncScanner = AsyncScanner(service, executor)
+    for (relative, _, target_dir), future in scanner.map_bounded(
+        target,
+        read_pair,
+        iter_common_folders(
+            service, source, target, stats, max_depth, cancel_event
+        ),
+        cancel_event,
+    ):
+        try:
+            old_remark, new_remark, repair = future.result()
+        except OSError:
+            continue
+        stats.compared += 1
+        if old_remark == new_remark and not repair:
+            continue
+        if keep_target and not new_remark:
+            continue
+        stats.changed += 1
+        yield MirrorChange(relative, target_dir, old_remark, new_remark)
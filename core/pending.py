@@ -0,0 +1,135 @@
+"""
+会话级待保存修改：跨目录切换保留脏集合，保存时只写入这部分增量。
+"""
+from __future__ import annotations
+
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.ini_service import IniVersion
+
+
+class PendingChanges:
+    """
+    以路径为键记录尚未写入磁盘的备注修改。
+
+    表格切换目录时行存储会被清空，但这里的修改会保留，
+    重新进入目录时再覆盖到新读取的行上。
+
+    Attributes:
+        changes: 路径到 (磁盘备注, 待写入备注) 的映射。
+        versions: 路径到读取磁盘备注时 desktop.ini 的版本，写入时据此检查
+            是否已被他人修改；未记录版本的路径不在其中。
+    """
+
+    def __init__(self) -> None:
+        self.changes: Dict[str, Tuple[str, str]] = {}
+        self.versions: Dict[str, IniVersion] = {}
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self.changes
+
+    def stage(
+        self,
+        path: str,
+        original: str,
+        remark: str,
+        version: Optional[IniVersion] = None,
+    ) -> None:
+        """
+        登记一项修改；改回磁盘原值时自动撤销登记。
+
+        Args:
+            path: 目录完整路径。
+            original: 磁盘上的备注。
+            remark: 待写入的备注。
+            version: 读取 original 时 desktop.ini 的版本；未知时为 None。
+        """
+        if remark == original:
+            self.discard(path)
+            return
+        self.changes[path] = (original, remark)
+        if version is None:
+            self.versions.pop(path, None)
+        else:
+            self.versions[path] = version
+
+    def expected(self, path: str) -> Tuple[str, Optional[IniVersion]]:
+        """
+        查询写入前用于并发检查的磁盘备注与版本。
+
+        Args:
+            path: 已登记的目录完整路径。
+
+        Returns:
+            (磁盘备注, 版本)；未记录版本时版本为 None。
+        """
+        return self.changes[path][0], self.versions.get(path)
+
+    def pending_remark(self, path: str) -> Optional[str]:
+        """
+        查询路径的待写入备注。
+
+        Args:
+            path: 目录完整路径。
+
+        Returns:
+            待写入的备注；没有登记时返回 None。
+        """
+        entry: Optional[Tuple[str, str]] = self.changes.get(path)
+        return entry[1] if entry else None
+
+    def refresh_original(
+        self,
+        path: str,
+        original: str,
+        version: Optional[IniVersion] = None,
+    ) -> Optional[str]:
+        """
+        重新读取磁盘备注后更新登记，磁盘值已等于待写入值时撤销登记。
+
+        Args:
+            path: 目录完整路径。
+            original: 最新读取的磁盘备注。
+            version: 对应的 desktop.ini 版本；未知时为 None。
+
+        Returns:
+            仍需写入的备注；无需写入时返回 None。
+        """
+        remark: Optional[str] = self.pending_remark(path)
+        if remark is None:
+            return None
+        self.stage(path, original, remark, version)
+        return self.pending_remark(path)
+
+    def discard(self, path: str) -> None:
+        """
+        移除一项登记（通常在写入成功后调用）。
+
+        Args:
+            path: 目录完整路径。
+        """
+        self.changes.pop(path, None)
+        self.versions.pop(path, None)
+
+    def sorted_items(self) -> Iterator[Tuple[str, str]]:
+        """
+        按路径排序枚举待写入项，使同一目录下的写入相邻以提高局部性。
+
+        Yields:
+            (路径, 待写入备注) 二元组。
+        """
+        for path in sorted(self.changes, key=str.lower):
+            yield path, self.changes[path][1]
+
+    def directories(self) -> List[str]:
+        """
+        列出包含待写入项的父目录。
+
+        Returns:
+            去重排序后的父目录列表。
+        """
+        return sorted({os.path.dirname(path) for path in self.changes})
@@ -0,0 +1,120 @@
+"""
+预取：在低优先级后台线程中为当前选中目录的子目录预热列表与备注缓存。
+"""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+from core.constants import PREFETCH_MAX_CHILDREN, PREFETCH_MAX_WORKERS
+from core.dir_cache import DirectoryCache
+from core.ini_service import DesktopIniService, IniVersion
+from core.utils import log_message
+
+
+class Prefetcher:
+    """
+    预取器使用独立的小线程池，不与界面加载争抢工作线程；
+    每次导航都会开启新一代任务，旧任务在开始前或读取间隙发现代数变化即退出。
+    每次只预取排在最前的 max_children 个子目录，大目录不会一次排入成千上万个任务。
+
+    Attributes:
+        service: desktop.ini 服务。
+        cache: 被预热的目录缓存。
+        max_children: 每次最多预取的子目录数。
+    """
+
+    def __init__(
+        self,
+        service: DesktopIniService,
+        cache: DirectoryCache,
+        max_workers: int = PREFETCH_MAX_WORKERS,
+        max_children: int = PREFETCH_MAX_CHILDREN,
+    ) -> None:
+        self.service: DesktopIniService = service
+        self.cache: DirectoryCache = cache
+        self.max_children: int = max_children
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="desktopini-prefetch"
+        )
+        self._generation: int = 0
+        self._futures: List[Future] = []
+        self._lock: threading.Lock = threading.Lock()
+
+    def prefetch(self, children: List[Path]) -> None:
+        """
+        取消上一批预取，并为给定子目录中排在最前的 max_children 个预热
+        列表与备注。
+
+        Args:
+            children: 当前选中目录的子目录（按展示顺序，越靠前越先预取）。
+        """
+        with self._lock:
+            self._cancel_locked()
+            generation: int = self._generation
+            self._futures = [
+                self._executor.submit(self._warm, child, generation)
+                for child in children[: self.max_children]
+            ]
+
+    def cancel(self) -> None:
+        """
+        取消所有尚未完成的预取。
+        """
+        with self._lock:
+            self._cancel_locked()
+
+    def shutdown(self) -> None:
+        """
+        停止预取线程池。
+        """
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _cancel_locked(self) -> None:
+        """
+        递增代数并取消排队中的任务（调用方需持有锁）。
+        """
+        self._generation += 1
+        for future in self._futures:
+            future.cancel()
+        self._futures = []
+
+    def _is_current(self, generation: int) -> bool:
+        """
+        判断任务是否仍属于最新一代。
+
+        Args:
+            generation: 任务提交时的代数。
+        """
+        return generation == self._generation
+
+    def _warm(self, folder: Path, generation: int) -> None:
+        """
+        预热单个目录：枚举子目录并逐个读取备注，期间发现导航即放弃。
+
+        Args:
+            folder: 需要预热的目录。
+            generation: 任务提交时的代数。
+        """
+        if not self._is_current(generation) or self.cache.has_fresh_remarks(
+            folder
+        ):
+            return
+        try:
+            subfolders: List[Path] = self.service.list_subfolders(folder)
+            remarks: List[str] = []
+            versions: List[Optional[IniVersion]] = []
+            for subfolder in subfolders:
+                if not self._is_current(generation):
+                    return
+                remark, version = self.service.read_remark(subfolder)
+                remarks.append(remark)
+                versions.append(version)
+        except OSError as exc:
+            log_message("INFO", f"prefetch skipped {folder}: {exc}")
+            return
+        if self._is_current(generation):
+            self.cache.put(folder, subfolders, remarks, versions)
@@ -0,0 +1,295 @@
+"""
+带超时的路径探测：在独立线程池中访问文件系统，避免失联的网络共享卡住界面线程。
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Callable, Dict, Optional, TypeVar, Union
+
+from core.constants import (
+    PROBE_MAX_WORKERS,
+    PROBE_NEGATIVE_TTL_S,
+    PROBE_TIMEOUT_ENV_VAR,
+    PROBE_TIMEOUT_S,
+)
+from core.utils import log_message
+
+T = TypeVar("T")
+
+KIND_DIR = "dir"
+KIND_FILE = "file"
+
+
+class PathUnreachableError(OSError):
+    """
+    路径所在的卷或共享在期限内没有响应，或近期已被判定为不可达。
+
+    Attributes:
+        share: 不可达的卷或共享根，例如 ``\\\\server\\share`` 或 ``D:``。
+    """
+
+    def __init__(self, share: str, message: str) -> None:
+        super().__init__(message)
+        self.share: str = share
+
+
+def share_root(path: Union[Path, str]) -> str:
+    """
+    提取路径所属的卷或共享根，作为不可达缓存的键。
+
+    Args:
+        path: 任意路径。
+
+    Returns:
+        盘符（``C:``）或 UNC 共享根（``\\\\server\\share``），统一为小写；
+        无法识别时返回路径锚点。
+    """
+    text: str = str(path)
+    drive: str = os.path.splitdrive(text)[0]
+    return (drive or Path(text).anchor).lower()
+
+
+class _Progress:
+    """
+    一次探测的进展时间，由执行线程更新、等待线程读取。
+
+    Attributes:
+        last: 最近一次开始执行或报告进展的时间（``time.monotonic``）。
+    """
+
+    __slots__ = ("last",)
+
+    def __init__(self) -> None:
+        self.last: float = 0.0
+
+
+class PathProbe:
+    """
+    在独立线程池中执行文件系统探测，超过期限即判定不可达并缓存该结果。
+
+    探测线程可能被挂起的 SMB 调用长期占用，因此与业务线程池分开，并且每个
+    卷或共享各用一个线程池：挂起的共享只占满自己的线程，不会拖累其他共享。
+    期限从探测真正开始执行时计起，执行中调用 ``heartbeat`` 报告进展会重新
+    计时，枚举大目录时只要持续有进展就不会被误判。
+
+    Attributes:
+        timeout: 默认探测期限（秒）。
+        negative_ttl: 不可达结果的缓存时长（秒）。
+        max_workers: 每个共享的探测线程数。
+    """
+
+    def __init__(
+        self,
+        timeout: float = PROBE_TIMEOUT_S,
+        negative_ttl: float = PROBE_NEGATIVE_TTL_S,
+        max_workers: int = PROBE_MAX_WORKERS,
+    ) -> None:
+        self.timeout: float = timeout
+        self.negative_ttl: float = negative_ttl
+        self.max_workers: int = max_workers
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._unreachable: Dict[str, float] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._local: threading.local = threading.local()
+
+    def run(
+        self,
+        path: Union[Path, str],
+        func: Callable[[], T],
+        timeout: Optional[float] = None,
+    ) -> T:
+        """
+        在期限内执行一次文件系统访问。
+
+        期限从 func 开始执行时计起，func 每次调用 ``heartbeat`` 都会重新计时；
+        连续 timeout 秒没有进展才判定共享不可达。在所属共享的线程池中排队
+        超过 timeout 秒仍未开始时放弃本次访问，但不记为不可达。已在探测线程中
+        执行时直接调用 func，避免嵌套排队。
+
+        Args:
+            path: 访问涉及的路径，用于定位所属共享。
+            func: 实际执行访问的无参函数。
+            timeout: 本次期限；None 使用默认期限。
+
+        Returns:
+            func 的返回值。
+
+        Raises:
+            PathUnreachableError: 共享近期不可达、排队超时或本次访问超时。
+        """
+        if getattr(self._local, "progress", None) is not None:
+            return func()
+        share: str = share_root(path)
+        self._check_share(share)
+        deadline: float = self.timeout if timeout is None else timeout
+        progress: _Progress = _Progress()
+        started: threading.Event = threading.Event()
+
+        def task() -> T:
+            progress.last = time.monotonic()
+            self._local.progress = progress
+            started.set()
+            try:
+                return func()
+            finally:
+                self._local.progress = None
+
+        future: Future = self._executor_for(share).submit(task)
+        if not started.wait(deadline) and future.cancel():
+            raise PathUnreachableError(
+                share, f"探测排队超时（{deadline:g} 秒）：{path}"
+            )
+        if not started.is_set():
+            # 等待期满时恰好开始执行，task 可能尚未记下开始时间。
+            progress.last = time.monotonic()
+        while True:
+            remaining: float = progress.last + deadline - time.monotonic()
+            try:
+                return future.result(timeout=max(0.0, remaining))
+            except FutureTimeoutError:
+                if progress.last + deadline > time.monotonic():
+                    continue
+            self._mark_unreachable(share)
+            raise PathUnreachableError(
+                share, f"访问超时（{deadline:g} 秒）：{path}"
+            )
+
+    def heartbeat(self) -> None:
+        """
+        在 ``run`` 执行的函数中报告进展，重新开始计时；在其他线程中调用时
+        不做任何事。
+        """
+        progress: Optional[_Progress] = getattr(self._local, "progress", None)
+        if progress is not None:
+            progress.last = time.monotonic()
+
+    def kind(
+        self, path: Union[Path, str], timeout: Optional[float] = None
+    ) -> Optional[str]:
+        """
+        判断路径类型。
+
+        Args:
+            path: 目标路径。
+            timeout: 本次期限；None 使用默认期限。
+
+        Returns:
+            ``"dir"``、``"file"``；路径不存在时返回 None。
+
+        Raises:
+            PathUnreachableError: 共享不可达或访问超时。
+        """
+
+        def probe() -> Optional[str]:
+            if os.path.isdir(path):
+                return KIND_DIR
+            if os.path.exists(path):
+                return KIND_FILE
+            return None
+
+        return self.run(path, probe, timeout)
+
+    def exists(
+        self, path: Union[Path, str], timeout: Optional[float] = None
+    ) -> bool:
+        """
+        带期限的 ``exists``。
+
+        Args:
+            path: 目标路径。
+            timeout: 本次期限；None 使用默认期限。
+
+        Returns:
+            True 表示路径存在。
+
+        Raises:
+            PathUnreachableError: 共享不可达或访问超时。
+        """
+        return self.run(path, lambda: os.path.exists(path), timeout)
+
+    def forget(self, path: Union[Path, str]) -> None:
+        """
+        清除路径所属共享的不可达记录，下一次访问会重新探测。
+
+        Args:
+            path: 共享内的任意路径。
+        """
+        with self._lock:
+            self._unreachable.pop(share_root(path), None)
+
+    def _executor_for(self, share: str) -> ThreadPoolExecutor:
+        """
+        返回共享专用的探测线程池，首次使用时创建。
+
+        Args:
+            share: 共享根。
+        """
+        with self._lock:
+            executor: Optional[ThreadPoolExecutor] = self._executors.get(share)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="desktopini-probe",
+                )
+                self._executors[share] = executor
+            return executor
+
+    def _check_share(self, share: str) -> None:
+        """
+        若共享仍在不可达缓存期内则立即失败。
+
+        Args:
+            share: 共享根。
+
+        Raises:
+            PathUnreachableError: 共享近期已判定不可达。
+        """
+        with self._lock:
+            expires: Optional[float] = self._unreachable.get(share)
+            if expires is None:
+                return
+            if expires <= time.monotonic():
+                del self._unreachable[share]
+                return
+        raise PathUnreachableError(share, f"共享暂不可达：{share}")
+
+    def _mark_unreachable(self, share: str) -> None:
+        """
+        记录不可达共享。
+
+        Args:
+            share: 共享根。
+        """
+        with self._lock:
+            self._unreachable[share] = time.monotonic() + self.negative_ttl
+        log_message("WARN", f"share unreachable: {share}")
+
+
+_default_probe: Optional[PathProbe] = None
+
+
+def get_default_probe() -> PathProbe:
+    """
+    返回进程内共享的探测器，保证不可达缓存在各调用方之间共用。
+
+    期限可通过环境变量 ``DESKTOPINI_PROBE_TIMEOUT``（秒）调整。
+
+    Returns:
+        全局 PathProbe 实例。
+    """
+    global _default_probe
+    if _default_probe is None:
+        timeout: float = PROBE_TIMEOUT_S
+        raw: str = os.environ.get(PROBE_TIMEOUT_ENV_VAR, "").strip()
+        if raw:
+            try:
+                timeout = max(0.1, float(raw))
+            except ValueError:
+                log_message("WARN", f"invalid {PROBE_TIMEOUT_ENV_VAR}: {raw}")
+        _default_probe = PathProbe(timeout=timeout)
+    return _default_probe
@@ -0,0 +1,107 @@
+"""
+按需性能剖析：通过环境变量或快捷键，用 cProfile 记录下一次界面操作。
+"""
+from __future__ import annotations
+
+import cProfile
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from core.constants import PROFILE_ENV_VAR, PROFILE_FILE_PREFIX
+from core.utils import get_log_dir, log_message
+
+
+class ProfileCapture:
+    """
+    一次性或持续的 cProfile 采集器，输出 pstats 文件到日志目录。
+
+    Attributes:
+        output_dir: pstats 文件输出目录。
+        armed: 是否已为下一次操作启用剖析。
+        persistent: True 表示每次操作都剖析，不会在采集后自动解除。
+        last_output: 最近一次写出的 pstats 文件路径。
+    """
+
+    def __init__(
+        self,
+        output_dir: Optional[Path] = None,
+        armed: bool = False,
+        persistent: bool = False,
+    ) -> None:
+        self.output_dir: Path = output_dir or get_log_dir()
+        self.armed: bool = armed or persistent
+        self.persistent: bool = persistent
+        self.last_output: Optional[Path] = None
+        self._active: bool = False
+
+    @classmethod
+    def from_environment(cls) -> "ProfileCapture":
+        """
+        根据环境变量创建采集器。
+
+        ``DESKTOPINI_PROFILE=1`` 只剖析启动后的第一次操作；
+        ``DESKTOPINI_PROFILE=all`` 对每次操作都输出剖析文件。
+
+        Returns:
+            已按环境变量配置好的采集器。
+        """
+        raw: str = os.environ.get(PROFILE_ENV_VAR, "").strip().lower()
+        if raw == "all":
+            return cls(persistent=True)
+        return cls(armed=raw not in ("", "0", "false", "no"))
+
+    def arm(self) -> None:
+        """
+        为下一次操作启用剖析。
+        """
+        self.armed = True
+        log_message("INFO", "profile armed for next action")
+
+    @contextmanager
+    def capture(self, action: str) -> Iterator[None]:
+        """
+        在已启用时剖析包裹的代码块，并在结束后写出 pstats 文件。
+
+        嵌套调用只由最外层采集，保证一次操作只产生一个文件。
+
+        Args:
+            action: 操作名称，会写入文件名便于区分。
+        """
+        if not self.armed or self._active:
+            yield
+            return
+
+        profile: cProfile.Profile = cProfile.Profile()
+        self._active = True
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._active = False
+            if not self.persistent:
+                self.armed = False
+            self._dump(profile, action)
+
+    def _dump(self, profile: cProfile.Profile, action: str) -> None:
+        """
+        写出 pstats 文件；失败只记日志，不影响业务操作。
+
+        Args:
+            profile: 已停止的剖析器。
+            action: 操作名称。
+        """
+        timestamp: str = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        target: Path = (
+            self.output_dir / f"{PROFILE_FILE_PREFIX}_{timestamp}_{action}.pstats"
+        )
+        try:
+            profile.dump_stats(str(target))
+        except Exception as exc:
+            log_message("ERROR", f"profile dump failed: {exc}")
+            return
+        self.last_output = target
+        log_message("INFO", f"profile [{action}] written to {target}")
@@ -0,0 +1,273 @@
+"""
+紧凑行存储：按行号索引的并列数组，父目录字符串只保存一份。
+"""
+from __future__ import annotations
+
+import os
+from array import array
+from pathlib import Path
+from typing import AbstractSet, Dict, Iterator, List, Optional, Union
+
+from core.ini_service import FolderRemark, IniVersion
+from core.sizer import SubtreeSize
+
+# 版本数组中表示“读取时未记录版本”的文件大小。
+_UNKNOWN_SIZE = -2
+
+
+class RowStore:
+    """
+    表格行模型。每行只保存名称、父目录编号和两份备注引用，
+    完整路径按需拼接，避免为每行保存 Path 对象与多份路径字符串。
+
+    行号即 Treeview 的 item ID（``str(row_id)``），因此表格、排序与保存
+    都可以直接通过行号定位数据。
+
+    Attributes:
+        root: 表格展示的根目录，用于计算相对路径。
+        names: 行号到目录名称。
+        parent_ids: 行号到父目录编号。
+        original: 行号到初始备注，用于脏检查。
+        current: 行号到当前备注。
+        sizes: 行号到已统计完成的子树大小（大小列开启时由后台填充）。
+
+    读取备注时 desktop.ini 的版本拆成三个整数数组保存，每行 24 字节，
+    保存时用于乐观并发检查。
+    """
+
+    __slots__ = (
+        "root",
+        "names",
+        "parent_ids",
+        "original",
+        "current",
+        "sizes",
+        "_version_mtimes",
+        "_version_sizes",
+        "_version_digests",
+        "_parents",
+        "_parent_index",
+    )
+
+    def __init__(self) -> None:
+        self.root: str = ""
+        self.names: List[str] = []
+        self.parent_ids: array = array("I")
+        self.original: List[str] = []
+        self.current: List[str] = []
+        self.sizes: Dict[int, SubtreeSize] = {}
+        self._version_mtimes: array = array("q")
+        self._version_sizes: array = array("q")
+        self._version_digests: array = array("q")
+        self._parents: List[str] = []
+        self._parent_index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def clear(self, root: Union[Path, str] = "") -> None:
+        """
+        清空全部行与父目录表。
+
+        Args:
+            root: 新的根目录，用于计算相对路径。
+        """
+        self.root = str(root)
+        self.names.clear()
+        self.parent_ids = array("I")
+        self.original.clear()
+        self.current.clear()
+        self.sizes.clear()
+        self._version_mtimes = array("q")
+        self._version_sizes = array("q")
+        self._version_digests = array("q")
+        self._parents.clear()
+        self._parent_index.clear()
+
+    def add(
+        self,
+        path: Union[Path, str],
+        remark: str,
+        version: Optional[IniVersion] = None,
+    ) -> int:
+        """
+        追加一行。
+
+        Args:
+            path: 目录完整路径。
+            remark: 读取到的备注，同时作为初始值与当前值。
+            version: 读取时 desktop.ini 的版本；未记录时为 None。
+
+        Returns:
+            新行的行号。
+        """
+        parent, name = os.path.split(str(path))
+        parent_id: int | None = self._parent_index.get(parent)
+        if parent_id is None:
+            parent_id = len(self._parents)
+            self._parents.append(parent)
+            self._parent_index[parent] = parent_id
+        self.names.append(name)
+        self.parent_ids.append(parent_id)
+        self.original.append(remark)
+        self.current.append(remark)
+        self._version_mtimes.append(0)
+        self._version_sizes.append(_UNKNOWN_SIZE)
+        self._version_digests.append(0)
+        row_id: int = len(self.names) - 1
+        if version is not None:
+            self._set_version(row_id, version)
+        return row_id
+
+    def path(self, row_id: int) -> str:
+        """
+        拼接行对应的完整路径。
+
+        Args:
+            row_id: 行号。
+
+        Returns:
+            目录完整路径字符串。
+        """
+        parent: str = self._parents[self.parent_ids[row_id]]
+        return os.path.join(parent, self.names[row_id])
+
+    def relative_path(self, row_id: int) -> str:
+        """
+        计算行相对根目录的路径；直接子目录即为名称本身。
+
+        Args:
+            row_id: 行号。
+
+        Returns:
+            相对路径字符串。
+        """
+        parent: str = self._parents[self.parent_ids[row_id]]
+        name: str = self.names[row_id]
+        if not self.root or not parent.startswith(self.root):
+            return name
+        prefix: str = parent[len(self.root):].lstrip("\\/")
+        return os.path.join(prefix, name) if prefix else name
+
+    def set_current(self, row_id: int, remark: str) -> None:
+        """
+        更新行的当前备注。
+
+        Args:
+            row_id: 行号。
+            remark: 新备注。
+        """
+        self.current[row_id] = remark
+
+    def version(self, row_id: int) -> Optional[IniVersion]:
+        """
+        查询行读取时 desktop.ini 的版本。
+
+        Args:
+            row_id: 行号。
+
+        Returns:
+            版本；未记录时为 None。
+        """
+        size: int = self._version_sizes[row_id]
+        if size == _UNKNOWN_SIZE:
+            return None
+        return IniVersion(
+            self._version_mtimes[row_id], size, self._version_digests[row_id]
+        )
+
+    def set_original(
+        self, row_id: int, remark: str, version: Optional[IniVersion] = None
+    ) -> None:
+        """
+        记录行在磁盘上的最新备注与版本（写入后或解决冲突后调用）。
+
+        Args:
+            row_id: 行号。
+            remark: 磁盘上的备注。
+            version: 对应的 desktop.ini 版本；未知时为 None。
+        """
+        self.original[row_id] = remark
+        if version is None:
+            self._version_sizes[row_id] = _UNKNOWN_SIZE
+        else:
+            self._set_version(row_id, version)
+
+    def _set_version(self, row_id: int, version: IniVersion) -> None:
+        """
+        把版本写入三个并列数组。
+        """
+        self._version_mtimes[row_id] = version.mtime_ns
+        self._version_sizes[row_id] = version.size
+        self._version_digests[row_id] = version.digest
+
+    def mark_saved(self, row_id: int) -> None:
+        """
+        写入成功后把当前备注记为初始值。
+
+        Args:
+            row_id: 行号。
+        """
+        self.original[row_id] = self.current[row_id]
+
+    def is_dirty(self, row_id: int) -> bool:
+        """
+        判断行是否有未保存的修改。
+
+        Args:
+            row_id: 行号。
+
+        Returns:
+            True 表示当前备注与初始值不同。
+        """
+        return self.current[row_id] != self.original[row_id]
+
+    def dirty_rows(self) -> Iterator[int]:
+        """
+        枚举所有有未保存修改的行号。
+
+        Yields:
+            脏行行号。
+        """
+        for row_id, (current, original) in enumerate(
+            zip(self.current, self.original)
+        ):
+            if current != original:
+                yield row_id
+
+    def find_paths(self, paths: AbstractSet[str]) -> Dict[str, int]:
+        """
+        查找给定路径在当前行存储中的行号。
+
+        Args:
+            paths: 需要查找的完整路径集合。
+
+        Returns:
+            命中路径到行号的映射；不在当前视图中的路径不会出现。
+        """
+        found: Dict[str, int] = {}
+        if not paths:
+            return found
+        for row_id in range(len(self.names)):
+            path: str = self.path(row_id)
+            if path in paths:
+                found[path] = row_id
+        return found
+
+    def row(self, row_id: int) -> FolderRemark:
+        """
+        生成行的 FolderRemark 视图，供需要完整记录的调用方使用。
+
+        Args:
+            row_id: 行号。
+
+        Returns:
+            新建的 FolderRemark 实例。
+        """
+        return FolderRemark(
+            name=self.names[row_id],
+            path=Path(self.path(row_id)),
+            original_remark=self.original[row_id],
+            current_remark=self.current[row_id],
+            version=self.version(row_id),
+        )
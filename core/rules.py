@@ -0,0 +1,367 @@
+"""
+规则批量备注：把“通配符/正则 -> 备注模板”规则编译成单个匹配器，并在整棵子树上求值。
+"""
+from __future__ import annotations
+
+import re
+import threading
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.async_scan import AsyncScanner, iter_sync
+from core.constants import MAPPING_SEPARATOR, RULE_REGEX_PREFIX
+from core.ini_service import DesktopIniService
+
+
+class RuleError(ValueError):
+    """
+    规则文本或模板无效。
+
+    Attributes:
+        line_no: 出错的行号（从 1 开始）。
+    """
+
+    def __init__(self, line_no: int, message: str) -> None:
+        super().__init__(f"第 {line_no} 行：{message}")
+        self.line_no: int = line_no
+
+
+@dataclass
+class RemarkRule:
+    """
+    单条备注规则。
+
+    Attributes:
+        line_no: 规则所在行号，用于报错定位。
+        pattern: 原始匹配表达式（通配符或去掉前缀后的正则）。
+        template: 备注模板，支持 ``{name}``、``{0}``（整个名称）、
+            ``{1}`` 起的捕获组以及正则命名组。
+        is_regex: True 表示 pattern 为正则表达式。
+    """
+
+    line_no: int
+    pattern: str
+    template: str
+    is_regex: bool
+
+
+@dataclass
+class RuleChange:
+    """
+    规则求值产生的一条备注变更。
+
+    Attributes:
+        path: 目录路径。
+        old_remark: 当前备注。
+        new_remark: 规则生成的备注。
+    """
+
+    path: Path
+    old_remark: str
+    new_remark: str
+
+
+def glob_to_regex(pattern: str) -> str:
+    """
+    将通配符转换为正则，``*``、``?`` 转为捕获组，便于在模板中引用。
+
+    Args:
+        pattern: 通配符表达式，例如 ``PRJ-*``。
+
+    Returns:
+        不含锚点的正则文本。
+    """
+    parts: List[str] = []
+    for char in pattern:
+        if char == "*":
+            parts.append("(.*)")
+        elif char == "?":
+            parts.append("(.)")
+        else:
+            parts.append(re.escape(char))
+    return "".join(parts)
+
+
+def parse_rules(lines: Iterable[str]) -> List[RemarkRule]:
+    """
+    解析规则文本，每行格式为 ``匹配表达式 -> 备注模板``。
+
+    以 ``re:`` 开头的表达式按正则处理，否则按通配符处理；
+    空行与 ``#`` 开头的注释行会被忽略。
+
+    Args:
+        lines: 规则文本行。
+
+    Returns:
+        按书写顺序排列的规则列表，靠前的规则优先匹配。
+
+    Raises:
+        RuleError: 当某行格式错误时抛出。
+    """
+    rules: List[RemarkRule] = []
+    for line_no, line in enumerate(lines, start=1):
+        stripped: str = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if MAPPING_SEPARATOR not in stripped:
+            raise RuleError(line_no, f"缺少 '{MAPPING_SEPARATOR}'")
+        pattern, template = stripped.split(MAPPING_SEPARATOR, 1)
+        pattern = pattern.strip()
+        is_regex: bool = pattern.startswith(RULE_REGEX_PREFIX)
+        if is_regex:
+            pattern = pattern[len(RULE_REGEX_PREFIX):].strip()
+        if not pattern:
+            raise RuleError(line_no, "匹配表达式为空")
+        rules.append(
+            RemarkRule(
+                line_no=line_no,
+                pattern=pattern,
+                template=template.strip(),
+                is_regex=is_regex,
+            )
+        )
+    return rules
+
+
+class _Segment:
+    """
+    一组合并编译的相邻规则。
+
+    Attributes:
+        regex: 合并后的正则；各规则包在一个分支组中。
+        branches: 分支组序号 -> (规则, 该规则捕获组数量)；单条规则不包分支组
+            时序号为 0，捕获组从 1 开始。
+    """
+
+    __slots__ = ("regex", "branches")
+
+    def __init__(
+        self,
+        regex: re.Pattern[str],
+        branches: Dict[int, Tuple[RemarkRule, int]],
+    ) -> None:
+        self.regex: re.Pattern[str] = regex
+        self.branches: Dict[int, Tuple[RemarkRule, int]] = branches
+
+
+class RuleMatcher:
+    """
+    将规则编译为带分支的正则，一次匹配即可确定命中规则与捕获组。
+
+    合并会改变捕获组的序号，因此使用数字反向引用（如 ``\\1``、``(?(1)...)``）
+    的规则单独编译；相邻的其余规则仍合并为一个正则，按书写顺序依次尝试。
+
+    Attributes:
+        rules: 参与匹配的规则列表。
+    """
+
+    def __init__(self, rules: List[RemarkRule]) -> None:
+        """
+        编译规则并校验模板引用的捕获组。
+
+        Args:
+            rules: 规则列表。
+
+        Raises:
+            RuleError: 正则无效、命名组冲突或模板引用不存在的组时抛出。
+        """
+        self.rules: List[RemarkRule] = rules
+        self._segments: List[_Segment] = []
+        pending: List[Tuple[RemarkRule, str, int]] = []
+        for rule in rules:
+            source: str = rule.pattern if rule.is_regex else glob_to_regex(
+                rule.pattern
+            )
+            try:
+                group_count: int = re.compile(source).groups
+            except re.error as exc:
+                raise RuleError(rule.line_no, f"正则无效：{exc}") from exc
+            _check_template(rule, group_count)
+            if rule.is_regex and _uses_group_numbers(source):
+                self._flush(pending)
+                self._segments.append(
+                    _Segment(
+                        re.compile(source, re.IGNORECASE),
+                        {0: (rule, group_count)},
+                    )
+                )
+            else:
+                pending.append((rule, source, group_count))
+        self._flush(pending)
+
+    def _flush(self, pending: List[Tuple[RemarkRule, str, int]]) -> None:
+        """
+        把累积的相邻规则合并编译为一段，并清空累积列表。
+
+        Raises:
+            RuleError: 合并后的正则无效（通常是命名组重名）时抛出。
+        """
+        if not pending:
+            return
+        branches: Dict[int, Tuple[RemarkRule, int]] = {}
+        sources: List[str] = []
+        group_index: int = 1
+        for rule, source, group_count in pending:
+            branches[group_index] = (rule, group_count)
+            sources.append(f"({source})")
+            group_index += group_count + 1
+        try:
+            regex: re.Pattern[str] = re.compile(
+                "|".join(sources), re.IGNORECASE
+            )
+        except re.error as exc:
+            raise RuleError(
+                pending[0][0].line_no, f"规则合并失败：{exc}"
+            ) from exc
+        self._segments.append(_Segment(regex, branches))
+        pending.clear()
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "RuleMatcher":
+        """
+        解析并编译规则文本。
+
+        Args:
+            lines: 规则文本行。
+
+        Returns:
+            编译后的匹配器。
+        """
+        return cls(parse_rules(lines))
+
+    def render(self, name: str) -> Optional[str]:
+        """
+        用首个完整匹配的规则生成备注。
+
+        Args:
+            name: 目录名称（匹配不区分大小写）。
+
+        Returns:
+            生成的备注；没有规则匹配时返回 None。
+        """
+        for segment in self._segments:
+            match: Optional[re.Match[str]] = segment.regex.fullmatch(name)
+            if match is None:
+                continue
+            branch: int = 0 if 0 in segment.branches else match.lastindex or 0
+            if branch not in segment.branches:
+                continue
+            rule, group_count = segment.branches[branch]
+            start: int = branch + 1
+            groups: List[str] = [
+                match.group(index) or ""
+                for index in range(start, start + group_count)
+            ]
+            named: Dict[str, str] = {
+                key: value or ""
+                for key, value in match.groupdict().items()
+                if value is not None
+            }
+            return rule.template.format(
+                name, *groups, **{**named, "name": name}
+            )
+        return None
+
+
+def _uses_group_numbers(source: str) -> bool:
+    """
+    判断正则是否按序号引用捕获组（``\\1`` 形式的反向引用或 ``(?(1)...)``
+    条件），这类正则合并后序号会错位。
+
+    字符集 ``[...]`` 中的 ``\\1`` 是八进制转义，不算引用。
+
+    Args:
+        source: 正则文本。
+    """
+    in_class: bool = False
+    index: int = 0
+    while index < len(source):
+        char: str = source[index]
+        if char == "\\":
+            following: str = source[index + 1:index + 2]
+            if not in_class and following.isdigit() and following != "0":
+                return True
+            index += 2
+            continue
+        if in_class:
+            if char == "]":
+                in_class = False
+        elif char == "[":
+            in_class = True
+            # 紧跟在 [ 或 [^ 之后的 ] 是普通字符。
+            if source[index + 1:index + 2] == "^":
+                index += 1
+            if source[index + 1:index + 2] == "]":
+                index += 1
+        elif source.startswith("(?(", index):
+            if source[index + 3:index + 4].isdigit():
+                return True
+        index += 1
+    return False
+
+
+def _check_template(rule: RemarkRule, group_count: int) -> None:
+    """
+    用占位值试渲染模板，提前发现引用越界或格式错误。
+
+    Args:
+        rule: 待校验规则。
+        group_count: 规则的捕获组数量。
+
+    Raises:
+        RuleError: 模板无效时抛出。
+    """
+    named: Dict[str, str] = {}
+    if rule.is_regex:
+        named = {key: "" for key in re.compile(rule.pattern).groupindex}
+    try:
+        rule.template.format(*([""] * (group_count + 1)), **named, name="")
+    except (IndexError, KeyError, ValueError) as exc:
+        raise RuleError(rule.line_no, f"备注模板无效：{exc!r}") from exc
+
+
+def iter_rule_changes(
+    service: DesktopIniService,
+    root: Path,
+    matcher: RuleMatcher,
+    executor: Executor,
+    cancel_event: Optional[threading.Event] = None,
+) -> Iterator[RuleChange]:
+    """
+    流式遍历子树并求值规则，只对命中的目录读取备注。
+
+    Args:
+        service: desktop.ini 服务。
+        root: 子树根目录（自身不参与匹配）。
+        matcher: 已编译的规则匹配器。
+        executor: 执行枚举与读取的线程池。
+        cancel_event: 设置后尽快停止。
+
+    Yields:
+        新备注与当前备注不同的变更。
+    """
+
+    scanner: AsyncScanner = AsyncScanner(service, executor)
+
+    def candidates() -> Iterator[Tuple[Path, str]]:
+        for folder, _ in iter_sync(
+            scanner.iter_subfolders(root), cancel_event
+        ):
+            new_remark: Optional[str] = matcher.render(folder.name)
+            if new_remark is not None:
+                yield folder, new_remark
+
+    for (folder, new_remark), future in scanner.map_bounded(
+        root,
+        lambda item: service.read_info_tip(item[0]),
+        candidates(),
+        cancel_event,
+    ):
+        try:
+            old_remark: str = future.result()
+        except OSError:
+            continue
+        if old_remark != new_remark:
+            yield RuleChange(folder, old_remark, new_remark)
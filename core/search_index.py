@@ -0,0 +1,249 @@
+"""
+表格筛选索引：为每行预先计算归一化的名称与备注文本（含拼音首字母），
+按输入逐字收窄匹配范围。
+"""
+from __future__ import annotations
+
+import bisect
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+from core.row_store import RowStore
+
+try:
+    from pypinyin import Style, lazy_pinyin
+except ImportError:  # pragma: no cover - 可选依赖
+    lazy_pinyin = None
+
+# GB2312 一级汉字按拼音排序，各声母首字的区位码即分段边界（无 i/u/v 开头）。
+_GB2312_INITIALS = (
+    (0xB0A1, "a"),
+    (0xB0C5, "b"),
+    (0xB2C1, "c"),
+    (0xB4EE, "d"),
+    (0xB6EA, "e"),
+    (0xB7A2, "f"),
+    (0xB8C1, "g"),
+    (0xB9FE, "h"),
+    (0xBBF7, "j"),
+    (0xBFA6, "k"),
+    (0xC0AC, "l"),
+    (0xC2E8, "m"),
+    (0xC4C3, "n"),
+    (0xC5B6, "o"),
+    (0xC5BE, "p"),
+    (0xC6DA, "q"),
+    (0xC8BB, "r"),
+    (0xC8F6, "s"),
+    (0xCBFA, "t"),
+    (0xCDDA, "w"),
+    (0xCEF4, "x"),
+    (0xD1B9, "y"),
+    (0xD4D1, "z"),
+)
+_GB2312_BOUNDS = [code for code, _ in _GB2312_INITIALS]
+_GB2312_LEVEL1_END = 0xD7F9
+
+# 各字段之间的分隔符，避免跨字段拼出误匹配。
+_FIELD_SEPARATOR = "\x00"
+
+_initial_cache: Dict[str, str] = {}
+
+
+def normalize_text(text: str) -> str:
+    """
+    归一化文本：全角转半角（NFKC）并做大小写折叠。
+
+    Args:
+        text: 原始文本。
+
+    Returns:
+        用于匹配的文本。
+    """
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def _gb2312_initial(char: str) -> str:
+    """
+    按 GB2312 区位码推算汉字的拼音首字母；二级字库等无法推算时返回原字符。
+    """
+    try:
+        encoded: bytes = char.encode("gb2312")
+    except UnicodeEncodeError:
+        return char
+    if len(encoded) != 2:
+        return char
+    code: int = encoded[0] << 8 | encoded[1]
+    if code < _GB2312_BOUNDS[0] or code > _GB2312_LEVEL1_END:
+        return char
+    return _GB2312_INITIALS[bisect.bisect_right(_GB2312_BOUNDS, code) - 1][1]
+
+
+def _char_initial(char: str) -> str:
+    """
+    取单个汉字的拼音首字母（带缓存）；安装了 pypinyin 时优先使用。
+    """
+    initial: Optional[str] = _initial_cache.get(char)
+    if initial is None:
+        if lazy_pinyin is not None:
+            initial = (lazy_pinyin(char, style=Style.FIRST_LETTER) or [char])[0]
+        else:
+            initial = _gb2312_initial(char)
+        initial = initial.lower()
+        _initial_cache[char] = initial
+    return initial
+
+
+def pinyin_initials(text: str) -> str:
+    """
+    生成文本中汉字的拼音首字母串，例如“项目 2024 归档”得到 ``xmgd``。
+
+    只取汉字，字母、数字与符号已在归一化文本中，无需重复索引。
+
+    Args:
+        text: 原始文本。
+
+    Returns:
+        首字母串；文本不含汉字时为空字符串。
+    """
+    return "".join(
+        _char_initial(char) for char in text if "\u4e00" <= char <= "\u9fff"
+    )
+
+
+class RowSearchIndex:
+    """
+    与 RowStore 行号对齐的筛选索引。
+
+    每行保存一段归一化文本：名称、备注以及两者的拼音首字母。
+    行存储只追加，因此索引按需补齐新行；备注修改后调用 ``update``。
+    查询以空白分词、各词都需命中；若新查询只是在上一次查询末尾追加字符，
+    只在上一次的结果中继续筛选。
+
+    Attributes:
+        store: 对应的行存储。
+    """
+
+    def __init__(self, store: RowStore) -> None:
+        self.store: RowStore = store
+        self._texts: List[str] = []
+        self._last_query: str = ""
+        self._last_matches: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def clear(self) -> None:
+        """
+        清空索引（行存储清空时调用）。
+        """
+        self._texts.clear()
+        self._forget_last()
+
+    def extend(self, limit: Optional[int] = None) -> int:
+        """
+        为尚未索引的行计算索引文本。
+
+        Args:
+            limit: 本次最多处理的行数；None 表示全部补齐。
+
+        Returns:
+            本次处理的行数。
+        """
+        start: int = len(self._texts)
+        end: int = len(self.store)
+        if limit is not None:
+            end = min(end, start + limit)
+        for row_id in range(start, end):
+            self._texts.append(self._row_text(row_id))
+        if end > start:
+            self._forget_last()
+        return end - start
+
+    def update(self, row_ids: Iterable[int]) -> None:
+        """
+        行的备注变化后刷新其索引文本。
+
+        Args:
+            row_ids: 需要刷新的行号。
+        """
+        for row_id in row_ids:
+            if row_id < len(self._texts):
+                self._texts[row_id] = self._row_text(row_id)
+        self._forget_last()
+
+    def match(self, query: str) -> Optional[List[int]]:
+        """
+        返回匹配查询的行号（升序）。
+
+        Args:
+            query: 用户输入的筛选文本。
+
+        Returns:
+            匹配的行号列表；查询为空时返回 None 表示不筛选。
+        """
+        self.extend()
+        normalized: str = normalize_text(query).strip()
+        if not normalized:
+            self._forget_last()
+            return None
+        candidates: Iterable[int] = range(len(self._texts))
+        if (
+            self._last_matches is not None
+            and self._last_query
+            and normalized.startswith(self._last_query)
+        ):
+            candidates = self._last_matches
+        matches: List[int] = self._filter(normalized, candidates)
+        self._last_query = normalized
+        self._last_matches = matches
+        return matches
+
+    def filter_rows(self, query: str, row_ids: Iterable[int]) -> List[int]:
+        """
+        在给定行中筛选匹配查询的行，用于加载过程中新追加的行。
+
+        Args:
+            query: 用户输入的筛选文本。
+            row_ids: 待检查的行号。
+
+        Returns:
+            匹配的行号列表；查询为空时原样返回全部行号。
+        """
+        self.extend()
+        normalized: str = normalize_text(query).strip()
+        if not normalized:
+            return list(row_ids)
+        return self._filter(normalized, row_ids)
+
+    def _filter(self, normalized: str, candidates: Iterable[int]) -> List[int]:
+        """
+        逐词收窄候选行，每个词都须出现在行的索引文本中。
+        """
+        texts: List[str] = self._texts
+        matches: List[int] = list(candidates)
+        for token in normalized.split():
+            matches = [row_id for row_id in matches if token in texts[row_id]]
+        return matches
+
+    def _row_text(self, row_id: int) -> str:
+        """
+        拼接单行的索引文本。
+        """
+        name: str = self.store.names[row_id]
+        remark: str = self.store.current[row_id]
+        return _FIELD_SEPARATOR.join(
+            (
+                normalize_text(name),
+                normalize_text(remark),
+                pinyin_initials(name),
+                pinyin_initials(remark),
+            )
+        )
+
+    def _forget_last(self) -> None:
+        """
+        丢弃上一次查询结果，下一次查询从全部行开始。
+        """
+        self._last_query = ""
+        self._last_matches = None
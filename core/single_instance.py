@@ -5,9 +5,13 @@ from __future__ import annotations
 
 import socket
 import threading
-from typing import Callable
+from typing import Callable, List
 
-from core.constants import SINGLE_INSTANCE_HOST, SINGLE_INSTANCE_PORT
+from core.constants import (
+    SINGLE_INSTANCE_HOST,
+    SINGLE_INSTANCE_PORT,
+    SINGLE_INSTANCE_READ_TIMEOUT_S,
+)
 from core.utils import log_message
 
 
@@ -44,7 +48,8 @@ class SingleInstance:
             sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
         try:
             sock.bind((self.host, self.port))
-            sock.listen(5)
+            # 多选右键菜单会同时启动多个进程转发路径，积压队列需足够长。
+            sock.listen(socket.SOMAXCONN)
             self.server_socket = sock
             return True
         except OSError:
@@ -53,7 +58,7 @@ class SingleInstance:
 
     def start_accepting(self, handler: Callable[[str], None]) -> None:
         """
-        在后台线程接受连接，读取路径字符串并交给回调。
+        在后台线程接受连接，读取到对端关闭为止的完整载荷并交给回调。
 
         Args:
             handler: 收到新路径字符串时的回调。
@@ -68,8 +73,14 @@ class SingleInstance:
                 except OSError:
                     break
                 try:
-                    data: bytes = conn.recv(4096)
-                    payload: str = data.decode("utf-8").strip()
+                    conn.settimeout(SINGLE_INSTANCE_READ_TIMEOUT_S)
+                    chunks: List[bytes] = []
+                    while True:
+                        chunk: bytes = conn.recv(4096)
+                        if not chunk:
+                            break
+                        chunks.append(chunk)
+                    payload: str = b"".join(chunks).decode("utf-8").strip()
                     if payload and handler:
                         handler(payload)
                 except Exception as exc:  # noqa: BLE001
@@ -0,0 +1,337 @@
+"""
+目录大小统计：并行递归计算子树的字节数与项目数，每个目录自身的统计按修改时间
+缓存并持久化到配置目录，子树一完成就产出结果，表格可逐行显示。
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from core.constants import SIZE_CACHE_MAX_ENTRIES, SIZE_UNITS
+from core.ini_service import DesktopIniService
+from core.utils import log_message
+
+# 目录自身的直接内容：(子目录列表, 文件总字节数, 文件数)。
+Listing = Tuple[List[Path], int, int]
+
+
+@dataclass
+class SubtreeSize:
+    """
+    子树统计结果。
+
+    Attributes:
+        size_bytes: 子树中全部文件的字节数。
+        items: 子树中的文件与目录总数（不含目录自身）。
+    """
+
+    size_bytes: int
+    items: int
+
+
+@dataclass
+class _CachedListing:
+    """
+    缓存的目录直接内容。
+
+    Attributes:
+        mtime_ns: 读取时目录自身的修改时间。
+        children: 子目录名称。
+        size_bytes: 直接文件的字节数。
+        files: 直接文件数。
+    """
+
+    __slots__ = ("mtime_ns", "children", "size_bytes", "files")
+
+    mtime_ns: int
+    children: List[str]
+    size_bytes: int
+    files: int
+
+
+class SizeCache:
+    """
+    线程安全的目录内容缓存，按目录修改时间判断是否过期，超出条数时按
+    最近最少使用淘汰，可保存为压缩 JSON 供下次启动沿用。
+
+    目录修改时间只在直接子项增删、改名时变化；文件原地变大变小不会更新它，
+    这类变化在该目录再次增删子项或强制刷新前不会反映到统计中。
+
+    Attributes:
+        path: 持久化文件；None 表示只在内存中缓存。
+        max_entries: 最多缓存的目录数。
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_entries: int = SIZE_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.path: Optional[Path] = path
+        self.max_entries: int = max_entries
+        self._entries: "OrderedDict[str, _CachedListing]" = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+        self._loaded: bool = path is None
+        self._dirty: bool = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ensure_loaded(self) -> None:
+        """
+        首次使用时从文件载入缓存；文件不存在或损坏时从空缓存开始。
+
+        在后台线程中调用，避免启动或导航时读取大文件。
+        """
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            assert self.path is not None
+            try:
+                with gzip.open(self.path, "rt", encoding="utf-8") as handle:
+                    data: object = json.load(handle)
+            except FileNotFoundError:
+                return
+            except (OSError, ValueError) as exc:
+                log_message("WARN", f"size cache ignored: {exc}")
+                return
+            if not isinstance(data, dict):
+                return
+            for key, value in data.items():
+                try:
+                    mtime_ns, children, size_bytes, files = value
+                    self._entries[key] = _CachedListing(
+                        int(mtime_ns),
+                        list(children),
+                        int(size_bytes),
+                        int(files),
+                    )
+                except (TypeError, ValueError):
+                    continue
+
+    def get(self, folder: Path, mtime_ns: int) -> Optional[Listing]:
+        """
+        目录修改时间未变时返回缓存的直接内容。
+
+        Args:
+            folder: 目录路径。
+            mtime_ns: 当前读取到的修改时间。
+
+        Returns:
+            (子目录列表, 文件字节数, 文件数)；未缓存或已过期时返回 None。
+        """
+        key: str = str(folder)
+        with self._lock:
+            entry: Optional[_CachedListing] = self._entries.get(key)
+            if entry is None or entry.mtime_ns != mtime_ns:
+                return None
+            self._entries.move_to_end(key)
+            return (
+                [folder / name for name in entry.children],
+                entry.size_bytes,
+                entry.files,
+            )
+
+    def put(self, folder: Path, mtime_ns: int, listing: Listing) -> None:
+        """
+        保存目录的直接内容，必要时淘汰最久未用的条目。
+
+        Args:
+            folder: 目录路径。
+            mtime_ns: 枚举之前读取的修改时间。
+            listing: (子目录列表, 文件字节数, 文件数)。
+        """
+        children, size_bytes, files = listing
+        key: str = str(folder)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = _CachedListing(
+                mtime_ns, [child.name for child in children], size_bytes, files
+            )
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def save(self) -> None:
+        """
+        有变化时写回文件（先写临时文件再替换），失败时只记录日志。
+        """
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data: Dict[str, list] = {
+                key: [
+                    entry.mtime_ns,
+                    entry.children,
+                    entry.size_bytes,
+                    entry.files,
+                ]
+                for key, entry in self._entries.items()
+            }
+            self._dirty = False
+        temp_path: Path = self.path.with_suffix(".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(
+                temp_path, "wt", encoding="utf-8", compresslevel=1
+            ) as handle:
+                json.dump(data, handle, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except OSError as exc:
+            log_message("WARN", f"size cache not saved: {exc}")
+
+
+@dataclass
+class _Node:
+    """
+    遍历中尚未完成的目录。
+
+    Attributes:
+        parent: 父目录键；遍历起点为 None。
+        report: 是否为调用方请求的目录（完成时产出）。
+        remaining: 尚未完成的子目录数。
+        size_bytes: 已累计的字节数。
+        items: 已累计的项目数。
+    """
+
+    __slots__ = ("parent", "report", "remaining", "size_bytes", "items")
+
+    parent: Optional[str]
+    report: bool
+    remaining: int
+    size_bytes: int
+    items: int
+
+
+def _measure(
+    service: DesktopIniService, cache: SizeCache, folder: Path, force: bool
+) -> Listing:
+    """
+    读取目录的直接内容：修改时间未变时沿用缓存，否则重新枚举并写回缓存。
+    """
+    mtime_ns: int = service.folder_mtime(folder)
+    if not force:
+        cached: Optional[Listing] = cache.get(folder, mtime_ns)
+        if cached is not None:
+            return cached
+    listing: Listing = service.measure_folder(folder)
+    cache.put(folder, mtime_ns, listing)
+    return listing
+
+
+def iter_subtree_sizes(
+    service: DesktopIniService,
+    cache: SizeCache,
+    folders: Iterable[Path],
+    executor: Executor,
+    cancel_event: Optional[threading.Event] = None,
+    force: bool = False,
+) -> Iterator[Tuple[Path, SubtreeSize]]:
+    """
+    并行统计多个目录的子树大小，每个目录的子树一完成就产出。
+
+    所有请求目录共用一次遍历：嵌套的请求目录（多层视图中的父子行）只遍历
+    一次；按深度优先推进，小的子树很快完成，不必等全部目录统计完毕。
+
+    Args:
+        service: desktop.ini 服务（调用方选择优先级）。
+        cache: 目录内容缓存。
+        folders: 需要统计的目录，通常为表格行的顺序。
+        executor: 执行读取的线程池。
+        cancel_event: 设置后尽快停止。
+        force: 为 True 时忽略缓存重新枚举（用于刷新）。
+
+    Yields:
+        (目录, 子树统计)；无法读取的目录按空目录计。
+    """
+    requested: List[Path] = list(folders)
+    if not requested:
+        return
+    cache.ensure_loaded()
+    wanted: Set[str] = {str(folder) for folder in requested}
+    nodes: Dict[str, _Node] = {}
+    pending: List[Path] = []
+    for folder in reversed(requested):
+        key: str = str(folder)
+        if key in nodes or any(str(p) in wanted for p in folder.parents):
+            continue
+        nodes[key] = _Node(None, True, 0, 0, 0)
+        pending.append(folder)
+    anchor: Path = requested[0]
+    in_flight: Dict[Future, Path] = {}
+    while pending or in_flight:
+        if cancel_event is not None and cancel_event.is_set():
+            for future in in_flight:
+                future.cancel()
+            return
+        # 在途上限每轮重新求值，跟随并发自动调节的结果。
+        limit: int = service.in_flight_limit(anchor)
+        while pending and len(in_flight) < limit:
+            folder = pending.pop()
+            in_flight[
+                executor.submit(_measure, service, cache, folder, force)
+            ] = folder
+        done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+        for future in done:
+            key = str(in_flight.pop(future))
+            try:
+                children, size_bytes, files = future.result()
+            except OSError:
+                children, size_bytes, files = [], 0, 0
+            node: _Node = nodes[key]
+            node.size_bytes += size_bytes
+            node.items += files + len(children)
+            node.remaining = len(children)
+            for child in reversed(children):
+                child_key: str = str(child)
+                nodes[child_key] = _Node(key, child_key in wanted, 0, 0, 0)
+                pending.append(child)
+            if not children:
+                yield from _complete(nodes, key)
+
+
+def _complete(
+    nodes: Dict[str, _Node], key: str
+) -> Iterator[Tuple[Path, SubtreeSize]]:
+    """
+    目录完成后产出（若被请求）并把统计加到父目录，父目录随之完成时继续向上。
+    """
+    current: Optional[str] = key
+    while current is not None:
+        node: _Node = nodes.pop(current)
+        if node.report:
+            yield Path(current), SubtreeSize(node.size_bytes, node.items)
+        if node.parent is None:
+            return
+        parent: _Node = nodes[node.parent]
+        parent.size_bytes += node.size_bytes
+        parent.items += node.items
+        parent.remaining -= 1
+        current = node.parent if parent.remaining == 0 else None
+
+
+def format_size(size_bytes: int) -> str:
+    """
+    把字节数格式化为便于阅读的文本，例如 ``1.5 GB``。
+
+    Args:
+        size_bytes: 字节数。
+    """
+    if size_bytes < 1024:
+        return f"{size_bytes} {SIZE_UNITS[0]}"
+    value: float = float(size_bytes)
+    for unit in SIZE_UNITS[1:]:
+        value /= 1024
+        if value < 1024 or unit == SIZE_UNITS[-1]:
+            break
+    return f"{value:.1f} {unit}"
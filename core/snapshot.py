@@ -0,0 +1,370 @@
+"""
+备注快照：把整棵子树的备注保存为有序压缩文本，并以流式归并比较、恢复。
+
+文件格式为 gzip 压缩的 utf-8 文本：首行为
+``#desktopini-snapshot<TAB>版本<TAB>根目录<TAB>最大深度``（不限深度时为空），
+其余每行 ``相对路径<TAB>备注``，只记录带备注的目录。相对路径以 ``/`` 分隔，
+按逐级目录名（不区分大小写）排序，与深度优先遍历的先序一致，
+因此写入、比较和恢复都无需把整棵树载入内存。
+"""
+from __future__ import annotations
+
+import gzip
+import os
+import re
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from core.async_scan import AsyncScanner
+from core.constants import (
+    SNAPSHOT_MAGIC,
+    SNAPSHOT_READABLE_VERSIONS,
+    SNAPSHOT_VERSION,
+)
+from core.ini_service import DesktopIniService
+
+DIFF_ADDED = "added"
+DIFF_REMOVED = "removed"
+DIFF_CHANGED = "changed"
+
+# 字段内需要转义的字符。
+_ESCAPES = {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"}
+_UNESCAPES = {value[1]: key for key, value in _ESCAPES.items()}
+_ESCAPE_PATTERN = re.compile(r"[\\\t\n\r]")
+_UNESCAPE_PATTERN = re.compile(r"\\(.)")
+
+SortKey = Tuple[Tuple[str, str], ...]
+
+
+class SnapshotError(ValueError):
+    """
+    快照文件损坏、版本不符或顺序错误。
+
+    Attributes:
+        line_no: 出错的行号（从 1 开始）；文件级错误为 0。
+    """
+
+    def __init__(self, line_no: int, message: str) -> None:
+        super().__init__(
+            f"第 {line_no} 行：{message}" if line_no else message
+        )
+        self.line_no: int = line_no
+
+
+@dataclass
+class RemarkDiff:
+    """
+    两个备注状态之间的一处差异。
+
+    Attributes:
+        path: 相对根目录的路径（``/`` 分隔）。
+        old: 左侧（旧）备注；为空表示新增。
+        new: 右侧（新）备注；为空表示删除。
+    """
+
+    __slots__ = ("path", "old", "new")
+
+    path: str
+    old: str
+    new: str
+
+    @property
+    def kind(self) -> str:
+        """
+        差异类型：``added``、``removed`` 或 ``changed``。
+        """
+        if not self.old:
+            return DIFF_ADDED
+        if not self.new:
+            return DIFF_REMOVED
+        return DIFF_CHANGED
+
+
+@dataclass
+class SnapshotHeader:
+    """
+    快照文件头。
+
+    Attributes:
+        root: 拍摄快照时的根目录。
+        max_depth: 拍摄时的最大深度；None 表示不限。与实时树比较或恢复时
+            必须按同一深度遍历，否则更深的目录会被当作删除。
+    """
+
+    root: str
+    max_depth: Optional[int] = None
+
+
+def path_sort_key(relative: str) -> SortKey:
+    """
+    快照路径的排序键：逐级比较目录名，先不区分大小写、再区分。
+
+    父目录的键是子目录键的前缀，因此排序结果等于按名称排序的深度优先先序。
+
+    Args:
+        relative: ``/`` 分隔的相对路径。
+
+    Returns:
+        可比较的元组。
+    """
+    return tuple((part.lower(), part) for part in relative.split("/"))
+
+
+def _escape(text: str) -> str:
+    """把反斜杠、制表符、换行与回车依次写成 ``\\\\``、``\\t``、``\\n``、``\\r``。"""
+    return _ESCAPE_PATTERN.sub(lambda match: _ESCAPES[match.group()], text)
+
+
+def _unescape(text: str) -> str:
+    """还原 ``_escape`` 的转义：``\\X`` 按上述映射还原，未知的转义还原为 X。"""
+    return _UNESCAPE_PATTERN.sub(
+        lambda match: _UNESCAPES.get(match.group(1), match.group(1)), text
+    )
+
+
+def _iter_sorted_tree(
+    service: DesktopIniService,
+    root: Path,
+    max_depth: Optional[int] = None,
+) -> Iterator[Tuple[str, Path]]:
+    """
+    按快照顺序（深度优先先序、名称不区分大小写）遍历子树。
+
+    Args:
+        service: desktop.ini 服务。
+        root: 遍历起点（自身不产出）。
+        max_depth: 最大深度；None 表示不限。
+
+    Yields:
+        (相对路径, 目录路径) 二元组。
+    """
+    stack: List[Tuple[str, Path, int]] = [("", root, 0)]
+    while stack:
+        relative, folder, depth = stack.pop()
+        if relative:
+            yield relative, folder
+        if max_depth is not None and depth >= max_depth:
+            continue
+        try:
+            children: List[Path] = service.list_subfolders(folder)
+        except OSError:
+            continue
+        children.sort(key=lambda child: (child.name.lower(), child.name))
+        for child in reversed(children):
+            child_relative: str = (
+                f"{relative}/{child.name}" if relative else child.name
+            )
+            stack.append((child_relative, child, depth + 1))
+
+
+def iter_live(
+    service: DesktopIniService,
+    root: Path,
+    executor: Executor,
+    max_depth: Optional[int] = None,
+) -> Iterator[Tuple[str, str]]:
+    """
+    按快照顺序流式读取实时目录树的备注，读取在线程池中并行、产出保持有序。
+
+    Args:
+        service: desktop.ini 服务。
+        root: 扫描根目录（自身不产出）。
+        executor: 执行读取的线程池。
+        max_depth: 最大深度；None 表示不限。
+
+    Yields:
+        (相对路径, 备注) 二元组，只包含带备注的目录。
+    """
+    scanner: AsyncScanner = AsyncScanner(service, executor)
+    for (relative, _), future in scanner.map_ordered(
+        root,
+        lambda item: service.read_info_tip(item[1]),
+        _iter_sorted_tree(service, root, max_depth),
+    ):
+        try:
+            remark: str = future.result()
+        except OSError:
+            continue
+        if remark:
+            yield relative, remark
+
+
+def write_snapshot(
+    target: Path,
+    root: Path,
+    entries: Iterable[Tuple[str, str]],
+    max_depth: Optional[int] = None,
+) -> int:
+    """
+    流式写出快照；先写临时文件，完成后再替换目标，避免中断留下半个文件。
+
+    Args:
+        target: 快照文件路径。
+        root: 扫描根目录，记录在文件头中供恢复时参考。
+        entries: 按快照顺序排列的 (相对路径, 备注)。
+        max_depth: entries 的扫描深度，记录在文件头中；None 表示不限。
+
+    Returns:
+        写入的条目数。
+    """
+    temp: Path = target.with_name(target.name + ".tmp")
+    count: int = 0
+    with gzip.open(temp, "wt", encoding="utf-8", newline="\n") as handle:
+        depth: str = "" if max_depth is None else str(max_depth)
+        handle.write(
+            f"{SNAPSHOT_MAGIC}\t{SNAPSHOT_VERSION}\t{_escape(str(root))}"
+            f"\t{depth}\n"
+        )
+        for relative, remark in entries:
+            handle.write(f"{_escape(relative)}\t{_escape(remark)}\n")
+            count += 1
+    os.replace(temp, target)
+    return count
+
+
+def read_snapshot_header(source: Path) -> SnapshotHeader:
+    """
+    读取快照文件头中记录的根目录与扫描深度。
+
+    Args:
+        source: 快照文件路径。
+
+    Returns:
+        快照文件头。
+
+    Raises:
+        SnapshotError: 文件头无效或版本不支持。
+    """
+    with gzip.open(source, "rt", encoding="utf-8", newline="\n") as handle:
+        return _parse_header(handle.readline())
+
+
+def _parse_header(line: str) -> SnapshotHeader:
+    """
+    校验文件头并解析根目录与深度；旧版本文件没有深度字段，视为不限。
+
+    Args:
+        line: 首行文本。
+
+    Raises:
+        SnapshotError: 文件头无效或版本不支持。
+    """
+    parts: List[str] = line.rstrip("\n").split("\t")
+    if len(parts) not in (3, 4) or parts[0] != SNAPSHOT_MAGIC:
+        raise SnapshotError(0, "不是备注快照文件")
+    if parts[1] not in SNAPSHOT_READABLE_VERSIONS:
+        raise SnapshotError(0, f"不支持的快照版本：{parts[1]}")
+    max_depth: Optional[int] = None
+    if len(parts) == 4 and parts[3]:
+        if not parts[3].isdigit():
+            raise SnapshotError(0, f"快照深度无效：{parts[3]}")
+        max_depth = int(parts[3])
+    return SnapshotHeader(_unescape(parts[2]), max_depth)
+
+
+def iter_snapshot(
+    source: Path, max_depth: Optional[int] = None
+) -> Iterator[Tuple[str, str]]:
+    """
+    流式读取快照条目，同时校验格式与顺序。
+
+    Args:
+        source: 快照文件路径。
+        max_depth: 只产出不深于此的条目，用于与较浅的快照或实时树比较；
+            None 表示全部产出。
+
+    Yields:
+        (相对路径, 备注) 二元组。
+
+    Raises:
+        SnapshotError: 文件头无效、行格式错误或条目未按顺序排列。
+        OSError: 文件无法读取或 gzip 数据损坏。
+    """
+    with gzip.open(source, "rt", encoding="utf-8", newline="\n") as handle:
+        _parse_header(handle.readline())
+        previous: Optional[SortKey] = None
+        for line_no, line in enumerate(handle, start=2):
+            fields: List[str] = line.rstrip("\n").split("\t")
+            if len(fields) != 2 or not fields[0]:
+                raise SnapshotError(line_no, "格式错误")
+            relative: str = _unescape(fields[0])
+            key: SortKey = path_sort_key(relative)
+            if previous is not None and key <= previous:
+                raise SnapshotError(line_no, f"条目顺序错误：{relative}")
+            previous = key
+            if max_depth is None or len(key) <= max_depth:
+                yield relative, _unescape(fields[1])
+
+
+def common_depth(*depths: Optional[int]) -> Optional[int]:
+    """
+    多个备注状态可以比较的深度：取最浅者，None 表示不限。
+
+    Args:
+        depths: 各状态的扫描深度。
+
+    Returns:
+        共同深度；全部不限时为 None。
+    """
+    limited: List[int] = [depth for depth in depths if depth is not None]
+    return min(limited) if limited else None
+
+
+def diff_entries(
+    left: Iterable[Tuple[str, str]], right: Iterable[Tuple[str, str]]
+) -> Iterator[RemarkDiff]:
+    """
+    对两个按快照顺序排列的备注流做归并比较，内存占用与条目数无关。
+
+    Args:
+        left: 旧状态。
+        right: 新状态。
+
+    Yields:
+        按路径顺序排列的差异。
+    """
+    left_iter: Iterator[Tuple[str, str]] = iter(left)
+    right_iter: Iterator[Tuple[str, str]] = iter(right)
+    left_path, left_remark, left_key = _next_entry(left_iter)
+    right_path, right_remark, right_key = _next_entry(right_iter)
+    while left_key is not None or right_key is not None:
+        order: int = _compare_keys(left_key, right_key)
+        if order < 0:
+            yield RemarkDiff(left_path, left_remark, "")
+            left_path, left_remark, left_key = _next_entry(left_iter)
+        elif order > 0:
+            yield RemarkDiff(right_path, "", right_remark)
+            right_path, right_remark, right_key = _next_entry(right_iter)
+        else:
+            if left_remark != right_remark:
+                yield RemarkDiff(left_path, left_remark, right_remark)
+            left_path, left_remark, left_key = _next_entry(left_iter)
+            right_path, right_remark, right_key = _next_entry(right_iter)
+
+
+def _next_entry(
+    entries: Iterator[Tuple[str, str]]
+) -> Tuple[str, str, Optional[SortKey]]:
+    """
+    取出下一条目并计算排序键；流结束时排序键为 None。
+    """
+    entry: Optional[Tuple[str, str]] = next(entries, None)
+    if entry is None:
+        return "", "", None
+    return entry[0], entry[1], path_sort_key(entry[0])
+
+
+def _compare_keys(left: Optional[SortKey], right: Optional[SortKey]) -> int:
+    """
+    比较两个排序键，已结束的流（None）视为无穷大。
+
+    Returns:
+        负数表示左侧在前，正数表示右侧在前，0 表示同一路径。
+    """
+    if right is None:
+        return -1
+    if left is None:
+        return 1
+    return (left > right) - (left < right)
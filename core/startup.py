@@ -0,0 +1,107 @@
+"""
+启动数据预读：在后台线程枚举盘符、探测初始路径并读取根目录，
+界面先完成首帧绘制，再用预读结果一次性填充目录树与表格。
+"""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from core.async_scan import AsyncScanner
+from core.constants import TREE_PAGE_SIZE
+from core.ini_service import DesktopIniService, IniVersion
+from core.probe import KIND_FILE, PathProbe, PathUnreachableError
+from core.utils import list_drives, log_message
+
+
+@dataclass
+class StartupState:
+    """
+    启动预读结果。
+
+    Attributes:
+        drives: 可用盘符；为空时无法启动。
+        root: 初始展示的目录；没有盘符时为 None。
+        folders: 根目录的子目录；读取失败时为 None。
+        remarks: 与 folders 对应的备注。
+        versions: 与 remarks 对应的 desktop.ini 版本，保存时用于并发检查。
+        children: 首屏子目录各自的子目录列表，用于决定懒加载占位符。
+        warning: 初始路径不可达时的提示。
+    """
+
+    drives: List[str]
+    root: Optional[Path] = None
+    folders: Optional[List[Path]] = None
+    remarks: Optional[List[str]] = None
+    versions: Optional[List[Optional[IniVersion]]] = None
+    children: Dict[Path, List[Path]] = field(default_factory=dict)
+    warning: Optional[str] = None
+
+
+def load_startup_state(
+    service: DesktopIniService,
+    probe: PathProbe,
+    executor: Executor,
+    initial_path: Optional[Path] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> StartupState:
+    """
+    预读启动所需的数据，在工作线程中调用。
+
+    初始路径不存在或不可达时回退到第一块盘符；根目录的备注与首屏子目录的
+    列表并行读取，填充界面时全部命中缓存，不再在主线程访问磁盘。
+
+    Args:
+        service: desktop.ini 服务。
+        probe: 路径探测器，用于限时探测初始路径。
+        executor: 并行读取用的线程池。
+        initial_path: 启动参数传入的路径。
+        cancel_event: 设置后尽快返回已读取的部分。
+
+    Returns:
+        预读结果。
+    """
+    state: StartupState = StartupState(drives=list_drives())
+    if not state.drives:
+        return state
+    root: Path = Path(state.drives[0])
+    if initial_path is not None:
+        try:
+            kind: Optional[str] = probe.kind(initial_path)
+        except PathUnreachableError as exc:
+            state.warning = f"{exc}"
+        else:
+            if kind == KIND_FILE:
+                root = initial_path.parent
+            elif kind is not None:
+                root = initial_path
+    state.root = root
+
+    try:
+        folders: List[Path] = service.list_subfolders(root)
+    except OSError as exc:
+        log_message("WARN", f"startup root unreadable: {exc}")
+        return state
+    scanner: AsyncScanner = AsyncScanner(service, executor)
+    remarks: List[str] = []
+    versions: List[Optional[IniVersion]] = []
+    for _, future in scanner.map_ordered(root, service.read_remark, folders):
+        remark, version = future.result()
+        remarks.append(remark)
+        versions.append(version)
+    state.folders = folders
+    state.remarks = remarks
+    state.versions = versions
+    if cancel_event is not None and cancel_event.is_set():
+        return state
+    for folder, future in scanner.map_ordered(
+        root, service.list_subfolders, folders[:TREE_PAGE_SIZE]
+    ):
+        try:
+            state.children[folder] = future.result()
+        except OSError:
+            continue
+    return state
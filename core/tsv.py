@@ -0,0 +1,172 @@
+"""
+表格与电子表格之间的 TSV 剪贴板往返：按 Excel 的制表符格式生成与解析
+(名称, 备注, 路径) 行，并按路径或名称把粘贴的行匹配到表格行。不依赖 Tk。
+"""
+from __future__ import annotations
+
+import csv
+import io
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.constants import (
+    COLUMN_HEADER_NAME,
+    COLUMN_HEADER_PATH,
+    COLUMN_HEADER_REMARK,
+)
+from core.row_store import RowStore
+
+# 一行 TSV：(名称, 备注, 完整路径)；粘贴的数据没有路径列时路径为空。
+TsvRow = Tuple[str, str, str]
+
+TSV_HEADER: TsvRow = (
+    COLUMN_HEADER_NAME,
+    COLUMN_HEADER_REMARK,
+    COLUMN_HEADER_PATH,
+)
+
+# 名称索引中出现多次的名称，无法据此唯一定位行。
+_AMBIGUOUS: int = -1
+
+
+def format_tsv(rows: Iterable[TsvRow]) -> str:
+    """
+    生成可直接粘贴到 Excel 的 TSV 文本，首行为列标题。
+
+    含制表符、换行或引号的值按 Excel 的规则加引号转义。
+
+    Args:
+        rows: (名称, 备注, 路径) 的可迭代对象。
+
+    Returns:
+        以 CRLF 分行的 TSV 文本。
+    """
+    buffer: io.StringIO = io.StringIO()
+    writer = csv.writer(buffer, dialect="excel-tab")
+    writer.writerow(TSV_HEADER)
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def parse_tsv(text: str) -> List[TsvRow]:
+    """
+    一次遍历解析从电子表格复制的 TSV 文本。
+
+    至少需要名称与备注两列，第三列为完整路径（可省略）；与 ``TSV_HEADER``
+    相同的标题行、空行与只有一列的行会被跳过，多余的列被忽略。
+
+    Args:
+        text: 剪贴板文本，CRLF 与 LF 换行均可。
+
+    Returns:
+        (名称, 备注, 路径) 列表，名称与路径已去除首尾空白，备注保持原样。
+
+    Raises:
+        csv.Error: 文本无法按 TSV 解析（例如包含 NUL 字符）。
+    """
+    parsed: List[TsvRow] = []
+    reader = csv.reader(io.StringIO(text, newline=None), dialect="excel-tab")
+    for cells in reader:
+        if len(cells) < 2:
+            continue
+        name: str = cells[0].strip()
+        path: str = cells[2].strip() if len(cells) > 2 else ""
+        if not name and not path:
+            continue
+        parsed.append((name, cells[1], path))
+    if parsed and parsed[0][:2] == TSV_HEADER[:2]:
+        del parsed[0]
+    return parsed
+
+
+@dataclass
+class TsvMatch:
+    """
+    粘贴行与表格行的匹配结果。
+
+    Attributes:
+        updates: 需要修改的行号到新备注。
+        unchanged: 已匹配但备注与当前值相同的行数。
+        unmatched: 没有找到对应行的名称或路径。
+        ambiguous: 只有名称且名称对应多行的名称。
+    """
+
+    updates: Dict[int, str] = field(default_factory=dict)
+    unchanged: int = 0
+    unmatched: List[str] = field(default_factory=list)
+    ambiguous: List[str] = field(default_factory=list)
+
+
+def _key(text: str) -> str:
+    """
+    Windows 路径与名称不区分大小写，统一分隔符与大小写后比较。
+    """
+    return os.path.normcase(text)
+
+
+def match_tsv_rows(
+    store: RowStore, row_ids: Iterable[int], pasted: List[TsvRow]
+) -> TsvMatch:
+    """
+    把粘贴的行匹配到表格行。
+
+    有路径时按完整路径匹配；没有路径或路径不在表格中时按名称匹配，名称可以是
+    表格中的相对路径或目录名，目录名在多层视图中对应多行时视为有歧义。
+    同一行被粘贴多次时以最后一次为准。
+
+    Args:
+        store: 表格对应的行存储。
+        row_ids: 参与匹配的行号（通常为当前可见行）。
+        pasted: ``parse_tsv`` 的结果。
+
+    Returns:
+        匹配结果。
+    """
+    ids: List[int] = list(row_ids)
+    path_index: Dict[str, int] = {
+        _key(store.path(row_id)): row_id for row_id in ids
+    }
+    # 名称索引只在有行需要按名称匹配时才建立。
+    relative_index: Dict[str, int] = {}
+    name_index: Dict[str, int] = {}
+    matched: Dict[int, str] = {}
+    result: TsvMatch = TsvMatch()
+    for name, remark, path in pasted:
+        found: Optional[int] = path_index.get(_key(path)) if path else None
+        if found is None and name:
+            if not relative_index:
+                _build_name_indexes(store, ids, relative_index, name_index)
+            key: str = _key(name)
+            found = relative_index.get(key)
+            if found is None:
+                found = name_index.get(key)
+        if found is None:
+            result.unmatched.append(path or name)
+        elif found == _AMBIGUOUS:
+            result.ambiguous.append(name)
+        else:
+            matched[found] = remark
+    for found, remark in matched.items():
+        if remark == store.current[found]:
+            result.unchanged += 1
+        else:
+            result.updates[found] = remark
+    return result
+
+
+def _build_name_indexes(
+    store: RowStore,
+    row_ids: List[int],
+    relative_index: Dict[str, int],
+    name_index: Dict[str, int],
+) -> None:
+    """
+    填充相对路径索引与目录名索引，重复的目录名记为有歧义。
+    """
+    for row_id in row_ids:
+        relative_index[_key(store.relative_path(row_id))] = row_id
+        folder_name: str = _key(store.names[row_id])
+        name_index[folder_name] = (
+            row_id if folder_name not in name_index else _AMBIGUOUS
+        )
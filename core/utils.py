@@ -4,17 +4,20 @@
 from __future__ import annotations
 
 import ctypes
+import io
 import os
 import tempfile
 from configparser import ConfigParser
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Sequence
 
 from core.constants import (
     FILE_ATTRIBUTE_HIDDEN,
     FILE_ATTRIBUTE_SYSTEM,
+    CONFIG_DIR_NAME,
     INVALID_FILE_ATTRIBUTES,
+    LOG_FILE_NAME,
 )
 
 
@@ -88,30 +91,53 @@ def safe_read_config(ini_path: Path) -> ConfigParser:
     Returns:
         已加载内容的 ConfigParser；若读取失败则为空实例。
     """
+    try:
+        data: bytes = ini_path.read_bytes()
+    except OSError:
+        parser: ConfigParser = ConfigParser()
+        parser.optionxform = str
+        return parser
+    return parse_config_bytes(data)
+
+
+def parse_config_bytes(data: bytes) -> ConfigParser:
+    """
+    按 desktop.ini 常见编码依次尝试解析原始内容，全部失败时返回空配置。
+
+    Args:
+        data: desktop.ini 的原始字节。
+
+    Returns:
+        已加载内容的 ConfigParser。
+    """
     parser: ConfigParser = ConfigParser()
     parser.optionxform = str
-    if not ini_path.exists():
-        return parser
     for encoding in ("utf-16", "utf-8-sig", "mbcs"):
         try:
-            text: str = ini_path.read_text(encoding=encoding)
-            parser.read_string(text)
+            text: str = data.decode(encoding)
+            parser.read_file(io.StringIO(text, newline=None))
             return parser
         except Exception:
+            parser = ConfigParser()
+            parser.optionxform = str
             continue
     return parser
 
 
-def write_config(ini_path: Path, parser: ConfigParser) -> None:
+def format_config(parser: ConfigParser) -> bytes:
     """
-    使用 utf-16 持久化 desktop.ini，保持与资源管理器一致的编码。
+    把配置序列化为 desktop.ini 的内容：utf-16 编码、CRLF 换行，
+    与资源管理器写出的格式一致。
 
     Args:
-        ini_path: 目标 desktop.ini 路径。
         parser: 已填充的配置对象。
+
+    Returns:
+        带 BOM 的 utf-16 字节。
     """
-    with ini_path.open("w", encoding="utf-16") as ini_file:
-        parser.write(ini_file)
+    buffer: io.StringIO = io.StringIO(newline="\r\n")
+    parser.write(buffer)
+    return buffer.getvalue().encode("utf-16")
 
 
 def ensure_folder_system(folder: Path) -> None:
@@ -148,6 +174,45 @@ def ensure_ini_hidden_system(ini_path: Path) -> None:
         set_file_attributes(ini_path, target)
 
 
+def common_parent(paths: Sequence[Path]) -> Optional[Path]:
+    """
+    计算一组路径的公共上级目录；只有一项时返回它本身。
+
+    Args:
+        paths: 路径列表。
+
+    Returns:
+        公共目录；列表为空或路径分属不同盘符时返回 None。
+    """
+    if not paths:
+        return None
+    try:
+        return Path(os.path.commonpath([str(path) for path in paths]))
+    except ValueError:
+        return None
+
+
+def get_log_dir() -> Path:
+    """
+    返回日志所在目录，性能剖析等诊断文件也统一写入此处。
+
+    Returns:
+        系统临时目录路径。
+    """
+    return Path(tempfile.gettempdir())
+
+
+def get_config_dir() -> Path:
+    """
+    返回跨次运行保存状态（如并发学习结果）的目录，不保证已创建。
+
+    Returns:
+        ``%APPDATA%`` 下的程序目录；未设置该变量时位于用户主目录。
+    """
+    base: str = os.environ.get("APPDATA") or str(Path.home())
+    return Path(base) / CONFIG_DIR_NAME
+
+
 def log_message(level: str, message: str) -> None:
     """
     追加简单日志到系统临时目录，便于问题追踪且不影响主流程。
@@ -160,8 +225,7 @@ def log_message(level: str, message: str) -> None:
         写日志失败时会忽略异常，保证业务逻辑不中断。
     """
     try:
-        log_dir: Path = Path(tempfile.gettempdir())
-        log_file: Path = log_dir / "desktopini_tool.log"
+        log_file: Path = get_log_dir() / LOG_FILE_NAME
         timestamp: str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         with log_file.open("a", encoding="utf-8", errors="ignore") as f:
             f.write(f"{timestamp} [{level}] {message}\n")
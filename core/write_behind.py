@@ -0,0 +1,256 @@
+"""
+自动保存的写回队列：从会话级待保存集合中按目录成批取出修改，
+跟踪写入中、已保存、失败与冲突的状态，写入期间的新修改保留到下一批。
+"""
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from core.async_scan import AsyncScanner
+from core.constants import (
+    ROW_STATE_CONFLICT,
+    ROW_STATE_FAILED,
+    ROW_STATE_PENDING,
+    ROW_STATE_SAVED,
+)
+from core.ini_service import DesktopIniService, IniVersion, RemarkConflictError
+from core.pending import PendingChanges
+
+# 一项写入结果：(路径, 写入的备注, 写入后的版本, 异常)；成功时异常为 None。
+WriteResult = Tuple[str, str, Optional[IniVersion], Optional[BaseException]]
+
+
+class WriteBehindQueue:
+    """
+    建立在 ``PendingChanges`` 之上的写回队列。
+
+    同一目录的多次修改在待保存集合中按路径合并，只保留最后的值；
+    队列只负责决定哪些路径本批写入、记录每个路径的状态。写入中的路径
+    不会再次被取出，写入期间用户又改了值时，写入完成后新值仍保留待写。
+    失败的路径不自动重试，直到再次修改或手动保存；发生冲突（磁盘上的备注
+    已被他人修改）的路径在用户选择保留哪一方之前不再写入。
+    本类不加锁，所有方法都在主线程调用。
+
+    Attributes:
+        pending: 会话级待保存集合（与手动保存共用）。
+        in_flight: 正在写入的路径到 (取出时的磁盘备注, 写入值)。
+        failures: 最近一次写入失败的路径到原因。
+        conflicts: 写入前发现被他人修改的路径到冲突详情。
+        saved: 本次会话中由写回成功保存的路径。
+    """
+
+    def __init__(self, pending: PendingChanges) -> None:
+        self.pending: PendingChanges = pending
+        self.in_flight: Dict[str, Tuple[str, str]] = {}
+        self.failures: Dict[str, str] = {}
+        self.conflicts: Dict[str, RemarkConflictError] = {}
+        self.saved: Set[str] = set()
+
+    def ready_count(self) -> int:
+        """
+        统计可以立即写入的路径数（不含写入中、失败与冲突待处理的）。
+        """
+        return sum(1 for path in self.pending.changes if self._ready(path))
+
+    def take_batch(self, limit: int) -> List[Tuple[str, str]]:
+        """
+        取出下一批待写入项并标记为写入中。
+
+        按路径排序后以父目录为单位整组取出，同一目录的写入在同一批内相邻；
+        达到 limit 后停止（第一组超过 limit 时只取前 limit 项）。
+
+        Args:
+            limit: 本批最多的项数。
+
+        Returns:
+            (路径, 待写入备注) 列表；没有可写项时为空。
+        """
+        groups: Dict[str, List[Tuple[str, str]]] = {}
+        for path, remark in self.pending.sorted_items():
+            if not self._ready(path):
+                continue
+            groups.setdefault(os.path.dirname(path), []).append((path, remark))
+        batch: List[Tuple[str, str]] = []
+        for items in groups.values():
+            if batch and len(batch) + len(items) > limit:
+                break
+            batch.extend(items)
+            if len(batch) >= limit:
+                break
+        batch = batch[:limit]
+        for path, remark in batch:
+            self.in_flight[path] = (self.pending.changes[path][0], remark)
+        return batch
+
+    def edited(self, path: str) -> None:
+        """
+        路径被再次修改：清除失败与已保存状态，下一批重新写入。
+
+        Args:
+            path: 目录完整路径。
+        """
+        self.failures.pop(path, None)
+        self.saved.discard(path)
+
+    def complete(
+        self,
+        path: str,
+        remark: str,
+        error: Optional[BaseException],
+        version: Optional[IniVersion] = None,
+    ) -> bool:
+        """
+        记录一次写入的结果（写回与手动保存共用）。
+
+        Args:
+            path: 目录完整路径。
+            remark: 已写入（或尝试写入）的备注。
+            error: 写入抛出的异常；成功时为 None。
+            version: 写入后 desktop.ini 的版本。
+
+        Returns:
+            True 表示磁盘值已是最新修改，可把对应行标记为已保存。
+        """
+        flight: Optional[Tuple[str, str]] = self.in_flight.pop(path, None)
+        if isinstance(error, RemarkConflictError):
+            self.conflicts[path] = error
+            return False
+        if error is not None:
+            self.failures[path] = str(error)
+            return False
+        self.failures.pop(path, None)
+        self.conflicts.pop(path, None)
+        latest: Optional[str] = self.pending.pending_remark(path)
+        if latest is None and flight is not None:
+            # 写入期间修改被改回原值：需要把原值再写回去。
+            self.pending.stage(path, remark, flight[0], version)
+            return False
+        if latest is not None and latest != remark:
+            # 写入期间又有新修改：以刚写入的值作为磁盘值，新值留待下一批。
+            self.pending.refresh_original(path, remark, version)
+            return False
+        self.pending.discard(path)
+        self.saved.add(path)
+        return True
+
+    def resolve(
+        self, path: str, keep_mine: bool
+    ) -> Optional[RemarkConflictError]:
+        """
+        按用户选择解决一项冲突。
+
+        保留自己的修改时以磁盘上的新备注与版本作为比对基准重新登记，
+        下一次写入会覆盖他人的修改（期间若再次被改仍会报冲突）；
+        采用磁盘备注时撤销本地修改。
+
+        Args:
+            path: 目录完整路径。
+            keep_mine: True 保留本地修改，False 采用磁盘上的备注。
+
+        Returns:
+            被解决的冲突，调用方据此同步表格；路径没有冲突时为 None。
+        """
+        conflict: Optional[RemarkConflictError] = self.conflicts.pop(
+            path, None
+        )
+        if conflict is None:
+            return None
+        mine: Optional[str] = self.pending.pending_remark(path)
+        if keep_mine and mine is not None:
+            self.pending.stage(
+                path, conflict.disk_remark, mine, conflict.version
+            )
+        else:
+            self.pending.discard(path)
+        return conflict
+
+    def abandon(self) -> None:
+        """
+        放弃跟踪写入中的路径（写回任务被取消时调用），它们仍留在待保存集合中。
+        """
+        self.in_flight.clear()
+
+    def state(self, path: str) -> Optional[str]:
+        """
+        查询路径的保存状态，用于表格行着色。
+
+        Args:
+            path: 目录完整路径。
+
+        Returns:
+            ``ROW_STATE_CONFLICT``/``ROW_STATE_FAILED``/``ROW_STATE_PENDING``/
+            ``ROW_STATE_SAVED`` 之一；没有修改时返回 None。
+        """
+        if path in self.conflicts:
+            return ROW_STATE_CONFLICT
+        if path in self.failures:
+            return ROW_STATE_FAILED
+        if path in self.pending:
+            return ROW_STATE_PENDING
+        if path in self.saved:
+            return ROW_STATE_SAVED
+        return None
+
+    def _ready(self, path: str) -> bool:
+        """
+        判断路径能否进入下一批写入。
+        """
+        return (
+            path not in self.in_flight
+            and path not in self.failures
+            and path not in self.conflicts
+        )
+
+
+def iter_checked_writes(
+    service: DesktopIniService,
+    executor: Executor,
+    pending: PendingChanges,
+    items: List[Tuple[str, str]],
+    cancel_event: Optional[threading.Event] = None,
+) -> Iterator[WriteResult]:
+    """
+    并行写入一批修改，每项写入前核对磁盘上的备注是否已被他人修改。
+
+    比对基准（读取时的备注与版本）在调用时从待保存集合中取出快照，
+    之后在工作线程中只读快照，不触碰待保存集合。
+
+    Args:
+        service: desktop.ini 服务（调用方选择优先级）。
+        executor: 执行写入的线程池。
+        pending: 待保存集合，提供比对基准。
+        items: (路径, 待写入备注) 列表，通常来自 ``take_batch``。
+        cancel_event: 设置后停止提交新的写入。
+
+    Returns:
+        按完成顺序产出 ``WriteResult`` 的迭代器。
+    """
+    expected: Dict[str, Tuple[str, Optional[IniVersion]]] = {
+        path: pending.expected(path) for path, _ in items
+    }
+
+    def write(item: Tuple[str, str]) -> Optional[IniVersion]:
+        original, version = expected[item[0]]
+        return service.write_info_tip(
+            Path(item[0]), item[1], original, version
+        )
+
+    def produce() -> Iterator[WriteResult]:
+        if not items:
+            return
+        scanner: AsyncScanner = AsyncScanner(service, executor)
+        for (path, remark), future in scanner.map_bounded(
+            Path(items[0][0]), write, items, cancel_event
+        ):
+            try:
+                written: Optional[IniVersion] = future.result()
+            except Exception as exc:
+                yield path, remark, None, exc
+                continue
+            yield path, remark, written, None
+
+    return produce()
@@ -1,13 +1,23 @@
 """
 入口：启动 Tk 界面；运行命令：python main.py
+首个参数为子命令（如 export）时改为执行命令行批处理，见 cli.py。
 """
 from __future__ import annotations
 
+import time
+
+# 启动指标的起点，尽量早于其他导入。
+_STARTED_AT: float = time.perf_counter()
+
+import multiprocessing
+import os
 import sys
 from pathlib import Path
+from typing import List
 
-from ui.main_window import MainApp
-from core.utils import log_message
+from core.constants import CLI_COMMANDS, SELECT_ARG, SELECT_PAYLOAD_PREFIX
+from core.probe import PathUnreachableError, get_default_probe
+from core.utils import common_parent, log_message
 from core.single_instance import SingleInstance
 
 
@@ -26,8 +36,15 @@ def _normalize_path_arg(raw: str) -> tuple[Path | None, str | None]:
         return None, None
     if len(text) == 2 and text.endswith(":"):
         text = text + "\\"
+    # resolve 会访问文件系统，失联的网络共享可能阻塞很久，因此限时执行。
     try:
-        return Path(text).expanduser().resolve(), None
+        candidate: Path = Path(text).expanduser()
+        return get_default_probe().run(candidate, candidate.resolve), None
+    except PathUnreachableError:
+        return (
+            Path(os.path.abspath(text)),
+            "传入路径所在的共享暂时无法访问。",
+        )
     except Exception:
         return None, "传入的路径无效，已回退到默认盘符。"
 
@@ -36,16 +53,32 @@ def main() -> None:
     """
     解析初始路径参数并启动 Tk 主窗口。
     """
+    if len(sys.argv) > 1 and sys.argv[1] in CLI_COMMANDS:
+        from cli import run_cli
+
+        sys.exit(run_cli(sys.argv[1:]))
+
     initial_path: Path | None = None
     initial_warning: str | None = None
-    if len(sys.argv) > 1:
+    selection: List[Path] = []
+    if len(sys.argv) > 2 and sys.argv[1] == SELECT_ARG:
+        # 多选右键菜单：资源管理器按项启动，每个进程带一项（也接受多项）。
+        for raw in sys.argv[2:]:
+            path, warning = _normalize_path_arg(raw)
+            if path is not None:
+                selection.append(path)
+            initial_warning = warning or initial_warning
+        initial_path = common_parent(selection)
+    elif len(sys.argv) > 1:
         initial_path, initial_warning = _normalize_path_arg(sys.argv[1])
-        if initial_warning:
-            log_message("WARN", initial_warning)
+    if initial_warning:
+        log_message("WARN", initial_warning)
 
     # 单实例：尝试作为主实例，失败则转发路径到已运行实例并退出。
     instance: SingleInstance = SingleInstance()
     payload: str = str(initial_path) if initial_path else ""
+    if selection:
+        payload = SELECT_PAYLOAD_PREFIX + "\n".join(map(str, selection))
     if not instance.try_bind():
         if instance.send_payload(payload):
             log_message("INFO", "已将路径交给已运行实例处理，当前进程退出。")
@@ -56,11 +89,21 @@ def main() -> None:
         )
         return
 
-    app: MainApp = MainApp(initial_path, initial_warning)
+    # 界面模块在此导入：转发后即退出的进程与多进程扫描的工作进程都无需加载 Tk。
+    from ui.main_window import MainApp
+
+    app: MainApp = MainApp(
+        initial_path,
+        initial_warning,
+        _STARTED_AT,
+        initial_selection=selection,
+    )
     if instance.server_socket:
         instance.start_accepting(app.handle_external_path)
     app.mainloop()
 
 
 if __name__ == "__main__":
+    # 打包后的 exe 以自身启动多进程扫描的工作进程。
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,126 @@
+"""
+后台任务：在工作线程中消费生成器，把产出分批交回 Tk 主循环处理。
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import tkinter as tk
+from typing import Callable, Generic, Iterable, List, Optional, TypeVar
+
+from core.constants import BACKGROUND_BATCH_LIMIT, BACKGROUND_POLL_MS
+from core.utils import log_message
+
+T = TypeVar("T")
+
+
+class _Finished:
+    """
+    结束标记，携带工作线程中的异常（若有）。
+    """
+
+    def __init__(self, error: Optional[BaseException]) -> None:
+        self.error: Optional[BaseException] = error
+
+
+class BackgroundTask(Generic[T]):
+    """
+    工作线程负责迭代 producer，主线程按固定间隔批量取回结果，
+    保证所有控件操作都发生在 Tk 线程。
+
+    Attributes:
+        widget: 用于调度 after() 的控件；销毁后停止回调。
+        cancel_event: 取消标记，会传给 producer 以便尽快停止。
+    """
+
+    def __init__(
+        self,
+        widget: tk.Misc,
+        producer: Callable[[threading.Event], Iterable[T]],
+        on_batch: Callable[[List[T]], None],
+        on_done: Optional[Callable[[Optional[BaseException]], None]] = None,
+        poll_ms: int = BACKGROUND_POLL_MS,
+    ) -> None:
+        self.widget: tk.Misc = widget
+        self.cancel_event: threading.Event = threading.Event()
+        self._producer: Callable[[threading.Event], Iterable[T]] = producer
+        self._on_batch: Callable[[List[T]], None] = on_batch
+        self._on_done: Optional[
+            Callable[[Optional[BaseException]], None]
+        ] = on_done
+        self._poll_ms: int = poll_ms
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        self._running: bool = False
+
+    @property
+    def running(self) -> bool:
+        """
+        任务是否仍在执行（含尚未取回的结果）。
+        """
+        return self._running
+
+    def start(self) -> None:
+        """
+        启动工作线程并开始轮询结果。
+        """
+        self._running = True
+        thread = threading.Thread(target=self._run, daemon=True)
+        thread.start()
+        self.widget.after(self._poll_ms, self._poll)
+
+    def cancel(self) -> None:
+        """
+        请求取消；之后不再回调 on_batch/on_done。
+        """
+        self.cancel_event.set()
+        self._running = False
+
+    def _run(self) -> None:
+        """
+        工作线程主体：迭代 producer 并把结果放入队列。
+        """
+        error: Optional[BaseException] = None
+        try:
+            for item in self._producer(self.cancel_event):
+                if self.cancel_event.is_set():
+                    break
+                self._queue.put(item)
+        except Exception as exc:
+            log_message("ERROR", f"background task failed: {exc}")
+            error = exc
+        self._queue.put(_Finished(error))
+
+    def _poll(self) -> None:
+        """
+        主线程轮询：取回一批结果交给回调，结束时调用 on_done。
+        """
+        if self.cancel_event.is_set():
+            return
+        try:
+            if not self.widget.winfo_exists():
+                self.cancel()
+                return
+        except tk.TclError:
+            self.cancel()
+            return
+        batch: List[T] = []
+        finished: Optional[_Finished] = None
+        while len(batch) < BACKGROUND_BATCH_LIMIT:
+            try:
+                item: object = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, _Finished):
+                finished = item
+                break
+            batch.append(item)  # type: ignore[arg-type]
+        if batch:
+            self._on_batch(batch)
+        if finished is not None:
+            self._running = False
+            if self._on_done:
+                self._on_done(finished.error)
+            return
+        # 本轮取满说明还有积压，尽快继续取回。
+        delay: int = 1 if len(batch) >= BACKGROUND_BATCH_LIMIT else self._poll_ms
+        self.widget.after(delay, self._poll)
@@ -0,0 +1,103 @@
+"""
+备注冲突对话框：列出保存时发现已被他人修改的目录，批量选择保留哪一方。
+"""
+from __future__ import annotations
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, List, Tuple
+
+from core.constants import (
+    BUTTON_CLOSE,
+    BUTTON_KEEP_MINE,
+    BUTTON_TAKE_THEIRS,
+    COLUMN_HEADER_DISK_REMARK,
+    COLUMN_HEADER_MY_REMARK,
+    COLUMN_HEADER_PATH,
+    MSG_CONFLICTS_HINT,
+    TITLE_CONFLICTS,
+)
+
+# 一项冲突：(目录完整路径, 我的修改, 磁盘上的备注)。
+ConflictRow = Tuple[str, str, str]
+
+
+def conflict_dialog(
+    parent: tk.Tk,
+    conflicts: List[ConflictRow],
+    on_resolve: Callable[[List[str], bool], None],
+) -> tk.Toplevel:
+    """
+    弹出冲突处理对话框（非模态）。
+
+    选中若干行后点击按钮只处理选中项，未选中时处理全部；已处理的行从列表中
+    移除，全部处理完后自动关闭。
+
+    Args:
+        parent: 主窗口引用。
+        conflicts: 待处理的冲突。
+        on_resolve: 处理回调 (路径列表, 是否保留我的修改)。
+
+    Returns:
+        对话框窗口，调用方可据此避免重复打开。
+    """
+    dialog: tk.Toplevel = tk.Toplevel(parent)
+    dialog.title(TITLE_CONFLICTS)
+    dialog.transient(parent)
+    dialog.geometry("900x420")
+
+    ttk.Label(dialog, text=MSG_CONFLICTS_HINT, wraplength=860).pack(
+        anchor=tk.W, padx=10, pady=6
+    )
+    list_frame: ttk.Frame = ttk.Frame(dialog)
+    list_frame.pack(fill=tk.BOTH, expand=True, padx=10)
+    list_frame.rowconfigure(0, weight=1)
+    list_frame.columnconfigure(0, weight=1)
+    table: ttk.Treeview = ttk.Treeview(
+        list_frame,
+        columns=("path", "mine", "theirs"),
+        show="headings",
+        selectmode="extended",
+    )
+    table.heading("path", text=COLUMN_HEADER_PATH)
+    table.heading("mine", text=COLUMN_HEADER_MY_REMARK)
+    table.heading("theirs", text=COLUMN_HEADER_DISK_REMARK)
+    table.column("path", width=420, anchor=tk.W)
+    table.column("mine", width=220, anchor=tk.W)
+    table.column("theirs", width=220, anchor=tk.W)
+    scroll: tk.Scrollbar = tk.Scrollbar(
+        list_frame,
+        orient=tk.VERTICAL,
+        command=table.yview,
+        width=18,
+        relief=tk.SUNKEN,
+        borderwidth=1,
+    )
+    table.configure(yscrollcommand=scroll.set)
+    table.grid(row=0, column=0, sticky="nsew")
+    scroll.grid(row=0, column=1, sticky="ns")
+    for index, (path, mine, theirs) in enumerate(conflicts):
+        table.insert("", tk.END, iid=str(index), values=(path, mine, theirs))
+
+    def resolve(keep_mine: bool) -> None:
+        item_ids: List[str] = list(table.selection() or table.get_children())
+        if not item_ids:
+            return
+        on_resolve(
+            [conflicts[int(item_id)][0] for item_id in item_ids], keep_mine
+        )
+        table.delete(*item_ids)
+        if not table.get_children():
+            dialog.destroy()
+
+    button_frame: ttk.Frame = ttk.Frame(dialog)
+    button_frame.pack(fill=tk.X, padx=10, pady=10)
+    for text, command in (
+        (BUTTON_CLOSE, dialog.destroy),
+        (BUTTON_TAKE_THEIRS, lambda: resolve(False)),
+        (BUTTON_KEEP_MINE, lambda: resolve(True)),
+    ):
+        ttk.Button(button_frame, text=text, command=command).pack(
+            side=tk.RIGHT, padx=4
+        )
+    return dialog
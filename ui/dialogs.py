@@ -3,27 +3,54 @@
 """
 from __future__ import annotations
 
+import os
+import tempfile
 import tkinter as tk
+from pathlib import Path
 from tkinter import messagebox, ttk
-from typing import Dict, List, Tuple, Callable
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
-from core.constants import TITLE_ERROR, TITLE_INFO, BUTTON_APPLY, BUTTON_CANCEL
+from core.constants import (
+    TITLE_ERROR,
+    TITLE_INFO,
+    BUTTON_APPLY,
+    BUTTON_CANCEL,
+    BUTTON_EXTERNAL_EDIT,
+    MAPPING_DIALOG_MAX_HEIGHT,
+    MAPPING_FILE_POLL_MS,
+    MAPPING_FILE_PREFIX,
+    MAPPING_INSERT_CHUNK,
+    MSG_MAPPING_EMPTY,
+    MSG_MAPPING_EXTERNAL,
+    MSG_MAPPING_LOADING,
+    MSG_MAPPING_RELOADED,
+)
+from core.mapping import (
+    MappingParseError,
+    format_mapping_lines,
+    parse_mapping_stream,
+    write_mapping_file,
+)
+from core.utils import log_message
 
 
 def mapping_dialog(
     parent: tk.Tk,
     mappings: List[Tuple[str, str, str]],
-    apply_callback: Callable[[tk.Text, tk.Toplevel], None],
+    apply_callback: Callable[[Dict[str, str], tk.Toplevel], None],
     title: str,
     hint: str,
 ) -> None:
     """
     弹出文本映射对话框，让用户批量编辑备注。
 
+    文本框高度有上限，内容分块插入以保证大批量时对话框立即可见；
+    也可导出到临时文件用外部编辑器修改，保存后自动重新解析。
+
     Args:
         parent: 主窗口引用，用于设置模态。
         mappings: 现有映射列表，三元组为 (名称, 备注, 路径)。
-        apply_callback: 点击“应用”时的处理回调。
+        apply_callback: 点击“应用”且解析成功时的处理回调。
         title: 对话框标题。
         hint: 顶部提示文案。
     """
@@ -39,8 +66,9 @@ def mapping_dialog(
     text_widget: tk.Text = tk.Text(
         text_frame,
         width=100,
-        height=max(10, len(mappings)),
+        height=min(max(10, len(mappings)), MAPPING_DIALOG_MAX_HEIGHT),
         wrap=tk.NONE,
+        undo=False,
     )
     y_scroll: tk.Scrollbar = tk.Scrollbar(
         text_frame,
@@ -62,23 +90,235 @@ def mapping_dialog(
     text_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
     y_scroll.pack(side=tk.RIGHT, fill=tk.Y)
     x_scroll.pack(side=tk.BOTTOM, fill=tk.X)
-    text_lines: List[str] = [
-        f"{name}->{remark}" for name, remark, _ in mappings
-    ]
-    text_widget.insert("1.0", "\n".join(text_lines))
 
     button_frame: ttk.Frame = ttk.Frame(dialog)
     button_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+    status_var: tk.StringVar = tk.StringVar(value="")
+    ttk.Label(button_frame, textvariable=status_var).pack(side=tk.LEFT)
 
     def on_apply() -> None:
-        apply_callback(text_widget, dialog)
+        mapping_dict: Dict[str, str]
+        if external.mapping is not None and not text_widget.edit_modified():
+            mapping_dict = external.mapping
+            if not mapping_dict:
+                messagebox.showinfo(TITLE_INFO, MSG_MAPPING_EMPTY, parent=dialog)
+                return
+        else:
+            mapping_dict = parse_mapping_lines(text_widget, dialog)
+            if not mapping_dict:
+                return
+        apply_callback(mapping_dict, dialog)
 
-    ttk.Button(button_frame, text=BUTTON_APPLY, command=on_apply).pack(
-        side=tk.RIGHT, padx=4
+    apply_button: ttk.Button = ttk.Button(
+        button_frame, text=BUTTON_APPLY, command=on_apply, state=tk.DISABLED
+    )
+    apply_button.pack(side=tk.RIGHT, padx=4)
+    external: _ExternalMappingFile = _ExternalMappingFile(
+        dialog, text_widget, status_var, apply_button
     )
     ttk.Button(button_frame, text=BUTTON_CANCEL, command=dialog.destroy).pack(
         side=tk.RIGHT, padx=4
     )
+    ttk.Button(
+        button_frame,
+        text=BUTTON_EXTERNAL_EDIT,
+        command=lambda: external.start(mappings),
+    ).pack(side=tk.RIGHT, padx=4)
+    dialog.bind("<Destroy>", external.on_destroy, add="+")
+
+    external.set_loading(True)
+    insert_lines_chunked(
+        text_widget,
+        list(format_mapping_lines(mappings)),
+        status_var,
+        on_done=lambda: external.set_loading(False),
+    )
+
+
+def insert_lines_chunked(
+    text_widget: tk.Text,
+    lines: List[str],
+    status_var: tk.StringVar,
+    on_done: Optional[Callable[[], None]] = None,
+) -> None:
+    """
+    清空文本框后分块插入文本行，每块之间让出主循环保持界面响应。
+
+    Args:
+        text_widget: 目标文本框。
+        lines: 不含换行符的文本行。
+        status_var: 展示载入进度的文本变量。
+        on_done: 全部插入完成后的回调。
+    """
+    text_widget.delete("1.0", tk.END)
+    total: int = len(lines)
+
+    def insert_chunk(start: int) -> None:
+        if not text_widget.winfo_exists():
+            return
+        end: int = min(start + MAPPING_INSERT_CHUNK, total)
+        chunk: str = "\n".join(lines[start:end])
+        if end < total:
+            chunk += "\n"
+        text_widget.insert(tk.END, chunk)
+        if end < total:
+            status_var.set(MSG_MAPPING_LOADING.format(done=end, total=total))
+            text_widget.after(1, insert_chunk, end)
+            return
+        status_var.set("")
+        text_widget.edit_modified(False)
+        if on_done:
+            on_done()
+
+    insert_chunk(0)
+
+
+class _ExternalMappingFile:
+    """
+    外部编辑会话：导出映射到临时文件，轮询修改时间并在变化时重新解析。
+
+    Attributes:
+        dialog: 所属对话框。
+        text_widget: 对话框中的文本框，外部文件变化后同步刷新。
+        status_var: 状态提示文本变量。
+        apply_button: “应用”按钮，文本框分块载入期间禁用。
+        path: 临时文件路径；未开始外部编辑时为 None。
+        mapping: 最近一次成功解析的外部文件内容。
+    """
+
+    def __init__(
+        self,
+        dialog: tk.Toplevel,
+        text_widget: tk.Text,
+        status_var: tk.StringVar,
+        apply_button: ttk.Button,
+    ) -> None:
+        self.dialog: tk.Toplevel = dialog
+        self.text_widget: tk.Text = text_widget
+        self.status_var: tk.StringVar = status_var
+        self.apply_button: ttk.Button = apply_button
+        self.path: Optional[Path] = None
+        self.mapping: Optional[Dict[str, str]] = None
+        self._mtime_ns: int = 0
+        self._poll_id: Optional[str] = None
+        self._loading: bool = False
+
+    def set_loading(self, loading: bool) -> None:
+        """
+        标记文本框是否正在分块载入。
+
+        载入期间文本框内容不完整且修改标记为真，“应用”会解析到半截文本，
+        因此禁用按钮；外部文件的变化也推迟到载入结束后再处理。
+
+        Args:
+            loading: True 表示开始载入，False 表示载入完成（修改标记已复位）。
+        """
+        self._loading = loading
+        self.apply_button.configure(
+            state=tk.DISABLED if loading else tk.NORMAL
+        )
+
+    def start(self, mappings: List[Tuple[str, str, str]]) -> None:
+        """
+        写出临时文件并用系统默认编辑器打开，开始轮询。
+
+        已有临时文件时直接重新打开，不会覆盖外部编辑的内容。
+
+        Args:
+            mappings: 三元组 (名称, 备注, 路径) 列表。
+        """
+        if self.path is None:
+            fd, raw_path = tempfile.mkstemp(
+                prefix=MAPPING_FILE_PREFIX, suffix=".txt"
+            )
+            os.close(fd)
+            self.path = Path(raw_path)
+            # 文本框已被修改时导出当前内容，避免丢失尚未应用的编辑。
+            lines: Iterable[str] = (
+                self.text_widget.get("1.0", "end-1c").splitlines()
+                if self.text_widget.edit_modified()
+                else format_mapping_lines(mappings)
+            )
+            try:
+                write_mapping_file(lines, self.path)
+            except OSError as exc:
+                messagebox.showerror(
+                    TITLE_ERROR, f"写出映射文件失败：{exc}", parent=self.dialog
+                )
+                self.path = None
+                return
+            self._mtime_ns = self.path.stat().st_mtime_ns
+        self.status_var.set(MSG_MAPPING_EXTERNAL.format(path=self.path))
+        if hasattr(os, "startfile"):
+            os.startfile(str(self.path))  # type: ignore[attr-defined]
+        if self._poll_id is None:
+            self._poll_id = self.dialog.after(MAPPING_FILE_POLL_MS, self._poll)
+
+    def _poll(self) -> None:
+        """
+        检查临时文件修改时间，变化时重新解析并刷新文本框。
+        """
+        self._poll_id = None
+        if self.path is None:
+            return
+        try:
+            mtime_ns: int = self.path.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = self._mtime_ns
+        # 载入中不更新记录的修改时间，载入结束后的下一次轮询再重新解析。
+        if mtime_ns != self._mtime_ns and not self._loading:
+            self._mtime_ns = mtime_ns
+            self._reload()
+        self._poll_id = self.dialog.after(MAPPING_FILE_POLL_MS, self._poll)
+
+    def _reload(self) -> None:
+        """
+        解析外部文件；成功则缓存结果并刷新文本框，失败则在状态栏提示。
+        """
+        assert self.path is not None
+        try:
+            lines: List[str] = self.path.read_text(
+                encoding="utf-8-sig"
+            ).splitlines()
+            mapping: Dict[str, str] = parse_mapping_stream(lines)
+        except (MappingParseError, OSError) as exc:
+            self.mapping = None
+            self.status_var.set(str(exc))
+            return
+        self.mapping = mapping
+        self.set_loading(True)
+
+        def on_done() -> None:
+            self.set_loading(False)
+            self.status_var.set(
+                MSG_MAPPING_RELOADED.format(count=len(mapping))
+            )
+
+        insert_lines_chunked(
+            self.text_widget, lines, self.status_var, on_done=on_done
+        )
+
+    def on_destroy(self, event: tk.Event) -> None:
+        """
+        对话框关闭时停止轮询并删除临时文件。
+
+        Args:
+            event: Destroy 事件；子控件销毁事件会被忽略。
+        """
+        if event.widget is not self.dialog:
+            return
+        if self._poll_id is not None:
+            try:
+                self.dialog.after_cancel(self._poll_id)
+            except tk.TclError:
+                pass
+            self._poll_id = None
+        if self.path is not None:
+            try:
+                self.path.unlink()
+            except OSError as exc:
+                log_message("WARN", f"remove mapping file failed: {exc}")
+            self.path = None
 
 
 def parse_mapping_lines(
@@ -94,33 +334,14 @@ def parse_mapping_lines(
     Returns:
         合法的名称到备注的映射字典；若格式错误则返回空字典并弹窗提示。
     """
-    raw_lines: List[str] = text_widget.get("1.0", tk.END).splitlines()
-    mapping_dict: Dict[str, str] = {}
-    line_no: int = 0
-    for line in raw_lines:
-        line_no += 1
-        stripped: str = line.strip()
-        if not stripped:
-            continue
-        if "->" not in stripped:
-            messagebox.showerror(
-                TITLE_ERROR,
-                f"第 {line_no} 行缺少 '->'：{line}",
-                parent=dialog,
-            )
-            return {}
-        name_part, remark_part = stripped.split("->", 1)
-        if not name_part.strip():
-            messagebox.showerror(
-                TITLE_ERROR,
-                f"第 {line_no} 行文件名为空：{line}",
-                parent=dialog,
-            )
-            return {}
-        mapping_dict[name_part.strip()] = remark_part
-    if not mapping_dict:
-        messagebox.showinfo(
-            TITLE_INFO, "没有可用的映射，请检查输入。", parent=dialog
+    try:
+        mapping_dict: Dict[str, str] = parse_mapping_stream(
+            text_widget.get("1.0", tk.END).splitlines()
         )
+    except MappingParseError as exc:
+        messagebox.showerror(TITLE_ERROR, str(exc), parent=dialog)
+        return {}
+    if not mapping_dict:
+        messagebox.showinfo(TITLE_INFO, MSG_MAPPING_EMPTY, parent=dialog)
         return {}
     return mapping_dict
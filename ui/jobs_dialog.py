@@ -0,0 +1,265 @@
+"""
+后台任务面板：列出可续跑任务的进度，支持暂停、继续、取消与删除。
+"""
+from __future__ import annotations
+
+import threading
+import time
+import tkinter as tk
+from concurrent.futures import Executor
+from tkinter import messagebox, ttk
+from typing import Callable, List, Optional, Set
+
+from core.constants import (
+    BUTTON_CANCEL,
+    BUTTON_CLOSE,
+    BUTTON_DELETE,
+    BUTTON_PAUSE,
+    BUTTON_RESUME,
+    COLUMN_HEADER_JOB_PROGRESS,
+    COLUMN_HEADER_JOB_STATUS,
+    COLUMN_HEADER_JOB_TITLE,
+    COLUMN_HEADER_JOB_UPDATED,
+    IO_PRIORITY_INDEX,
+    IO_PRIORITY_SAVE,
+    JOB_KIND_APPLY,
+    JOB_PANEL_REFRESH_MS,
+    JOB_STATUS_LABELS,
+    MSG_JOBS_HINT,
+    TITLE_ERROR,
+    TITLE_JOBS,
+    TITLE_RESULT,
+)
+from core.ini_service import DesktopIniService
+from core.jobs import Job, JobError, JobManager
+from core.mapping import summarize_names
+from ui.background import BackgroundTask
+
+
+def start_job(
+    parent: tk.Misc,
+    manager: JobManager,
+    job: Job,
+    service: DesktopIniService,
+    executor: Executor,
+    on_finished: Callable[[Job], None],
+) -> BackgroundTask:
+    """
+    在后台线程中执行（或继续）任务，结束后在主线程回调。
+
+    任务挂在 parent 上而不是任务面板上，关闭面板不会中断任务；
+    界面触发的写入按 save 优先级调度，导出、恢复与同步按 index 优先级。
+
+    Args:
+        parent: 用于调度回调的控件，通常为主窗口。
+        manager: 任务管理器。
+        job: 要执行的任务。
+        service: desktop.ini 服务。
+        executor: 执行读写的线程池。
+        on_finished: 任务结束（完成、暂停后取消、出错）后的回调。
+
+    Returns:
+        已启动的后台任务。
+    """
+    priority: int = (
+        IO_PRIORITY_SAVE if job.kind == JOB_KIND_APPLY else IO_PRIORITY_INDEX
+    )
+
+    def produce(cancel_event: threading.Event) -> List[Job]:
+        return [
+            manager.run(job, service.with_priority(priority), executor)
+        ]
+
+    def on_done(error: Optional[BaseException]) -> None:
+        if error is not None:
+            messagebox.showerror(TITLE_ERROR, f"任务执行失败：{error}")
+            return
+        on_finished(job)
+
+    task: BackgroundTask = BackgroundTask(
+        parent, produce, lambda jobs: None, on_done
+    )
+    task.start()
+    return task
+
+
+def format_job_result(job: Job) -> str:
+    """
+    生成任务结束时的结果文本，包含失败明细。
+
+    Args:
+        job: 已结束的任务。
+    """
+    messages: List[str] = [
+        job.title,
+        f"处理总数: {job.done} | 成功: {job.done - job.failed_count}"
+        f" | 失败: {job.failed_count}",
+    ]
+    if job.failures:
+        messages.append("失败项列表：")
+        messages.append(
+            summarize_names(
+                [f"{path}: {reason}" for path, reason in job.failures]
+            )
+        )
+    return "\n".join(messages)
+
+
+def jobs_dialog(
+    parent: tk.Tk,
+    manager: JobManager,
+    service: DesktopIniService,
+    executor: Executor,
+    on_finished: Callable[[Job], None],
+) -> tk.Toplevel:
+    """
+    弹出后台任务面板（非模态），定时刷新任务进度。
+
+    Args:
+        parent: 主窗口引用；继续执行的任务挂在主窗口上运行。
+        manager: 任务管理器。
+        service: desktop.ini 服务。
+        executor: 执行读写的线程池。
+        on_finished: 从面板继续的任务结束后的回调，通常用于刷新表格。
+
+    Returns:
+        面板窗口，调用方可据此避免重复打开。
+    """
+    dialog: tk.Toplevel = tk.Toplevel(parent)
+    dialog.title(TITLE_JOBS)
+    dialog.transient(parent)
+    dialog.geometry("900x360")
+
+    ttk.Label(dialog, text=MSG_JOBS_HINT).pack(anchor=tk.W, padx=10, pady=6)
+    list_frame: ttk.Frame = ttk.Frame(dialog)
+    list_frame.pack(fill=tk.BOTH, expand=True, padx=10)
+    list_frame.rowconfigure(0, weight=1)
+    list_frame.columnconfigure(0, weight=1)
+    table: ttk.Treeview = ttk.Treeview(
+        list_frame,
+        columns=("title", "status", "progress", "updated"),
+        show="headings",
+        selectmode="browse",
+    )
+    table.heading("title", text=COLUMN_HEADER_JOB_TITLE)
+    table.heading("status", text=COLUMN_HEADER_JOB_STATUS)
+    table.heading("progress", text=COLUMN_HEADER_JOB_PROGRESS)
+    table.heading("updated", text=COLUMN_HEADER_JOB_UPDATED)
+    table.column("title", width=460, anchor=tk.W)
+    table.column("status", width=80, anchor=tk.W)
+    table.column("progress", width=120, anchor=tk.E)
+    table.column("updated", width=150, anchor=tk.W)
+    scroll: tk.Scrollbar = tk.Scrollbar(
+        list_frame,
+        orient=tk.VERTICAL,
+        command=table.yview,
+        width=18,
+        relief=tk.SUNKEN,
+        borderwidth=1,
+    )
+    table.configure(yscrollcommand=scroll.set)
+    table.grid(row=0, column=0, sticky="nsew")
+    scroll.grid(row=0, column=1, sticky="ns")
+
+    def refresh() -> None:
+        if not dialog.winfo_exists():
+            return
+        jobs: List[Job] = manager.jobs()
+        seen: Set[str] = set()
+        for job in jobs:
+            if job.planned:
+                progress: str = f"{job.done}/{job.planned}"
+            else:
+                progress = str(job.done)
+            if job.failed_count:
+                progress += f"（失败 {job.failed_count}）"
+            values = (
+                job.title,
+                JOB_STATUS_LABELS.get(job.status, job.status),
+                progress,
+                time.strftime(
+                    "%Y-%m-%d %H:%M:%S", time.localtime(job.updated)
+                ),
+            )
+            seen.add(job.job_id)
+            if table.exists(job.job_id):
+                table.item(job.job_id, values=values)
+            else:
+                table.insert("", tk.END, iid=job.job_id, values=values)
+        stale: List[str] = [
+            item_id for item_id in table.get_children() if item_id not in seen
+        ]
+        if stale:
+            table.delete(*stale)
+        dialog.after(JOB_PANEL_REFRESH_MS, refresh)
+
+    def selected_id() -> Optional[str]:
+        selection = table.selection()
+        return selection[0] if selection else None
+
+    def on_pause() -> None:
+        job_id: Optional[str] = selected_id()
+        control = manager.control(job_id) if job_id else None
+        if control is not None:
+            control.pause()
+
+    def on_resume() -> None:
+        job_id: Optional[str] = selected_id()
+        if job_id is None:
+            return
+        control = manager.control(job_id)
+        if control is not None:
+            control.resume()
+            return
+        try:
+            job: Job = manager.store.load(job_id)
+        except JobError as exc:
+            messagebox.showerror(TITLE_ERROR, str(exc), parent=dialog)
+            return
+        if not job.resumable:
+            return
+
+        def finished(done_job: Job) -> None:
+            if done_job.finished and done_job.failed_count:
+                messagebox.showinfo(TITLE_RESULT, format_job_result(done_job))
+            on_finished(done_job)
+
+        start_job(parent, manager, job, service, executor, finished)
+
+    def on_cancel() -> None:
+        job_id: Optional[str] = selected_id()
+        control = manager.control(job_id) if job_id else None
+        if control is not None:
+            control.cancel()
+
+    def on_delete() -> None:
+        job_id: Optional[str] = selected_id()
+        if job_id is None:
+            return
+        title: str = table.set(job_id, "title")
+        if not messagebox.askyesno(
+            TITLE_JOBS, f"确认删除任务“{title}”？", parent=dialog
+        ):
+            return
+        try:
+            manager.delete(job_id)
+        except JobError as exc:
+            messagebox.showerror(TITLE_ERROR, str(exc), parent=dialog)
+            return
+        if table.exists(job_id):
+            table.delete(job_id)
+
+    button_frame: ttk.Frame = ttk.Frame(dialog)
+    button_frame.pack(fill=tk.X, padx=10, pady=10)
+    for text, command in (
+        (BUTTON_CLOSE, dialog.destroy),
+        (BUTTON_DELETE, on_delete),
+        (BUTTON_CANCEL, on_cancel),
+        (BUTTON_RESUME, on_resume),
+        (BUTTON_PAUSE, on_pause),
+    ):
+        ttk.Button(button_frame, text=text, command=command).pack(
+            side=tk.RIGHT, padx=4
+        )
+    refresh()
+    return dialog
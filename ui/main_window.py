@@ -3,13 +3,25 @@ Tk 主窗口：目录树、备注表格、文本映射、保存。
 """
 from __future__ import annotations
 
+import csv
+import os
 import sys
+import threading
+import time
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from tkinter import messagebox, simpledialog, ttk
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from core.ini_service import DesktopIniService, FolderRemark
+from core.ini_service import (
+    DesktopIniService,
+    IniVersion,
+    RemarkConflictError,
+)
+from core.io_scheduler import IoScheduler
+from core.io_tuner import ConcurrencyTuner
 from core.context_menu import (
     register_context_menu,
     unregister_context_menu,
@@ -24,6 +36,33 @@ from core.constants import (
     TEXT_REFRESH,
     TEXT_MAP_BUTTON,
     TEXT_SAVE,
+    LABEL_TREE_FILTER,
+    LABEL_TABLE_FILTER,
+    MSG_FILTER_COUNT,
+    MSG_STARTUP_LOADING,
+    IO_PRIORITY_INDEX,
+    IO_PRIORITY_PREFETCH,
+    IO_PRIORITY_SAVE,
+    IO_TUNER_MAX_LIMIT,
+    IO_TUNING_FILE_NAME,
+    JOB_DIR_NAME,
+    JOB_KIND_EXPORT,
+    JOB_STOP_TIMEOUT_S,
+    MSG_BATCH_VIEW,
+    SELECT_PAYLOAD_PREFIX,
+    SELECTION_COLLECT_MS,
+    METRIC_STARTUP_FIRST_PAINT,
+    METRIC_STARTUP_INTERACTIVE,
+    STARTUP_EXIT_ENV_VAR,
+    STARTUP_POLL_MS,
+    TEXT_AUTOSAVE,
+    TEXT_CONFLICTS_BUTTON,
+    TEXT_CONFLICTS_BUTTON_COUNT,
+    MSG_SAVE_CONFLICTS,
+    TEXT_JOBS_BUTTON,
+    TEXT_JOBS_BUTTON_COUNT,
+    TEXT_MIRROR_BUTTON,
+    TEXT_RULE_BUTTON,
     TITLE_INFO,
     TITLE_MAPPING,
     TITLE_EDIT_REMARK,
@@ -33,18 +72,79 @@ from core.constants import (
     PROMPT_NEW_REMARK,
     LABEL_DRIVE,
     LABEL_CURRENT_PATH_PREFIX,
-    PLACEHOLDER_LOADING,
+    LABEL_DEPTH,
+    MAX_TABLE_DEPTH,
+    MSG_LOADING_ROWS,
+    COLUMN_HEADER_RELATIVE_PATH,
+    LABEL_PENDING,
+    LABEL_WRITE_FAILED,
+    AUTOSAVE_BATCH_SIZE,
+    AUTOSAVE_DELAY_MS,
+    AUTOSAVE_MAX_WAIT_MS,
+    MSG_AUTOSAVE_BUSY,
+    MSG_CLOSE_PENDING,
+    ROW_STATE_COLORS,
+    TEXT_TREE_COUNTS,
+    TEXT_UNREACHABLE,
+    TREE_COUNT_FRESH_S,
+    TREE_COUNT_MAX_FOLDERS,
+    TREE_FILTER_DELAY_MS,
     COLUMN_HEADER_NAME,
     COLUMN_HEADER_REMARK,
     COLUMN_HEADER_PATH,
+    MSG_PASTE_NO_ROWS,
+    MSG_PASTE_SUMMARY,
+    COLUMN_HEADER_SIZE,
+    COLUMN_HEADER_ITEMS,
+    SIZE_CACHE_FILE_NAME,
+    TEXT_SHOW_SIZES,
+    PROFILE_HOTKEY,
+    TEXT_PROFILE_ARMED,
+)
+from core.mapping import summarize_names
+from core.aggregates import AggregateStore, refresh_aggregates
+from core.async_scan import AsyncScanner, iter_sync
+from core.dir_cache import CachedDirectory, DirectoryCache
+from core.jobs import Job, JobManager, JobStore
+from core.pending import PendingChanges
+from core.prefetch import Prefetcher
+from core.probe import (
+    KIND_FILE,
+    PathProbe,
+    PathUnreachableError,
+    get_default_probe,
+)
+from core.metrics import StartupTimer
+from core.profiling import ProfileCapture
+from core.row_store import RowStore
+from core.sizer import SizeCache, SubtreeSize, format_size, iter_subtree_sizes
+from core.startup import StartupState, load_startup_state
+from core.tsv import TsvMatch, TsvRow, format_tsv, match_tsv_rows, parse_tsv
+from core.write_behind import (
+    WriteBehindQueue,
+    WriteResult,
+    iter_checked_writes,
+)
+from core.utils import (
+    common_parent,
+    ensure_windows_platform,
+    get_config_dir,
+    log_message,
 )
-from core.utils import ensure_windows_platform, list_drives, log_message
 from ui.table_actions import (
     sort_by_column,
     select_all_rows,
-    sync_remark_to_rows,
+    sync_remarks_to_rows,
 )
-from ui.dialogs import mapping_dialog, parse_mapping_lines
+from ui.background import BackgroundTask
+from ui.conflict_dialog import ConflictRow, conflict_dialog
+from ui.dialogs import mapping_dialog
+from ui.jobs_dialog import jobs_dialog
+from ui.rule_dialog import rule_dialog
+from ui.mirror_dialog import mirror_dialog
+from ui.table_filter import TableFilter
+from ui.tree_pager import MORE_VALUE, PLACEHOLDER_VALUE, TreePager
+from ui.watchdog import EventLoopWatchdog
 
 
 class MainApp(tk.Tk):
@@ -52,51 +152,143 @@ class MainApp(tk.Tk):
     主界面：目录树 + 备注表格。
 
     Attributes:
-        service: desktop.ini 读写服务实例。
-        rows_by_path: 路径到 FolderRemark 的映射，用于脏检查。
+        service: desktop.ini 读写服务实例，以界面优先级调度。
+        io_tuner: 按实测延迟调节各卷并发上限，关闭时保存学习结果。
+        io_scheduler: 按卷、按优先级发放 I/O 名额的调度器，各类后台任务共用。
+        probe: 带超时的路径探测器，避免失联共享阻塞界面。
+        rows: 表格行存储，行号即表格 item ID，只覆盖当前目录。
+        pending: 会话级待保存修改，切换目录后仍然保留。
+        write_behind: 自动保存的写回队列，跟踪各路径的待写、已保存、失败与
+            冲突状态；手动保存同样经由它登记结果。
+        autosave_task: 进行中的自动保存批次。
         sort_directions: 列排序方向标记。
-        current_path: 当前加载的目录路径。
-        initial_path: 启动参数传入的初始路径。
+        current_path: 当前加载的目录路径；批量视图中为 None。
+        batch_paths: 批量视图展示的选中目录；普通目录视图中为 None。
+        initial_path: 启动参数传入的初始路径（尚未探测，启动预读时处理）。
         initial_warning: 路径解析警告信息。
+        profiler: 按需性能剖析器，由环境变量或快捷键启用。
+        watchdog: 主循环卡顿监控，记录超过阈值的卡顿与对应操作。
+        executor: 后台扫描与批量写入共用的线程池，线程按需创建，
+            实际并发由调度器按卷控制。
+        scanner: 按卷限流的异步扫描引擎，多层加载经由它遍历子树。
+        load_task: 进行中的多层目录加载任务。
+        dir_cache: 子目录列表与备注缓存，由预取器在后台预热。
+        prefetcher: 为选中目录的子目录预热缓存的后台预取器。
+        tree_pager: 目录树分页插入与子目录筛选。
+        table_filter: 表格按名称与备注的增量筛选，批量操作只作用于可见行。
+        startup_timer: 启动里程碑计时，记录首帧绘制与可交互耗时。
+        startup_task: 进行中的启动预读任务。
+        jobs: 可续跑任务管理器，规则与镜像写入经由它执行。
+        aggregates: 子树“有备注/全部”统计，展开节点时在后台刷新，
+            写入备注时经服务的写入回调增量更新。
+        aggregate_task: 进行中的子树统计刷新任务。
+        size_cache: 目录大小统计缓存，按目录修改时间复用并在关闭时保存。
+        size_task: 进行中的表格大小统计任务，导航时取消。
     """
 
     def __init__(
         self,
         initial_path: Optional[Path] = None,
         initial_warning: Optional[str] = None,
+        started_at: Optional[float] = None,
+        initial_selection: Optional[List[Path]] = None,
     ) -> None:
         """
         初始化窗口与数据状态，处理启动参数。
 
+        构造函数只建立控件；注册表检查、盘符枚举与根目录读取都在后台进行，
+        窗口先以占位状态完成首帧绘制。
+
         Args:
             initial_path: 启动时要展示的目录；无效时回退到第一块盘符。
             initial_warning: 路径解析产生的警告文案。
+            started_at: 进程启动时的 ``time.perf_counter()`` 读数，
+                用于计算启动指标；None 表示从构造时起算。
+            initial_selection: 多选右键菜单启动时带入的选中项，
+                与随后转发来的同批选中项合并为批量视图。
         """
         super().__init__()
+        self.startup_timer: StartupTimer = StartupTimer(started_at)
         ensure_windows_platform()
         self.title(APP_TITLE)
         self.geometry("1200x720")
 
-        self.service: DesktopIniService = DesktopIniService()
-        self.rows_by_path: Dict[str, FolderRemark] = {}
+        self.probe: PathProbe = get_default_probe()
+        self.io_tuner: ConcurrencyTuner = ConcurrencyTuner.load(
+            get_config_dir() / IO_TUNING_FILE_NAME
+        )
+        self.io_scheduler: IoScheduler = IoScheduler(tuner=self.io_tuner)
+        self.service: DesktopIniService = DesktopIniService(
+            probe=self.probe, scheduler=self.io_scheduler
+        )
+        self.rows: RowStore = RowStore()
+        self.pending: PendingChanges = PendingChanges()
+        self.write_behind: WriteBehindQueue = WriteBehindQueue(self.pending)
+        self.autosave_task: Optional[BackgroundTask] = None
+        self._autosave_after: Optional[str] = None
+        # 本轮第一次修改后最迟写入的时间（monotonic），持续编辑也不会无限推迟。
+        self._autosave_deadline: Optional[float] = None
+        self._conflicts_window: Optional[tk.Toplevel] = None
         self.sort_directions: Dict[str, bool] = {
             "name": True,
             "remark": True,
+            "relpath": True,
             "path": True,
+            "size": False,
+            "items": False,
         }
         self.current_path: Optional[Path] = None
-        self.initial_path: Optional[Path] = (
-            initial_path if initial_path and initial_path.exists() else None
-        )
+        self.batch_paths: Optional[List[Path]] = None
+        self._pending_selection: List[Path] = []
+        self._selection_after: Optional[str] = None
+        self.initial_path: Optional[Path] = initial_path
         self.initial_warning: Optional[str] = initial_warning
+        self.profiler: ProfileCapture = ProfileCapture.from_environment()
+        self.watchdog: EventLoopWatchdog = EventLoopWatchdog(self)
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=IO_TUNER_MAX_LIMIT, thread_name_prefix="desktopini"
+        )
+        self.scanner: AsyncScanner = AsyncScanner(
+            self.service.with_priority(IO_PRIORITY_INDEX), self.executor
+        )
+        self.load_task: Optional[BackgroundTask] = None
+        self.dir_cache: DirectoryCache = DirectoryCache()
+        self.prefetcher: Prefetcher = Prefetcher(
+            self.service.with_priority(IO_PRIORITY_PREFETCH), self.dir_cache
+        )
+        self.startup_task: Optional[BackgroundTask] = None
+        self.jobs: JobManager = JobManager(
+            JobStore(get_config_dir() / JOB_DIR_NAME)
+        )
+        self._jobs_window: Optional[tk.Toplevel] = None
+        self.aggregates: AggregateStore = AggregateStore()
+        self.service.write_listeners.append(self.aggregates.update_remark)
+        self.aggregate_task: Optional[BackgroundTask] = None
+        self._aggregate_root: Optional[Path] = None
+        self.size_cache: SizeCache = SizeCache(
+            get_config_dir() / SIZE_CACHE_FILE_NAME
+        )
+        self.size_task: Optional[BackgroundTask] = None
+        self._size_force: bool = False
 
         self.drive_var: tk.StringVar = tk.StringVar()
+        self.depth_var: tk.StringVar = tk.StringVar(value="1")
         self.dir_tree: ttk.Treeview
+        self.tree_pager: TreePager
+        self._tree_filter_after: Optional[str] = None
         self.table: ttk.Treeview
+        self.table_filter: TableFilter
+        self._table_filter_after: Optional[str] = None
         self.path_label: tk.Label
 
         self._build_layout()
-        self._init_drives()
+        self.bind_all(PROFILE_HOTKEY, self._arm_profiler)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.watchdog.start()
+        self.bind("<Map>", self._on_first_map, add="+")
+        self._start_deferred_init()
+        if initial_selection:
+            self._queue_selection(initial_selection)
 
     def _build_layout(self) -> None:
         """
@@ -128,20 +320,30 @@ class MainApp(tk.Tk):
         self.bind_button_text: tk.StringVar = tk.StringVar(
             value=TEXT_BIND_MENU
         )
-        bind_button: ttk.Button = ttk.Button(
+        # 注册状态在后台查询，查询完成前禁用按钮。
+        self.bind_button: ttk.Button = ttk.Button(
             top_bar,
             textvariable=self.bind_button_text,
             command=self._toggle_context_menu,
+            state=tk.DISABLED,
         )
-        bind_button.pack(side=tk.LEFT, padx=4)
+        self.bind_button.pack(side=tk.LEFT, padx=4)
 
         splitter: ttk.Panedwindow = ttk.Panedwindow(
             self, orient=tk.HORIZONTAL
         )
         splitter.pack(fill=tk.BOTH, expand=True, padx=8, pady=6)
 
-        # 左侧目录树。
+        # 左侧目录树，上方的筛选框只作用于已枚举的子目录。
         left_frame: ttk.Frame = ttk.Frame(splitter)
+        filter_bar: ttk.Frame = ttk.Frame(left_frame)
+        filter_bar.pack(fill=tk.X, pady=(0, 4))
+        ttk.Label(filter_bar, text=LABEL_TREE_FILTER).pack(side=tk.LEFT)
+        self.tree_filter_var: tk.StringVar = tk.StringVar(value="")
+        ttk.Entry(filter_bar, textvariable=self.tree_filter_var).pack(
+            side=tk.LEFT, fill=tk.X, expand=True, padx=4
+        )
+        self.tree_filter_var.trace_add("write", self._on_tree_filter_changed)
         left_container: ttk.Frame = ttk.Frame(left_frame)
         left_container.pack(fill=tk.BOTH, expand=True)
         left_container.rowconfigure(0, weight=1)
@@ -176,6 +378,9 @@ class MainApp(tk.Tk):
         self.dir_tree.grid(row=0, column=0, sticky="nsew")
         dir_scrollbar_y.grid(row=0, column=1, sticky="ns")
         dir_scrollbar_x.grid(row=1, column=0, sticky="ew")
+        self.tree_pager = TreePager(
+            self.dir_tree, self._has_subfolder, label=self._tree_label
+        )
         self.dir_tree.bind("<<TreeviewOpen>>", self._on_tree_expand)
         self.dir_tree.bind("<<TreeviewSelect>>", self._on_tree_select)
         splitter.add(left_frame, weight=1)
@@ -189,17 +394,91 @@ class MainApp(tk.Tk):
             action_bar, text=LABEL_CURRENT_PATH_PREFIX
         )
         self.path_label.pack(side=tk.LEFT)
+        self.pending_var: tk.StringVar = tk.StringVar(value="")
+        ttk.Label(action_bar, textvariable=self.pending_var).pack(
+            side=tk.LEFT, padx=12
+        )
 
         mapping_button: ttk.Button = ttk.Button(
             action_bar,
             text=TEXT_MAP_BUTTON,
             command=self._bulk_mapping_dialog,
         )
+        rule_button: ttk.Button = ttk.Button(
+            action_bar,
+            text=TEXT_RULE_BUTTON,
+            command=self._rule_dialog,
+        )
+        mirror_button: ttk.Button = ttk.Button(
+            action_bar,
+            text=TEXT_MIRROR_BUTTON,
+            command=self._mirror_dialog,
+        )
         save_button: ttk.Button = ttk.Button(
             action_bar, text=TEXT_SAVE, command=self._save_changes
         )
-        for widget in (save_button, mapping_button):
+        self.autosave_var: tk.BooleanVar = tk.BooleanVar(value=False)
+        autosave_check: ttk.Checkbutton = ttk.Checkbutton(
+            action_bar,
+            text=TEXT_AUTOSAVE,
+            variable=self.autosave_var,
+            command=self._on_autosave_changed,
+        )
+        self.jobs_button: ttk.Button = ttk.Button(
+            action_bar, text=TEXT_JOBS_BUTTON, command=self._jobs_dialog
+        )
+        self.conflicts_button: ttk.Button = ttk.Button(
+            action_bar,
+            text=TEXT_CONFLICTS_BUTTON,
+            command=self._conflicts_dialog,
+            state=tk.DISABLED,
+        )
+        for widget in (
+            self.jobs_button,
+            self.conflicts_button,
+            autosave_check,
+            save_button,
+            mirror_button,
+            rule_button,
+            mapping_button,
+        ):
             widget.pack(side=tk.RIGHT, padx=4)
+        depth_spinbox: ttk.Spinbox = ttk.Spinbox(
+            action_bar,
+            from_=1,
+            to=MAX_TABLE_DEPTH,
+            width=4,
+            textvariable=self.depth_var,
+            command=self._on_depth_changed,
+        )
+        depth_spinbox.bind("<Return>", self._on_depth_changed)
+        depth_spinbox.pack(side=tk.RIGHT, padx=4)
+        ttk.Label(action_bar, text=LABEL_DEPTH).pack(side=tk.RIGHT)
+
+        # 表格筛选：按名称与备注（含拼音首字母）逐字筛选当前表格。
+        table_filter_bar: ttk.Frame = ttk.Frame(right_frame)
+        table_filter_bar.pack(fill=tk.X, pady=(0, 6))
+        ttk.Label(table_filter_bar, text=LABEL_TABLE_FILTER).pack(
+            side=tk.LEFT
+        )
+        self.table_filter_var: tk.StringVar = tk.StringVar(value="")
+        ttk.Entry(
+            table_filter_bar, textvariable=self.table_filter_var
+        ).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=4)
+        self.filter_count_var: tk.StringVar = tk.StringVar(value="")
+        ttk.Label(table_filter_bar, textvariable=self.filter_count_var).pack(
+            side=tk.LEFT, padx=4
+        )
+        self.table_filter_var.trace_add(
+            "write", self._on_table_filter_changed
+        )
+        self.show_sizes_var: tk.BooleanVar = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            table_filter_bar,
+            text=TEXT_SHOW_SIZES,
+            variable=self.show_sizes_var,
+            command=self._on_show_sizes_changed,
+        ).pack(side=tk.RIGHT, padx=4)
 
         style: ttk.Style = ttk.Style(self)
         style.configure("Bordered.Treeview", borderwidth=1, relief="solid")
@@ -216,7 +495,8 @@ class MainApp(tk.Tk):
 
         self.table = ttk.Treeview(
             table_container,
-            columns=("name", "remark", "path"),
+            columns=("name", "remark", "relpath", "path", "size", "items"),
+            displaycolumns=("name", "remark", "relpath", "path"),
             show="headings",
             selectmode="extended",
             style="Bordered.Treeview",
@@ -231,14 +511,32 @@ class MainApp(tk.Tk):
             text=COLUMN_HEADER_REMARK,
             command=lambda: self._sort_by_column("remark"),
         )
+        self.table.heading(
+            "relpath",
+            text=COLUMN_HEADER_RELATIVE_PATH,
+            command=lambda: self._sort_by_column("relpath"),
+        )
         self.table.heading(
             "path",
             text=COLUMN_HEADER_PATH,
             command=lambda: self._sort_by_column("path"),
         )
+        self.table.heading(
+            "size",
+            text=COLUMN_HEADER_SIZE,
+            command=lambda: self._sort_by_column("size"),
+        )
+        self.table.heading(
+            "items",
+            text=COLUMN_HEADER_ITEMS,
+            command=lambda: self._sort_by_column("items"),
+        )
         self.table.column("name", width=200, anchor=tk.W, stretch=True)
         self.table.column("remark", width=300, anchor=tk.W, stretch=True)
+        self.table.column("relpath", width=240, anchor=tk.W, stretch=True)
         self.table.column("path", width=400, anchor=tk.W, stretch=True)
+        self.table.column("size", width=90, anchor=tk.E, stretch=False)
+        self.table.column("items", width=80, anchor=tk.E, stretch=False)
 
         table_scrollbar_y: tk.Scrollbar = tk.Scrollbar(
             table_container,
@@ -260,49 +558,136 @@ class MainApp(tk.Tk):
             yscrollcommand=table_scrollbar_y.set,
             xscrollcommand=table_scrollbar_x.set,
         )
+        for state, color in ROW_STATE_COLORS.items():
+            self.table.tag_configure(state, background=color)
         self.table.grid(row=0, column=0, sticky="nsew")
+        self.table_filter = TableFilter(self.table, self.rows)
         table_scrollbar_y.grid(row=0, column=1, sticky="ns")
         table_scrollbar_x.grid(row=1, column=0, sticky="ew")
         self.table.bind("<Double-1>", self._on_table_double_click)
         self.table.bind("<Control-a>", self._select_all_rows)
         self.table.bind("<Control-A>", self._select_all_rows)
+        for sequence in ("<Control-c>", "<Control-C>"):
+            self.table.bind(sequence, self._copy_rows_as_tsv)
+        for sequence in ("<Control-v>", "<Control-V>"):
+            self.table.bind(sequence, self._paste_tsv)
 
         splitter.add(right_frame, weight=2)
 
-        # 初始化右键绑定按钮状态。
-        if is_context_menu_registered(CONTEXT_MENU_NAME):
-            self.bind_button_text.set(TEXT_UNBIND_MENU)
-        else:
-            self.bind_button_text.set(TEXT_BIND_MENU)
-        self._show_initial_warning()
+        # 启动预读完成前的占位状态。
+        self.drive_combo.configure(state=tk.DISABLED)
+        self.dir_tree.insert("", tk.END, text=MSG_STARTUP_LOADING)
+        self.path_label.config(
+            text=f"{LABEL_CURRENT_PATH_PREFIX}{MSG_STARTUP_LOADING}"
+        )
 
-    def _init_drives(self) -> None:
+    def _start_deferred_init(self) -> None:
         """
-        初始化盘符选择，并加载首个目录树节点。
+        在后台查询右键菜单注册状态并预读盘符与初始目录，完成后填充界面。
         """
-        drives: List[str] = list_drives()
-        if not drives:
-            messagebox.showerror(TITLE_ERROR, "未找到可用盘符。")
-            self.destroy()
-            return
-        self.drive_combo["values"] = drives
+        initial_path: Optional[Path] = self.initial_path
+
+        def produce_state(cancel_event: threading.Event) -> List[StartupState]:
+            return [
+                load_startup_state(
+                    self.service,
+                    self.probe,
+                    self.executor,
+                    initial_path,
+                    cancel_event,
+                )
+            ]
 
-        if self.initial_path:
-            target: Path = (
-                self.initial_path
-                if self.initial_path.is_dir()
-                else self.initial_path.parent
-            )
-            drive_root: str = target.anchor or drives[0]
-            if drive_root in drives:
-                self.drive_var.set(drive_root)
-            else:
-                self.drive_var.set(drives[0])
-            self._load_tree_root(target)
+        def produce_menu(cancel_event: threading.Event) -> List[bool]:
+            return [is_context_menu_registered(CONTEXT_MENU_NAME)]
+
+        def on_done(error: Optional[BaseException]) -> None:
+            self.startup_task = None
+            if error is not None:
+                messagebox.showerror(TITLE_ERROR, f"启动失败：{error}")
+                self.destroy()
+
+        self.startup_task = BackgroundTask(
+            self,
+            produce_state,
+            lambda states: self._finish_startup(states[0]),
+            on_done,
+            poll_ms=STARTUP_POLL_MS,
+        )
+        self.startup_task.start()
+        # 查询失败时仍启用按钮，点击时会重新检查注册状态。
+        BackgroundTask(
+            self,
+            produce_menu,
+            lambda states: self._apply_menu_state(states[0]),
+            lambda error: self.bind_button.configure(state=tk.NORMAL),
+            poll_ms=STARTUP_POLL_MS,
+        ).start()
+
+    def _on_first_map(self, event: tk.Event) -> None:
+        """
+        主窗口首次映射时刷新挂起的绘制并记录首帧耗时。
+
+        Args:
+            event: Map 事件；子控件的事件也会冒泡到这里，只处理主窗口本身。
+        """
+        if (
+            event.widget is not self
+            or METRIC_STARTUP_FIRST_PAINT in self.startup_timer.marks
+        ):
             return
+        self.update_idletasks()
+        self.startup_timer.mark(METRIC_STARTUP_FIRST_PAINT)
 
-        self.drive_var.set(drives[0])
-        self._load_tree_root(Path(drives[0]))
+    def _apply_menu_state(self, registered: bool) -> None:
+        """
+        根据后台查询结果设置右键菜单按钮文案并启用按钮。
+
+        Args:
+            registered: 右键菜单是否已注册。
+        """
+        self.bind_button_text.set(
+            TEXT_UNBIND_MENU if registered else TEXT_BIND_MENU
+        )
+        self.bind_button.configure(state=tk.NORMAL)
+
+    def _finish_startup(self, state: StartupState) -> None:
+        """
+        用启动预读结果初始化盘符与目录树；根目录数据先写入缓存，
+        因此加载过程不再访问磁盘。
+
+        Args:
+            state: 启动预读结果。
+        """
+        if not state.drives or state.root is None:
+            messagebox.showerror(TITLE_ERROR, "未找到可用盘符。")
+            self.destroy()
+            return
+        self.drive_combo["values"] = state.drives
+        self.drive_combo.configure(state="readonly")
+        if state.warning:
+            self.initial_warning = self.initial_warning or state.warning
+        # 预读期间已有外部请求打开了其他目录时，不再覆盖。
+        if self.current_path is None:
+            drive_root: str = state.root.anchor
+            if drive_root not in state.drives:
+                drive_root = state.drives[0]
+            self.drive_var.set(drive_root)
+            if state.folders is not None and state.remarks is not None:
+                self.dir_cache.put(
+                    state.root, state.folders, state.remarks, state.versions
+                )
+                for folder, children in state.children.items():
+                    self.dir_cache.put(folder, children)
+            self._load_tree_root(state.root)
+        self.startup_timer.mark(
+            METRIC_STARTUP_INTERACTIVE, f"rows={len(self.rows)}"
+        )
+        self._show_initial_warning()
+        # 上次未完成的任务只在按钮上提示数量，不打断启动。
+        self.after_idle(self._refresh_jobs_button)
+        if os.environ.get(STARTUP_EXIT_ENV_VAR, "").strip() == "1":
+            self.after_idle(self._on_close)
 
     def _load_tree_root(self, root_path: Path) -> None:
         """
@@ -311,54 +696,71 @@ class MainApp(tk.Tk):
         Args:
             root_path: 作为根节点展示的路径。
         """
-        self.dir_tree.delete(*self.dir_tree.get_children())
-        root_id: str = self.dir_tree.insert(
-            "",
-            tk.END,
-            text=str(root_path),
-            values=(str(root_path),),
-            open=True,
-        )
-        self._insert_children(root_id, root_path)
-        self.dir_tree.selection_set(root_id)
-        self.dir_tree.focus(root_id)
-        self._load_directory(root_path)
+        with self._operation("load_tree_root"):
+            self.tree_pager.reset()
+            self.dir_tree.delete(*self.dir_tree.get_children())
+            root_id: str = self.dir_tree.insert(
+                "",
+                tk.END,
+                text=str(root_path),
+                values=(str(root_path),),
+                open=True,
+            )
+            self._insert_children(root_id, root_path)
+            self.dir_tree.selection_set(root_id)
+            self.dir_tree.focus(root_id)
+            self._load_directory(root_path)
 
     def _insert_children(self, node_id: str, path: Path) -> None:
         """
-        插入子节点，懒加载更深层目录。
+        插入子节点，懒加载更深层目录；子目录较多时分页插入。
 
         Args:
             node_id: 目录树节点 ID。
             path: 节点对应的路径。
         """
-        for child_id in self.dir_tree.get_children(node_id):
-            self.dir_tree.delete(child_id)
+        with self._operation("tree_expand"):
+            for child_id in self.dir_tree.get_children(node_id):
+                self.dir_tree.delete(child_id)
 
-        try:
-            subfolders: List[Path] = self.service.list_subfolders(path)
-        except Exception as exc:
-            messagebox.showerror(
-                TITLE_ERROR,
-                f"读取目录失败: {path}\n{exc}",
-            )
-            return
-
-        for folder in subfolders:
-            child_id: str = self.dir_tree.insert(
-                node_id,
-                tk.END,
-                text=folder.name,
-                values=(str(folder),),
-                open=False,
-            )
-            if self._has_subfolder(folder):
-                self.dir_tree.insert(
-                    child_id,
-                    tk.END,
-                    text=PLACEHOLDER_LOADING,
-                    values=("placeholder",),
+            base_text: str = self.dir_tree.item(node_id, "text")
+            if base_text.endswith(TEXT_UNREACHABLE):
+                base_text = base_text[: -len(TEXT_UNREACHABLE)]
+            try:
+                subfolders: List[Path] = self._list_children(path)
+            except PathUnreachableError as exc:
+                log_message("WARN", f"tree expand unreachable: {exc}")
+                self.dir_tree.item(node_id, text=base_text + TEXT_UNREACHABLE)
+                return
+            except Exception as exc:
+                messagebox.showerror(
+                    TITLE_ERROR,
+                    f"读取目录失败: {path}\n{exc}",
                 )
+                return
+            self.dir_tree.item(node_id, text=base_text)
+            self.tree_pager.populate(node_id, subfolders)
+        self._refresh_tree_counts(path)
+
+    def _list_children(self, path: Path) -> List[Path]:
+        """
+        枚举子目录，优先使用缓存，未命中时读取并写回缓存（仅列表）。
+
+        Args:
+            path: 父目录。
+
+        Returns:
+            子目录列表。
+
+        Raises:
+            PathUnreachableError: 路径所在共享不可达。
+        """
+        cached: Optional[CachedDirectory] = self.dir_cache.get(path)
+        if cached is not None:
+            return cached.folders
+        subfolders: List[Path] = self.service.list_subfolders(path)
+        self.dir_cache.put(path, subfolders)
+        return subfolders
 
     def _has_subfolder(self, path: Path) -> bool:
         """
@@ -370,16 +772,108 @@ class MainApp(tk.Tk):
         Returns:
             True 表示存在有效子目录，False 表示不存在或访问失败。
         """
+        cached: Optional[CachedDirectory] = self.dir_cache.get(path)
+        if cached is not None:
+            return bool(cached.folders)
         try:
-            for child in path.iterdir():
-                if (
-                    child.is_dir()
-                    and child.name.lower() not in self.service.skip_names
-                ):
-                    return True
+            return self.service.has_subfolder(path)
         except Exception:
             return False
-        return False
+
+    def _tree_label(self, folder: Path, name: Optional[str] = None) -> str:
+        """
+        生成目录树节点文字：已有子树统计时附加“有备注/全部”。
+
+        Args:
+            folder: 节点对应的目录。
+            name: 展示的名称；None 时使用目录名。
+        """
+        name = name or folder.name or str(folder)
+        counts: Optional[Tuple[int, int]] = self.aggregates.counts(folder)
+        if counts is None or not counts[1]:
+            return name
+        return TEXT_TREE_COUNTS.format(
+            name=name, remarked=counts[0], total=counts[1]
+        )
+
+    def _refresh_tree_counts(self, path: Path) -> None:
+        """
+        在后台刷新展开节点的子树统计，完成后更新目录树文字。
+
+        正在刷新的子树已包含 path、或统计完整且刚刷新过时不重复启动。
+        已有完整统计的子树只核对 path 与直接子目录的修改时间，更深处
+        只进入新出现或已变化的目录；首次展开才遍历整棵子树。
+
+        Args:
+            path: 刚展开的目录。
+        """
+        running: Optional[Path] = self._aggregate_root
+        if (
+            self.aggregate_task is not None
+            and self.aggregate_task.running
+            and running is not None
+            and (running == path or running in path.parents)
+        ):
+            return
+        if self.aggregates.recently_validated(path, TREE_COUNT_FRESH_S):
+            return
+        max_depth: Optional[int] = (
+            1 if self.aggregates.counts(path) is not None else None
+        )
+        if self.aggregate_task is not None:
+            self.aggregate_task.cancel()
+        service: DesktopIniService = self.service.with_priority(
+            IO_PRIORITY_INDEX
+        )
+
+        def produce(
+            cancel_event: threading.Event,
+        ) -> List[Optional[Tuple[int, int]]]:
+            return [
+                refresh_aggregates(
+                    service,
+                    self.aggregates,
+                    path,
+                    self.executor,
+                    cancel_event,
+                    max_folders=TREE_COUNT_MAX_FOLDERS,
+                    max_depth=max_depth,
+                )
+            ]
+
+        def on_done(error: Optional[BaseException]) -> None:
+            self._aggregate_root = None
+            self._render_tree_counts()
+
+        self._aggregate_root = path
+        self.aggregate_task = BackgroundTask(
+            self, produce, lambda results: None, on_done
+        )
+        self.aggregate_task.start()
+
+    def _render_tree_counts(self) -> None:
+        """
+        用当前统计重写已展开部分的目录树节点文字。
+        """
+        with self._operation("tree_counts"):
+            stack: List[str] = list(self.dir_tree.get_children())
+            while stack:
+                item_id: str = stack.pop()
+                path_str: str = self.dir_tree.set(item_id, "fullpath")
+                if not path_str or path_str in (PLACEHOLDER_VALUE, MORE_VALUE):
+                    continue
+                path: Path = Path(path_str)
+                top_level: bool = not self.dir_tree.parent(item_id)
+                text: str = self._tree_label(
+                    path, str(path) if top_level else None
+                )
+                if self.dir_tree.item(item_id, "text").endswith(
+                    TEXT_UNREACHABLE
+                ):
+                    text += TEXT_UNREACHABLE
+                self.dir_tree.item(item_id, text=text)
+                if self.dir_tree.item(item_id, "open"):
+                    stack.extend(self.dir_tree.get_children(item_id))
 
     def _on_tree_expand(self, event: tk.Event) -> None:
         """
@@ -390,7 +884,7 @@ class MainApp(tk.Tk):
         """
         node_id: str = self.dir_tree.focus()
         path_str: str = self.dir_tree.set(node_id, "fullpath")
-        if not path_str or path_str == "placeholder":
+        if not path_str or path_str == PLACEHOLDER_VALUE:
             return
         self._insert_children(node_id, Path(path_str))
 
@@ -404,43 +898,350 @@ class MainApp(tk.Tk):
         selected_ids: Tuple[str, ...] = self.dir_tree.selection()
         if not selected_ids:
             return
+        if self.tree_pager.is_more_node(selected_ids[0]):
+            self.tree_pager.show_more(selected_ids[0])
+            return
         path_str: str = self.dir_tree.set(selected_ids[0], "fullpath")
-        if not path_str or path_str == "placeholder":
+        if not path_str or path_str == PLACEHOLDER_VALUE:
+            return
+        path: Path = Path(path_str)
+        if self.batch_paths is None and path == self.current_path:
+            # 筛选重建后重新选中同一目录，表格内容不变，无需重新加载。
+            return
+        self._load_directory(path)
+
+    def _on_tree_filter_changed(self, *args: object) -> None:
+        """
+        筛选框内容变化后防抖，停止输入片刻再筛选。
+        """
+        if self._tree_filter_after is not None:
+            self.after_cancel(self._tree_filter_after)
+        self._tree_filter_after = self.after(
+            TREE_FILTER_DELAY_MS, self._apply_tree_filter
+        )
+
+    def _apply_tree_filter(self) -> None:
+        """
+        用筛选文本缩小选中节点（未展开时为其父节点）的子项，不重新枚举目录。
+        """
+        self._tree_filter_after = None
+        focused: str = self.dir_tree.focus()
+        if not focused:
+            return
+        node_id: str = focused
+        if not self.tree_pager.is_populated(node_id):
+            node_id = self.dir_tree.parent(node_id)
+        if not node_id:
+            return
+        focused_path: str = self.dir_tree.set(focused, "fullpath")
+        was_selected: bool = focused in self.dir_tree.selection()
+        with self._operation("tree_filter"):
+            self.tree_pager.set_filter(node_id, self.tree_filter_var.get())
+            if self.dir_tree.exists(focused):
+                return
+            # 重建删除了获得焦点的子节点：按路径找回，找不到（被筛掉或尚未
+            # 插入）时把焦点留在被筛选的节点上，后续输入仍作用于同一节点。
+            found: Optional[str] = self.tree_pager.find_child(
+                node_id, focused_path
+            )
+            self.dir_tree.focus(found or node_id)
+            if found is not None and was_selected:
+                self.dir_tree.selection_set(found)
+                self.dir_tree.see(found)
+
+    def _on_table_filter_changed(self, *args: object) -> None:
+        """
+        筛选框内容变化后在空闲时筛选，连续输入合并为一次。
+        """
+        if self._table_filter_after is None:
+            self._table_filter_after = self.after_idle(
+                self._apply_table_filter
+            )
+
+    def _apply_table_filter(self) -> None:
+        """
+        按筛选文本更新表格可见行。
+        """
+        self._table_filter_after = None
+        with self._operation("table_filter"):
+            self.table_filter.apply(self.table_filter_var.get())
+        self._update_filter_count()
+
+    def _update_filter_count(self) -> None:
+        """
+        刷新筛选命中数量提示，未筛选时不显示。
+        """
+        if not self.table_filter.active:
+            self.filter_count_var.set("")
             return
-        self._load_directory(Path(path_str))
+        self.filter_count_var.set(
+            MSG_FILTER_COUNT.format(
+                visible=self.table_filter.visible_count(),
+                total=len(self.table_filter.order),
+            )
+        )
 
     def _load_directory(self, path: Path) -> None:
         """
         加载当前目录的子目录备注，刷新表格与内存模型。
 
+        深度为 1 时同步读取直接子目录；更大深度时在后台流式加载。
+
         Args:
             path: 需要展示的目录路径。
         """
-        self.current_path = path
-        self.path_label.config(text=f"{LABEL_CURRENT_PATH_PREFIX}{path}")
-        self.rows_by_path.clear()
-        for item in self.table.get_children():
-            self.table.delete(item)
+        with self._operation("load_directory"):
+            self._cancel_load_task()
+            self._cancel_size_task()
+            self.prefetcher.cancel()
+            self.current_path = path
+            self.batch_paths = None
+            self.path_label.config(text=f"{LABEL_CURRENT_PATH_PREFIX}{path}")
+            self.table_filter.clear_table()
+            self.rows.clear(path)
+
+            depth: int = self._table_depth()
+            if depth > 1:
+                self._load_directory_recursive(path, depth)
+                return
 
-        subfolders: List[Path] = self.service.list_subfolders(path)
-        for folder in subfolders:
-            remark: str = self.service.read_info_tip(folder)
-            row: FolderRemark = FolderRemark(
-                name=folder.name,
-                path=folder,
-                original_remark=remark,
-                current_remark=remark,
+            cached: Optional[CachedDirectory] = self.dir_cache.get(path)
+            versions: List[Optional[IniVersion]]
+            if cached is not None and cached.remarks is not None:
+                subfolders: List[Path] = cached.folders
+                remarks: List[str] = cached.remarks
+                versions = cached.versions or [None] * len(subfolders)
+            else:
+                try:
+                    listing: List[
+                        Tuple[Path, str, Optional[IniVersion]]
+                    ] = self.service.list_remarks(path)
+                except PathUnreachableError as exc:
+                    self.path_label.config(
+                        text=(
+                            f"{LABEL_CURRENT_PATH_PREFIX}{path}"
+                            f" {TEXT_UNREACHABLE}"
+                        )
+                    )
+                    log_message("WARN", f"load directory unreachable: {exc}")
+                    return
+                subfolders = [folder for folder, _, _ in listing]
+                remarks = [remark for _, remark, _ in listing]
+                versions = [version for _, _, version in listing]
+                self.dir_cache.put(
+                    path, subfolders, list(remarks), list(versions)
+                )
+            self.table_filter.rows_added(
+                [
+                    self._append_row(folder, remark, version)
+                    for folder, remark, version in zip(
+                        subfolders, remarks, versions
+                    )
+                ]
             )
-            self.rows_by_path[str(folder)] = row
-            self.table.insert(
-                "",
-                tk.END,
-                values=(row.name, row.current_remark, str(row.path)),
+            self._update_filter_count()
+            self._update_pending_label()
+            # 用户通常接着打开某个子目录，提前在后台预热它们的列表与备注。
+            self.prefetcher.prefetch(subfolders)
+            self.path_label.config(
+                text=f"{LABEL_CURRENT_PATH_PREFIX}{path} | 子目录：{len(subfolders)}"
             )
-        self.path_label.config(
-            text=f"{LABEL_CURRENT_PATH_PREFIX}{path} | 子目录：{len(subfolders)}"
+            self._start_size_task()
+
+    def _load_directory_recursive(self, path: Path, depth: int) -> None:
+        """
+        在后台遍历多层子目录，边发现边插入表格，导航时可取消。
+
+        Args:
+            path: 根目录。
+            depth: 最大深度。
+        """
+
+        def produce(cancel_event: threading.Event) -> Iterator[Tuple[Path, str]]:
+            return iter_sync(
+                self.scanner.iter_remarks(path, depth), cancel_event
+            )
+
+        def on_batch(batch: List[Tuple[Path, str]]) -> None:
+            with self._operation("load_directory_batch"):
+                self.table_filter.rows_added(
+                    [
+                        self._append_row(folder, remark)
+                        for folder, remark in batch
+                    ]
+                )
+            self._update_filter_count()
+            self.path_label.config(
+                text=f"{LABEL_CURRENT_PATH_PREFIX}{path} | "
+                + MSG_LOADING_ROWS.format(count=len(self.rows))
+            )
+
+        def on_done(error: Optional[BaseException]) -> None:
+            self.load_task = None
+            self._update_pending_label()
+            suffix: str = f"深度 {depth} 子目录：{len(self.rows)}"
+            if error is not None:
+                suffix += f"（加载中断：{error}）"
+            self.path_label.config(
+                text=f"{LABEL_CURRENT_PATH_PREFIX}{path} | {suffix}"
+            )
+            self._start_size_task()
+
+        self.load_task = BackgroundTask(self, produce, on_batch, on_done)
+        self.load_task.start()
+
+    def _append_row(
+        self,
+        folder: Path,
+        remark: str,
+        version: Optional[IniVersion] = None,
+    ) -> int:
+        """
+        追加一行到行存储与表格，并覆盖此前暂存、尚未保存的修改。
+
+        Args:
+            folder: 目录路径。
+            remark: 磁盘上的备注。
+            version: 读取时 desktop.ini 的版本；未记录时为 None。
+
+        Returns:
+            新行的行号。
+        """
+        row_id: int = self.rows.add(folder, remark, version)
+        if self.pending:
+            staged: Optional[str] = self.pending.refresh_original(
+                str(folder), remark, version
+            )
+            if staged is not None:
+                self.rows.set_current(row_id, staged)
+                remark = staged
+        state: Optional[str] = self.write_behind.state(str(folder))
+        self.table.insert(
+            "",
+            tk.END,
+            iid=str(row_id),
+            tags=(state,) if state else (),
+            values=(
+                folder.name,
+                remark,
+                self.rows.relative_path(row_id),
+                str(folder),
+                "",
+                "",
+            ),
+        )
+        return row_id
+
+    def _cancel_load_task(self) -> None:
+        """
+        取消正在进行的多层加载。
+        """
+        if self.load_task is not None:
+            self.load_task.cancel()
+            self.load_task = None
+
+    def _on_show_sizes_changed(self) -> None:
+        """
+        切换大小列：开启时显示两列并开始统计当前表格，关闭时隐藏并停止统计。
+        """
+        columns: Tuple[str, ...] = ("name", "remark", "relpath", "path")
+        if self.show_sizes_var.get():
+            self.table.configure(displaycolumns=columns + ("size", "items"))
+            if self.load_task is None:
+                self._start_size_task()
+        else:
+            self._cancel_size_task()
+            self.table.configure(displaycolumns=columns)
+
+    def _start_size_task(self) -> None:
+        """
+        大小列开启时在后台统计表格各行的子树大小，子树完成即填入对应行。
+
+        统计在表格加载完成后开始，从不阻塞目录加载；未变化的目录沿用缓存，
+        刷新当前目录时忽略缓存重新统计。
+        """
+        self._cancel_size_task()
+        force: bool = self._size_force
+        self._size_force = False
+        if not self.show_sizes_var.get() or not len(self.rows):
+            return
+        row_ids: Dict[str, int] = {
+            self.rows.path(row_id): row_id for row_id in range(len(self.rows))
+        }
+        folders: List[Path] = [
+            Path(path_str)
+            for path_str, row_id in row_ids.items()
+            if row_id not in self.rows.sizes
+        ]
+        service: DesktopIniService = self.service.with_priority(
+            IO_PRIORITY_INDEX
         )
 
+        def produce(
+            cancel_event: threading.Event,
+        ) -> Iterator[Tuple[Path, SubtreeSize]]:
+            return iter_subtree_sizes(
+                service,
+                self.size_cache,
+                folders,
+                self.executor,
+                cancel_event,
+                force=force,
+            )
+
+        def on_batch(batch: List[Tuple[Path, SubtreeSize]]) -> None:
+            with self._operation("size_batch"):
+                for folder, size in batch:
+                    row_id: Optional[int] = row_ids.get(str(folder))
+                    if row_id is None:
+                        continue
+                    self.rows.sizes[row_id] = size
+                    item_id: str = str(row_id)
+                    if self.table.exists(item_id):
+                        self.table.set(
+                            item_id, "size", format_size(size.size_bytes)
+                        )
+                        self.table.set(item_id, "items", str(size.items))
+
+        def on_done(error: Optional[BaseException]) -> None:
+            self.size_task = None
+            if error is not None:
+                log_message("WARN", f"folder sizes interrupted: {error}")
+
+        self.size_task = BackgroundTask(self, produce, on_batch, on_done)
+        self.size_task.start()
+
+    def _cancel_size_task(self) -> None:
+        """
+        取消正在进行的大小统计。
+        """
+        if self.size_task is not None:
+            self.size_task.cancel()
+            self.size_task = None
+
+    def _table_depth(self) -> int:
+        """
+        读取表格深度设置，非法输入回退为 1。
+
+        Returns:
+            1 到 MAX_TABLE_DEPTH 之间的深度。
+        """
+        try:
+            depth: int = int(self.depth_var.get())
+        except (tk.TclError, ValueError):
+            return 1
+        return max(1, min(depth, MAX_TABLE_DEPTH))
+
+    def _on_depth_changed(self, event: Optional[tk.Event] = None) -> None:
+        """
+        深度设置变化后重新加载当前目录。
+
+        Args:
+            event: 键盘事件（通过 Spinbox 按钮触发时为 None）。
+        """
+        if self.current_path:
+            self._load_directory(self.current_path)
+
     def _on_drive_changed(self, event: tk.Event) -> None:
         """
         切换盘符后重载目录树。
@@ -464,34 +1265,310 @@ class MainApp(tk.Tk):
 
     def _refresh_current(self) -> None:
         """
-        刷新当前目录，重新读取备注。
+        刷新当前目录，重新读取备注；同时清除该共享的不可达记录以便重试。
         """
-        if self.current_path:
+        if self.batch_paths:
+            self._load_batch(self.batch_paths)
+        elif self.current_path:
+            self.probe.forget(self.current_path)
+            self.dir_cache.clear()
+            self._size_force = True
             self._load_directory(self.current_path)
 
     def _selected_item_ids(self) -> List[str]:
         """
-        返回当前选中行（按显示顺序），便于批量处理。
+        返回当前选中且未被筛掉的行（按显示顺序），便于批量处理。
 
         Returns:
             Treeview 选中行的 ID 列表。
         """
-        return sorted(self.table.selection(), key=self.table.index)
+        return sorted(
+            (
+                item_id
+                for item_id in self.table.selection()
+                if self.table_filter.is_visible(item_id)
+            ),
+            key=self.table.index,
+        )
 
-    def _set_remark_for_paths(self, paths: List[str], remark: str) -> None:
+    def _set_remark_for_rows(self, row_ids: List[int], remark: str) -> None:
         """
-        同步内存模型与表格中的备注值。
+        同步行存储与表格中的备注值。
 
         Args:
-            paths: 需要更新的路径集合。
+            row_ids: 需要更新的行号。
             remark: 要写入的新备注。
         """
-        sync_remark_to_rows(self.table, self.rows_by_path, paths, remark)
+        self._apply_remark_updates({row_id: remark for row_id in row_ids})
+
+    def _apply_remark_updates(self, updates: Dict[int, str]) -> None:
+        """
+        批量更新表格与行存储，并把修改登记到会话级待保存集合。
+
+        Args:
+            updates: 行号到新备注的映射。
+        """
+        sync_remarks_to_rows(self.table, self.rows, updates)
+        self.table_filter.refresh_rows(updates)
+        for row_id, remark in updates.items():
+            path: str = self.rows.path(row_id)
+            self.pending.stage(
+                path,
+                self.rows.original[row_id],
+                remark,
+                self.rows.version(row_id),
+            )
+            self.write_behind.edited(path)
+        self._render_row_states(updates)
+        self._update_pending_label()
+        self._schedule_autosave()
+
+    def _render_row_state(self, row_id: int, path: str) -> None:
+        """
+        按保存状态设置行的颜色标签。
+
+        Args:
+            row_id: 行号。
+            path: 行对应的完整路径。
+        """
+        state: Optional[str] = self.write_behind.state(path)
+        self.table.item(str(row_id), tags=(state,) if state else ())
+
+    def _render_row_states(self, row_ids: Iterable[int]) -> None:
+        """
+        批量设置多行的保存状态标签：按状态分组，每个状态只调用一次
+        ``tag remove``/``tag add``，大批量修改时不必逐行调用 Tk。
+
+        Args:
+            row_ids: 行号。
+        """
+        item_ids: List[str] = []
+        groups: Dict[str, List[str]] = {
+            state: [] for state in ROW_STATE_COLORS
+        }
+        for row_id in row_ids:
+            item_id: str = str(row_id)
+            item_ids.append(item_id)
+            state: Optional[str] = self.write_behind.state(
+                self.rows.path(row_id)
+            )
+            if state:
+                groups[state].append(item_id)
+        if not item_ids:
+            return
+        widget: str = str(self.table)
+        for state, members in groups.items():
+            self.table.tk.call(widget, "tag", "remove", state, item_ids)
+            if members:
+                self.table.tk.call(widget, "tag", "add", state, members)
+
+    def _on_autosave_changed(self) -> None:
+        """
+        切换自动保存：开启时立即安排写入已有修改，关闭时停止计时
+        （正在写入的一批照常完成）。
+        """
+        if self.autosave_var.get():
+            self._schedule_autosave()
+        else:
+            self._stop_autosave_timer()
+
+    def _schedule_autosave(self) -> None:
+        """
+        自动保存开启时安排下一批写入：可写项达到批量上限时立即写入，
+        否则在停止编辑 ``AUTOSAVE_DELAY_MS`` 后写入，每次修改重新计时；
+        持续编辑时最迟在第一次修改后 ``AUTOSAVE_MAX_WAIT_MS`` 写入。
+        期间的修改合并到同一批。
+        """
+        if not self.autosave_var.get():
+            return
+        ready: int = self.write_behind.ready_count()
+        if not ready:
+            return
+        if ready >= AUTOSAVE_BATCH_SIZE:
+            self._flush_autosave()
+            return
+        now: float = time.monotonic()
+        if self._autosave_deadline is None:
+            self._autosave_deadline = now + AUTOSAVE_MAX_WAIT_MS / 1000
+        if self._autosave_after is not None:
+            self.after_cancel(self._autosave_after)
+        delay_ms: int = min(
+            AUTOSAVE_DELAY_MS,
+            max(0, int((self._autosave_deadline - now) * 1000)),
+        )
+        self._autosave_after = self.after(delay_ms, self._flush_autosave)
+
+    def _stop_autosave_timer(self) -> None:
+        """
+        取消自动保存计时，下一次修改重新开始一轮。
+        """
+        if self._autosave_after is not None:
+            self.after_cancel(self._autosave_after)
+            self._autosave_after = None
+        self._autosave_deadline = None
+
+    def _flush_autosave(self) -> None:
+        """
+        在后台写入下一批修改，逐项回报结果；同一时间只有一批在写。
+        """
+        self._stop_autosave_timer()
+        if self.autosave_task is not None:
+            return
+        batch: List[Tuple[str, str]] = self.write_behind.take_batch(
+            AUTOSAVE_BATCH_SIZE
+        )
+        if not batch:
+            return
+        save_service: DesktopIniService = self.service.with_priority(
+            IO_PRIORITY_SAVE
+        )
+        cancel_event: threading.Event = threading.Event()
+        results: Iterator[WriteResult] = iter_checked_writes(
+            save_service, self.executor, self.pending, batch, cancel_event
+        )
+
+        def produce(event: threading.Event) -> Iterator[WriteResult]:
+            # 任务自带的取消标记在后台线程中才传入，比对基准需在主线程取快照，
+            # 因此先建好迭代器，取消时转发到它自己的标记上。
+            for result in results:
+                if event.is_set():
+                    cancel_event.set()
+                    return
+                yield result
+
+        def on_done(error: Optional[BaseException]) -> None:
+            self.autosave_task = None
+            if error is not None:
+                log_message("WARN", f"autosave interrupted: {error}")
+            # 没有回报结果的项重新排队。
+            self.write_behind.abandon()
+            self._update_pending_label()
+            self._render_tree_counts()
+            self._schedule_autosave()
+
+        self.autosave_task = BackgroundTask(
+            self, produce, self._finish_writes, on_done
+        )
+        self.autosave_task.start()
+
+    def _cancel_autosave(self) -> None:
+        """
+        停止自动保存计时与进行中的批次，未回报的项留在待保存集合中。
+        """
+        self._stop_autosave_timer()
+        if self.autosave_task is not None:
+            self.autosave_task.cancel()
+            self.autosave_task = None
+            self.write_behind.abandon()
+
+    def _finish_writes(self, results: List[WriteResult]) -> None:
+        """
+        登记一批写入结果，更新缓存、行存储与行颜色（自动与手动保存共用）。
+
+        Args:
+            results: 写入结果列表。
+        """
+        with self._operation("finish_writes"):
+            visible_rows: Dict[str, int] = self.rows.find_paths(
+                {result[0] for result in results}
+            )
+            for path, remark, version, error in results:
+                self.write_behind.complete(path, remark, error, version)
+                if error is None:
+                    self.dir_cache.update_remark(Path(path), remark, version)
+                row_id: Optional[int] = visible_rows.get(path)
+                if row_id is None:
+                    continue
+                if error is None:
+                    self.rows.set_original(row_id, remark, version)
+                self._render_row_state(row_id, path)
+        self._update_pending_label()
+
+    def _conflicts_dialog(self) -> None:
+        """
+        打开冲突处理对话框；已打开时按最新的冲突重建。
+        """
+        if (
+            self._conflicts_window is not None
+            and self._conflicts_window.winfo_exists()
+        ):
+            self._conflicts_window.destroy()
+        conflicts: List[ConflictRow] = [
+            (
+                path,
+                self.pending.pending_remark(path) or "",
+                conflict.disk_remark,
+            )
+            for path, conflict in sorted(self.write_behind.conflicts.items())
+        ]
+        if not conflicts:
+            return
+        self._conflicts_window = conflict_dialog(
+            self, conflicts, self._resolve_conflicts
+        )
+
+    def _resolve_conflicts(self, paths: List[str], keep_mine: bool) -> None:
+        """
+        按用户选择解决冲突，并同步行存储、表格与缓存。
+
+        Args:
+            paths: 要处理的目录完整路径。
+            keep_mine: True 保留本地修改（随后重新写入），False 采用磁盘备注。
+        """
+        visible_rows: Dict[str, int] = self.rows.find_paths(set(paths))
+        updates: Dict[int, str] = {}
+        for path in paths:
+            conflict = self.write_behind.resolve(path, keep_mine)
+            if conflict is None:
+                continue
+            disk_remark: str = conflict.disk_remark
+            self.dir_cache.update_remark(
+                Path(path), disk_remark, conflict.version
+            )
+            row_id: Optional[int] = visible_rows.get(path)
+            if row_id is None:
+                continue
+            self.rows.set_original(row_id, disk_remark, conflict.version)
+            if not keep_mine:
+                updates[row_id] = disk_remark
+            self._render_row_state(row_id, path)
+        sync_remarks_to_rows(self.table, self.rows, updates)
+        self.table_filter.refresh_rows(updates)
+        self._update_pending_label()
+        self._schedule_autosave()
+
+    def _update_pending_label(self) -> None:
+        """
+        刷新待保存数量提示与冲突按钮。
+        """
+        conflicts: int = len(self.write_behind.conflicts)
+        self.conflicts_button.configure(
+            text=(
+                TEXT_CONFLICTS_BUTTON_COUNT.format(count=conflicts)
+                if conflicts
+                else TEXT_CONFLICTS_BUTTON
+            ),
+            state=tk.NORMAL if conflicts else tk.DISABLED,
+        )
+        if not self.pending:
+            self.pending_var.set("")
+            return
+        text: str = LABEL_PENDING.format(
+            count=len(self.pending),
+            dirs=len(self.pending.directories()),
+        )
+        if self.write_behind.failures:
+            text += LABEL_WRITE_FAILED.format(
+                count=len(self.write_behind.failures)
+            )
+        self.pending_var.set(text)
 
     def handle_external_path(self, payload: str) -> None:
         """
         处理其他进程转发的路径请求，在当前实例中打开目标目录。
 
+        多选右键菜单转发的路径先暂存，同一批启动合并后打开为批量视图。
+
         Args:
             payload: 外部进程传递的路径字符串。
         """
@@ -503,26 +1580,160 @@ class MainApp(tk.Tk):
             except Exception:
                 pass
 
+            if payload.startswith(SELECT_PAYLOAD_PREFIX):
+                self._queue_selection(
+                    [
+                        Path(line.strip())
+                        for line in payload[
+                            len(SELECT_PAYLOAD_PREFIX):
+                        ].splitlines()
+                        if line.strip()
+                    ]
+                )
+                return
             target_text: str = payload.strip()
             if not target_text:
                 return
+            self._open_external_directory(Path(target_text))
 
-            target_path: Path = Path(target_text)
-            if not target_path.exists():
-                messagebox.showerror(
-                    TITLE_ERROR, f"路径不存在：{target_path}"
-                )
-                return
+        self.after(0, _process)
+
+    def _open_external_directory(self, target_path: Path) -> None:
+        """
+        探测外部传入的路径并把它设为目录树根。
+
+        Args:
+            target_path: 外部传入的路径，文件路径换成其所在目录。
+        """
+        try:
+            directory: Optional[Path] = self._probe_directory(target_path)
+        except PathUnreachableError as exc:
+            messagebox.showerror(TITLE_ERROR, f"无法访问：{exc}")
+            return
+        if directory is None:
+            messagebox.showerror(TITLE_ERROR, f"路径不存在：{target_path}")
+            return
+
+        drive_root: str = directory.anchor
+        if drive_root and drive_root in self.drive_combo["values"]:
+            self.drive_var.set(drive_root)
+        self._load_tree_root(directory)
+
+    def _queue_selection(self, paths: List[Path]) -> None:
+        """
+        暂存多选菜单转发的路径，停止收到新路径片刻后一并打开。
+
+        Args:
+            paths: 新收到的路径。
+        """
+        for path in paths:
+            if path not in self._pending_selection:
+                self._pending_selection.append(path)
+        if self._selection_after is not None:
+            self.after_cancel(self._selection_after)
+        self._selection_after = self.after(
+            SELECTION_COLLECT_MS, self._flush_selection
+        )
 
-            directory: Path = (
-                target_path if target_path.is_dir() else target_path.parent
+    def _flush_selection(self) -> None:
+        """
+        打开暂存的选中项：多项时显示批量视图，单项时与普通右键菜单一致。
+        """
+        self._selection_after = None
+        if self.startup_task is not None:
+            # 启动预读尚未完成，稍后再打开，避免被初始目录覆盖。
+            self._selection_after = self.after(
+                SELECTION_COLLECT_MS, self._flush_selection
             )
-            drive_root: str = directory.anchor
-            if drive_root and drive_root in self.drive_combo["values"]:
-                self.drive_var.set(drive_root)
-            self._load_tree_root(directory)
+            return
+        paths: List[Path] = self._pending_selection
+        self._pending_selection = []
+        if len(paths) > 1:
+            self._load_batch(paths)
+        elif paths and paths[0] != self.current_path:
+            self._open_external_directory(paths[0])
+
+    def _load_batch(self, paths: List[Path]) -> None:
+        """
+        把多选的目录本身作为表格行展示（批量视图），在后台读取备注。
 
-        self.after(0, _process)
+        批量视图没有当前目录，规则与镜像等子树操作不可用；刷新时重新读取这些目录。
+
+        Args:
+            paths: 选中的目录。
+        """
+        with self._operation("load_batch"):
+            self._cancel_load_task()
+            self._cancel_size_task()
+            self.prefetcher.cancel()
+            self.current_path = None
+            self.batch_paths = list(paths)
+            root: Optional[Path] = common_parent(
+                [path.parent for path in paths]
+            )
+            title: str = MSG_BATCH_VIEW.format(count=len(paths))
+            self.path_label.config(text=f"{LABEL_CURRENT_PATH_PREFIX}{title}")
+            self.table_filter.clear_table()
+            self.rows.clear(root or "")
+
+        def produce(
+            cancel_event: threading.Event,
+        ) -> Iterator[Tuple[Path, Tuple[str, Optional[IniVersion]]]]:
+            scanner: AsyncScanner = AsyncScanner(self.service, self.executor)
+            for path, future in scanner.map_ordered(
+                paths[0],
+                self.service.read_remark,
+                paths,
+                hold=cancel_event.is_set,
+            ):
+                if cancel_event.is_set():
+                    return
+                yield path, future.result()
+
+        def on_batch(
+            batch: List[Tuple[Path, Tuple[str, Optional[IniVersion]]]]
+        ) -> None:
+            with self._operation("load_batch_rows"):
+                self.table_filter.rows_added(
+                    [
+                        self._append_row(folder, remark, version)
+                        for folder, (remark, version) in batch
+                    ]
+                )
+            self._update_filter_count()
+
+        def on_done(error: Optional[BaseException]) -> None:
+            self.load_task = None
+            self._update_pending_label()
+            if error is not None:
+                self.path_label.config(
+                    text=(
+                        f"{LABEL_CURRENT_PATH_PREFIX}{title}"
+                        f"（加载中断：{error}）"
+                    )
+                )
+            self._start_size_task()
+
+        self.load_task = BackgroundTask(self, produce, on_batch, on_done)
+        self.load_task.start()
+
+    def _probe_directory(self, path: Path) -> Optional[Path]:
+        """
+        限时探测路径，文件路径换成其所在目录。
+
+        Args:
+            path: 待探测路径。
+
+        Returns:
+            可展示的目录；路径不存在时返回 None。
+
+        Raises:
+            PathUnreachableError: 路径所在共享不可达或探测超时。
+        """
+        kind: Optional[str] = self.probe.kind(path)
+        if kind is None:
+            return None
+        return path.parent if kind == KIND_FILE else path
 
     def _on_table_double_click(self, event: tk.Event) -> None:
         """
@@ -535,12 +1746,8 @@ class MainApp(tk.Tk):
         column: str = self.table.identify_column(event.x)
         if not item_id or column != "#2":
             return
-        values: Tuple[str, str, str] = self.table.item(
-            item_id, "values"
-        )  # type: ignore[assignment]
-        if len(values) < 3:
-            return
-        current: str = values[1]
+        row_id: int = int(item_id)
+        current: str = self.rows.current[row_id]
         new_remark: Optional[str] = simpledialog.askstring(
             TITLE_EDIT_REMARK,
             PROMPT_NEW_REMARK,
@@ -548,7 +1755,7 @@ class MainApp(tk.Tk):
         )
         if new_remark is None:
             return
-        self._set_remark_for_paths([values[2]], new_remark)
+        self._set_remark_for_rows([row_id], new_remark)
 
     def _bulk_mapping_dialog(self) -> None:
         """
@@ -559,55 +1766,57 @@ class MainApp(tk.Tk):
             messagebox.showinfo(TITLE_INFO, "请先选择至少一行。")
             return
 
-        mappings: List[Tuple[str, str, str]] = []
-        for item_id in item_ids:
-            values: Tuple[str, str, str] = self.table.item(
-                item_id, "values"
-            )  # type: ignore[assignment]
-            if len(values) < 3:
-                continue
-            mappings.append((values[0], values[1], values[2]))
-
-        def apply_callback(text_widget: tk.Text, dialog: tk.Toplevel) -> None:
-            mapping_dict: Dict[str, str] = parse_mapping_lines(
-                text_widget, dialog
+        row_ids: List[int] = [int(item_id) for item_id in item_ids]
+        # 多层视图中名称可能重复，统一用相对路径（直接子目录即名称）作为键。
+        mappings: List[Tuple[str, str, str]] = [
+            (
+                self.rows.relative_path(row_id),
+                self.rows.current[row_id],
+                self.rows.path(row_id),
             )
-            if not mapping_dict:
-                return
+            for row_id in row_ids
+        ]
 
+        def apply_callback(
+            mapping_dict: Dict[str, str], dialog: tk.Toplevel
+        ) -> None:
             applied: List[str] = []
             missing: List[str] = []
             extra: List[str] = []
             unchanged: List[str] = []
 
-            name_to_info: Dict[str, Tuple[str, str]] = {
-                name: (remark, path) for name, remark, path in mappings
-            }
-            for name, remark in mapping_dict.items():
-                if name in name_to_info:
-                    current_remark, path = name_to_info[name]
-                    if remark == current_remark:
-                        unchanged.append(name)
-                        continue
-                    self._set_remark_for_paths([path], remark)
-                    applied.append(name)
-                else:
-                    extra.append(name)
-
-            for name in name_to_info:
-                if name not in mapping_dict:
-                    missing.append(name)
+            with self._operation("mapping_apply"):
+                name_to_row: Dict[str, int] = {
+                    key: row_id
+                    for row_id, (key, _, _) in zip(row_ids, mappings)
+                }
+                updates: Dict[int, str] = {}
+                for name, remark in mapping_dict.items():
+                    if name in name_to_row:
+                        row_id = name_to_row[name]
+                        if remark == self.rows.current[row_id]:
+                            unchanged.append(name)
+                            continue
+                        updates[row_id] = remark
+                        applied.append(name)
+                    else:
+                        extra.append(name)
+                self._apply_remark_updates(updates)
+
+                for name in name_to_row:
+                    if name not in mapping_dict:
+                        missing.append(name)
 
             messages: List[str] = []
             if applied:
-                messages.append(f"已应用：{', '.join(applied)}")
+                messages.append(f"已应用：{summarize_names(applied)}")
             if unchanged:
-                messages.append(f"未变更：{', '.join(unchanged)}")
+                messages.append(f"未变更：{summarize_names(unchanged)}")
             if missing:
-                messages.append(f"未提供备注：{', '.join(missing)}")
+                messages.append(f"未提供备注：{summarize_names(missing)}")
             if extra:
                 messages.append(
-                    f"多余文件名（未匹配选中项）：{', '.join(extra)}"
+                    f"多余文件名（未匹配选中项）：{summarize_names(extra)}"
                 )
 
             if messages:
@@ -626,30 +1835,149 @@ class MainApp(tk.Tk):
             hint=MSG_MAPPING_HINT,
         )
 
-    def _save_changes(self) -> None:
+    def _rule_dialog(self) -> None:
         """
-        将修改写入 desktop.ini 并展示处理结果。
+        打开规则批量备注对话框，规则作用于当前目录的整个子树。
         """
-        changed: List[FolderRemark] = [
-            row
-            for row in self.rows_by_path.values()
-            if row.current_remark != row.original_remark
-        ]
-        if not changed:
-            messagebox.showinfo(TITLE_INFO, "没有需要保存的修改。")
+        if not self.current_path:
+            messagebox.showinfo(TITLE_INFO, "请先选择目录。")
+            return
+        root: Path = self.current_path
+        rule_dialog(
+            self,
+            root,
+            self.service,
+            self.executor,
+            self.jobs,
+            on_committed=lambda: self._after_job_write(root),
+        )
+
+    def _mirror_dialog(self) -> None:
+        """
+        打开备注镜像对话框，把当前目录子树的备注同步到另一棵目录树。
+        """
+        if not self.current_path:
+            messagebox.showinfo(TITLE_INFO, "请先选择目录。")
+            return
+        root: Path = self.current_path
+        mirror_dialog(
+            self,
+            root,
+            self.service,
+            self.executor,
+            self.jobs,
+            on_committed=lambda: self._after_job_write(root),
+        )
+
+    def _jobs_dialog(self) -> None:
+        """
+        打开后台任务面板；已打开时只把它提到前面。
+        """
+        if self._jobs_window is not None and self._jobs_window.winfo_exists():
+            self._jobs_window.lift()
             return
 
+        def on_finished(job: Job) -> None:
+            if job.kind == JOB_KIND_EXPORT:
+                self._refresh_jobs_button()
+            else:
+                self._after_job_write(Path(str(job.params["root"])))
+
+        self._jobs_window = jobs_dialog(
+            self, self.jobs, self.service, self.executor, on_finished
+        )
+        self._jobs_window.bind(
+            "<Destroy>", lambda event: self._refresh_jobs_button(), add="+"
+        )
+
+    def _refresh_jobs_button(self) -> None:
+        """
+        在后台任务按钮上显示未完成任务的数量。
+        """
+        count: int = len(self.jobs.jobs())
+        self.jobs_button.configure(
+            text=TEXT_JOBS_BUTTON_COUNT.format(count=count)
+            if count
+            else TEXT_JOBS_BUTTON
+        )
+
+    def _after_job_write(self, root: Path) -> None:
+        """
+        写入任务结束后刷新任务数量并清空目录缓存；当前目录位于写入子树内时
+        重新加载，用户已切换到别处时不打断其浏览。
+
+        Args:
+            root: 任务写入的子树根目录。
+        """
+        self._refresh_jobs_button()
+        self._render_tree_counts()
+        current: Optional[Path] = self.current_path
+        if current is not None and (
+            current == root or root in current.parents
+        ):
+            self._reload_after_bulk_write(current)
+        else:
+            self.dir_cache.clear()
+
+    def _reload_after_bulk_write(self, root: Path) -> None:
+        """
+        批量写入子树后清空目录缓存并重新加载，避免展示过期备注。
+
+        Args:
+            root: 被写入的子树根目录。
+        """
+        self.dir_cache.clear()
+        self._load_directory(root)
+
+    def _save_changes(self) -> bool:
+        """
+        将会话内所有待保存修改写入 desktop.ini 并展示处理结果。
+
+        只写入登记过的增量，同一目录下的写入相邻提交，由线程池并行执行。
+
+        Returns:
+            True 表示全部写入成功（或无需写入）。
+        """
+        if not self.pending:
+            messagebox.showinfo(TITLE_INFO, "没有需要保存的修改。")
+            return True
+
+        # 自动保存正在写入的项由该批次负责，这里跳过以免同一目录并发写入；
+        # 有冲突的项需先在冲突对话框中选择保留哪一方。
+        items: List[Tuple[str, str]] = [
+            (path, remark)
+            for path, remark in self.pending.sorted_items()
+            if path not in self.write_behind.in_flight
+            and path not in self.write_behind.conflicts
+        ]
+        if not items:
+            if self.write_behind.conflicts:
+                self._conflicts_dialog()
+            else:
+                messagebox.showinfo(TITLE_INFO, MSG_AUTOSAVE_BUSY)
+            return False
+        results: List[WriteResult] = []
         success_items: List[str] = []
         failed_items: List[Tuple[str, str]] = []
-        for row in changed:
-            try:
-                self.service.write_info_tip(row.path, row.current_remark)
-                row.original_remark = row.current_remark
-                success_items.append(row.name)
-            except Exception as exc:
-                failed_items.append((row.name, str(exc)))
+        conflict_count: int = 0
+        save_service: DesktopIniService = self.service.with_priority(
+            IO_PRIORITY_SAVE
+        )
+        with self._operation("save"):
+            for result in iter_checked_writes(
+                save_service, self.executor, self.pending, items
+            ):
+                results.append(result)
+                path, _, _, error = result
+                if isinstance(error, RemarkConflictError):
+                    conflict_count += 1
+                elif error is not None:
+                    failed_items.append((path, str(error)))
+                else:
+                    success_items.append(os.path.basename(path))
+        self._finish_writes(results)
 
-        total_count: int = len(changed)
+        total_count: int = len(items)
         success_count: int = len(success_items)
         failed_count: int = len(failed_items)
 
@@ -659,16 +1987,20 @@ class MainApp(tk.Tk):
         ]
         if success_items:
             messages.append(
-                f"成功项({success_count}): {', '.join(success_items)}"
+                f"成功项({success_count}): {summarize_names(success_items)}"
             )
         if failed_items:
             messages.append("失败项列表：")
             for name, reason in failed_items:
                 messages.append(f"- {name}: {reason}")
+        if conflict_count:
+            messages.append(MSG_SAVE_CONFLICTS.format(count=conflict_count))
 
+        self._render_tree_counts()
         messagebox.showinfo(TITLE_RESULT, "\n".join(messages))
-        if self.current_path:
-            self._load_directory(self.current_path)
+        if conflict_count:
+            self._conflicts_dialog()
+        return not failed_items and not conflict_count
 
     def _sort_by_column(self, column: str) -> None:
         """
@@ -677,7 +2009,9 @@ class MainApp(tk.Tk):
         Args:
             column: 目标列名。
         """
-        sort_by_column(self.table, column, self.sort_directions)
+        sort_by_column(
+            self.table_filter, self.rows, column, self.sort_directions
+        )
 
     def _select_all_rows(self, event: tk.Event) -> str:
         """
@@ -692,6 +2026,77 @@ class MainApp(tk.Tk):
         select_all_rows(self.table)
         return "break"
 
+    def _copy_rows_as_tsv(self, event: tk.Event) -> str:
+        """
+        Ctrl+C 把选中行以 TSV（名称、备注、完整路径）复制到剪贴板，
+        可直接粘贴到 Excel 等电子表格。
+
+        Args:
+            event: 键盘事件。
+
+        Returns:
+            固定返回 "break" 以阻断默认快捷键行为。
+        """
+        rows: List[TsvRow] = [
+            (
+                self.rows.relative_path(row_id),
+                self.rows.current[row_id],
+                self.rows.path(row_id),
+            )
+            for row_id in map(int, self._selected_item_ids())
+        ]
+        if rows:
+            self.clipboard_clear()
+            self.clipboard_append(format_tsv(rows))
+            log_message("INFO", f"copied {len(rows)} rows as TSV")
+        return "break"
+
+    def _paste_tsv(self, event: tk.Event) -> str:
+        """
+        Ctrl+V 把剪贴板中的 TSV 应用到当前可见行：有路径列时按完整路径匹配，
+        否则按名称匹配；匹配到的修改作为一批登记为待保存，随后提示汇总。
+
+        Args:
+            event: 键盘事件。
+
+        Returns:
+            固定返回 "break" 以阻断默认快捷键行为。
+        """
+        try:
+            text: str = self.clipboard_get()
+        except tk.TclError:
+            text = ""
+        try:
+            pasted: List[TsvRow] = parse_tsv(text)
+        except csv.Error as exc:
+            log_message("WARN", f"clipboard TSV rejected: {exc}")
+            pasted = []
+        if not pasted:
+            messagebox.showinfo(TITLE_INFO, MSG_PASTE_NO_ROWS, parent=self)
+            return "break"
+        with self._operation("paste_tsv"):
+            match: TsvMatch = match_tsv_rows(
+                self.rows, map(int, self.table.get_children()), pasted
+            )
+            self._apply_remark_updates(match.updates)
+        messages: List[str] = [
+            MSG_PASTE_SUMMARY.format(
+                total=len(pasted),
+                applied=len(match.updates),
+                unchanged=match.unchanged,
+            )
+        ]
+        if match.ambiguous:
+            messages.append(
+                f"名称对应多行（请提供完整路径）：{summarize_names(match.ambiguous)}"
+            )
+        if match.unmatched:
+            messages.append(
+                f"未匹配当前可见行：{summarize_names(match.unmatched)}"
+            )
+        messagebox.showinfo(TITLE_RESULT, "\n".join(messages), parent=self)
+        return "break"
+
     def _toggle_context_menu(self) -> None:
         """
         注册/取消资源管理器右键菜单，保持按钮文案同步。
@@ -716,6 +2121,7 @@ class MainApp(tk.Tk):
                     python_exe,
                     target,
                     CONTEXT_MENU_NAME,
+                    multi_select=True,
                 )
                 self.bind_button_text.set(TEXT_UNBIND_MENU)
                 messagebox.showinfo(TITLE_INFO, "已绑定右键菜单。")
@@ -723,6 +2129,62 @@ class MainApp(tk.Tk):
             log_message("ERROR", f"context menu toggle failed: {exc}")
             messagebox.showerror(TITLE_ERROR, f"操作失败：{exc}")
 
+    @contextmanager
+    def _operation(self, action: str) -> Iterator[None]:
+        """
+        包裹一次界面操作：登记到卡顿监控，剖析器已启用时记录调用栈耗时。
+
+        Args:
+            action: 操作名称，例如 ``load_directory``、``save``。
+        """
+        with self.watchdog.operation(action), self.profiler.capture(action):
+            yield
+        self._update_profile_title()
+
+    def _arm_profiler(self, event: tk.Event) -> None:
+        """
+        快捷键回调：为下一次界面操作启用性能剖析。
+
+        Args:
+            event: 键盘事件。
+        """
+        self.profiler.arm()
+        self._update_profile_title()
+
+    def _update_profile_title(self) -> None:
+        """
+        在标题栏提示剖析器是否处于就绪状态。
+        """
+        if self.profiler.armed and not self.profiler.persistent:
+            self.title(f"{APP_TITLE}{TEXT_PROFILE_ARMED}")
+        else:
+            self.title(APP_TITLE)
+
+    def _on_close(self) -> None:
+        """
+        关闭窗口前提示未保存修改，然后停止卡顿监控、写出统计摘要并停止后台线程池。
+        """
+        self._cancel_autosave()
+        if self.pending:
+            answer: Optional[bool] = messagebox.askyesnocancel(
+                TITLE_INFO, MSG_CLOSE_PENDING.format(count=len(self.pending))
+            )
+            if answer is None or (answer and not self._save_changes()):
+                self._schedule_autosave()
+                return
+        self.watchdog.stop()
+        log_message(
+            "INFO", f"io scheduler summary: {self.io_scheduler.summary()}"
+        )
+        self.io_tuner.save()
+        self._cancel_size_task()
+        self.size_cache.save()
+        # 先让进行中的任务停止并保存检查点，再停线程池，下次可从该处继续。
+        self.jobs.cancel_all(JOB_STOP_TIMEOUT_S)
+        self.prefetcher.shutdown()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.destroy()
+
     def _show_initial_warning(self) -> None:
         """
         启动时提示路径回退信息，便于用户理解初始状态。
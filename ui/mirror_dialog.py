@@ -0,0 +1,287 @@
+"""
+备注镜像对话框：选择目标目录、流式预览差异与统计，确认后作为可续跑任务
+并行写入目标。
+"""
+from __future__ import annotations
+
+import threading
+import tkinter as tk
+from concurrent.futures import Executor
+from pathlib import Path
+from tkinter import filedialog, messagebox, ttk
+from typing import Callable, Dict, Iterator, List, Optional
+
+from core.constants import (
+    BUTTON_APPLY,
+    BUTTON_CLOSE,
+    BUTTON_PREVIEW,
+    COLUMN_HEADER_NEW_REMARK,
+    COLUMN_HEADER_OLD_REMARK,
+    COLUMN_HEADER_RELATIVE_PATH,
+    IO_PRIORITY_INDEX,
+    JOB_KIND_APPLY,
+    JOB_STATUS_LABELS,
+    LABEL_MIRROR_TARGET,
+    MSG_JOB_UNFINISHED,
+    MSG_MIRROR_APPLYING,
+    MSG_MIRROR_HINT,
+    MSG_MIRROR_SCANNED,
+    MSG_MIRROR_SCANNING,
+    TEXT_ATTRIBUTE_REPAIR,
+    TEXT_KEEP_TARGET,
+    TEXT_SELECT_FOLDER,
+    TITLE_ERROR,
+    TITLE_INFO,
+    TITLE_MIRROR,
+    TITLE_RESULT,
+)
+from core.ini_service import DesktopIniService
+from core.jobs import Job, JobManager
+from core.mapping import summarize_names
+from core.mirror import MirrorChange, MirrorStats, iter_mirror_changes
+from ui.background import BackgroundTask
+from ui.jobs_dialog import start_job
+
+
+def mirror_dialog(
+    parent: tk.Tk,
+    source: Path,
+    service: DesktopIniService,
+    executor: Executor,
+    jobs: JobManager,
+    on_committed: Callable[[], None],
+) -> None:
+    """
+    弹出备注镜像对话框，源为当前目录。
+
+    确认后的写入作为可续跑任务在主窗口上执行，关闭对话框不会中断写入。
+
+    Args:
+        parent: 主窗口引用，用于设置模态。
+        source: 源根目录。
+        service: desktop.ini 服务；比较与写入分别以 index、save 优先级调度。
+        executor: 比较与写入共用的线程池。
+        jobs: 任务管理器。
+        on_committed: 写入结束后的回调，通常用于清理缓存并刷新表格。
+    """
+    dialog: tk.Toplevel = tk.Toplevel(parent)
+    dialog.title(TITLE_MIRROR)
+    dialog.transient(parent)
+    dialog.grab_set()
+    dialog.geometry("1000x640")
+
+    ttk.Label(dialog, text=f"{source}\n{MSG_MIRROR_HINT}").pack(
+        anchor=tk.W, padx=10, pady=6
+    )
+    target_frame: ttk.Frame = ttk.Frame(dialog)
+    target_frame.pack(fill=tk.X, padx=10)
+    target_var: tk.StringVar = tk.StringVar(value="")
+    keep_var: tk.BooleanVar = tk.BooleanVar(value=False)
+    ttk.Label(target_frame, text=LABEL_MIRROR_TARGET).pack(side=tk.LEFT)
+    ttk.Entry(target_frame, textvariable=target_var).pack(
+        side=tk.LEFT, fill=tk.X, expand=True, padx=4
+    )
+
+    def on_browse() -> None:
+        selected: str = filedialog.askdirectory(parent=dialog)
+        if selected:
+            target_var.set(selected)
+
+    ttk.Button(target_frame, text=TEXT_SELECT_FOLDER, command=on_browse).pack(
+        side=tk.LEFT, padx=4
+    )
+    ttk.Checkbutton(
+        target_frame, text=TEXT_KEEP_TARGET, variable=keep_var
+    ).pack(side=tk.LEFT, padx=4)
+
+    preview_frame: ttk.Frame = ttk.Frame(dialog)
+    preview_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    preview_frame.rowconfigure(0, weight=1)
+    preview_frame.columnconfigure(0, weight=1)
+    preview: ttk.Treeview = ttk.Treeview(
+        preview_frame,
+        columns=("path", "old", "new"),
+        show="headings",
+        selectmode="none",
+    )
+    preview.heading("path", text=COLUMN_HEADER_RELATIVE_PATH)
+    preview.heading("old", text=COLUMN_HEADER_OLD_REMARK)
+    preview.heading("new", text=COLUMN_HEADER_NEW_REMARK)
+    preview.column("path", width=420, anchor=tk.W)
+    preview.column("old", width=260, anchor=tk.W)
+    preview.column("new", width=260, anchor=tk.W)
+    preview_scroll: tk.Scrollbar = tk.Scrollbar(
+        preview_frame,
+        orient=tk.VERTICAL,
+        command=preview.yview,
+        width=18,
+        relief=tk.SUNKEN,
+        borderwidth=1,
+    )
+    preview.configure(yscrollcommand=preview_scroll.set)
+    preview.grid(row=0, column=0, sticky="nsew")
+    preview_scroll.grid(row=0, column=1, sticky="ns")
+
+    button_frame: ttk.Frame = ttk.Frame(dialog)
+    button_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+    status_var: tk.StringVar = tk.StringVar(value="")
+    ttk.Label(button_frame, textvariable=status_var).pack(side=tk.LEFT)
+
+    changes: List[MirrorChange] = []
+    stats: MirrorStats = MirrorStats()
+    task: Optional[BackgroundTask] = None
+
+    def on_preview() -> None:
+        nonlocal task, stats
+        target: Path = Path(target_var.get().strip())
+        if not target_var.get().strip() or not target.is_dir():
+            messagebox.showinfo(
+                TITLE_INFO, "请先选择存在的目标目录。", parent=dialog
+            )
+            return
+        if target.resolve() == source.resolve():
+            messagebox.showinfo(
+                TITLE_INFO, "目标目录不能与当前目录相同。", parent=dialog
+            )
+            return
+        if task is not None:
+            task.cancel()
+        changes.clear()
+        stats = MirrorStats()
+        scan_stats: MirrorStats = stats
+        keep_target: bool = keep_var.get()
+        preview.delete(*preview.get_children())
+        apply_button.configure(state=tk.DISABLED)
+        status_var.set(MSG_MIRROR_SCANNING.format(summary=stats.summary()))
+
+        def produce(cancel_event: threading.Event) -> Iterator[MirrorChange]:
+            return iter_mirror_changes(
+                service.with_priority(IO_PRIORITY_INDEX),
+                source,
+                target,
+                executor,
+                scan_stats,
+                keep_target=keep_target,
+                cancel_event=cancel_event,
+            )
+
+        def on_batch(batch: List[MirrorChange]) -> None:
+            for change in batch:
+                new_text: str = change.new_remark
+                if change.repair_only:
+                    new_text += TEXT_ATTRIBUTE_REPAIR
+                preview.insert(
+                    "",
+                    tk.END,
+                    values=(change.relative, change.old_remark, new_text),
+                )
+            changes.extend(batch)
+            status_var.set(
+                MSG_MIRROR_SCANNING.format(summary=scan_stats.summary())
+            )
+
+        def on_done(error: Optional[BaseException]) -> None:
+            if error is not None:
+                messagebox.showerror(
+                    TITLE_ERROR, f"比较失败：{error}", parent=dialog
+                )
+            status_var.set(
+                MSG_MIRROR_SCANNED.format(summary=scan_stats.summary())
+            )
+            if changes:
+                apply_button.configure(state=tk.NORMAL)
+
+        task = BackgroundTask(dialog, produce, on_batch, on_done)
+        task.start()
+
+    def on_apply() -> None:
+        if not changes:
+            return
+        if not messagebox.askyesno(
+            TITLE_MIRROR,
+            f"确认把 {len(changes)} 项备注写入目标目录？",
+            parent=dialog,
+        ):
+            return
+        pending: Dict[str, MirrorChange] = {
+            str(change.target): change for change in changes
+        }
+        target_root: str = str(Path(target_var.get().strip()).resolve())
+        try:
+            job: Job = jobs.create(
+                JOB_KIND_APPLY,
+                f"镜像备注 {source} → {target_root}",
+                {"root": target_root},
+                [
+                    (path, change.new_remark, change.old_remark)
+                    for path, change in pending.items()
+                ],
+            )
+        except OSError as exc:
+            messagebox.showerror(
+                TITLE_ERROR, f"无法创建任务：{exc}", parent=dialog
+            )
+            return
+        apply_button.configure(state=tk.DISABLED)
+        preview_button.configure(state=tk.DISABLED)
+        status_var.set(MSG_MIRROR_APPLYING.format(count=len(changes)))
+        write_stats: MirrorStats = stats
+
+        def on_finished(done_job: Job) -> None:
+            messages: List[str]
+            if done_job.finished:
+                write_stats.written = done_job.done - done_job.failed_count
+                write_stats.failed = [
+                    (pending[path], reason)
+                    for path, reason in done_job.failures
+                    if path in pending
+                ]
+                messages = [write_stats.summary()]
+                if write_stats.failed:
+                    messages.append("失败项列表：")
+                    messages.append(
+                        summarize_names(
+                            [
+                                f"{change.relative}: {reason}"
+                                for change, reason in write_stats.failed
+                            ]
+                        )
+                    )
+            else:
+                messages = [
+                    MSG_JOB_UNFINISHED.format(
+                        status=JOB_STATUS_LABELS.get(
+                            done_job.status, done_job.status
+                        ),
+                        done=done_job.done,
+                    )
+                ]
+            if dialog.winfo_exists():
+                changes.clear()
+                preview.delete(*preview.get_children())
+                status_var.set("")
+                preview_button.configure(state=tk.NORMAL)
+                messagebox.showinfo(
+                    TITLE_RESULT, "\n".join(messages), parent=dialog
+                )
+            on_committed()
+
+        start_job(parent, jobs, job, service, executor, on_finished)
+
+    def on_close() -> None:
+        if task is not None:
+            task.cancel()
+        dialog.destroy()
+
+    apply_button: ttk.Button = ttk.Button(
+        button_frame, text=BUTTON_APPLY, command=on_apply, state=tk.DISABLED
+    )
+    apply_button.pack(side=tk.RIGHT, padx=4)
+    ttk.Button(button_frame, text=BUTTON_CLOSE, command=on_close).pack(
+        side=tk.RIGHT, padx=4
+    )
+    preview_button: ttk.Button = ttk.Button(
+        button_frame, text=BUTTON_PREVIEW, command=on_preview
+    )
+    preview_button.pack(side=tk.RIGHT, padx=4)
+    dialog.protocol("WM_DELETE_WINDOW", on_close)
@@ -0,0 +1,254 @@
+"""
+规则批量备注对话框：编辑规则、流式预览子树变更、确认后作为可续跑任务并行写入。
+"""
+from __future__ import annotations
+
+import threading
+import tkinter as tk
+from concurrent.futures import Executor
+from pathlib import Path
+from tkinter import messagebox, ttk
+from typing import Callable, Iterator, List, Optional
+
+from core.constants import (
+    BUTTON_APPLY,
+    BUTTON_CLOSE,
+    BUTTON_PREVIEW,
+    COLUMN_HEADER_NEW_REMARK,
+    COLUMN_HEADER_OLD_REMARK,
+    COLUMN_HEADER_RELATIVE_PATH,
+    IO_PRIORITY_INDEX,
+    JOB_KIND_APPLY,
+    JOB_STATUS_LABELS,
+    MSG_JOB_UNFINISHED,
+    MSG_RULE_APPLYING,
+    MSG_RULE_HINT,
+    MSG_RULE_SCANNED,
+    MSG_RULE_SCANNING,
+    TITLE_ERROR,
+    TITLE_INFO,
+    TITLE_RESULT,
+    TITLE_RULES,
+)
+from core.ini_service import DesktopIniService
+from core.jobs import Job, JobManager
+from core.mapping import summarize_names
+from core.rules import RuleChange, RuleError, RuleMatcher, iter_rule_changes
+from ui.background import BackgroundTask
+from ui.jobs_dialog import start_job
+
+
+def rule_dialog(
+    parent: tk.Tk,
+    root: Path,
+    service: DesktopIniService,
+    executor: Executor,
+    jobs: JobManager,
+    on_committed: Callable[[], None],
+) -> None:
+    """
+    弹出规则批量备注对话框。
+
+    确认后的写入作为可续跑任务在主窗口上执行，关闭对话框不会中断写入，
+    进度可在后台任务面板查看。
+
+    Args:
+        parent: 主窗口引用，用于设置模态。
+        root: 规则作用的子树根目录。
+        service: desktop.ini 服务；扫描与写入分别以 index、save 优先级调度。
+        executor: 扫描与写入共用的线程池。
+        jobs: 任务管理器。
+        on_committed: 写入结束后的回调，通常用于刷新表格。
+    """
+    dialog: tk.Toplevel = tk.Toplevel(parent)
+    dialog.title(TITLE_RULES)
+    dialog.transient(parent)
+    dialog.grab_set()
+    dialog.geometry("1000x640")
+
+    ttk.Label(dialog, text=f"{root}\n{MSG_RULE_HINT}").pack(
+        anchor=tk.W, padx=10, pady=6
+    )
+    rules_text: tk.Text = tk.Text(dialog, width=100, height=8, wrap=tk.NONE)
+    rules_text.pack(fill=tk.X, padx=10)
+
+    preview_frame: ttk.Frame = ttk.Frame(dialog)
+    preview_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    preview_frame.rowconfigure(0, weight=1)
+    preview_frame.columnconfigure(0, weight=1)
+    preview: ttk.Treeview = ttk.Treeview(
+        preview_frame,
+        columns=("path", "old", "new"),
+        show="headings",
+        selectmode="none",
+    )
+    preview.heading("path", text=COLUMN_HEADER_RELATIVE_PATH)
+    preview.heading("old", text=COLUMN_HEADER_OLD_REMARK)
+    preview.heading("new", text=COLUMN_HEADER_NEW_REMARK)
+    preview.column("path", width=420, anchor=tk.W)
+    preview.column("old", width=260, anchor=tk.W)
+    preview.column("new", width=260, anchor=tk.W)
+    preview_scroll: tk.Scrollbar = tk.Scrollbar(
+        preview_frame,
+        orient=tk.VERTICAL,
+        command=preview.yview,
+        width=18,
+        relief=tk.SUNKEN,
+        borderwidth=1,
+    )
+    preview.configure(yscrollcommand=preview_scroll.set)
+    preview.grid(row=0, column=0, sticky="nsew")
+    preview_scroll.grid(row=0, column=1, sticky="ns")
+
+    button_frame: ttk.Frame = ttk.Frame(dialog)
+    button_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+    status_var: tk.StringVar = tk.StringVar(value="")
+    ttk.Label(button_frame, textvariable=status_var).pack(side=tk.LEFT)
+
+    changes: List[RuleChange] = []
+    task: Optional[BackgroundTask] = None
+
+    def relative(path: Path) -> str:
+        try:
+            return str(path.relative_to(root))
+        except ValueError:
+            return str(path)
+
+    def on_preview() -> None:
+        nonlocal task
+        try:
+            matcher: RuleMatcher = RuleMatcher.from_lines(
+                rules_text.get("1.0", tk.END).splitlines()
+            )
+        except RuleError as exc:
+            messagebox.showerror(TITLE_ERROR, str(exc), parent=dialog)
+            return
+        if not matcher.rules:
+            messagebox.showinfo(TITLE_INFO, "请先输入至少一条规则。", parent=dialog)
+            return
+        if task is not None:
+            task.cancel()
+        changes.clear()
+        preview.delete(*preview.get_children())
+        apply_button.configure(state=tk.DISABLED)
+        status_var.set(MSG_RULE_SCANNING.format(count=0))
+
+        def produce(cancel_event: threading.Event) -> Iterator[RuleChange]:
+            return iter_rule_changes(
+                service.with_priority(IO_PRIORITY_INDEX),
+                root,
+                matcher,
+                executor,
+                cancel_event,
+            )
+
+        def on_batch(batch: List[RuleChange]) -> None:
+            for change in batch:
+                preview.insert(
+                    "",
+                    tk.END,
+                    values=(
+                        relative(change.path),
+                        change.old_remark,
+                        change.new_remark,
+                    ),
+                )
+            changes.extend(batch)
+            status_var.set(MSG_RULE_SCANNING.format(count=len(changes)))
+
+        def on_done(error: Optional[BaseException]) -> None:
+            if error is not None:
+                messagebox.showerror(
+                    TITLE_ERROR, f"扫描失败：{error}", parent=dialog
+                )
+            status_var.set(MSG_RULE_SCANNED.format(count=len(changes)))
+            if changes:
+                apply_button.configure(state=tk.NORMAL)
+
+        task = BackgroundTask(dialog, produce, on_batch, on_done)
+        task.start()
+
+    def on_apply() -> None:
+        if not changes:
+            return
+        if not messagebox.askyesno(
+            TITLE_RULES,
+            f"确认写入 {len(changes)} 项备注变更？",
+            parent=dialog,
+        ):
+            return
+        try:
+            job: Job = jobs.create(
+                JOB_KIND_APPLY,
+                f"规则批量备注 {root}",
+                {"root": str(root)},
+                [
+                    (str(change.path), change.new_remark, change.old_remark)
+                    for change in changes
+                ],
+            )
+        except OSError as exc:
+            messagebox.showerror(
+                TITLE_ERROR, f"无法创建任务：{exc}", parent=dialog
+            )
+            return
+        apply_button.configure(state=tk.DISABLED)
+        preview_button.configure(state=tk.DISABLED)
+        status_var.set(MSG_RULE_APPLYING.format(count=len(changes)))
+
+        def on_finished(done_job: Job) -> None:
+            messages: List[str]
+            if done_job.finished:
+                messages = [
+                    f"处理总数: {done_job.done}"
+                    f" | 成功: {done_job.done - done_job.failed_count}"
+                    f" | 失败: {done_job.failed_count}"
+                ]
+                if done_job.failures:
+                    messages.append("失败项列表：")
+                    messages.append(
+                        summarize_names(
+                            [
+                                f"{relative(Path(path))}: {reason}"
+                                for path, reason in done_job.failures
+                            ]
+                        )
+                    )
+            else:
+                messages = [
+                    MSG_JOB_UNFINISHED.format(
+                        status=JOB_STATUS_LABELS.get(
+                            done_job.status, done_job.status
+                        ),
+                        done=done_job.done,
+                    )
+                ]
+            if dialog.winfo_exists():
+                changes.clear()
+                preview.delete(*preview.get_children())
+                status_var.set("")
+                preview_button.configure(state=tk.NORMAL)
+                messagebox.showinfo(
+                    TITLE_RESULT, "\n".join(messages), parent=dialog
+                )
+            on_committed()
+
+        start_job(parent, jobs, job, service, executor, on_finished)
+
+    def on_close() -> None:
+        if task is not None:
+            task.cancel()
+        dialog.destroy()
+
+    apply_button: ttk.Button = ttk.Button(
+        button_frame, text=BUTTON_APPLY, command=on_apply, state=tk.DISABLED
+    )
+    apply_button.pack(side=tk.RIGHT, padx=4)
+    ttk.Button(button_frame, text=BUTTON_CLOSE, command=on_close).pack(
+        side=tk.RIGHT, padx=4
+    )
+    preview_button: ttk.Button = ttk.Button(
+        button_frame, text=BUTTON_PREVIEW, command=on_preview
+    )
+    preview_button.pack(side=tk.RIGHT, padx=4)
+    dialog.protocol("WM_DELETE_WINDOW", on_close)
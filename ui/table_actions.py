@@ -1,44 +1,66 @@
 """
 表格相关操作：排序、全选、行编辑同步。
+
+表格行的 item ID 即 RowStore 行号，所有操作直接读写行存储，
+不再从 Treeview 回读显示值。
 """
 from __future__ import annotations
 
 from tkinter import ttk
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 
-from core.ini_service import FolderRemark
+from core.row_store import RowStore
+from core.sizer import SubtreeSize
+from ui.table_filter import TableFilter
 
 
 def sort_by_column(
-    table: ttk.Treeview,
+    table_filter: TableFilter,
+    store: RowStore,
     column: str,
     sort_directions: Dict[str, bool],
 ) -> None:
     """
-    按列排序表格，仅影响显示顺序。
+    按列排序表格，仅影响显示顺序；被筛掉的行一并排序，清除筛选后顺序一致。
 
     Args:
-        table: 需要排序的 Treeview 控件。
-        column: 目标列名，支持 ``name``/``remark``/``path``。
+        table_filter: 表格筛选器，持有全部行的显示顺序。
+        store: 表格对应的行存储。
+        column: 目标列名，支持 ``name``/``remark``/``relpath``/``path``
+            以及按数值排序的 ``size``/``items``（尚未统计的行视为最小）。
         sort_directions: 列到排序方向的布尔映射，True 表示升序。
     """
-    index_map: Dict[str, int] = {"name": 0, "remark": 1, "path": 2}
-    if column not in index_map:
+    key_getters: Dict[str, Callable[[int], str]] = {
+        "name": lambda row_id: store.names[row_id],
+        "remark": lambda row_id: store.current[row_id],
+        "relpath": store.relative_path,
+        "path": store.path,
+    }
+    size_getters: Dict[str, Callable[[SubtreeSize], int]] = {
+        "size": lambda size: size.size_bytes,
+        "items": lambda size: size.items,
+    }
+    sort_key: Callable[[str], Union[str, int]]
+    if column in key_getters:
+        getter: Callable[[int], str] = key_getters[column]
+
+        def sort_key(item_id: str) -> Union[str, int]:
+            return getter(int(item_id)).lower()
+
+    elif column in size_getters:
+        size_getter: Callable[[SubtreeSize], int] = size_getters[column]
+
+        def sort_key(item_id: str) -> Union[str, int]:
+            size: Optional[SubtreeSize] = store.sizes.get(int(item_id))
+            return -1 if size is None else size_getter(size)
+
+    else:
         return
     reverse: bool = sort_directions.get(column, True)
-    items: List[str] = list(table.get_children(""))
-
-    def sort_key(item_id: str) -> str:
-        values: Tuple[str, str, str] = table.item(
-            item_id, "values"
-        )  # type: ignore[assignment]
-        if len(values) <= index_map[column]:
-            return ""
-        return values[index_map[column]].lower()
-
-    items.sort(key=sort_key, reverse=not reverse)
-    for idx, item_id in enumerate(items):
-        table.move(item_id, "", idx)
+    items: List[str] = sorted(
+        table_filter.order, key=sort_key, reverse=not reverse
+    )
+    table_filter.reorder(items)
     sort_directions[column] = not reverse
 
 
@@ -55,28 +77,35 @@ def select_all_rows(table: ttk.Treeview) -> None:
 
 def sync_remark_to_rows(
     table: ttk.Treeview,
-    rows_by_path: Dict[str, FolderRemark],
-    paths: List[str],
+    store: RowStore,
+    row_ids: Iterable[int],
     remark: str,
 ) -> None:
     """
-    更新表格显示与内存模型中的备注值，保持一致性。
+    更新表格显示与行存储中的备注值，保持一致性。
 
     Args:
         table: 目标 Treeview 控件。
-        rows_by_path: 路径到 FolderRemark 的映射。
-        paths: 需要更新的路径列表。
+        store: 表格对应的行存储。
+        row_ids: 需要更新的行号。
         remark: 要写入的新备注值。
     """
-    for item_id in table.get_children():
-        values: Tuple[str, str, str] = table.item(
-            item_id, "values"
-        )  # type: ignore[assignment]
-        if len(values) < 3:
-            continue
-        path_str: str = values[2]
-        if path_str in paths:
-            updated: Tuple[str, str, str] = (values[0], remark, path_str)
-            table.item(item_id, values=updated)
-            if path_str in rows_by_path:
-                rows_by_path[path_str].current_remark = remark
+    sync_remarks_to_rows(table, store, {row_id: remark for row_id in row_ids})
+
+
+def sync_remarks_to_rows(
+    table: ttk.Treeview,
+    store: RowStore,
+    updates: Dict[int, str],
+) -> None:
+    """
+    批量更新表格显示与行存储中的备注值，按行号直接定位，不遍历表格。
+
+    Args:
+        table: 目标 Treeview 控件。
+        store: 表格对应的行存储。
+        updates: 行号到新备注的映射。
+    """
+    for row_id, remark in updates.items():
+        store.set_current(row_id, remark)
+        table.set(str(row_id), "remark", remark)
@@ -0,0 +1,185 @@
+"""
+表格筛选：按名称与备注（含拼音首字母）筛选当前表格，
+不匹配的行只从视图摘下（detach），行存储与行号保持不变。
+"""
+from __future__ import annotations
+
+from tkinter import ttk
+from typing import Iterable, List, Optional, Set
+
+from core.constants import TABLE_INDEX_CHUNK, TABLE_INDEX_DELAY_MS
+from core.row_store import RowStore
+from core.search_index import RowSearchIndex
+
+
+class TableFilter:
+    """
+    管理表格的全部行顺序与当前可见行。
+
+    ``order`` 记录所有行（含被筛掉的行）的显示顺序，排序作用于它；
+    可见行由 ``RowSearchIndex`` 计算。输入在上一次查询后追加字符时，
+    只摘下不再匹配的行，否则按 ``order`` 一次性重排可见行。
+    加载完成后在空闲时分批预建索引，首次输入不必等待整表索引。
+
+    Attributes:
+        table: 表格控件，item ID 为行号字符串。
+        store: 表格对应的行存储。
+        index: 行存储的筛选索引。
+        order: 全部行的 item ID，按当前排序。
+        query: 当前筛选文本。
+    """
+
+    def __init__(
+        self,
+        table: ttk.Treeview,
+        store: RowStore,
+        index: Optional[RowSearchIndex] = None,
+    ) -> None:
+        self.table: ttk.Treeview = table
+        self.store: RowStore = store
+        self.index: RowSearchIndex = index or RowSearchIndex(store)
+        self.order: List[str] = []
+        self.query: str = ""
+        self._visible: Optional[Set[int]] = None
+        self._warm_after: Optional[str] = None
+
+    @property
+    def active(self) -> bool:
+        """
+        是否处于筛选状态。
+        """
+        return self._visible is not None
+
+    def visible_count(self) -> int:
+        """
+        当前可见行数。
+        """
+        if self._visible is None:
+            return len(self.order)
+        return len(self._visible)
+
+    def is_visible(self, item_id: str) -> bool:
+        """
+        判断行当前是否可见。
+
+        Args:
+            item_id: 表格 item ID。
+        """
+        return self._visible is None or int(item_id) in self._visible
+
+    def clear_table(self) -> None:
+        """
+        删除表格全部行（含被筛掉的行）并清空索引，保留筛选文本。
+        """
+        self._cancel_warm()
+        if self.order:
+            self.table.delete(*self.order)
+        self.order.clear()
+        self.index.clear()
+        self._visible = set() if self.query.strip() else None
+
+    def rows_added(self, row_ids: List[int]) -> None:
+        """
+        登记新插入表格的行；筛选生效时摘下其中不匹配的行。
+
+        Args:
+            row_ids: 已插入表格的行号。
+        """
+        self.order.extend(str(row_id) for row_id in row_ids)
+        if self._visible is not None:
+            matched: List[int] = self.index.filter_rows(self.query, row_ids)
+            self._visible.update(matched)
+            matched_set: Set[int] = set(matched)
+            hidden: List[str] = [
+                str(row_id) for row_id in row_ids if row_id not in matched_set
+            ]
+            if hidden:
+                self.table.detach(*hidden)
+        self._schedule_warm()
+
+    def apply(self, query: str) -> None:
+        """
+        按新的筛选文本更新可见行，并从选中项中去掉被隐藏的行。
+
+        Args:
+            query: 用户输入的筛选文本。
+        """
+        self._cancel_warm()
+        matches: Optional[List[int]] = self.index.match(query)
+        self.query = query
+        previous: Optional[Set[int]] = self._visible
+        if matches is None:
+            self._visible = None
+            self.table.set_children("", *self.order)
+            return
+        visible: Set[int] = set(matches)
+        self._visible = visible
+        if previous is not None and visible <= previous:
+            # 只收窄：摘下不再匹配的行即可，无需重排。
+            removed: List[str] = [
+                str(row_id) for row_id in previous if row_id not in visible
+            ]
+            if removed:
+                self.table.detach(*removed)
+        else:
+            self.table.set_children("", *self._visible_order())
+        hidden: List[str] = [
+            item_id
+            for item_id in self.table.selection()
+            if int(item_id) not in visible
+        ]
+        if hidden:
+            self.table.selection_remove(*hidden)
+
+    def reorder(self, items: Iterable[str]) -> None:
+        """
+        用排序后的全部行替换显示顺序，只把可见行挂回表格。
+
+        Args:
+            items: 排序后的全部 item ID。
+        """
+        self.order = list(items)
+        self.table.set_children("", *self._visible_order())
+
+    def refresh_rows(self, row_ids: Iterable[int]) -> None:
+        """
+        行的备注变化后刷新其索引文本（可见性在下一次输入时更新）。
+
+        Args:
+            row_ids: 备注发生变化的行号。
+        """
+        self.index.update(row_ids)
+
+    def _visible_order(self) -> List[str]:
+        """
+        按当前顺序列出可见行。
+        """
+        if self._visible is None:
+            return self.order
+        visible: Set[int] = self._visible
+        return [item_id for item_id in self.order if int(item_id) in visible]
+
+    def _schedule_warm(self) -> None:
+        """
+        安排空闲时分批建立索引。
+        """
+        if self._warm_after is None and len(self.index) < len(self.store):
+            self._warm_after = self.table.after(
+                TABLE_INDEX_DELAY_MS, self._warm
+            )
+
+    def _warm(self) -> None:
+        """
+        分批建立索引的回调。
+        """
+        self._warm_after = None
+        self.index.extend(TABLE_INDEX_CHUNK)
+        self._schedule_warm()
+
+    def _cancel_warm(self) -> None:
+        """
+        取消待执行的索引预建。
+        """
+        if self._warm_after is not None:
+            self.table.after_cancel(self._warm_after)
+            self._warm_after = None
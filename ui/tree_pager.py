@@ -0,0 +1,272 @@
+"""
+目录树分页填充：子目录很多时先插入首屏，其余在空闲时分批插入，
+超过上限后改为“显示更多”节点，并支持按名称筛选已枚举的子目录。
+"""
+from __future__ import annotations
+
+import tkinter as tk
+from dataclasses import dataclass
+from pathlib import Path
+from tkinter import ttk
+from typing import Callable, Dict, List, Optional
+
+from core.constants import (
+    PLACEHOLDER_LOADING,
+    TEXT_SHOW_MORE,
+    TREE_AUTO_LIMIT,
+    TREE_CHUNK_DELAY_MS,
+    TREE_CHUNK_SIZE,
+    TREE_PAGE_SIZE,
+)
+
+# fullpath 列中的特殊值：懒加载占位符与“显示更多”节点。
+PLACEHOLDER_VALUE = "placeholder"
+MORE_VALUE = "more"
+
+
+@dataclass
+class _NodeState:
+    """
+    单个已展开节点的分页状态。
+
+    Attributes:
+        folders: 枚举得到的全部子目录。
+        visible: 经筛选后需要展示的子目录。
+        inserted: visible 中已插入的数量。
+        limit: 当前允许自动插入到的位置，点击“显示更多”后递增。
+        filter_text: 当前筛选文本（小写）。
+        after_id: 待执行的分批插入回调。
+        more_id: “显示更多”节点 ID。
+    """
+
+    folders: List[Path]
+    visible: List[Path]
+    inserted: int = 0
+    limit: int = TREE_AUTO_LIMIT
+    filter_text: str = ""
+    after_id: Optional[str] = None
+    more_id: Optional[str] = None
+
+
+class TreePager:
+    """
+    管理目录树各节点的分页插入。
+
+    首屏同步插入 ``page_size`` 项，之后每隔 ``chunk_delay_ms`` 插入一批，
+    单个节点自动插入达到 ``auto_limit`` 后停止并放置“显示更多”节点，
+    避免一次展开数万子目录时卡住界面并占用大量 Tk 内存。
+
+    Attributes:
+        tree: 目录树控件。
+        has_children: 判断目录是否有子目录，用于决定是否放置懒加载占位符。
+        label: 生成节点文字（例如附加子树统计）；None 时使用目录名。
+    """
+
+    def __init__(
+        self,
+        tree: ttk.Treeview,
+        has_children: Callable[[Path], bool],
+        label: Optional[Callable[[Path], str]] = None,
+        page_size: int = TREE_PAGE_SIZE,
+        chunk_size: int = TREE_CHUNK_SIZE,
+        chunk_delay_ms: int = TREE_CHUNK_DELAY_MS,
+        auto_limit: int = TREE_AUTO_LIMIT,
+    ) -> None:
+        self.tree: ttk.Treeview = tree
+        self.has_children: Callable[[Path], bool] = has_children
+        self.label: Callable[[Path], str] = label or (lambda path: path.name)
+        self._page_size: int = page_size
+        self._chunk_size: int = chunk_size
+        self._chunk_delay_ms: int = chunk_delay_ms
+        self._auto_limit: int = auto_limit
+        self._nodes: Dict[str, _NodeState] = {}
+
+    def populate(self, node_id: str, folders: List[Path]) -> None:
+        """
+        用新的子目录列表重建节点的子项（不带筛选）。
+
+        Args:
+            node_id: 目录树节点 ID。
+            folders: 已排序的子目录列表。
+        """
+        self._cancel(node_id)
+        # 父节点重新展开后，旧的后代节点已被删除，顺带释放它们的状态。
+        for stale_id in [
+            item for item in self._nodes if not self.tree.exists(item)
+        ]:
+            self._cancel(stale_id)
+            del self._nodes[stale_id]
+        state: _NodeState = _NodeState(
+            folders=folders, visible=folders, limit=self._auto_limit
+        )
+        self._nodes[node_id] = state
+        self._rebuild(node_id, state)
+
+    def set_filter(self, node_id: str, text: str) -> None:
+        """
+        按名称（不区分大小写的子串）筛选节点的子项，不重新枚举目录。
+
+        Args:
+            node_id: 已展开的节点 ID。
+            text: 筛选文本；为空时显示全部。
+        """
+        state: Optional[_NodeState] = self._nodes.get(node_id)
+        if state is None or not self.tree.exists(node_id):
+            return
+        needle: str = text.strip().lower()
+        if needle == state.filter_text:
+            return
+        self._cancel(node_id)
+        state.filter_text = needle
+        state.visible = state.folders
+        if needle:
+            state.visible = [
+                folder
+                for folder in state.folders
+                if needle in folder.name.lower()
+            ]
+        state.limit = self._auto_limit
+        self._rebuild(node_id, state)
+
+    def is_populated(self, node_id: str) -> bool:
+        """
+        节点是否已由分页器填充过子项。
+
+        Args:
+            node_id: 目录树节点 ID。
+        """
+        return node_id in self._nodes
+
+    def find_child(self, node_id: str, path: str) -> Optional[str]:
+        """
+        在节点已插入的子项中按完整路径查找。
+
+        Args:
+            node_id: 目录树节点 ID。
+            path: 子目录完整路径。
+
+        Returns:
+            子节点 ID；尚未插入或已被筛掉时为 None。
+        """
+        for child_id in self.tree.get_children(node_id):
+            if self.tree.set(child_id, "fullpath") == path:
+                return child_id
+        return None
+
+    def is_more_node(self, item_id: str) -> bool:
+        """
+        判断节点是否为“显示更多”节点。
+
+        Args:
+            item_id: 目录树节点 ID。
+        """
+        return self.tree.set(item_id, "fullpath") == MORE_VALUE
+
+    def show_more(self, more_id: str) -> None:
+        """
+        响应“显示更多”：放宽该节点的自动插入上限并继续分批插入。
+
+        Args:
+            more_id: “显示更多”节点 ID。
+        """
+        node_id: str = self.tree.parent(more_id)
+        state: Optional[_NodeState] = self._nodes.get(node_id)
+        if state is None:
+            return
+        state.limit = state.inserted + self._auto_limit
+        self._remove_more(state)
+        self._schedule(node_id, state)
+
+    def reset(self) -> None:
+        """
+        取消全部待插入批次并清空状态（目录树根节点重建时调用）。
+        """
+        for node_id in list(self._nodes):
+            self._cancel(node_id)
+        self._nodes.clear()
+
+    def _rebuild(self, node_id: str, state: _NodeState) -> None:
+        """
+        清空节点子项并插入首屏，其余交给分批插入。
+        """
+        children = self.tree.get_children(node_id)
+        if children:
+            self.tree.delete(*children)
+        state.inserted = 0
+        state.more_id = None
+        self._insert_next(node_id, state, self._page_size)
+        self._schedule(node_id, state)
+
+    def _insert_next(
+        self, node_id: str, state: _NodeState, count: int
+    ) -> None:
+        """
+        插入 visible 中接下来的 count 项。
+        """
+        end: int = min(state.inserted + count, len(state.visible), state.limit)
+        for folder in state.visible[state.inserted:end]:
+            child_id: str = self.tree.insert(
+                node_id,
+                tk.END,
+                text=self.label(folder),
+                values=(str(folder),),
+                open=False,
+            )
+            if self.has_children(folder):
+                self.tree.insert(
+                    child_id,
+                    tk.END,
+                    text=PLACEHOLDER_LOADING,
+                    values=(PLACEHOLDER_VALUE,),
+                )
+        state.inserted = max(state.inserted, end)
+
+    def _schedule(self, node_id: str, state: _NodeState) -> None:
+        """
+        安排下一批插入；达到上限时放置“显示更多”节点。
+        """
+        remaining: int = len(state.visible) - state.inserted
+        if remaining <= 0:
+            return
+        if state.inserted >= state.limit:
+            state.more_id = self.tree.insert(
+                node_id,
+                tk.END,
+                text=TEXT_SHOW_MORE.format(count=remaining),
+                values=(MORE_VALUE,),
+            )
+            return
+        state.after_id = self.tree.after(
+            self._chunk_delay_ms, self._continue, node_id
+        )
+
+    def _continue(self, node_id: str) -> None:
+        """
+        分批插入回调；节点已被删除时丢弃状态。
+        """
+        state: Optional[_NodeState] = self._nodes.get(node_id)
+        if state is None:
+            return
+        state.after_id = None
+        if not self.tree.exists(node_id):
+            del self._nodes[node_id]
+            return
+        self._insert_next(node_id, state, self._chunk_size)
+        self._schedule(node_id, state)
+
+    def _remove_more(self, state: _NodeState) -> None:
+        """
+        删除“显示更多”节点。
+        """
+        if state.more_id is not None and self.tree.exists(state.more_id):
+            self.tree.delete(state.more_id)
+        state.more_id = None
+
+    def _cancel(self, node_id: str) -> None:
+        """
+        取消节点待执行的分批插入。
+        """
+        state: Optional[_NodeState] = self._nodes.get(node_id)
+        if state is not None and state.after_id is not None:
+            self.tree.after_cancel(state.after_id)
+            state.after_id = None
@@ -0,0 +1,142 @@
+"""
+Tk 主循环卡顿监控：测量 after() 调度延迟，记录超过阈值的卡顿及当时的操作。
+"""
+from __future__ import annotations
+
+import time
+import tkinter as tk
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from core.constants import (
+    UI_RESPONSE_BUDGET_MS,
+    UI_STALL_THRESHOLD_MS,
+    UI_WATCHDOG_INTERVAL_MS,
+)
+from core.metrics import record_metric
+from core.utils import log_message
+
+
+class EventLoopWatchdog:
+    """
+    周期性调度 after() 回调，比较实际触发时间与预期时间得出主循环延迟。
+
+    卡顿期间回调无法执行，因此在卡顿结束后的首次回调中结算；
+    采样窗口内开始过的所有操作都会记入该次卡顿。
+
+    Attributes:
+        widget: 用于调度 after() 的 Tk 控件。
+        interval_ms: 采样间隔。
+        threshold_ms: 记录卡顿的最小延迟。
+        budget_ms: 响应预算，超出时以 WARN 级别记录。
+        stall_count: 累计卡顿次数。
+        over_budget_count: 超出预算的卡顿次数。
+        max_lag_ms: 最大延迟。
+        total_stall_ms: 卡顿累计时长。
+    """
+
+    def __init__(
+        self,
+        widget: tk.Misc,
+        interval_ms: int = UI_WATCHDOG_INTERVAL_MS,
+        threshold_ms: int = UI_STALL_THRESHOLD_MS,
+        budget_ms: int = UI_RESPONSE_BUDGET_MS,
+    ) -> None:
+        self.widget: tk.Misc = widget
+        self.interval_ms: int = interval_ms
+        self.threshold_ms: int = threshold_ms
+        self.budget_ms: int = budget_ms
+        self.stall_count: int = 0
+        self.over_budget_count: int = 0
+        self.max_lag_ms: float = 0.0
+        self.total_stall_ms: float = 0.0
+        self._active_ops: List[str] = []
+        self._window_ops: List[str] = []
+        self._expected: float = 0.0
+        self._after_id: Optional[str] = None
+
+    def start(self) -> None:
+        """
+        开始采样；重复调用无副作用。
+        """
+        if self._after_id is not None:
+            return
+        self._schedule()
+
+    def stop(self) -> None:
+        """
+        停止采样并把汇总写入日志。
+        """
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+        log_message("INFO", f"ui watchdog summary: {self.summary()}")
+
+    @contextmanager
+    def operation(self, name: str) -> Iterator[None]:
+        """
+        标记一段正在执行的界面操作，卡顿发生时据此归因。
+
+        Args:
+            name: 操作名称。
+        """
+        self._active_ops.append(name)
+        if name not in self._window_ops:
+            self._window_ops.append(name)
+        try:
+            yield
+        finally:
+            self._active_ops.pop()
+
+    def summary(self) -> str:
+        """
+        生成卡顿统计摘要。
+
+        Returns:
+            包含次数、最大延迟与累计时长的单行文本。
+        """
+        return (
+            f"stalls={self.stall_count} over_budget={self.over_budget_count}"
+            f" max_lag_ms={self.max_lag_ms:.1f}"
+            f" total_stall_ms={self.total_stall_ms:.1f}"
+        )
+
+    def _schedule(self) -> None:
+        """
+        登记下一次采样回调并记录预期触发时间。
+        """
+        self._expected = time.perf_counter() + self.interval_ms / 1000
+        self._after_id = self.widget.after(self.interval_ms, self._tick)
+
+    def _tick(self) -> None:
+        """
+        采样回调：计算延迟，超过阈值时记录卡顿，然后开启新窗口。
+        """
+        lag_ms: float = (time.perf_counter() - self._expected) * 1000
+        if lag_ms >= self.threshold_ms:
+            self._record_stall(lag_ms)
+        self._window_ops = list(self._active_ops)
+        self._schedule()
+
+    def _record_stall(self, lag_ms: float) -> None:
+        """
+        记录一次卡顿到统计与日志。
+
+        Args:
+            lag_ms: 本次主循环延迟。
+        """
+        self.stall_count += 1
+        self.total_stall_ms += lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        operations: str = ",".join(self._window_ops) or "idle"
+        record_metric("ui_stall", lag_ms, f"operation={operations}")
+        if lag_ms >= self.budget_ms:
+            self.over_budget_count += 1
+            log_message(
+                "WARN",
+                f"ui stall {lag_ms:.0f}ms exceeds budget "
+                f"{self.budget_ms}ms during {operations}",
+            )